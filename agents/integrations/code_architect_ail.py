@@ -21,6 +21,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from tools.ail.context_provider import ArchaeologyContextProvider, ArchaeologicalContext
 from tools.ail.agent_integration import (
     get_context_from_input,
+    get_contexts_from_inputs,
     extract_file_path,
     formulate_question,
 )
@@ -227,6 +228,27 @@ class CodeArchitectAIL:
             question = formulate_question(user_input, task_type="review")
             context = self.provider.get_context_sync(file_path, question)
 
+        return self._review_from_context(context)
+
+    def enhanced_reviews(self, user_inputs: List[str]) -> List[ArchitecturalReview]:
+        """
+        Review several inputs, answering all their questions in one batch.
+
+        Args:
+            user_inputs: Natural language inputs, each naming a file
+
+        Returns:
+            ArchitecturalReview per input, in input order
+        """
+        contexts = get_contexts_from_inputs(self.provider, user_inputs, str(self.repo_path))
+        for user_input, context in zip(user_inputs, contexts):
+            if context is None:
+                raise ValueError(f"Could not extract file path from input: {user_input}")
+
+        return [self._review_from_context(context) for context in contexts]
+
+    def _review_from_context(self, context: ArchaeologicalContext) -> ArchitecturalReview:
+        """Build an architectural review from archaeological context."""
         # Extract architectural insights
         insights = self._extract_architectural_insights(context)
 
@@ -21,6 +21,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from tools.ail.context_provider import ArchaeologyContextProvider, ArchaeologicalContext
 from tools.ail.agent_integration import (
     get_context_from_input,
+    get_contexts_from_inputs,
     extract_file_path,
     formulate_question,
 )
@@ -163,6 +164,19 @@ class SecurityAuditAIL:
             question = formulate_question(user_input, task_type="review")
             context = self.provider.get_context_sync(file_path, question)
 
+        return self._report_from_context(context)
+
+    def enhanced_audits(self, user_inputs: List[str]) -> List[SecurityAuditReport]:
+        """Audit several inputs, answering all their questions in one batch."""
+        contexts = get_contexts_from_inputs(self.provider, user_inputs, str(self.repo_path))
+        for user_input, context in zip(user_inputs, contexts):
+            if context is None:
+                raise ValueError(f"Could not extract file path from input: {user_input}")
+
+        return [self._report_from_context(context) for context in contexts]
+
+    def _report_from_context(self, context: ArchaeologicalContext) -> SecurityAuditReport:
+        """Build a security audit report from archaeological context."""
         incidents = self._extract_security_incidents(context)
         vulnerability_patterns = self._extract_vulnerability_patterns(context)
         auth_evolution = self._extract_authentication_evolution(context)
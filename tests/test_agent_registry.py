@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tests for the agent registry.
+
+Tests:
+- Parsed index cached on disk and reused by later registries
+- Only agent files whose mtime or size changed are reparsed
+- Cache ignored when unreadable or derived with other patterns
+- Indexed search: n-gram substring lookup, BM25 keyword weights, LRU results
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from agent_registry import AgentMetadata, AgentRegistry, NGramIndex, RegistryIndexCache
+
+
+def write_agent(agents_dir: Path, name: str, description: str) -> Path:
+    """Write an agent definition with frontmatter."""
+    path = agents_dir / f"{name}.md"
+    path.write_text(f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n")
+    return path
+
+
+def bump_mtime(path: Path):
+    """Move a path's mtime forward (filesystem timestamps can be coarse)."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def agents_dir(tmp_path):
+    """Agents directory with three agents, a template and a broken file."""
+    agents_dir = tmp_path / "agents"
+    agents_dir.mkdir()
+    write_agent(agents_dir, "api-designer", "Design REST api contracts and review them")
+    write_agent(agents_dir, "db-tuner", "Optimize database performance")
+    write_agent(agents_dir, "doc-writer", "Write documentation and tutorials")
+    write_agent(agents_dir, "agent-template", "Template")
+    (agents_dir / "broken.md").write_text("no frontmatter")
+    return agents_dir
+
+
+def new_registry(agents_dir: Path, **kwargs) -> AgentRegistry:
+    return AgentRegistry(agents_dir, cache_dir=agents_dir.parent / "cache", **kwargs)
+
+
+class TestRegistryIndexCache:
+    """Test the persistent registry index."""
+
+    def test_warm_registry_reparses_nothing(self, agents_dir):
+        cold = new_registry(agents_dir)
+        assert cold.cache_stats == {"parsed": 4, "cached": 0}
+        assert cold.cache.exists()
+
+        warm = new_registry(agents_dir)
+
+        assert warm.cache_stats == {"parsed": 0, "cached": 4}
+        assert warm.name_index == cold.name_index
+        assert dict(warm.keyword_index) == dict(cold.keyword_index)
+        assert dict(warm.capability_index) == dict(cold.capability_index)
+        assert dict(warm.domain_index) == dict(cold.domain_index)
+        assert warm.get_agent("db-tuner").file_path == agents_dir / "db-tuner.md"
+
+    def test_no_cache_without_cache_dir(self, agents_dir):
+        registry = AgentRegistry(agents_dir)
+
+        assert registry.cache is None
+        assert registry.cache_stats == {"parsed": 4, "cached": 0}
+        assert sorted(p.name for p in agents_dir.parent.iterdir()) == ["agents"]
+
+    def test_matches_uncached_registry(self, agents_dir):
+        new_registry(agents_dir)
+
+        assert new_registry(agents_dir).name_index == \
+            AgentRegistry(agents_dir, use_cache=False).name_index
+
+    def test_only_changed_files_are_reparsed(self, agents_dir):
+        new_registry(agents_dir)
+        bump_mtime(write_agent(agents_dir, "db-tuner", "Optimize database queries and indexes"))
+        (agents_dir / "doc-writer.md").unlink()
+        write_agent(agents_dir, "sec-auditor", "Audit security")
+
+        registry = new_registry(agents_dir)
+
+        assert registry.cache_stats == {"parsed": 2, "cached": 2}
+        assert registry.list_all_agents() == ["api-designer", "db-tuner", "sec-auditor"]
+        assert "indexes" in registry.get_agent("db-tuner").keywords
+        assert new_registry(agents_dir).cache_stats["parsed"] == 0
+
+    def test_pattern_change_invalidates_cache(self, agents_dir, monkeypatch):
+        new_registry(agents_dir)
+        monkeypatch.setitem(AgentRegistry.DOMAINS, "docs", ["documentation"])
+
+        registry = new_registry(agents_dir)
+
+        assert registry.cache_stats["cached"] == 0
+        assert registry.find_by_domain("docs") == ["doc-writer"]
+
+    @pytest.mark.parametrize("attribute, value", [
+        ("STOPWORDS", AgentRegistry.STOPWORDS | {"writes"}),
+        ("WORD_PATTERN", re.compile(r'\b[a-z][a-z-]*\b')),
+        ("MIN_KEYWORD_LENGTH", 4),
+        ("PREVIEW_CHARS", 100),
+    ])
+    def test_keyword_setting_change_invalidates_cache(self, agents_dir, monkeypatch,
+                                                      attribute, value):
+        new_registry(agents_dir)
+        monkeypatch.setattr(AgentRegistry, attribute, value)
+
+        assert new_registry(agents_dir).cache_stats["cached"] == 0
+
+    def test_corrupt_cache_ignored(self, agents_dir):
+        registry = new_registry(agents_dir)
+        registry.cache.path.write_bytes(b"not a pickle")
+
+        assert new_registry(agents_dir).cache_stats == {"parsed": 4, "cached": 0}
+
+    def test_cache_keyed_by_agents_dir(self, agents_dir, tmp_path):
+        registry = new_registry(agents_dir)
+        other = RegistryIndexCache(tmp_path / "other", registry.cache.store_dir)
+
+        assert other.load(registry._cache_fingerprint()) == {}
+
+    def test_cache_disabled(self, agents_dir):
+        registry = new_registry(agents_dir, use_cache=False)
+
+        assert registry.cache is None
+        assert len(registry.list_all_agents()) == 3
+        assert not (agents_dir.parent / "cache").exists()
+
+
+class TestNGramIndex:
+    """Test n-gram substring lookup."""
+
+    @pytest.fixture
+    def index(self):
+        index = NGramIndex()
+        index.add("a", "design rest api contracts")
+        index.add("b", "optimize database performance")
+        index.add("c", "api gateway")
+        return index
+
+    @pytest.mark.parametrize("query", [
+        "api", "rest api", "base perf", "performance", "api contracts", "zzz", "a", "", "gateway!",
+    ])
+    def test_matches_substring_scan(self, index, query):
+        assert index.find(query) == {key for key, text in index.texts.items() if query in text}
+
+
+class TestIndexedSearch:
+    """Test AgentRegistry.search over its indices."""
+
+    @pytest.fixture
+    def registry(self, agents_dir):
+        write_agent(agents_dir, "cache-expert", "Cache tuning with cache eviction and cache warming")
+        write_agent(agents_dir, "perf-engineer", "Review cache and database performance")
+        return AgentRegistry(agents_dir, use_cache=False)
+
+    def test_name_and_description_matches(self, registry):
+        results = registry.search("db-tuner")
+        assert results[0][0] == "db-tuner"
+        assert results[0][1] > 18.0  # Exact name + name substring + keyword
+
+        assert [name for name, _ in registry.search("database performance")][:2] == \
+            ["db-tuner", "perf-engineer"]
+
+    def test_keyword_weights_follow_bm25(self, registry):
+        results = dict(registry.search("eviction"))
+        assert list(results) == ["cache-expert"]
+
+        # "cache" appears three times in cache-expert's short description
+        cache = dict(registry.search("cache"))
+        assert cache["cache-expert"] > cache["perf-engineer"] > 0
+
+        # A keyword in several agents weighs less than one in a single agent
+        weights = {word: dict(postings) for word, postings in registry._keyword_weights.items()}
+        assert weights["eviction"]["cache-expert"] > weights["cache"]["cache-expert"] / 3
+        assert weights["database"]["db-tuner"] < AgentRegistry.KEYWORD_WEIGHT
+
+    def test_results_cached_until_refresh(self, registry):
+        first = registry.search("quantum")
+        registry.name_index["quantum-specialist"] = AgentMetadata(
+            name="quantum-specialist", description="Quantum computing"
+        )
+
+        assert registry.search("quantum") == first
+        registry.refresh_search_index()
+        assert [name for name, _ in registry.search("quantum")] == ["quantum-specialist"]
+
+    def test_lru_evicts_oldest(self, registry):
+        registry.SEARCH_CACHE_SIZE = 2
+        for query in ("api", "cache", "database"):
+            registry.search(query)
+
+        assert [key[0] for key in registry._search_cache] == ["cache", "database"]
+        registry.search("cache")
+        registry.search("review")
+        assert [key[0] for key in registry._search_cache] == ["cache", "review"]
+
+    def test_returned_list_is_a_copy(self, registry):
+        registry.search("api").clear()
+
+        assert registry.search("api")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -152,6 +152,31 @@ class TestCodeArchitectAIL:
         assert 'confidence' in review_dict
         assert 'architectural_insights' in review_dict
 
+    def test_enhanced_reviews_batch(self, architect_ail):
+        """Test that a review sweep answers every input in one batch."""
+        inputs = [
+            "Review tools/ail/context_provider.py",
+            "Review tools/ail/agent_integration.py",
+        ]
+        calls = []
+        get_contexts_sync = architect_ail.provider.get_contexts_sync
+
+        def counting_get_contexts_sync(batch):
+            calls.append(batch)
+            return get_contexts_sync(batch)
+
+        architect_ail.provider.get_contexts_sync = counting_get_contexts_sync
+
+        reviews = architect_ail.enhanced_reviews(inputs)
+
+        assert len(calls) == 1
+        assert [review.file_path for review in reviews] == [
+            "tools/ail/context_provider.py",
+            "tools/ail/agent_integration.py",
+        ]
+        with pytest.raises(ValueError):
+            architect_ail.enhanced_reviews(["No file mentioned here"])
+
     def test_quality_improvement_measurement(self, architect_ail):
         """Test quality improvement with AIL vs without AIL."""
         # This test measures the quality improvement from AIL integration
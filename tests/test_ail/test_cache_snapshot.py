@@ -0,0 +1,289 @@
+"""
+Tests for the persistent L1/L2 cache snapshot, provider warm start and
+HEAD-aware cache invalidation.
+"""
+
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, Mock
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'tools'))
+
+from tools.ail.cache_snapshot import CacheSnapshot, CacheSnapshotStore
+from tools.ail.context_provider import (
+    ArchaeologyContextProvider,
+    ArchaeologicalContext,
+    ContextSource,
+)
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run a git command in the test repository."""
+    result = subprocess.run(
+        ['git', '-C', str(repo), '-c', 'user.name=Test Author',
+         '-c', 'user.email=test@example.com', *args],
+        check=True, capture_output=True, text=True,
+    )
+    return result.stdout.strip()
+
+
+def commit_file(repo: Path, name: str, content: str, message: str) -> None:
+    """Write a file and commit it."""
+    path = repo / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', message)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository with one commit."""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    git(repo, 'init', '-q')
+    commit_file(repo, 'src/app.py', 'print(1)\n', 'Add app')
+    return repo
+
+
+def new_provider(repo: Path, tmp_path: Path) -> ArchaeologyContextProvider:
+    """Provider whose backend answers every question without reading history."""
+    provider = ArchaeologyContextProvider(
+        repo_path=str(repo),
+        history_dir=str(tmp_path / 'history'),
+        persist_cache=True,
+        cache_dir=str(tmp_path / 'cache'),
+    )
+    provider._initialize_components = Mock(return_value=True)
+
+    async def backend(file_path, question, line_range=None):
+        provider.backend_calls += 1
+        return MagicMock(answer=f"Answer: {question}", confidence=0.8, citations=[])
+
+    provider.backend_calls = 0
+    provider._query_archaeology = backend
+    return provider
+
+
+class TestCacheSnapshotStore:
+    """Test snapshot persistence."""
+
+    def test_missing_snapshot(self, repo, tmp_path):
+        store = CacheSnapshotStore(str(repo), tmp_path / 'cache')
+
+        assert not store.exists()
+        assert store.load() is None
+
+    def test_round_trip(self, repo, tmp_path):
+        store = CacheSnapshotStore(str(repo), tmp_path / 'cache')
+        snapshot = CacheSnapshot(
+            head_sha='a' * 40,
+            results=[{'answer': 'x'}],
+            l1_entries=[('key', 0)],
+            l2_entries=[{'query_text': 'why', 'result': 0}],
+            l2_embeddings=np.ones((1, 4), dtype=np.float32),
+            embedding_provider='HashingEmbeddingProvider:4',
+        )
+
+        store.save(snapshot)
+        loaded = store.load()
+
+        assert loaded.head_sha == 'a' * 40
+        assert loaded.l1_entries == [('key', 0)]
+        assert loaded.l2_embeddings.shape == (1, 4)
+        assert loaded.embedding_provider == 'HashingEmbeddingProvider:4'
+        assert list(store.store_dir.iterdir()) == [store.path]  # No temp files left
+
+    def test_corrupt_or_foreign_snapshot_ignored(self, repo, tmp_path):
+        store = CacheSnapshotStore(str(repo), tmp_path / 'cache')
+        store.save(CacheSnapshot(head_sha=None, results=[], l1_entries=[]))
+
+        assert CacheSnapshotStore(str(tmp_path), store.store_dir).load() is None
+
+        store.path.write_bytes(b'not a pickle')
+        assert store.load() is None
+
+
+class TestProviderWarmStart:
+    """Test provider snapshot save/load."""
+
+    def test_l1_and_l2_survive_restart(self, repo, tmp_path):
+        first = new_provider(repo, tmp_path)
+        first.get_context_sync('src/app.py', 'Why was the retry logic changed?')
+        assert first.save_cache_snapshot()
+
+        second = new_provider(repo, tmp_path)
+        exact = second.get_context_sync('src/app.py', 'Why was the retry logic changed?')
+        assert exact.cached and exact.cache_level == 'L1'
+        assert exact.answer == 'Answer: Why was the retry logic changed?'
+        assert exact.head_sha == git(repo, 'rev-parse', 'HEAD')
+
+        similar = second.get_context_sync('src/app.py', 'why was retry logic changed?')
+        assert similar.cached and similar.cache_level == 'L2'
+        assert second.backend_calls == 0
+
+    def test_answers_for_files_changed_since_snapshot_are_evicted(self, repo, tmp_path):
+        first = new_provider(repo, tmp_path)
+        first.get_context_sync('src/app.py', 'Why?')
+        first.save_cache_snapshot()
+
+        commit_file(repo, 'src/app.py', 'print(2)\n', 'Change app')
+
+        second = new_provider(repo, tmp_path)
+        result = second.get_context_sync('src/app.py', 'Why?')
+
+        assert second.backend_calls == 1
+        assert not result.cached
+        assert result.head_sha == git(repo, 'rev-parse', 'HEAD')
+
+    def test_l2_reembedded_for_other_provider(self, repo, tmp_path):
+        first = new_provider(repo, tmp_path)
+        first.get_context_sync('src/app.py', 'Why was the retry logic changed?')
+        first.save_cache_snapshot()
+
+        snapshot = first._snapshot_store.load()
+        snapshot.embedding_provider = 'SomeOtherProvider:384'
+        snapshot.l2_embeddings = np.zeros((1, 384), dtype=np.float32)
+        first._snapshot_store.save(snapshot)
+
+        second = new_provider(repo, tmp_path)
+        second.l1_cache.clear()
+        similar = second.get_context_sync('src/app.py', 'why was retry logic changed?')
+
+        assert similar.cache_level == 'L2'
+        assert second.backend_calls == 0
+
+    def test_persistence_disabled_by_default(self, repo, tmp_path):
+        provider = ArchaeologyContextProvider(repo_path=str(repo))
+
+        assert not provider.save_cache_snapshot()
+        assert not (repo / '.ail' / 'cache').exists()
+
+    def test_context_dict_round_trip(self):
+        context = ArchaeologicalContext(
+            file_path='a.py', question='Why?', answer='Because', sources=[],
+            confidence=0.5, head_sha='b' * 40,
+        )
+
+        assert ArchaeologicalContext.from_dict(context.to_dict()) == context
+
+
+def cache_answer(provider: ArchaeologyContextProvider, file_path: str, question: str,
+                 cited_sha: str = '') -> None:
+    """Put an answer computed at the provider's HEAD into both cache tiers."""
+    sources = []
+    if cited_sha:
+        sources.append(ContextSource(
+            commit_sha=cited_sha, commit_message='', author='Test Author',
+            date=datetime.now(), source_type='commit', relevance_score=0.9, excerpt='',
+        ))
+    context = ArchaeologicalContext(
+        file_path=file_path, question=question, answer=f'Answer: {question}',
+        sources=sources, confidence=0.8, head_sha=provider._head_sha,
+    )
+    provider.cache.put(file_path, question, provider._generate_cache_key(file_path, question), context)
+
+
+class TestHeadAwareInvalidation:
+    """Test eviction of cached answers affected by new commits."""
+
+    @pytest.fixture
+    def history_repo(self, repo):
+        commit_file(repo, 'docs/guide.md', '# Guide\n', 'Add guide')
+        commit_file(repo, 'src/util.py', 'x = 1\n', 'Add util')
+        return repo
+
+    def cached_files(self, provider):
+        return sorted(context.file_path for context in provider.l1_cache.cache.values())
+
+    def test_only_touched_files_are_evicted(self, history_repo, tmp_path):
+        provider = new_provider(history_repo, tmp_path)
+        cache_answer(provider, 'src/app.py', 'Why?')
+        cache_answer(provider, 'docs/guide.md', 'Why?')
+
+        commit_file(history_repo, 'src/app.py', 'print(2)\n', 'Change app')
+        evicted = provider.refresh_history()
+
+        assert evicted == 2  # One L1 and one L2 entry
+        assert self.cached_files(provider) == ['docs/guide.md']
+        assert provider.l2_cache.size == 1
+        kept = provider.get_context_sync('docs/guide.md', 'Why?')
+        assert kept.cached and kept.head_sha == git(history_repo, 'rev-parse', 'HEAD')
+
+    def test_answers_citing_touched_history_are_evicted(self, history_repo, tmp_path):
+        app_commit = git(history_repo, 'log', '-1', '--format=%H', '--', 'src/app.py')
+        util_commit = git(history_repo, 'log', '-1', '--format=%H', '--', 'src/util.py')
+        provider = new_provider(history_repo, tmp_path)
+        cache_answer(provider, 'docs/guide.md', 'Why?', cited_sha=app_commit)
+        cache_answer(provider, 'docs/other.md', 'Why?', cited_sha=util_commit)
+
+        commit_file(history_repo, 'src/app.py', 'print(2)\n', 'Change app')
+        provider.refresh_history()
+
+        assert self.cached_files(provider) == ['docs/other.md']
+
+    def test_answers_citing_vanished_commits_are_evicted(self, history_repo, tmp_path):
+        provider = new_provider(history_repo, tmp_path)
+        cache_answer(provider, 'docs/guide.md', 'Why?', cited_sha='f' * 40)
+        cache_answer(provider, 'src/util.py', 'Why?')
+
+        commit_file(history_repo, 'README.md', 'hi\n', 'Add readme')
+        provider.refresh_history()
+
+        assert self.cached_files(provider) == ['src/util.py']
+
+    def test_queries_refresh_after_head_moves(self, history_repo, tmp_path, monkeypatch):
+        provider = new_provider(history_repo, tmp_path)
+        cache_answer(provider, 'src/app.py', 'Why?')
+        cache_answer(provider, 'docs/guide.md', 'Why?')
+        commit_file(history_repo, 'src/app.py', 'print(2)\n', 'Change app')
+
+        # Within the check interval the moved HEAD is not noticed yet
+        assert provider.get_context_sync('src/app.py', 'Why?').cached
+
+        monkeypatch.setattr(ArchaeologyContextProvider, 'HEAD_CHECK_INTERVAL_S', 0.0)
+        assert not provider.get_context_sync('src/app.py', 'Why?').cached
+        assert provider.backend_calls == 1
+        assert provider.get_contexts_sync([('docs/guide.md', 'Why?')])[0].cached
+        assert provider._head_sha == git(history_repo, 'rev-parse', 'HEAD')
+
+    def test_unchanged_head_keeps_everything(self, history_repo, tmp_path):
+        provider = new_provider(history_repo, tmp_path)
+        cache_answer(provider, 'src/app.py', 'Why?')
+
+        assert provider.refresh_history() == 0
+        assert self.cached_files(provider) == ['src/app.py']
+
+    def test_unknown_head_evicts_its_answers(self, history_repo, tmp_path):
+        provider = new_provider(history_repo, tmp_path)
+        cache_answer(provider, 'src/app.py', 'Why?')
+        next(iter(provider.l1_cache.cache.values())).head_sha = 'e' * 40
+
+        provider.invalidate_stale_entries(provider._refresh_history())
+
+        assert provider.l1_cache.size == 0
+
+    def test_snapshot_keeps_untouched_answers_across_commits(self, history_repo, tmp_path):
+        first = new_provider(history_repo, tmp_path)
+        first.get_context_sync('src/app.py', 'Why?')
+        first.get_context_sync('docs/guide.md', 'Why?')
+        first.save_cache_snapshot()
+
+        commit_file(history_repo, 'src/app.py', 'print(2)\n', 'Change app')
+
+        second = new_provider(history_repo, tmp_path)
+        guide = second.get_context_sync('docs/guide.md', 'Why?')
+        assert guide.cached
+        app = second.get_context_sync('src/app.py', 'Why?')
+        assert not app.cached
+        assert second.backend_calls == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
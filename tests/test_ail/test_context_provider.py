@@ -335,7 +335,7 @@ class TestArchaeologyContextProvider:
         mock_history = MagicMock()
         mock_history.total_commits = 10
         mock_history.commits = []
-        mock_git_instance.analyze_repo.return_value = mock_history
+        mock_git_instance.analyze_repo_incremental.return_value = (mock_history, [])
 
         # Mock synthesizer
         mock_synth_instance = MagicMock()
@@ -356,6 +356,186 @@ class TestArchaeologyContextProvider:
         assert "Test answer from archaeology" in result.answer
         assert provider.stats.total_queries == 1
 
+    def test_get_contexts_batch_order_and_cache(self, temp_git_repo):
+        """Batched queries return in input order, mixing cache hits and misses."""
+        provider = ArchaeologyContextProvider(
+            repo_path=str(temp_git_repo), enable_semantic_cache=False
+        )
+
+        cached_context = ArchaeologicalContext(
+            file_path="a.py",
+            question="Cached?",
+            answer="Cached answer",
+            sources=[],
+            confidence=0.9,
+        )
+        provider.l1_cache.put(provider._generate_cache_key("a.py", "Cached?"), cached_context)
+
+        answers = {}
+
+        async def fake_batch(items, line_ranges=None):
+            answers['items'] = list(items)
+            return [
+                MagicMock(answer=f"Answer for {path}: {question}", confidence=0.8, citations=[])
+                for path, question in items
+            ]
+
+        provider._initialize_components = Mock(return_value=True)
+        provider._query_archaeology_batch = fake_batch
+
+        batch = [("b.py", "Why?"), ("a.py", "Cached?"), ("c.py", "How?"), ("b.py", "Why?")]
+        results = provider.get_contexts_sync(batch)
+
+        assert [r.file_path for r in results] == ["b.py", "a.py", "c.py", "b.py"]
+        assert results[1].answer == "Cached answer" and results[1].cached
+        assert results[0].answer == "Answer for b.py: Why?"
+        assert results[2].answer == "Answer for c.py: How?"
+        # Duplicate questions are answered once
+        assert answers['items'] == [("b.py", "Why?"), ("c.py", "How?")]
+        assert provider.stats.total_queries == 4
+        assert provider.stats.hits == 1
+
+        # Answers were cached for the next batch
+        again = provider.get_contexts_sync([("c.py", "How?")])
+        assert again[0].cached
+
+    def test_get_contexts_uses_one_faiss_batch(self, temp_git_repo):
+        """FAISS misses are embedded and searched once for the whole batch."""
+        provider = ArchaeologyContextProvider(
+            repo_path=str(temp_git_repo), enable_semantic_cache=False
+        )
+        provider._initialize_components = Mock(return_value=True)
+        provider._faiss_enabled = True
+        provider._faiss_initialized = True
+
+        provider._embedding_generator = MagicMock()
+        provider._embedding_generator.embed_queries.side_effect = lambda texts: [[0.0]] * len(texts)
+        provider._faiss_index = MagicMock()
+        provider._faiss_index.search_batch.side_effect = lambda embeddings, k: [
+            [("commit_a", 0.9)] if i % 2 == 0 else [] for i in range(len(embeddings))
+        ]
+        provider._faiss_index.doc_to_idx = {"commit_a": 0}
+        provider._answer_from_faiss_hits = Mock(
+            side_effect=lambda path, question, hits, owners=None: MagicMock(
+                answer=f"faiss {path}", confidence=0.9, citations=[]
+            )
+        )
+
+        async def fallback(path, question):
+            return MagicMock(answer=f"fallback {path}", confidence=0.5, citations=[])
+
+        provider._query_without_faiss = fallback
+
+        batch = [(f"file{i}.py", "Why?") for i in range(4)]
+        results = provider.get_contexts_sync(batch)
+
+        assert provider._embedding_generator.embed_queries.call_count == 1
+        assert provider._faiss_index.search_batch.call_count == 1
+        assert [r.answer for r in results] == [
+            "faiss file0.py", "fallback file1.py", "faiss file2.py", "fallback file3.py"
+        ]
+
+    def test_concurrent_identical_misses_query_once(self, temp_git_repo):
+        """Concurrent misses for the same question share one backend query."""
+        provider = ArchaeologyContextProvider(
+            repo_path=str(temp_git_repo), enable_semantic_cache=False
+        )
+        provider._initialize_components = Mock(return_value=True)
+        calls = []
+
+        async def slow_query(file_path, question, line_range=None):
+            calls.append((file_path, question))
+            await asyncio.sleep(0.05)
+            return MagicMock(answer="Shared answer", confidence=0.8, citations=[])
+
+        provider._query_archaeology = slow_query
+
+        async def sweep():
+            return await asyncio.gather(
+                *[provider.get_context("test.py", "Why?") for _ in range(5)],
+                provider.get_contexts([("test.py", "Why?")]),
+            )
+
+        *results, batch_results = asyncio.run(sweep())
+
+        assert len(calls) == 1
+        assert all(r.answer == "Shared answer" for r in results + batch_results)
+        stats = provider.get_single_flight_stats()
+        assert stats.backend_queries == 1
+        assert stats.coalesced == 5
+        assert provider.get_combined_cache_stats()['backend_queries_saved'] == 5
+
+        # The shared answer was cached once for later calls
+        assert provider.get_context_sync("test.py", "Why?").cached
+
+    def test_near_duplicate_misses_join_in_flight_query(self, temp_git_repo):
+        """With coalesce_near_duplicates, L2-similar concurrent misses share a query."""
+        provider = ArchaeologyContextProvider(
+            repo_path=str(temp_git_repo), coalesce_near_duplicates=True
+        )
+        provider._initialize_components = Mock(return_value=True)
+        calls = []
+
+        async def slow_query(file_path, question, line_range=None):
+            calls.append(question)
+            await asyncio.sleep(0.05)
+            return MagicMock(answer="Retry answer", confidence=0.8, citations=[])
+
+        provider._query_archaeology = slow_query
+
+        async def sweep():
+            return await asyncio.gather(
+                provider.get_context("test.py", "Why was the retry logic changed?"),
+                provider.get_context("test.py", "why was retry logic changed?"),
+            )
+
+        leader, follower = asyncio.run(sweep())
+
+        assert calls == ["Why was the retry logic changed?"]
+        assert follower.answer == "Retry answer"
+        assert follower.question == "why was retry logic changed?"
+        assert follower.similarity_score >= provider.l2_cache.similarity_threshold
+        assert provider.get_single_flight_stats().near_duplicates == 1
+
+    def test_line_range_ranks_line_owners_first(self, temp_git_repo, tmp_path):
+        """Commits that last changed the queried lines are cited first."""
+        import subprocess
+        (temp_git_repo / 'test.py').write_text('# Test file\nprint("Goodbye")\n')
+        subprocess.run(['git', 'commit', '-qam', 'Say goodbye'], cwd=temp_git_repo,
+                       check=True, capture_output=True)
+        shas = subprocess.run(['git', 'rev-list', 'HEAD'], cwd=temp_git_repo, check=True,
+                              capture_output=True, text=True).stdout.split()
+
+        provider = ArchaeologyContextProvider(
+            repo_path=str(temp_git_repo), enable_semantic_cache=False, persist_cache=False,
+            history_dir=str(tmp_path / 'history'), blame_dir=str(tmp_path / 'blame'),
+        )
+        provider._faiss_enabled = False
+
+        second_line = provider.get_context_sync("test.py", "Why is this here?", line_range=(2, 2))
+        first_line = provider.get_context_sync("test.py", "Why is this here?", line_range=(1, 1))
+
+        assert second_line.line_range == (2, 2)
+        assert second_line.sources[0].commit_sha == shas[0]
+        assert "Say goodbye" in second_line.answer
+        assert first_line.sources[0].commit_sha == shas[1]
+        assert provider._blame_index.exists()
+
+        # Each range is cached on its own
+        assert provider.get_context_sync("test.py", "Why is this here?", line_range=(2, 2)).cached
+        with pytest.raises(ValueError, match="Invalid line range"):
+            provider.get_context_sync("test.py", "Why?", line_range=(3, 2))
+
+        # Batches take a line range per question, sharing the cache with get_context
+        batch = provider.get_contexts_sync([
+            ("test.py", "Why is this here?", (2, 2)),
+            ("test.py", "Why is this here?", (1, 1)),
+            ("test.py", "Who wrote this?", (1, 1)),
+        ])
+        assert batch[0].cached and batch[1].cached
+        assert batch[2].line_range == (1, 1)
+        assert batch[2].sources[0].commit_sha == shas[1]
+
     def test_graceful_degradation(self, temp_git_repo):
         """Test graceful degradation when CCA unavailable."""
         provider = ArchaeologyContextProvider(repo_path=str(temp_git_repo))
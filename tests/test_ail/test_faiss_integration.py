@@ -7,6 +7,7 @@ components, including unit tests, integration tests, and performance benchmarks.
 
 import asyncio
 import json
+import subprocess
 import tempfile
 import time
 from pathlib import Path
@@ -242,6 +243,61 @@ class TestEmbeddingGenerator:
             test_cache["key1"]
         )
 
+    @staticmethod
+    def fake_encode(texts, **kwargs):
+        """Deterministic per-text embeddings standing in for the sentence model."""
+        return np.array([[len(t), sum(map(ord, t)) % 97, 1.0] for t in texts], dtype=np.float32)
+
+    def parallel_generator(self, embedding_config, mock_transformer):
+        """Generator encoding 2-text chunks on 2 forked workers with a fake model."""
+        mock_transformer.return_value.encode.side_effect = self.fake_encode
+        embedding_config.num_workers = 2
+        embedding_config.worker_chunk_size = 2
+        embedding_config.worker_start_method = "fork"
+        return EmbeddingGenerator(embedding_config)
+
+    @patch('tools.ail.embeddings.HAS_SENTENCE_TRANSFORMERS', True)
+    @patch('tools.ail.embeddings.SentenceTransformer')
+    def test_parallel_encoding_streams_in_order(self, mock_transformer, embedding_config,
+                                                mock_commits):
+        """Uncached commits are encoded by workers and yielded in commit order."""
+        generator = self.parallel_generator(embedding_config, mock_transformer)
+        generator.embed_commits(mock_commits[1:3])  # One chunk: encoded in-process
+        parent_encode = mock_transformer.return_value.encode
+
+        blocks = list(generator.iter_commit_embeddings(mock_commits))
+
+        texts = [generator._prepare_commit_text(c) for c in mock_commits]
+        assert [doc_id for _, ids in blocks for doc_id in ids] == \
+            [f"commit_{c.commit.sha}" for c in mock_commits]
+        np.testing.assert_array_equal(np.concatenate([e for e, _ in blocks]),
+                                      self.fake_encode(texts))
+        assert len(blocks) == 2  # Chunks [0, 3] and [4], cached rows filled in between
+        assert parent_encode.call_count == 1
+        assert len(generator._cache) == len(mock_commits)
+
+    @patch('tools.ail.embeddings.HAS_SENTENCE_TRANSFORMERS', True)
+    @patch('tools.ail.embeddings.SentenceTransformer')
+    def test_worker_failure_falls_back_in_process(self, mock_transformer, embedding_config):
+        """If workers cannot load the model, chunks are encoded in this process."""
+        import os
+        parent = os.getpid()
+        model = mock_transformer.return_value
+
+        def load(*args, **kwargs):
+            if os.getpid() != parent:
+                raise RuntimeError("no model in worker")
+            return model
+
+        generator = self.parallel_generator(embedding_config, mock_transformer)
+        mock_transformer.side_effect = load
+        texts = [f"Text {i}" for i in range(5)]
+
+        embeddings = generator.embed_batch(texts)
+
+        np.testing.assert_array_equal(embeddings, self.fake_encode(texts))
+        assert model.encode.call_count == 3
+
     def test_graceful_degradation(self, embedding_config, mock_commits):
         """Test graceful degradation when model unavailable."""
         with patch('tools.ail.embeddings.HAS_SENTENCE_TRANSFORMERS', False):
@@ -306,6 +362,45 @@ class TestFAISSIndex:
         assert all(isinstance(r, tuple) for r in results)
         assert all(len(r) == 2 for r in results)  # (doc_id, score)
 
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_search_ids(self, faiss_config):
+        """Test searching returns FAISS integer ids that map to metadata."""
+        index = FAISSIndex(faiss_config)
+
+        embeddings = np.random.randn(20, 384).astype(np.float32)
+        doc_ids = [f"commit_{i:040d}" for i in range(20)]
+        index.add_documents(embeddings, doc_ids)
+
+        results = index.search_ids(embeddings[7], k=5)
+
+        assert results
+        assert all(isinstance(faiss_id, int) for faiss_id, _ in results)
+        assert index.metadata[results[0][0]] == doc_ids[7]
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    @pytest.mark.parametrize("metric", ["cosine", "l2"])
+    def test_search_ids_within_matches_exact_search(self, faiss_config, metric):
+        """Subset search ranks candidates exactly, on the search_ids score scale."""
+        faiss_config.index_type = "IndexFlatL2"
+        faiss_config.metric = metric
+        index = FAISSIndex(faiss_config)
+        rng = np.random.default_rng(1)
+        embeddings = rng.standard_normal((40, 384)).astype(np.float32)
+        index.add_documents(embeddings, [f"doc_{i}" for i in range(40)])
+        index.remove_document("doc_5")
+        query = rng.standard_normal(384).astype(np.float32)
+
+        candidates = [3, 5, 9, 12, 12, 30, 999]
+        results = index.search_ids_within(query, candidates, k=3)
+
+        # Brute force over the live candidates
+        subset = sorted({3, 9, 12, 30})
+        flat = index.search_ids(query, k=40)
+        expected = [(idx, score) for idx, score in flat if idx in subset][:3]
+        assert [idx for idx, _ in results] == [idx for idx, _ in expected]
+        assert [score for _, score in results] == pytest.approx([s for _, s in expected], rel=1e-4)
+        assert index.search_ids_within(query, [5, 999], k=3) == []
+
     @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
     def test_batch_search(self, faiss_config):
         """Test batch searching."""
@@ -384,6 +479,111 @@ class TestFAISSIndex:
         assert memory_stats['total_mb'] > 0
 
 
+class TestFAISSCompaction:
+    """Tests for the stored vector matrix, in-place updates and compaction."""
+
+    @pytest.fixture(params=["IndexHNSWFlat", "IndexFlatL2"])
+    def index(self, request, faiss_config):
+        """Create a populated index of each removal-capable and HNSW type."""
+        faiss_config.index_type = request.param
+        faiss_config.auto_optimize = False
+        index = FAISSIndex(faiss_config)
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.standard_normal((20, 384)).astype(np.float32)
+        self.doc_ids = [f"doc_{i}" for i in range(20)]
+        index.add_documents(self.embeddings, self.doc_ids)
+        return index
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_removed_documents_leave_results(self, index):
+        """Removed documents never appear in results, even before compaction."""
+        index.remove_document("doc_3")
+
+        results = index.search(self.embeddings[3], k=5)
+
+        assert "doc_3" not in [doc_id for doc_id, _ in results]
+        assert len(results) == 5
+        assert index.size == 19
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_rebuild_compacts_and_keeps_ids(self, index):
+        """Compaction drops tombstones while FAISS ids stay stable."""
+        for i in range(5):
+            index.remove_document(f"doc_{i}")
+        index.update_document("doc_10", self.embeddings[0])
+        id_before = index.doc_to_idx["doc_7"]
+
+        index.rebuild()
+
+        assert index.index.ntotal == 15
+        assert index._n_vectors == 15
+        assert index.tombstone_ratio == 0.0
+        assert index.doc_to_idx["doc_7"] == id_before
+        assert index.search(self.embeddings[7], k=1)[0][0] == "doc_7"
+        assert index.search(self.embeddings[0], k=1)[0][0] == "doc_10"
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_update_document_replaces_embedding(self, index):
+        """Updated documents are found by their new embedding only."""
+        index.update_document("doc_5", self.embeddings[12] * -1)
+
+        results = index.search(self.embeddings[12] * -1, k=1)
+
+        assert results[0][0] == "doc_5"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-4)
+        assert index.size == 20
+        if index.config.index_type == "IndexFlatL2":
+            assert index.index.ntotal == 20  # Replaced in place
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_vectors_persist_memory_mapped(self, index):
+        """Saved vectors reload memory-mapped and still support rebuilds."""
+        index.remove_document("doc_0")
+        index.save()
+        assert index.config.vectors_path.exists()
+
+        loaded = FAISSIndex(index.config)
+        loaded.load()
+        loaded.rebuild()
+
+        assert isinstance(loaded._vectors, np.ndarray)
+        assert loaded.size == 19
+        assert loaded.search(self.embeddings[9], k=1)[0][0] == "doc_9"
+
+        loaded.add_documents(self.embeddings[:1], ["doc_new"])
+        assert loaded.doc_to_idx["doc_new"] == 20  # Ids are never reused
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_load_without_vector_store_reconstructs(self, index):
+        """Indexes saved before the vector store existed are migrated."""
+        index.save()
+        index.config.vectors_path.unlink()
+
+        loaded = FAISSIndex(index.config)
+        loaded.load()
+        loaded.remove_document("doc_1")
+        loaded.rebuild()
+
+        assert loaded.index.ntotal == 19
+        assert loaded.search(self.embeddings[4], k=1)[0][0] == "doc_4"
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_tombstones_trigger_background_compaction(self, index):
+        """Passing the tombstone threshold compacts on a background thread."""
+        index.config.auto_optimize = True
+        index.config.compaction_threshold = 0.2
+
+        for i in range(5):
+            index.remove_document(f"doc_{i}")
+
+        thread = index._compaction_thread
+        assert thread is not None
+        thread.join(timeout=10)
+        assert index.tombstone_ratio == 0.0
+        assert index.index.ntotal == 15
+        assert not index.needs_optimization()
+
+
 # ===========================
 # Integration Tests
 # ===========================
@@ -482,6 +682,135 @@ class TestFAISSIntegration:
             assert answer.answer == "fallback answer"
             assert answer.reasoning == "TF-IDF"
 
+    @pytest.fixture
+    def scoped_provider(self, mock_repo, faiss_config):
+        """Provider with a real index of 30 commits and a file index over them."""
+        from tools.code_archaeology.file_index import FileCommitIndex
+
+        faiss_config.index_type = "IndexFlatL2"
+        index = FAISSIndex(faiss_config)
+        rng = np.random.default_rng(2)
+        self.embeddings = rng.standard_normal((30, 384)).astype(np.float32)
+        index.add_documents(self.embeddings, [f"commit_{i}" for i in range(30)])
+
+        # src/busy.py is touched by commits 0-11, lib/rare.py by 12-13 (renamed from lib/old.py)
+        history = MagicMock()
+        history.file_history = {
+            "src/busy.py": [MagicMock(sha=str(i)) for i in range(12)],
+            "lib/old.py": [MagicMock(sha="12")],
+            "lib/rare.py": [MagicMock(sha="13")],
+        }
+        history.commits = [MagicMock(renames={"lib/rare.py": "lib/old.py"})]
+
+        provider = ArchaeologyContextProvider(repo_path=str(mock_repo), enable_semantic_cache=False)
+        provider._faiss_index = index
+        provider._file_index = FileCommitIndex(history)
+        provider._embedding_generator = MagicMock()
+        provider._answer_from_faiss_hits = MagicMock(side_effect=lambda path, question, hits, owners=None: hits)
+        return provider
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_query_scoped_to_file_commits(self, scoped_provider):
+        """Commits touching the file are searched alone when there are enough."""
+        # The query matches commit 20, which never touched busy.py
+        scoped_provider._embedding_generator.embed_query.return_value = self.embeddings[20]
+
+        with patch.object(scoped_provider._faiss_index, 'search_ids',
+                          wraps=scoped_provider._faiss_index.search_ids) as global_search:
+            hits = asyncio.run(scoped_provider._query_with_faiss("src/busy.py", "Why?"))
+
+        global_search.assert_not_called()
+        index = scoped_provider._faiss_index
+        assert sorted(index.metadata[idx] for idx, _ in hits) == \
+            sorted(f"commit_{i}" for i in range(12))
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_small_scope_falls_back_to_global(self, scoped_provider):
+        """Few file commits come first, followed by global hits."""
+        scoped_provider._embedding_generator.embed_query.return_value = self.embeddings[20]
+        scoped_provider._embedding_generator.embed_queries.return_value = self.embeddings[[20, 20]]
+        index = scoped_provider._faiss_index
+
+        hits = asyncio.run(scoped_provider._query_with_faiss("lib/rare.py", "Why?"))
+
+        doc_ids = [index.metadata[idx] for idx, _ in hits]
+        assert sorted(doc_ids[:2]) == ["commit_12", "commit_13"]
+        assert doc_ids[2] == "commit_20"
+        assert len(doc_ids) == len(set(doc_ids)) == 20
+
+        batch = asyncio.run(scoped_provider._query_with_faiss_batch(
+            [("lib/rare.py", "Why?"), ("src/busy.py", "Why?")]
+        ))
+        assert batch[0] == hits
+        assert "commit_20" not in {index.metadata[idx] for idx, _ in batch[1]}
+
+    @pytest.fixture
+    def git_repo(self, temp_dir):
+        """Create a real repository with two commits touching src/app.py."""
+        repo_dir = temp_dir / "git_repo"
+        repo_dir.mkdir()
+        self.git(repo_dir, "init", "-q")
+        for i in range(2):
+            self.commit(repo_dir, f"print({i})\n", f"Change app {i}")
+        return repo_dir
+
+    @staticmethod
+    def git(repo_dir, *args):
+        return subprocess.run(
+            ["git", "-C", str(repo_dir), "-c", "user.name=Test Author",
+             "-c", "user.email=test@example.com", *args],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+
+    def commit(self, repo_dir, content, message):
+        (repo_dir / "src").mkdir(exist_ok=True)
+        (repo_dir / "src" / "app.py").write_text(content)
+        self.git(repo_dir, "add", "-A")
+        self.git(repo_dir, "commit", "-q", "-m", message)
+        return self.git(repo_dir, "rev-parse", "HEAD")
+
+    @staticmethod
+    def sha_embedding(sha):
+        """Deterministic unit vector for a commit SHA."""
+        rng = np.random.default_rng(int(sha[:8], 16))
+        vector = rng.standard_normal(384).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def fake_generator(self):
+        """Embedding generator mapping each commit to its SHA's vector."""
+        generator = MagicMock(is_loaded=True)
+
+        def iter_commit_embeddings(commits, use_cache=True):
+            if commits:
+                yield (np.stack([self.sha_embedding(c.commit.sha) for c in commits]),
+                       [f"commit_{c.commit.sha}" for c in commits])
+
+        generator.iter_commit_embeddings.side_effect = iter_commit_embeddings
+        return generator
+
+    @pytest.mark.skipif(not HAS_FAISS, reason="FAISS not installed")
+    def test_refresh_embeds_new_commits(self, git_repo):
+        """Commits read by refresh_history are searchable through FAISS."""
+        generator = self.fake_generator()
+        with patch('tools.ail.context_provider.EmbeddingGenerator', return_value=generator):
+            provider = ArchaeologyContextProvider(
+                repo_path=str(git_repo), enable_semantic_cache=False
+            )
+            assert provider._initialize_components() and provider._initialize_faiss()
+
+            old_sha = self.git(git_repo, "rev-parse", "HEAD")
+            generator.embed_query.return_value = self.sha_embedding(old_sha)
+            answer = asyncio.run(provider._query_with_faiss("src/app.py", "Why?"))
+            assert answer.citations[0].commit_sha == old_sha
+
+            new_sha = self.commit(git_repo, "print(2)\n", "Change app again")
+            provider.refresh_history()
+
+            generator.embed_query.return_value = self.sha_embedding(new_sha)
+            answer = asyncio.run(provider._query_with_faiss("src/app.py", "Why?"))
+            assert answer.citations[0].commit_sha == new_sha
+            assert f"commit_{new_sha}" in provider._faiss_index.doc_to_idx
+
 
 # ===========================
 # Performance Benchmarks
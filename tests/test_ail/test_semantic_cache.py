@@ -266,6 +266,64 @@ class TestSemanticCacheCore:
         assert semantic_cache.size == 0
 
 
+class TestSemanticCacheEmbeddings:
+    """Test embedding backend selection and file scoping."""
+
+    def test_default_provider_has_stable_dimension(self):
+        """Default hashing provider is not fitted on a probe query."""
+        cache = SemanticCache(enabled=True)
+        if not cache.enabled:
+            pytest.skip("code_archaeology not importable")
+
+        assert cache.dimension == cache.embedding_provider.dimension == 512
+
+    def test_declared_dimension_skips_probe(self):
+        """Providers that declare an integer dimension are not probed."""
+        provider = Mock()
+        provider.dimension = 64
+        provider.embed = Mock(side_effect=lambda texts: [np.ones(64) for _ in texts])
+
+        cache = SemanticCache(embedding_provider=provider, enabled=True)
+
+        assert cache.dimension == 64
+        provider.embed.assert_not_called()
+
+    def test_default_provider_discriminates_queries(self, sample_context):
+        """Rewordings hit while different questions about the file miss."""
+        cache = SemanticCache(similarity_threshold=0.85, enabled=True)
+        if not cache.enabled:
+            pytest.skip("code_archaeology not importable")
+
+        cache.put("cache.py", "How are entries evicted from the cache?", sample_context)
+
+        assert cache.get("cache.py", "How are cache entries evicted?") is not None
+        assert cache.get("cache.py", "What logging strategy is used?") is None
+
+    def test_other_file_never_hits(self, semantic_cache, sample_context, mock_embedding_provider):
+        """Identical queries about a different file miss."""
+        mock_embedding_provider.embed = Mock(return_value=[np.ones(512)])
+        semantic_cache.put("auth.py", "why jwt", sample_context)
+
+        assert semantic_cache.get("api.py", "why jwt") is None
+        assert semantic_cache.get("auth.py", "why jwt") is not None
+
+    def test_set_embedding_provider_resets_entries(self, semantic_cache, sample_context,
+                                                   mock_embedding_provider):
+        """Switching providers drops entries from the old embedding space."""
+        mock_embedding_provider.embed = Mock(return_value=[np.ones(512)])
+        semantic_cache.put("test.py", "query", sample_context)
+
+        provider = Mock()
+        provider.dimension = 384
+        provider.embed = Mock(return_value=[np.ones(384)])
+        semantic_cache.set_embedding_provider(provider)
+
+        assert semantic_cache.size == 0
+        assert semantic_cache.dimension == 384
+        semantic_cache.put("test.py", "query", sample_context)
+        assert semantic_cache.get("test.py", "query") is not None
+
+
 class TestSemanticCacheEviction:
     """Test cache eviction policies."""
 
@@ -0,0 +1,111 @@
+"""
+Tests for single-flight coalescing of concurrent cache misses.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'tools'))
+
+from tools.ail.semantic_cache import SemanticCache
+from tools.ail.single_flight import SingleFlight, SingleFlightStats
+
+
+class TestSingleFlightStats:
+    """Test coalescing statistics."""
+
+    def test_queries_saved(self):
+        stats = SingleFlightStats(backend_queries=3, coalesced=5, near_duplicates=2)
+
+        assert stats.queries_saved == 7
+        assert stats.saved_rate == 0.7
+        assert stats.to_dict()['queries_saved'] == 7
+
+    def test_empty_saved_rate(self):
+        assert SingleFlightStats().saved_rate == 0.0
+
+
+class TestSingleFlight:
+    """Test the in-flight query registry."""
+
+    def test_identical_key_joins_leader(self):
+        flights = SingleFlight()
+
+        leader, _ = flights.join("k", "a.py", "Why?")
+        follower, similarity = flights.join("k", "a.py", "Why?")
+
+        assert leader is None
+        assert follower is not None and similarity == 1.0
+        assert flights.in_flight == 1
+
+        flights.complete("k", "answer")
+
+        assert follower.result() == "answer"
+        assert flights.in_flight == 0
+        assert flights.stats.backend_queries == 1
+        assert flights.stats.coalesced == 1
+
+    def test_completed_key_starts_new_flight(self):
+        flights = SingleFlight()
+        flights.join("k", "a.py", "Why?")
+        flights.complete("k", "answer")
+
+        future, _ = flights.join("k", "a.py", "Why?")
+
+        assert future is None
+        assert flights.stats.backend_queries == 2
+
+    def test_failure_propagates_to_waiters(self):
+        flights = SingleFlight()
+        flights.join("k", "a.py", "Why?")
+        follower, _ = flights.join("k", "a.py", "Why?")
+
+        flights.fail("k", ValueError("backend down"))
+
+        with pytest.raises(ValueError, match="backend down"):
+            follower.result()
+        assert flights.in_flight == 0
+
+    def test_near_duplicates_disabled_by_default(self):
+        flights = SingleFlight(semantic_cache=SemanticCache())
+
+        flights.join("k1", "a.py", "Why was the retry logic changed?")
+        future, _ = flights.join("k2", "a.py", "why was retry logic changed?")
+
+        assert future is None
+        assert flights.stats.backend_queries == 2
+
+    def test_near_duplicate_joins_similar_query_for_same_file(self):
+        flights = SingleFlight(semantic_cache=SemanticCache(), near_duplicates=True)
+
+        flights.join("k1", "a.py", "Why was the retry logic changed?")
+        similar, similarity = flights.join("k2", "a.py", "why was retry logic changed?")
+        other_file, _ = flights.join("k3", "b.py", "why was retry logic changed?")
+        unrelated, _ = flights.join("k4", "a.py", "Who wrote the session parser?")
+
+        assert similar is not None
+        assert similarity >= 0.85
+        assert other_file is None
+        assert unrelated is None
+        assert flights.stats.near_duplicates == 1
+        assert flights.stats.backend_queries == 3
+
+    def test_waiters_across_event_loop(self):
+        """Futures can be awaited from asyncio while the leader finishes."""
+        flights = SingleFlight()
+
+        async def scenario():
+            flights.join("k", "a.py", "Why?")
+            follower, _ = flights.join("k", "a.py", "Why?")
+            asyncio.get_running_loop().call_later(0.01, flights.complete, "k", 42)
+            return await asyncio.wrap_future(follower)
+
+        assert asyncio.run(scenario()) == 42
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
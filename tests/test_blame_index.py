@@ -0,0 +1,167 @@
+"""
+Tests for the persisted, incrementally refreshed line blame index.
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.code_archaeology.blame_index import BlameIndex, parse_porcelain
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run a git command in the test repository."""
+    result = subprocess.run(
+        ['git', '-C', str(repo), '-c', 'user.name=Test Author',
+         '-c', 'user.email=test@example.com', *args],
+        check=True, capture_output=True, text=True,
+    )
+    return result.stdout.strip()
+
+
+def commit_files(repo: Path, files: dict, message: str) -> str:
+    """Write (or delete, for None content) files, commit, and return the SHA."""
+    for name, content in files.items():
+        path = repo / name
+        if content is None:
+            path.unlink()
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', message)
+    return git(repo, 'rev-parse', 'HEAD')
+
+
+def line_owners(repo: Path, path: str) -> list:
+    """SHA of every line of a file at HEAD, from per-line porcelain output."""
+    output = git(repo, 'blame', '--line-porcelain', 'HEAD', '--', path)
+    return [line[:40] for line in output.splitlines() if re.match(r'[0-9a-f]{40} \d+ \d+', line)]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository where app.py's lines come from three commits."""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    git(repo, 'init', '-q')
+    commit_files(repo, {'src/app.py': 'a\nb\nc\nd\ne\n', 'README.md': 'hello\n'}, 'Initial')
+    commit_files(repo, {'src/app.py': 'a\nB\nC\nd\ne\n'}, 'Change b and c')
+    commit_files(repo, {'src/app.py': 'a\nB\nC\nd\nE\nf\n'}, 'Change e, add f')
+    return repo
+
+
+@pytest.fixture
+def shas(repo):
+    """SHAs of the repository's commits, oldest first."""
+    return git(repo, 'rev-list', '--reverse', 'HEAD').split()
+
+
+@pytest.fixture
+def index(repo, tmp_path):
+    """Create a blame index stored outside the repository."""
+    return BlameIndex(str(repo), store_dir=tmp_path / 'blame')
+
+
+class TestParsePorcelain:
+    """Test suite for porcelain parsing."""
+
+    def test_runs_match_per_line_blame(self, repo):
+        """Every line maps to the same commit as git's per-line output."""
+        starts, shas = parse_porcelain(git(repo, 'blame', '--porcelain', 'HEAD', '--', 'src/app.py'))
+
+        per_line = [shas[i] for i in range(len(shas)) for _ in range(starts[i + 1] - starts[i])]
+        assert per_line == line_owners(repo, 'src/app.py')
+        assert starts == [1, 2, 4, 5, 7]
+
+    def test_adjacent_groups_from_one_commit_merge(self):
+        """Consecutive groups from the same commit become one run."""
+        sha = 'a' * 40
+        output = f"{sha} 1 1 2\nauthor x\n\tone\n{sha} 2 2\n\ttwo\n{sha} 9 3 1\n\tthree\n"
+
+        assert parse_porcelain(output) == ([1, 4], [sha])
+
+    def test_empty_output(self):
+        assert parse_porcelain("") == ([1], [])
+
+
+class TestBlameIndex:
+    """Test suite for BlameIndex."""
+
+    def test_commits_for_lines(self, index, shas):
+        """Owners of a range are ranked by lines owned, then first appearance."""
+        first, second, third = shas
+        index.refresh()
+
+        assert index.commits_for_lines('src/app.py', 1) == [(first, 1)]
+        assert index.commits_for_lines('src/app.py', 2, 3) == [(second, 2)]
+        assert index.commits_for_lines('src/app.py', 2, 6) == [(second, 2), (third, 2), (first, 1)]
+        assert index.commits_for_lines('src/app.py', 1, 6) == [(first, 2), (second, 2), (third, 2)]
+        assert index.commits_for_lines('./src/app.py', 4, 100) == [(third, 2), (first, 1)]
+        assert index.commits_for_lines('src/app.py', 7, 9) == []
+        assert index.commits_for_lines('missing.py', 1) == []
+
+    def test_refresh_only_blames_changed_files(self, repo, index, shas):
+        """A new HEAD re-blames the files it changed and drops deleted ones."""
+        assert index.refresh() == 2
+        assert index.refresh() == 0
+
+        fourth = commit_files(repo, {'README.md': 'hello\nworld\n'}, 'Extend readme')
+        assert index.refresh() == 1
+        assert index.head_sha == fourth
+        assert index.commits_for_lines('README.md', 2) == [(fourth, 1)]
+        assert index.commits_for_lines('src/app.py', 1) == [(shas[0], 1)]
+
+        commit_files(repo, {'README.md': None}, 'Remove readme')
+        assert index.refresh() == 1
+        assert sorted(index.files) == ['src/app.py']
+
+    def test_unknown_indexed_head_rebuilds(self, repo, index):
+        """An indexed HEAD missing from the repository triggers a full blame."""
+        index.refresh()
+        index.head_sha = 'f' * 40
+        index.files['stale.py'] = ([1, 2], ['f' * 40])
+
+        assert index.refresh() == 2
+        assert sorted(index.files) == ['README.md', 'src/app.py']
+
+    def test_process_pool_matches_in_process(self, repo, tmp_path, monkeypatch):
+        """Blaming in worker processes yields the same index."""
+        serial = BlameIndex(str(repo), store_dir=tmp_path / 'serial', max_workers=1)
+        serial.refresh()
+
+        monkeypatch.setattr(BlameIndex, 'MIN_PARALLEL_FILES', 1)
+        parallel = BlameIndex(str(repo), store_dir=tmp_path / 'parallel', max_workers=2)
+        parallel.refresh()
+
+        assert parallel.files == serial.files
+
+    def test_round_trip(self, repo, index, tmp_path):
+        """A saved index loads with the same HEAD and blame."""
+        index.refresh()
+        index.save()
+
+        loaded = BlameIndex(str(repo), store_dir=tmp_path / 'blame')
+        assert loaded.load()
+        assert loaded.head_sha == index.head_sha
+        assert loaded.files == index.files
+        assert loaded.refresh() == 0
+
+        other = tmp_path / 'other'
+        other.mkdir()
+        git(other, 'init', '-q')
+        assert not BlameIndex(str(other), store_dir=tmp_path / 'blame').load()
+
+        index.clear()
+        assert not index.exists()
+        assert index.head_sha is None and index.files == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -14,6 +14,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from tools.code_archaeology.context_synthesizer import (
     ContextSynthesizer,
     SimpleEmbeddingProvider,
+    HashingEmbeddingProvider,
+    ExactVectorIndex,
     SearchableIndex,
     SearchResult,
     Answer,
@@ -94,6 +96,173 @@ class TestSimpleEmbeddingProvider:
 
         assert sim_1_2 > sim_1_3
 
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_tfidf_matches_reference(self, provider):
+        """Rows are smoothed TF-IDF weights, L2-normalized."""
+        texts = ["cache cache parser", "parser index", "index index index"]
+        embeddings = provider.embed(texts)
+
+        vocab = provider._vocabulary
+        assert set(vocab) == {"cache", "parser", "index"}
+        n = len(texts)
+        df = {"cache": 1, "parser": 2, "index": 2}
+        idf = {t: np.log((1 + n) / (1 + df[t])) + 1 for t in df}
+
+        expected = np.zeros((n, len(vocab)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.split():
+                expected[row, vocab[token]] += idf[token]
+        expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+
+        np.testing.assert_allclose(embeddings, expected, rtol=1e-5)
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_vocabulary_keeps_most_frequent_tokens(self):
+        """Vocabulary is capped at max_features by corpus frequency."""
+        provider = SimpleEmbeddingProvider(max_features=2)
+        provider.embed(["alpha beta beta gamma", "gamma gamma beta"])
+
+        assert provider._vocabulary == {"beta": 0, "gamma": 1}
+        assert provider.dimension == 2
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_query_embedding_reuses_vocabulary(self, provider):
+        """Later calls embed into the fitted space; unknown tokens are ignored."""
+        provider.embed(["fix parser bug", "add cache layer"])
+        vocabulary = dict(provider._vocabulary)
+
+        query = provider.embed(["parser unknownword", "zzz"])
+
+        assert provider._vocabulary == vocabulary
+        assert query.shape == (2, len(vocabulary))
+        assert query[0, vocabulary["parser"]] == pytest.approx(1.0)
+        assert not query[1].any()
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_save_and_load_vocabulary(self, provider, tmp_path):
+        """A saved provider embeds queries identically after loading."""
+        provider.embed(["fix parser bug", "add cache layer", "parser cache"])
+        path = tmp_path / 'vocabulary.json'
+
+        provider.save(str(path))
+        loaded = SimpleEmbeddingProvider.load(str(path))
+
+        queries = ["parser cache bug", "layer"]
+        np.testing.assert_array_equal(loaded.embed(queries), provider.embed(queries))
+        assert loaded.dimension == provider.dimension
+
+
+class TestHashingEmbeddingProvider:
+    """Test suite for HashingEmbeddingProvider class."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create HashingEmbeddingProvider instance."""
+        return HashingEmbeddingProvider(n_features=128)
+
+    def test_dimension_is_fixed(self, provider):
+        """Dimension does not depend on the texts embedded first."""
+        assert provider.dimension == 128
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_first_call_does_not_freeze_features(self, provider):
+        """Texts embedded after a probe still get distinct embeddings."""
+        provider.embed(["test"])
+        embeddings = provider.embed(["why was jwt chosen", "how does caching work"])
+
+        assert embeddings.shape == (2, 128)
+        assert embeddings.dtype == np.float32
+        assert np.all(np.linalg.norm(embeddings, axis=1) > 0.99)
+        assert np.dot(embeddings[0], embeddings[1]) < 0.5
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_embeddings_are_deterministic(self, provider):
+        """The same text embeds identically across provider instances."""
+        text = "Why was REST chosen over GraphQL?"
+        other = HashingEmbeddingProvider(n_features=128)
+
+        assert np.array_equal(provider.embed([text]), other.embed([text]))
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_rewording_scores_above_different_intent(self, provider):
+        """Light rewording stays closer than a different question."""
+        embeddings = provider.embed([
+            "how are entries evicted from the cache",
+            "how are cache entries evicted",
+            "what logging strategy is used",
+        ])
+
+        assert np.dot(embeddings[0], embeddings[1]) > 0.85
+        assert np.dot(embeddings[0], embeddings[2]) < 0.3
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_empty_text_embeds_to_zero(self, provider):
+        """Texts without tokens give a zero vector instead of NaNs."""
+        embeddings = provider.embed(["", "?!"])
+
+        assert not np.any(np.isnan(embeddings))
+        assert np.all(embeddings == 0)
+
+
+def reference_cosine_top_k(embeddings, query, k):
+    """Rank rows by cosine similarity one document at a time."""
+    similarities = [
+        float(np.dot(query, row) / (np.linalg.norm(query) * np.linalg.norm(row) + 1e-10))
+        for row in embeddings
+    ]
+    order = sorted(range(len(embeddings)), key=lambda i: (-similarities[i], i))[:k]
+    return [(i, similarities[i]) for i in order]
+
+
+@pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+class TestExactVectorIndex:
+    """Test suite for the NumPy fallback vector search."""
+
+    @pytest.fixture
+    def embeddings(self):
+        """Sparse TF-IDF-like rows with a zero row."""
+        rng = np.random.default_rng(3)
+        embeddings = rng.random((300, 64)).astype(np.float32) * 5
+        embeddings[rng.random((300, 64)) < 0.8] = 0
+        embeddings[17] = 0
+        return embeddings
+
+    @pytest.mark.parametrize("density", [0.05, 1.0])
+    @pytest.mark.parametrize("chunk_rows", [None, 64])
+    def test_matches_per_document_cosine(self, embeddings, density, chunk_rows):
+        """Sparse and dense queries rank like the per-document loop."""
+        rng = np.random.default_rng(4)
+        query = rng.standard_normal(64).astype(np.float32) * (rng.random(64) < density)
+        query[0] = 1.0
+
+        results = ExactVectorIndex(embeddings, chunk_rows=chunk_rows).search(query, k=10)
+        expected = reference_cosine_top_k(embeddings, query, 10)
+
+        assert [i for i, _ in results] == [i for i, _ in expected]
+        assert [s for _, s in results] == pytest.approx([s for _, s in expected], abs=1e-5)
+
+    def test_memory_mapped_chunks(self, embeddings, tmp_path):
+        """A memory-mapped matrix is scored in place, block by block."""
+        path = tmp_path / "embeddings.npy"
+        np.save(path, embeddings)
+        mapped = np.load(path, mmap_mode='r')
+        query = embeddings[5] + 0.1
+
+        chunked = ExactVectorIndex(mapped, chunk_rows=50)
+
+        assert chunked._columns is None
+        np.testing.assert_allclose(chunked.scores(query),
+                                   ExactVectorIndex(embeddings).scores(query), atol=1e-6)
+        assert chunked.search(query, k=1)[0][0] == 5
+
+    def test_k_bounds_and_zero_query(self, embeddings):
+        """k is capped at the corpus size; a zero query scores everything 0."""
+        index = ExactVectorIndex(embeddings[:4])
+
+        assert len(index.search(embeddings[0], k=10)) == 4
+        assert index.search(embeddings[0], k=0) == []
+        assert index.search(np.zeros(64), k=2) == [(0, 0.0), (1, 0.0)]
+
 
 class TestCitation:
     """Test suite for Citation dataclass."""
@@ -306,6 +475,46 @@ class TestContextSynthesizer:
         top_result = results[0]
         assert "auth" in top_result.commit.commit.message.lower()
 
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_hybrid_search_matches_exact_sha(self, synthesizer, sample_enriched_history):
+        """A SHA in the query ranks its commit first through the BM25 ranking."""
+        index = synthesizer.build_searchable_index(sample_enriched_history)
+
+        results = synthesizer.search(index, "What happened in def456?", k=5)
+
+        assert index.lexical_index is not None
+        assert results[0].commit.commit.sha == "def456"
+        assert all(0.0 < r.relevance_score <= 1.0 for r in results)
+        assert len(results) <= index.size
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_vector_only_search(self, sample_enriched_history):
+        """Without the lexical index, search ranks by embedding similarity alone."""
+        synthesizer = ContextSynthesizer(lexical=False)
+        index = synthesizer.build_searchable_index(sample_enriched_history)
+
+        results = synthesizer.search(index, "authentication system JWT", k=5)
+
+        assert index.lexical_index is None
+        assert len(results) == index.size
+        assert "auth" in results[0].commit.commit.message.lower()
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
+    def test_search_without_faiss(self, synthesizer, sample_enriched_history, monkeypatch):
+        """Without FAISS the NumPy index ranks like cosine over the embeddings."""
+        from tools.code_archaeology import context_synthesizer
+
+        monkeypatch.setattr(context_synthesizer, "HAS_FAISS", False)
+        index = ContextSynthesizer(lexical=False).build_searchable_index(sample_enriched_history)
+        query = index.embedding_provider.embed(["authentication system JWT"])[0]
+
+        results = synthesizer.search(index, "authentication system JWT", k=5)
+
+        assert index.faiss_index is None and index.vector_index is not None
+        expected = reference_cosine_top_k(index.embeddings, query, 5)
+        assert [r.relevance_score for r in results] == pytest.approx([s for _, s in expected], abs=1e-5)
+        assert "auth" in results[0].commit.commit.message.lower()
+
     @pytest.mark.skipif(not HAS_NUMPY, reason="numpy required")
     def test_synthesize_answer(self, synthesizer, sample_enriched_history):
         """Test answer synthesis."""
@@ -0,0 +1,95 @@
+"""
+Tests for the file → commit posting index.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.code_archaeology.file_index import FileCommitIndex
+from tools.code_archaeology.git_analyzer import Commit, RepositoryHistory, TemporalCorrelator
+
+
+def make_history(changes):
+    """Build a history from (sha, files, renames) tuples, oldest first."""
+    start = datetime(2024, 1, 1)
+    commits = [
+        Commit(
+            sha=sha, message=sha, author="a", email="a@example.com",
+            date=start + timedelta(days=i), parents=[],
+            files_changed=list(files), renames=dict(renames),
+        )
+        for i, (sha, files, renames) in enumerate(changes)
+    ]
+    commits.reverse()
+    return RepositoryHistory(
+        repo_path=Path("."), commits=commits, arch_commits=[], temporal_index={},
+        file_history=TemporalCorrelator.build_file_history(commits),
+        author_stats={}, branch_commits={},
+    )
+
+
+@pytest.fixture
+def index():
+    """Index over a history where src/app.py became src/core/main.py."""
+    return FileCommitIndex(make_history([
+        ("c1", ["src/app.py", "README.md"], {}),
+        ("c2", ["src/app.py"], {}),
+        ("c3", ["src/core/main.py"], {"src/core/main.py": "src/app.py"}),
+        ("c4", ["src/core/main.py", "src/core/util.py"], {}),
+        ("c5", ["src/cli.py"], {}),
+        ("c6", ["docs/guide.md"], {}),
+    ]))
+
+
+class TestFileCommitIndex:
+    """Test suite for FileCommitIndex."""
+
+    def test_follows_renames(self, index):
+        """A file's commits include those made under its earlier names."""
+        assert index.paths_for("src/core/main.py") == ["src/core/main.py", "src/app.py"]
+        assert index.commits_for_file("src/core/main.py") == ["c3", "c4", "c1", "c2"]
+        assert index.commits_for_file("src/core/main.py", follow_renames=False) == ["c3", "c4"]
+        assert index.commits_for_file("missing.py") == []
+
+    def test_rename_chains_and_cycles(self):
+        """Renames are followed transitively and a rename back terminates."""
+        index = FileCommitIndex(make_history([
+            ("c1", ["a.py"], {}),
+            ("c2", ["b.py"], {"b.py": "a.py"}),
+            ("c3", ["c.py"], {"c.py": "b.py"}),
+            ("c4", ["a.py"], {"a.py": "c.py"}),
+        ]))
+
+        assert index.paths_for("a.py") == ["a.py", "c.py", "b.py"]
+        assert sorted(index.commits_for_file("a.py")) == ["c1", "c2", "c3", "c4"]
+
+    def test_directory_postings(self, index):
+        """Directories cover every file below them; the root is not indexed."""
+        assert index.commits_for_directory("src/core") == {"c3", "c4"}
+        assert index.commits_for_directory("src") == {"c1", "c2", "c3", "c4", "c5"}
+        assert index.commits_for_directory("") == set()
+
+    def test_candidates_widen_to_directories(self, index):
+        """Below min_count the file's directories are added, never the root."""
+        assert index.candidate_shas("src/core/util.py") == ["c4"]
+        assert index.candidate_shas("src/core/util.py", min_count=2) == ["c4", "c3"]
+        assert set(index.candidate_shas("src/core/util.py", min_count=5)) == \
+            {"c1", "c2", "c3", "c4", "c5"}
+        assert index.candidate_shas("src/core/util.py", min_count=100) == \
+            index.candidate_shas("src/core/util.py", min_count=5)
+
+    def test_paths_are_normalized(self, index):
+        """Leading ./ and backslashes resolve to the git form."""
+        assert index.commits_for_file("./src/core/main.py") == \
+            index.commits_for_file("src\\core\\main.py") == \
+            index.commits_for_file("src/core/main.py")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -129,6 +129,101 @@ class TestGitArchaeologist:
         assert all(isinstance(count, int) for _, count in history.top_contributors)
 
 
+class TestStreamingExtraction:
+    """Test suite for the single-pass git log --numstat -z extractor."""
+
+    @pytest.fixture
+    def small_repo(self, tmp_path):
+        """Create a repository with renames, binary files and a merge."""
+        import subprocess
+
+        def git(*args):
+            subprocess.run(
+                ['git', '-C', str(tmp_path), '-c', 'user.name=Test Author',
+                 '-c', 'user.email=test@example.com', *args],
+                check=True, capture_output=True,
+            )
+
+        git('init', '-q')
+        body = "".join(f"line_{i} = {i}\n" for i in range(20))
+        (tmp_path / 'app.py').write_text(body)
+        git('add', '-A')
+        git('commit', '-q', '-m', 'Initial commit\n\nWith a body line.')
+
+        git('mv', 'app.py', 'main.py')
+        (tmp_path / 'main.py').write_text(body.replace("line_3 = 3", "line_3 = 4"))
+        (tmp_path / 'logo.bin').write_bytes(b'\x00\x01\x02')
+        git('add', '-A')
+        git('commit', '-q', '-m', 'Rename app to main')
+
+        git('checkout', '-q', '-b', 'feature')
+        (tmp_path / 'feature.py').write_text("x = 1\n")
+        git('add', '-A')
+        git('commit', '-q', '-m', 'Add feature module')
+        git('checkout', '-q', '-')
+        git('merge', '-q', '--no-ff', '-m', 'Merge feature', 'feature')
+
+        return tmp_path
+
+    def test_matches_legacy_extraction(self, small_repo):
+        """Streaming extraction reports the same commits as the legacy path."""
+        archaeologist = GitArchaeologist(str(small_repo))
+
+        streamed = archaeologist.extract_commit_history(streaming=True)
+        legacy = archaeologist.extract_commit_history(streaming=False)
+
+        assert [c.sha for c in streamed] == [c.sha for c in legacy]
+        for s, l in zip(streamed, legacy):
+            assert s.message == l.message
+            assert s.author == l.author
+            assert s.email == l.email
+            assert s.date == l.date
+            assert s.parents == l.parents
+            assert len(s.files_changed) == len(l.files_changed)
+            # --stat only reports a combined change count per file
+            assert s.additions + s.deletions >= l.additions
+
+    def test_renames_and_binary_files(self, small_repo):
+        """Renamed files are recorded under their new path; binaries count zero lines."""
+        archaeologist = GitArchaeologist(str(small_repo))
+        commits = {c.message: c for c in archaeologist.iter_commits()}
+
+        rename = commits['Rename app to main']
+        assert rename.files_changed == ['logo.bin', 'main.py']
+        assert rename.renames == {'main.py': 'app.py'}
+        assert rename.additions == 1
+        assert rename.deletions == 1
+
+        merge = commits['Merge feature']
+        assert merge.is_merge
+        assert merge.files_changed == ['feature.py']
+
+        initial = commits['Initial commit\nWith a body line.']
+        assert initial.parents == []
+
+    def test_limit_and_early_stop(self, small_repo):
+        """Limit caps the stream and abandoning the generator is safe."""
+        archaeologist = GitArchaeologist(str(small_repo))
+
+        assert len(archaeologist.extract_commit_history(limit=2)) == 2
+
+        newest = archaeologist.extract_commit_history(limit=1)[0]
+        stream = archaeologist.iter_commits()
+        first = next(stream)
+        stream.close()
+        assert first.sha == newest.sha
+
+    def test_synthetic_repo_builder(self, tmp_path):
+        """The benchmark repository builder produces the requested history."""
+        from tools.code_archaeology.benchmarks import build_synthetic_repo
+
+        repo = build_synthetic_repo(tmp_path / 'synthetic', n_commits=25, files_per_commit=2)
+        commits = GitArchaeologist(str(repo)).extract_commit_history()
+
+        assert len(commits) == 25
+        assert all(len(c.files_changed) == 2 for c in commits)
+
+
 class TestCommitAnalyzer:
     """Test suite for CommitAnalyzer class."""
 
@@ -2,6 +2,9 @@
 Tests for GitHub Integration module.
 """
 
+import asyncio
+import time
+
 import pytest
 from pathlib import Path
 from datetime import datetime
@@ -20,8 +23,13 @@ from tools.code_archaeology.github_integrator import (
     ReviewComment,
     IssueComment,
     EnrichedCommit,
+    AsyncGitHubEnricher,
+    GraphQLBulkFetcher,
 )
-from tools.code_archaeology.git_analyzer import Commit
+from tools.code_archaeology.fake_github import FakeGitHubServer
+from tools.code_archaeology.github_cache import GitHubResponseCache
+from tools.code_archaeology.commit_pr_map import CommitPullRequestMap
+from tools.code_archaeology.git_analyzer import Commit, RepositoryHistory
 
 
 class TestGitHubArchaeologist:
@@ -433,5 +441,610 @@ class TestEnrichedHistory:
         assert enriched_history.enrichment_rate == 0.0
 
 
+class TestEnrichedHistoryLookup:
+    """Test SHA and FAISS id lookup tables on EnrichedHistory."""
+
+    @pytest.fixture
+    def enriched_history(self):
+        """Create an enriched history with a few commits."""
+        from tools.code_archaeology.github_integrator import EnrichedHistory
+        from tools.code_archaeology.git_analyzer import RepositoryHistory
+
+        commits = [
+            Commit(
+                sha=f"{i:040x}",
+                message=f"Commit {i}",
+                author="user1",
+                email="user1@example.com",
+                date=datetime.now(),
+                parents=[],
+            )
+            for i in range(5)
+        ]
+        base_history = RepositoryHistory(
+            repo_path=Path("."),
+            commits=commits,
+            arch_commits=[],
+            temporal_index={},
+            file_history={},
+            author_stats={},
+            branch_commits={},
+        )
+        return EnrichedHistory(
+            base_history=base_history,
+            enriched_commits=[EnrichedCommit(commit=c) for c in commits],
+            pull_requests={},
+            issues={},
+            commit_to_pr={},
+        )
+
+    def test_get_commit_by_sha(self, enriched_history):
+        """Commits resolve by SHA; unknown SHAs return None."""
+        target = enriched_history.enriched_commits[3]
+
+        assert enriched_history.get_commit(target.commit.sha) is target
+        assert enriched_history.get_commit("0" * 39 + "z") is None
+
+    def test_link_faiss_ids(self, enriched_history):
+        """FAISS ids resolve to commits after linking index metadata."""
+        shas = [ec.commit.sha for ec in enriched_history.enriched_commits]
+        metadata = {10 + i: f"commit_{sha}" for i, sha in enumerate(shas)}
+        metadata[99] = "commit_" + "f" * 40  # Not in this history
+        metadata[100] = "pr_12"
+
+        linked = enriched_history.link_faiss_ids(metadata)
+
+        assert linked == 5
+        assert enriched_history.get_commit_by_faiss_id(12).commit.sha == shas[2]
+        assert enriched_history.get_commit_by_faiss_id(99) is None
+
+    def test_faiss_ids_resolve_after_linking(self, enriched_history):
+        """Commits and index ids added after linking resolve by FAISS id."""
+        metadata = {0: f"commit_{enriched_history.enriched_commits[0].commit.sha}"}
+        enriched_history.link_faiss_ids(metadata)
+        new_commit = EnrichedCommit(commit=Commit(
+            sha="b" * 40, message="Later commit", author="user1",
+            email="user1@example.com", date=datetime.now(), parents=[],
+        ))
+
+        metadata[1] = "commit_" + "b" * 40  # Indexed before the history knows it
+        assert enriched_history.get_commit_by_faiss_id(1) is None
+        enriched_history.add_enriched_commits([new_commit])
+
+        assert enriched_history.get_commit_by_faiss_id(1) is new_commit
+        assert enriched_history.get_commit_by_faiss_id(0) is enriched_history.enriched_commits[1]
+
+    def test_add_enriched_commits_updates_tables(self, enriched_history):
+        """Incremental additions are visible through the lookup tables."""
+        new_commit = Commit(
+            sha="a" * 40,
+            message="Fix bug (#7)",
+            author="user2",
+            email="user2@example.com",
+            date=datetime.now(),
+            parents=[],
+        )
+        pr = PullRequest(
+            number=7, title="Fix bug", body="", author="user2", state="merged",
+            created_at=datetime.now(), merged_at=datetime.now(), closed_at=None,
+            commits=[new_commit.sha], labels=[], reviewers=[],
+        )
+        enriched = EnrichedCommit(commit=new_commit, pull_request=pr)
+
+        enriched_history.add_enriched_commits([enriched])
+
+        assert enriched_history.enriched_commits[0] is enriched
+        assert enriched_history.get_commit("a" * 40) is enriched
+        assert enriched_history.pull_requests[7] is pr
+        assert enriched_history.commit_to_pr["a" * 40] == 7
+
+    def test_direct_list_mutation_resyncs(self, enriched_history):
+        """Appending to enriched_commits directly still resolves by SHA."""
+        extra = EnrichedCommit(commit=Commit(
+            sha="b" * 40, message="Extra", author="user1",
+            email="user1@example.com", date=datetime.now(), parents=[],
+        ))
+        enriched_history.enriched_commits.append(extra)
+
+        assert enriched_history.get_commit("b" * 40) is extra
+
+
+def make_history(commits):
+    """Wrap commits in a RepositoryHistory."""
+    return RepositoryHistory(
+        repo_path=Path('.'), commits=commits, arch_commits=[], temporal_index={},
+        file_history={}, author_stats={}, branch_commits={},
+    )
+
+
+def make_commit(sha, message):
+    return Commit(sha=sha, message=message, author="Dev", email="dev@example.com",
+                  date=datetime(2024, 1, 1), parents=[])
+
+
+class TestConcurrentEnrichment:
+    """Concurrent enrichment against a local fake GitHub server."""
+
+    @pytest.fixture
+    def server(self):
+        with FakeGitHubServer() as server:
+            server.add_pull_request(1, commits=["a" * 40], comments=2, review_comments=1)
+            server.add_pull_request(2, commits=["b" * 40], review_comments=3)
+            server.add_pull_request(4, commits=["c" * 40, "d" * 40], comments=1)
+            server.add_issue(3, comments=2)
+            yield server
+
+    @pytest.fixture
+    def history(self):
+        return make_history([
+            make_commit("a" * 40, "Add cache (#1)"),
+            make_commit("b" * 40, "Fix parser (#2)\n\nFixes #3"),
+            make_commit("c" * 40, "No reference in message"),
+            make_commit("e" * 40, "Unlinked commit"),
+            make_commit("f" * 40, "Closes #3"),
+        ])
+
+    def archaeologist(self, server):
+        return GitHubArchaeologist("owner", "repo", token="test", base_url=server.url)
+
+    def summarize(self, enriched_history):
+        return [
+            (ec.commit.sha,
+             ec.pull_request.number if ec.pull_request else None,
+             len(ec.pull_request.comments) if ec.pull_request else 0,
+             sorted(ec.pull_request.reviewers) if ec.pull_request else [],
+             [(issue.number, len(issue.comments)) for issue in ec.related_issues],
+             ec.discussion_context)
+            for ec in enriched_history.enriched_commits
+        ]
+
+    def test_base_url_and_pool_size(self, server):
+        client = GitHubAPIClient(token="test", base_url=server.url + "/", pool_size=4)
+
+        assert client.base_url == server.url
+        assert client.get_pull_request("owner", "repo", 1)['number'] == 1
+
+        client.set_pool_size(16)
+        assert client.pool_size == 16
+        assert client.session.get_adapter(server.url)._pool_maxsize == 16
+
+    def test_concurrent_matches_sequential(self, server, history):
+        sequential = self.archaeologist(server).enrich_history(history, concurrency=1)
+        concurrent = self.archaeologist(server).enrich_history(history, concurrency=8)
+
+        assert self.summarize(concurrent) == self.summarize(sequential)
+        assert concurrent.commit_to_pr == sequential.commit_to_pr == {
+            "a" * 40: 1, "b" * 40: 2, "c" * 40: 4,
+        }
+        assert sorted(concurrent.issues) == [3]
+        assert concurrent.enrichment_rate == sequential.enrichment_rate
+
+    def test_requests_run_in_parallel(self, server, history):
+        server.latency = 0.05
+        archaeologist = self.archaeologist(server)
+
+        archaeologist.enrich_history(history, concurrency=8)
+
+        assert 1 < server.max_in_flight <= 8
+
+    def test_concurrency_is_bounded(self, server, history):
+        server.latency = 0.02
+        archaeologist = self.archaeologist(server)
+
+        archaeologist.enrich_history(history, concurrency=2)
+
+        assert server.max_in_flight <= 2
+
+    def test_pull_request_subrequests_issued_together(self, server):
+        server.latency = 0.1
+        enricher = AsyncGitHubEnricher(self.archaeologist(server), concurrency=4)
+
+        start = time.perf_counter()
+        enriched = asyncio.run(enricher.enrich_commits([make_commit("a" * 40, "Add cache (#1)")]))
+        elapsed = time.perf_counter() - start
+
+        assert enriched[0].pull_request.number == 1
+        assert server.max_in_flight == 4
+        assert elapsed < 0.3  # One round trip, not four
+
+    def test_waits_for_rate_limit_reset(self, history):
+        with FakeGitHubServer(rate_limit=20, rate_limit_window=0.5) as server:
+            server.add_pull_request(1, commits=["a" * 40], comments=1)
+            server.add_pull_request(2, commits=["b" * 40])
+            server.add_pull_request(4, commits=["c" * 40])
+            server.add_issue(3)
+            archaeologist = self.archaeologist(server)
+
+            enriched = archaeologist.enrich_history(history, concurrency=4)
+
+        # Enrichment paused for the reset instead of hitting 403s
+        assert enriched.commit_to_pr == {"a" * 40: 1, "b" * 40: 2, "c" * 40: 4}
+        assert sorted(enriched.issues) == [3]
+
+    def test_runs_inside_event_loop(self, server, history):
+        archaeologist = self.archaeologist(server)
+
+        async def enrich():
+            return archaeologist.enrich_history(history, concurrency=4)
+
+        assert asyncio.run(enrich()).commit_to_pr["a" * 40] == 1
+
+
+class TestGitHubCaching:
+    """PR/issue memo and the persistent conditional-request cache."""
+
+    @pytest.fixture
+    def server(self):
+        with FakeGitHubServer() as server:
+            server.add_pull_request(7, commits=["a" * 40, "b" * 40, "c" * 40], comments=2)
+            server.add_issue(9, comments=1)
+            yield server
+
+    @pytest.fixture
+    def history(self):
+        return make_history([
+            make_commit("a" * 40, "Part one (#7)\n\nRefs #9"),
+            make_commit("b" * 40, "Part two (#7)\n\nRefs #9"),
+            make_commit("c" * 40, "Part three (#7)"),
+        ])
+
+    @pytest.mark.parametrize("concurrency", [1, 8])
+    def test_pull_request_fetched_once(self, server, history, concurrency):
+        archaeologist = GitHubArchaeologist("owner", "repo", token="test", base_url=server.url)
+
+        enriched = archaeologist.enrich_history(history, concurrency=concurrency)
+
+        assert server.requests.count("/repos/owner/repo/pulls/7") == 1
+        assert server.requests.count("/repos/owner/repo/issues/9") == 1
+        assert server.request_count == 6  # Four PR requests, issue and its comments
+        assert archaeologist.memo_hits == 3
+        assert {ec.pull_request.number for ec in enriched.enriched_commits} == {7}
+        assert enriched.enriched_commits[0].pull_request is enriched.enriched_commits[2].pull_request
+
+    def test_missing_pull_request_memoized(self, server):
+        archaeologist = GitHubArchaeologist("owner", "repo", token="test", base_url=server.url)
+
+        assert archaeologist.fetch_pull_request(404) is None
+        assert archaeologist.fetch_pull_request(404) is None
+        assert server.request_count == 1
+
+        archaeologist.clear_memo()
+        archaeologist.fetch_pull_request(404)
+        assert server.request_count == 2
+
+    def test_warm_run_revalidates_without_quota(self, server, history, tmp_path):
+        cache_dir = tmp_path / 'github'
+        cold = GitHubArchaeologist("owner", "repo", token="test", base_url=server.url,
+                                   cache_dir=str(cache_dir))
+        cold_result = cold.enrich_history(history)
+        quota_after_cold = server.rate_limit_remaining
+        assert (cache_dir / GitHubResponseCache.FILENAME).exists()
+
+        warm = GitHubArchaeologist("owner", "repo", token="test", base_url=server.url,
+                                   cache_dir=str(cache_dir))
+        warm_result = warm.enrich_history(history)
+
+        assert server.not_modified_count == 6
+        assert server.rate_limit_remaining == quota_after_cold
+        assert warm.client.response_cache.stats.revalidated == 6
+        assert warm_result.commit_to_pr == cold_result.commit_to_pr
+        assert len(warm_result.pull_requests[7].comments) == 2
+
+    def test_changed_resource_is_downloaded(self, server, tmp_path):
+        cache_dir = str(tmp_path / 'github')
+        first = GitHubArchaeologist("owner", "repo", token="test", base_url=server.url,
+                                    cache_dir=cache_dir)
+        first.fetch_issue(9)
+        assert first.client.save_response_cache()
+
+        server.issues[9]['comments'].append(FakeGitHubServer._comment(9, 5))
+        server.touch()
+        issue = GitHubArchaeologist("owner", "repo", token="test", base_url=server.url,
+                                    cache_dir=cache_dir).fetch_issue(9)
+
+        assert len(issue.comments) == 2
+        assert server.not_modified_count == 1  # Issue unchanged, comments re-downloaded
+
+    def test_last_modified_validator(self, server, tmp_path):
+        cache = GitHubResponseCache(tmp_path / 'github')
+        client = GitHubAPIClient(token="test", base_url=server.url, response_cache=cache)
+        client.get_issue("owner", "repo", 9)
+
+        # Only Last-Modified known: revalidated with If-Modified-Since
+        url = f"{server.url}/repos/owner/repo/issues/9"
+        cache.get(url).etag = None
+        assert client.get_issue("owner", "repo", 9)['number'] == 9
+        assert server.not_modified_count == 1
+
+
+class TestGitHubResponseCache:
+    """Test response cache persistence."""
+
+    def test_round_trip(self, tmp_path):
+        cache = GitHubResponseCache(tmp_path)
+        cache.put("https://api.github.com/x", {'a': 1}, etag='"abc"')
+        cache.put("https://api.github.com/y", {'b': 2})  # No validator: not cached
+
+        assert cache.save()
+        assert not cache.save()  # Unchanged
+
+        loaded = GitHubResponseCache(tmp_path)
+        assert loaded.size == 1
+        entry = loaded.get("https://api.github.com/x")
+        assert entry.body == {'a': 1}
+        assert entry.validators == {'If-None-Match': '"abc"'}
+
+    def test_corrupt_cache_ignored(self, tmp_path):
+        (tmp_path / GitHubResponseCache.FILENAME).write_bytes(b'not a pickle')
+
+        assert GitHubResponseCache(tmp_path).size == 0
+
+    def test_clear(self, tmp_path):
+        cache = GitHubResponseCache(tmp_path)
+        cache.put("k", [], last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        cache.save()
+
+        cache.clear()
+
+        assert cache.size == 0
+        assert not cache.exists()
+
+
+class TestPagination:
+    """REST list endpoints follow every page."""
+
+    def test_all_comment_pages_fetched(self, tmp_path):
+        with FakeGitHubServer() as server:
+            server.add_pull_request(1, commits=["a" * 40], comments=150, review_comments=101)
+            server.add_issue(2, comments=230)
+            archaeologist = GitHubArchaeologist("owner", "repo", token="test", base_url=server.url)
+
+            pr = archaeologist.fetch_pull_request(1)
+            issue = archaeologist.fetch_issue(2)
+
+        assert len(pr.comments) == 150
+        assert len(pr.review_comments) == 101
+        assert len(issue.comments) == 230
+        assert server.requests.count("/repos/owner/repo/issues/2/comments") == 3
+
+    def test_cached_pages_revalidated(self, tmp_path):
+        with FakeGitHubServer() as server:
+            server.add_issue(2, comments=150)
+            cache = GitHubResponseCache(tmp_path)
+            client = GitHubAPIClient(token="test", base_url=server.url, response_cache=cache)
+
+            assert len(client.get_issue_comments("owner", "repo", 2)) == 150
+            assert len(client.get_issue_comments("owner", "repo", 2)) == 150
+
+        assert server.not_modified_count == 2  # Both pages answered from the cache
+
+
+class TestGraphQLBulkMode:
+    """Bulk enrichment through the GraphQL stub."""
+
+    @pytest.fixture
+    def server(self):
+        with FakeGitHubServer(graphql_page_size=2) as server:
+            server.add_issue(3, comments=5)
+            server.add_issue(8, comments=3)
+            server.add_pull_request(1, commits=["a" * 40], comments=5, review_comments=7, closes=[8])
+            server.add_pull_request(4, commits=["c" * 40, "d" * 40], comments=1)
+            yield server
+
+    @pytest.fixture
+    def history(self):
+        return make_history([
+            make_commit("a" * 40, "Add cache (#1)"),
+            make_commit("b" * 40, "Fix parser (#2)\n\nFixes #3"),
+            make_commit("c" * 40, "No reference in message"),
+            make_commit("e" * 40, "Unlinked commit"),
+        ])
+
+    def archaeologist(self, server, token="test"):
+        return GitHubArchaeologist("owner", "repo", token=token, base_url=server.url)
+
+    def test_matches_rest_and_reads_all_pages(self, server, history):
+        bulk = self.archaeologist(server).enrich_history(history, bulk=True)
+        graphql_requests = server.request_count
+        rest = self.archaeologist(server).enrich_history(history, concurrency=1)
+
+        assert set(server.requests[:graphql_requests]) == {"/graphql"}
+        assert bulk.commit_to_pr == rest.commit_to_pr == {"a" * 40: 1, "c" * 40: 4}
+        for name in ('title', 'state', 'commits', 'labels', 'url', 'merged_at'):
+            assert getattr(bulk.pull_requests[1], name) == getattr(rest.pull_requests[1], name)
+        assert len(bulk.pull_requests[1].comments) == 5
+        assert len(bulk.pull_requests[1].review_comments) == 7
+        assert sorted(bulk.pull_requests[1].reviewers) == sorted(rest.pull_requests[1].reviewers)
+        assert bulk.pull_requests[4].commits == ["c" * 40, "d" * 40]
+        assert len(bulk.issues[3].comments) == 5
+        assert (sorted(c.body for c in bulk.pull_requests[1].review_comments)
+                == sorted(c.body for c in rest.pull_requests[1].review_comments))
+
+    def test_linked_issues_attached(self, server, history):
+        enriched = self.archaeologist(server).enrich_history(history, bulk=True)
+
+        first = enriched.get_commit("a" * 40)
+        assert [issue.number for issue in first.related_issues] == [8]
+        assert len(first.related_issues[0].comments) == 3
+
+    def test_batches_fifty_per_query(self):
+        with FakeGitHubServer() as server:
+            commits = []
+            for number in range(1, 121):
+                sha = f"{number:040x}"
+                server.add_pull_request(number, commits=[sha])
+                commits.append(make_commit(sha, f"Change (#{number})"))
+            fetcher = GraphQLBulkFetcher(self.archaeologist(server))
+
+            enriched = fetcher.enrich_commits(commits)
+
+        assert fetcher.queries == 3  # 120 PRs in batches of 50, nothing to resolve or page
+        assert server.request_count == 3
+        assert [ec.pull_request.number for ec in enriched] == list(range(1, 121))
+
+    def test_memoized_numbers_not_refetched(self, server, history):
+        archaeologist = self.archaeologist(server)
+        archaeologist.enrich_history(history, bulk=True)
+        first_run = server.request_count
+
+        archaeologist.enrich_history(history, bulk=True)
+
+        assert server.request_count == first_run + 1  # Only the commit-to-PR lookup
+
+    def test_without_token_falls_back_to_rest(self, server, history, monkeypatch):
+        monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+        enriched = self.archaeologist(server, token=None).enrich_history(
+            history, concurrency=1, bulk=True)
+
+        assert "/graphql" not in server.requests
+        assert enriched.commit_to_pr == {"a" * 40: 1, "c" * 40: 4}
+
+    def test_graphql_errors_raise(self, server):
+        client = GitHubAPIClient(token="test", base_url=server.url)
+
+        with pytest.raises(Exception, match="GraphQL"):
+            client.graphql("query { viewer { login } }")
+
+
+class TestCommitPullRequestMap:
+    """Commit -> PR links from the closed PR list."""
+
+    @pytest.fixture
+    def server(self):
+        with FakeGitHubServer() as server:
+            for number in range(1, 151):
+                server.add_pull_request(number, commits=[f"{number:040x}", f"{number + 1000:040x}"],
+                                        merge_commit=f"{number + 5000:040x}")
+            server.add_pull_request(151, commits=["f" * 40], merged=False)  # Still open
+            yield server
+
+    def archaeologist(self, server, cache_dir=None):
+        return GitHubArchaeologist("owner", "repo", token="test", base_url=server.url,
+                                   cache_dir=str(cache_dir) if cache_dir else None)
+
+    def test_build_maps_commits_and_merge_commits(self, server):
+        archaeologist = self.archaeologist(server)
+
+        assert archaeologist.build_commit_pr_map() == 150
+
+        commit_map = archaeologist.commit_pr_map
+        assert commit_map.get(f"{7:040x}") == 7
+        assert commit_map.get(f"{1007:040x}") == 7
+        assert commit_map.get(f"{5007:040x}") == 7  # Squash/merge commit
+        assert commit_map.get("f" * 40) is None      # Open PRs are not listed
+        assert server.requests.count("/repos/owner/repo/pulls") == 2  # 150 closed PRs, 100 per page
+
+    def test_linking_uses_map_instead_of_api(self, server):
+        archaeologist = self.archaeologist(server)
+        history = make_history([
+            make_commit(f"{12:040x}", "No reference"),
+            make_commit(f"{5013:040x}", "Squashed change"),
+            make_commit("e" * 40, "Direct push"),
+        ])
+
+        enriched = archaeologist.enrich_history(history, concurrency=1, commit_map=True)
+
+        assert not any(path.startswith("/repos/owner/repo/commits/") for path in server.requests)
+        assert enriched.commit_to_pr == {f"{12:040x}": 12, f"{5013:040x}": 13}
+
+    def test_map_used_by_concurrent_and_bulk_paths(self, server):
+        history = make_history([make_commit(f"{12:040x}", "No reference")])
+
+        for options in ({'concurrency': 4}, {'bulk': True}):
+            archaeologist = self.archaeologist(server)
+            archaeologist.build_commit_pr_map()
+            server.requests.clear()
+
+            enriched = archaeologist.enrich_history(history, **options)
+
+            assert enriched.commit_to_pr == {f"{12:040x}": 12}
+            assert not any("/commits/" in path for path in server.requests)
+            assert "associatedPullRequests" not in str(server.requests)
+
+    def test_incremental_refresh_reads_only_new_prs(self, server, tmp_path):
+        self.archaeologist(server, tmp_path).build_commit_pr_map()
+        assert (tmp_path / CommitPullRequestMap.FILENAME).exists()
+
+        server.add_pull_request(200, commits=["a" * 40])
+        server.update_pull_request(3, comments=[FakeGitHubServer._comment(3, 0)])  # Same head
+        server.update_pull_request(4, commits=[f"{4:040x}", "b" * 40])               # New commit
+        server.requests.clear()
+
+        refreshed = self.archaeologist(server, tmp_path)
+        assert refreshed.build_commit_pr_map() == 2  # PR 200 and the changed PR 4
+
+        assert server.requests.count("/repos/owner/repo/pulls") == 1  # Stopped on page one
+        assert refreshed.commit_pr_map.get("a" * 40) == 200
+        assert refreshed.commit_pr_map.get("b" * 40) == 4
+        assert refreshed.commit_pr_map.get(f"{9:040x}") == 9  # Loaded from disk
+
+    def test_stored_map_loaded_on_construction(self, server, tmp_path):
+        self.archaeologist(server, tmp_path).build_commit_pr_map()
+        server.requests.clear()
+
+        archaeologist = self.archaeologist(server, tmp_path)
+        assert archaeologist.commit_pr_map.is_built
+
+        commit = make_commit(f"{12:040x}", "No reference")
+        assert archaeologist.link_commit_to_pr(commit) == 12
+        assert not server.requests  # No /commits/{sha}/pulls request
+
+    def test_stored_map_misses_fall_back_to_api(self, server, tmp_path):
+        self.archaeologist(server, tmp_path).build_commit_pr_map()
+        server.add_pull_request(200, commits=["a" * 40])  # Merged after the build
+
+        archaeologist = self.archaeologist(server, tmp_path)
+        assert archaeologist.link_commit_to_pr(make_commit("a" * 40, "No reference")) == 200
+
+        archaeologist.build_commit_pr_map()
+        server.requests.clear()
+        assert archaeologist.link_commit_to_pr(make_commit("e" * 40, "Direct push")) is None
+        assert not server.requests  # The refreshed map is complete
+
+    def test_failed_commit_list_is_retried(self, server, tmp_path, monkeypatch):
+        route = server.route
+        monkeypatch.setattr(server, "route", lambda path, query=None: (
+            (502, {"message": "Bad Gateway"}) if path.endswith("/pulls/7/commits")
+            else route(path, query)
+        ))
+        archaeologist = self.archaeologist(server, tmp_path)
+
+        assert archaeologist.build_commit_pr_map() == 149
+        assert 7 not in archaeologist.commit_pr_map.pr_heads
+        assert not archaeologist.commit_map_complete
+        server.requests.clear()
+        assert archaeologist.link_commit_to_pr(make_commit(f"{7:040x}", "No reference")) == 7
+        assert server.requests == [f"/repos/owner/repo/commits/{7:040x}/pulls"]
+
+        monkeypatch.setattr(server, "route", route)
+        refreshed = self.archaeologist(server, tmp_path)
+        assert refreshed.build_commit_pr_map() == 1
+        assert refreshed.commit_pr_map.get(f"{7:040x}") == 7
+        assert refreshed.commit_map_complete
+
+    def test_lowest_pr_number_wins(self):
+        commit_map = CommitPullRequestMap("owner", "repo")
+        commit_map.add_pull_request(9, ["a" * 40])
+        commit_map.add_pull_request(4, ["a" * 40])
+        commit_map.add_pull_request(12, ["a" * 40])
+
+        assert commit_map.get("a" * 40) == 4
+
+    def test_store_round_trip_and_repository_check(self, tmp_path):
+        commit_map = CommitPullRequestMap("owner", "repo", store_dir=tmp_path)
+        assert not commit_map.is_built
+        commit_map.add_pull_request(5, ["a" * 40], head_sha="a" * 40)
+        commit_map.mark_built("2024-02-01T00:00:00Z")
+        commit_map.save()
+
+        loaded = CommitPullRequestMap("owner", "repo", store_dir=tmp_path)
+        assert loaded.load()
+        assert loaded.is_built
+        assert loaded.get("a" * 40) == 5
+        assert loaded.updated_through == "2024-02-01T00:00:00Z"
+
+        assert not CommitPullRequestMap("owner", "other", store_dir=tmp_path).load()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
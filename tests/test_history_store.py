@@ -0,0 +1,174 @@
+"""
+Tests for the persisted, incrementally refreshed history store.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.code_archaeology.git_analyzer import GitArchaeologist, TemporalCorrelator
+from tools.code_archaeology.history_store import HistoryStore
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run a git command in the test repository."""
+    result = subprocess.run(
+        ['git', '-C', str(repo), '-c', 'user.name=Test Author',
+         '-c', 'user.email=test@example.com', *args],
+        check=True, capture_output=True, text=True,
+    )
+    return result.stdout.strip()
+
+
+def commit_file(repo: Path, name: str, content: str, message: str) -> None:
+    """Write a file and commit it."""
+    path = repo / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', message)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a small repository with a few commits."""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    git(repo, 'init', '-q')
+    commit_file(repo, 'README.md', 'hello\n', 'Initial commit')
+    commit_file(repo, 'src/app.py', 'print(1)\n', 'Add app')
+    commit_file(repo, 'src/app.py', 'print(2)\n', 'Refactor app output')
+    return repo
+
+
+@pytest.fixture
+def store(repo, tmp_path):
+    """Create a history store outside the repository."""
+    return HistoryStore(str(repo), store_dir=tmp_path / 'history')
+
+
+class TestHistoryStore:
+    """Test suite for HistoryStore persistence."""
+
+    def test_cold_start_builds_and_persists(self, repo, store):
+        """First run analyzes the full history and writes the store."""
+        archaeologist = GitArchaeologist(str(repo))
+
+        history, new_commits = archaeologist.analyze_repo_incremental(store)
+
+        assert history.total_commits == 3
+        assert len(new_commits) == 3
+        assert store.exists()
+
+    def test_round_trip_preserves_history(self, repo, store):
+        """Loaded history matches what was saved, including indexes."""
+        archaeologist = GitArchaeologist(str(repo))
+        history, _ = archaeologist.analyze_repo_incremental(store)
+
+        loaded = store.load()
+
+        assert loaded is not None
+        assert loaded.head_sha == git(repo, 'rev-parse', 'HEAD')
+        assert [c.sha for c in loaded.history.commits] == [c.sha for c in history.commits]
+        assert loaded.history.author_stats == history.author_stats
+        assert {k: [c.sha for c in v] for k, v in loaded.history.file_history.items()} == \
+            {k: [c.sha for c in v] for k, v in history.file_history.items()}
+        assert [ac.commit.sha for ac in loaded.history.arch_commits] == \
+            [ac.commit.sha for ac in history.arch_commits]
+
+        # Index entries must reference the same Commit objects as the commit list
+        by_sha = {c.sha: c for c in loaded.history.commits}
+        for commits in loaded.history.file_history.values():
+            assert all(c is by_sha[c.sha] for c in commits)
+
+    def test_round_trip_preserves_renames(self, repo, store):
+        """Renames recorded on commits survive a save and load."""
+        git(repo, 'mv', 'src/app.py', 'src/main.py')
+        git(repo, 'commit', '-q', '-m', 'Rename app to main')
+        archaeologist = GitArchaeologist(str(repo))
+        archaeologist.analyze_repo_incremental(store)
+
+        loaded = store.load()
+
+        assert loaded.history.commits[0].renames == {'src/main.py': 'src/app.py'}
+        assert loaded.history.commits[1].renames == {}
+
+    def test_warm_start_without_changes_reads_nothing(self, repo, store):
+        """When refs are unchanged no new commits are read."""
+        archaeologist = GitArchaeologist(str(repo))
+        archaeologist.analyze_repo_incremental(store)
+
+        history, new_commits = archaeologist.analyze_repo_incremental(store)
+
+        assert new_commits == []
+        assert history.total_commits == 3
+
+    def test_incremental_refresh_matches_full_analysis(self, repo, store):
+        """Only new commits are read and indexes match a full rebuild."""
+        archaeologist = GitArchaeologist(str(repo))
+        archaeologist.analyze_repo_incremental(store)
+
+        commit_file(repo, 'src/app.py', 'print(3)\n', 'Tweak app again')
+        commit_file(repo, 'docs/guide.md', '# Guide\n', 'Add guide')
+
+        history, new_commits = archaeologist.analyze_repo_incremental(store)
+        full = archaeologist.analyze_repo()
+
+        assert [c.message for c in new_commits] == ['Add guide', 'Tweak app again']
+        assert [c.sha for c in history.commits] == [c.sha for c in full.commits]
+        assert history.author_stats == full.author_stats
+        assert {k: [c.sha for c in v] for k, v in history.file_history.items()} == \
+            {k: [c.sha for c in v] for k, v in full.file_history.items()}
+        assert {k: len(v) for k, v in history.temporal_index.items()} == \
+            {k: len(v) for k, v in full.temporal_index.items()}
+        assert set(history.branch_commits) == set(full.branch_commits)
+        for branch, commits in full.branch_commits.items():
+            assert [c.sha for c in history.branch_commits[branch]] == [c.sha for c in commits]
+
+    def test_rewritten_history_triggers_rebuild(self, repo, store):
+        """If stored refs vanish (e.g. after a rewrite and gc) the store is rebuilt."""
+        archaeologist = GitArchaeologist(str(repo))
+        archaeologist.analyze_repo_incremental(store)
+
+        snapshot = store.load()
+        missing = 'f' * 40
+        store.save(snapshot.history, [missing], snapshot.branch_tips)
+
+        history, new_commits = archaeologist.analyze_repo_incremental(store)
+
+        assert history.total_commits == 3
+        assert len(new_commits) == 3
+        assert store.load().tips[0] == git(repo, 'rev-parse', 'HEAD')
+
+    def test_store_for_other_repo_is_ignored(self, repo, store, tmp_path):
+        """A store written for a different repository path is not reused."""
+        archaeologist = GitArchaeologist(str(repo))
+        archaeologist.analyze_repo_incremental(store)
+
+        other = HistoryStore(str(tmp_path), store_dir=store.store_dir)
+        assert other.load() is None
+
+
+class TestIncrementalIndexes:
+    """Test incremental TemporalCorrelator updates."""
+
+    def test_update_file_history_appends_in_order(self, repo):
+        """Updating an index equals building it from all commits."""
+        commits = GitArchaeologist(str(repo)).extract_commit_history()
+        older, newer = commits[1:], commits[:1]
+
+        index = TemporalCorrelator.build_file_history(older)
+        TemporalCorrelator.update_file_history(index, newer)
+
+        expected = TemporalCorrelator.build_file_history(commits)
+        assert {k: [c.sha for c in v] for k, v in index.items()} == \
+            {k: [c.sha for c in v] for k, v in expected.items()}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
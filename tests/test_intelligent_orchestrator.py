@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Tests for the intelligent orchestrator's project analysis and agent discovery.
+
+Tests:
+- Language, framework and technology detection from one tree walk
+- Pruning of dependency and VCS directories
+- Manifests read at most once per analysis
+- ProjectContext caching keyed by directory and manifest mtimes
+- Indexed discovery ranking identical to scoring every agent
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from agent_registry import AgentMetadata, AgentRegistry
+from intelligent_orchestrator import (
+    AgentDiscoveryEngine,
+    AgentTier,
+    ProjectAnalyzer,
+    TierManager,
+)
+
+
+def write(root: Path, name: str, content: str = "") -> Path:
+    """Write a file below root, creating parent directories."""
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def bump_mtime(path: Path):
+    """Move a path's mtime forward (filesystem timestamps can be coarse)."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A small web project with infrastructure files."""
+    write(tmp_path, "package.json", '{"dependencies": {"react": "18", "pg": "8"}}')
+    write(tmp_path, "src/App.js", "export default 1")
+    write(tmp_path, "src/server.py", "print(1)")
+    write(tmp_path, "deploy/service.yaml", "apiVersion: v1\nkind: Service\n")
+    write(tmp_path, "Dockerfile", "FROM python")
+    write(tmp_path, "app/config/routes.rb", "")
+    write(tmp_path, "src/__tests__/App.test.js", "")
+    write(tmp_path, "README.md", "# Project")
+    write(tmp_path, ".github/workflows/ci.yml", "on: push")
+    return tmp_path
+
+
+class TestProjectAnalyzer:
+    """Test single-walk project analysis."""
+
+    def test_detection(self, project):
+        context = ProjectAnalyzer(project).analyze()
+
+        assert context.languages == {"javascript", "python", "ruby"}
+        assert {"react", "rails"} <= context.frameworks
+        assert {"docker", "kubernetes", "postgresql"} <= context.technologies
+        assert "redis" not in context.technologies
+        assert context.project_type == "web"
+        assert context.has_tests and context.has_ci_cd and context.has_docs
+        assert context.file_count == 4
+        assert context.complexity == "low"
+
+    def test_ignored_directories_are_pruned(self, project):
+        write(project, "node_modules/lib/index.rs", "")
+        write(project, "node_modules/lib/package.json", '{"dependencies": {"redis": "4"}}')
+        write(project, ".git/hooks/pre-commit.go", "")
+
+        context = ProjectAnalyzer(project).analyze()
+
+        assert "rust" not in context.languages
+        assert "go" not in context.languages
+        assert "redis" not in context.technologies
+        assert context.file_count == 4
+
+    def test_manifests_read_once(self, project, monkeypatch):
+        write(project, "packages/web/package.json", '{"dependencies": {"vue": "3"}}')
+        analyzer = ProjectAnalyzer(project)
+        reads = []
+        original = analyzer._read_manifest
+        monkeypatch.setattr(analyzer, "_read_manifest",
+                            lambda entry, scan: reads.append(entry.path) or original(entry, scan))
+
+        context = analyzer.analyze()
+
+        assert "vue" in context.frameworks and "react" in context.frameworks
+        assert len(reads) == len(set(reads))
+        assert str(project / "package.json") in reads
+
+    def test_context_cached_until_tree_changes(self, project, monkeypatch):
+        analyzer = ProjectAnalyzer(project)
+        first = analyzer.analyze()
+        scans = []
+        original = analyzer._scan
+        monkeypatch.setattr(analyzer, "_scan", lambda: scans.append(1) or original())
+
+        assert analyzer.analyze() == first
+        assert scans == []
+
+        write(project, "src/lib.rs", "")
+        bump_mtime(project / "src")
+        assert "rust" in analyzer.analyze().languages
+        assert len(scans) == 1
+
+    def test_manifest_edit_invalidates_cache(self, project):
+        analyzer = ProjectAnalyzer(project)
+        assert "redis" not in analyzer.analyze().technologies
+
+        manifest = write(project, "package.json", '{"dependencies": {"react": "18", "redis": "4"}}')
+        bump_mtime(manifest)
+
+        assert "redis" in analyzer.analyze().technologies
+
+    def test_cached_context_is_a_copy(self, project):
+        analyzer = ProjectAnalyzer(project)
+        analyzer.analyze().languages.add("cobol")
+
+        assert "cobol" not in analyzer.analyze().languages
+
+
+def discover_exhaustive(engine, query, max_results=5, tier_filter=None):
+    """Rank by scoring every agent with _calculate_relevance."""
+    query_lower = query.lower()
+    scored = []
+    for agent_name in engine.registry.list_all_agents():
+        if tier_filter and TierManager.get_tier(agent_name) != tier_filter:
+            continue
+        score, breakdown = engine._calculate_relevance(agent_name, query_lower)
+        if score > 0.1:
+            scored.append((agent_name, score, breakdown))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored[:max_results]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Discovery engine over the repository's agents."""
+    return AgentDiscoveryEngine(AgentRegistry())
+
+
+class TestAgentDiscoveryIndex:
+    """Test inverted-index discovery against exhaustive scoring."""
+
+    @pytest.mark.parametrize("query", [
+        "optimize my React app",
+        "security audit",
+        "the-critic",
+        "the critic",
+        "I need help generating diverse ideas for a product feature",
+        "explain the seo sitemap",
+        "xyz",
+    ])
+    @pytest.mark.parametrize("tier_filter", [None, AgentTier.CORE, AgentTier.EXPERIMENTAL])
+    @pytest.mark.parametrize("max_results", [1, 5, 100])
+    def test_matches_exhaustive_scoring(self, engine, query, tier_filter, max_results):
+        indexed = [
+            (r.agent_name, r.relevance_score, r.match_breakdown)
+            for r in engine.discover(query, max_results, tier_filter)
+        ]
+
+        assert indexed == discover_exhaustive(engine, query, max_results, tier_filter)
+
+    def test_keywords_match_as_substrings(self, engine):
+        matches = engine.index.matching_keywords("improve web performance")
+
+        assert {"web", "performance", "web performance"} <= matches
+        assert "og" not in matches
+
+    def test_description_text_matches_inside_words(self, engine):
+        agents = engine.index.agents_with_description_text("brainstorm")
+
+        assert agents == {
+            name for name in engine.registry.list_all_agents()
+            if "brainstorm" in engine.registry.get_agent(name).description.lower()
+        }
+        assert engine.index.agents_with_description_text("qqq") == set()
+
+    def test_rebuild_index_after_registry_change(self, tmp_path):
+        registry = AgentRegistry(tmp_path)
+        engine = AgentDiscoveryEngine(registry)
+        assert engine.discover("quantum annealing") == []
+
+        registry.name_index["quantum-specialist"] = AgentMetadata(
+            name="quantum-specialist", description="Quantum annealing expert"
+        )
+        engine.rebuild_index()
+
+        assert [r.agent_name for r in engine.discover("quantum annealing")] == ["quantum-specialist"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+"""
+Tests for the BM25 lexical index and reciprocal rank fusion.
+"""
+
+import math
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.code_archaeology.lexical_index import BM25Index, reciprocal_rank_fusion
+
+
+DOCUMENTS = [
+    "Fix parse_config crash on empty files\n1f3a9c0d2b7e4f5a6b8c9d0e1f2a3b4c5d6e7f80",
+    "Refactor cache eviction (#42) and cache warming\n1f3a9c77aa11bb22cc33dd44ee55ff6677889900",
+    "Add retry with timeout to the api client\n9e8d7c6b5a4f3e2d1c0b9a8f7e6d5c4b3a291807",
+    "Update docs for cache configuration",
+    "",
+]
+
+
+def reference_bm25(documents, query, k1=1.2, b=0.75):
+    """Score every document with a straightforward BM25 loop."""
+    tokenized = [re.findall(r'\w+', d.lower()) for d in documents]
+    average = sum(map(len, tokenized)) / len(tokenized)
+    scores = []
+    for tokens in tokenized:
+        score = 0.0
+        for term in dict.fromkeys(re.findall(r'\w+', query.lower())):
+            df = sum(term in t for t in tokenized)
+            tf = tokens.count(term)
+            if tf:
+                idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / average))
+        scores.append(score)
+    return scores
+
+
+@pytest.fixture
+def index():
+    """Index over a handful of commit-like documents."""
+    return BM25Index(DOCUMENTS)
+
+
+class TestBM25Index:
+    """Test suite for BM25Index."""
+
+    @pytest.mark.parametrize("query", [
+        "cache", "cache eviction", "parse_config", "42", "api client retry", "missing",
+    ])
+    @pytest.mark.parametrize("chunk_size", [2, 50_000])
+    def test_matches_reference_scores(self, query, chunk_size, monkeypatch):
+        """Scores equal a plain BM25 loop, however documents are chunked."""
+        monkeypatch.setattr(BM25Index, "CHUNK_SIZE", chunk_size)
+        index = BM25Index(DOCUMENTS)
+        reference = reference_bm25(DOCUMENTS, query)
+
+        results = index.search(query, k=10)
+
+        expected = sorted(
+            ((i, s) for i, s in enumerate(reference) if s > 0), key=lambda x: (-x[1], x[0])
+        )
+        assert [i for i, _ in results] == [i for i, _ in expected]
+        assert [s for _, s in results] == pytest.approx([s for _, s in expected], rel=1e-5)
+
+    def test_sparse_postings_match_reference(self):
+        """Rare query terms in a large corpus are aggregated without a dense pass."""
+        documents = DOCUMENTS + ["filler words about nothing"] * 200
+        query = "cache eviction parse_config"
+        reference = reference_bm25(documents, query)
+
+        results = BM25Index(documents).search(query, k=3)
+
+        expected = sorted(range(len(documents)), key=lambda i: -reference[i])[:3]
+        assert [i for i, _ in results] == expected
+        assert [s for _, s in results] == pytest.approx([reference[i] for i in expected], rel=1e-5)
+
+    def test_top_k(self, index):
+        """Only the k best documents are returned."""
+        assert [i for i, _ in index.search("cache", k=1)] == [1]
+        assert index.search("cache", k=0) == []
+
+    def test_abbreviated_sha_matches(self, index):
+        """Short SHA prefixes match every full SHA they prefix."""
+        assert [i for i, _ in index.search("what did 9e8d7c6 change?")] == [2]
+        assert {i for i, _ in index.search("1f3a9c0")} == {0}
+        assert {i for i, _ in index.search("1f3a9c7")} == {1}
+        assert {i for i, _ in index.search("1f3a9c0d")} == {0}
+        # Too short to be treated as a SHA
+        assert index.search("1f3a9c") == []
+
+    def test_empty_corpus(self):
+        """An empty index answers every query with no results."""
+        index = BM25Index([])
+
+        assert index.size == 0
+        assert index.search("anything") == []
+
+
+class TestReciprocalRankFusion:
+    """Test suite for reciprocal_rank_fusion."""
+
+    def test_items_in_both_rankings_rise(self):
+        fused = reciprocal_rank_fusion([[1, 2, 3], [3, 4]], k=10, constant=60)
+
+        assert [item for item, _ in fused] == [3, 1, 2, 4]
+        assert fused[0][1] == pytest.approx(1 / 63 + 1 / 61)
+
+    def test_ties_keep_first_appearance(self):
+        fused = reciprocal_rank_fusion([[7], [5]], k=10)
+
+        assert [item for item, _ in fused] == [7, 5]
+
+    def test_k_limits_results(self):
+        assert len(reciprocal_rank_fusion([[1, 2, 3], [4, 5]], k=2)) == 2
+        assert reciprocal_rank_fusion([[], []]) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Tests for the telemetry collector's summaries.
+
+Tests:
+- Summary from the columnar store identical to a scan of every event
+- Only events appended since the checkpoint are parsed
+- Closed days compacted into segments and reused on rebuild
+- Checkpoint rebuilt when files are rewritten, truncated or inserted
+- Duration sketches: accuracy against exact sorts, merging, bounded size
+- Percentiles per agent, command and window of days
+"""
+
+import json
+import math
+import os
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+import telemetry
+import numpy as np
+from telemetry import DurationSketch, EventColumns, EventType, TelemetryCollector, TelemetryStore
+
+AGENTS = ["the-critic", "api-designer", "db-tuner", "doc-writer"]
+COMMANDS = ["/review", "/deploy"]
+DAY = 86400.0
+
+
+def make_events(n: int, start: float, seed: int = 0):
+    """Random events of every type over one day."""
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        event = {"timestamp": start + i * DAY / n}
+        kind = rng.choice(list(EventType) + ["custom"])
+        event["event_type"] = kind if kind == "custom" else kind.value
+        if kind in (EventType.COMMAND_INVOKED, EventType.COMMAND_COMPLETED):
+            event["command_name"] = rng.choice(COMMANDS)
+        elif kind != EventType.USER_FEEDBACK or rng.random() < 0.5:
+            event["agent_name"] = rng.choice(AGENTS)
+        if kind in (EventType.AGENT_COMPLETED, EventType.AGENT_FAILED, "custom"):
+            event["duration_seconds"] = rng.choice([0, rng.uniform(0.1, 90.0)])
+        if kind == EventType.USER_FEEDBACK:
+            event["user_satisfied"] = rng.random() < 0.7
+        events.append(event)
+    return events
+
+
+def write_day(collector: TelemetryCollector, day: str, events, mode: str = "a") -> Path:
+    """Append events to a daily file."""
+    path = collector.events_dir / f"{day}.jsonl"
+    with open(path, mode) as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+    return path
+
+
+def bump_mtime(path: Path):
+    """Move a path's mtime forward (filesystem timestamps can be coarse)."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def rounded(value):
+    """Round floats so summation order at the last bit does not matter."""
+    if isinstance(value, dict):
+        return {key: rounded(item) for key, item in value.items()}
+    if isinstance(value, float):
+        return round(value, 9)
+    return value
+
+
+def assert_within_accuracy(approx: float, sorted_values, q: float):
+    """A sketch quantile lies between the exact values around rank q, up to the accuracy."""
+    k = (len(sorted_values) - 1) * q
+    low, high = sorted_values[math.floor(k)], sorted_values[math.ceil(k)]
+    accuracy = DurationSketch.RELATIVE_ACCURACY
+    assert low * (1 - accuracy) - 1e-12 <= approx <= high * (1 + accuracy) + 1e-12
+
+
+PERCENTILE_FIELDS = {"median_duration": 50, "p95_duration": 95, "p99_duration": 99}
+
+
+def assert_matches_scan(collector: TelemetryCollector, summary):
+    """Counters equal a scan of every event; percentiles within sketch accuracy."""
+    events = collector.load_events()
+    scanned = collector._summary_from_events(events)
+    durations = sorted(e["duration_seconds"] for e in events if e.get("duration_seconds") is not None)
+    for name, percentile in PERCENTILE_FIELDS.items():
+        assert_within_accuracy(summary["performance"][name], durations, percentile / 100)
+        summary = json.loads(json.dumps(summary))
+        summary["performance"][name] = scanned["performance"][name]
+    assert json.dumps(rounded(summary)) == json.dumps(rounded(scanned))
+
+
+@pytest.fixture
+def collector(tmp_path):
+    """Collector with three days of events."""
+    collector = TelemetryCollector(tmp_path)
+    for day in range(3):
+        write_day(collector, f"2025-10-0{day + 1}", make_events(300, 1759276800 + day * DAY, seed=day))
+    return collector
+
+
+class TestColumnarSummary:
+    """Test summaries served from the columnar store."""
+
+    def test_matches_event_scan(self, collector):
+        summary = collector.generate_summary()
+
+        assert summary["total_events"] == 900
+        assert list(summary["agents"]) == list(collector._summary_from_events(
+            collector.load_events())["agents"])
+        assert_matches_scan(collector, summary)
+        assert json.loads(collector.summary_file.read_text()) == summary
+
+    def test_empty(self, tmp_path):
+        collector = TelemetryCollector(tmp_path)
+
+        assert collector.generate_summary() == collector._empty_summary()
+        assert not collector.summary_file.exists()
+
+    def test_only_appended_events_parsed(self, collector, monkeypatch):
+        collector.generate_summary()
+        reads = []
+        original = TelemetryStore._read_events
+        monkeypatch.setattr(TelemetryStore, "_read_events", staticmethod(
+            lambda path, offset: reads.append((path.name, offset)) or original(path, offset)))
+
+        collector.generate_summary()
+        assert reads == []
+
+        last = collector.events_dir / "2025-10-03.jsonl"
+        size = last.stat().st_size
+        write_day(collector, "2025-10-03", make_events(10, 1759276800 + 2.5 * DAY, seed=7))
+        write_day(collector, "2025-10-04", make_events(50, 1759276800 + 3 * DAY, seed=8))
+        summary = collector.generate_summary()
+
+        assert reads == [("2025-10-03.jsonl", size), ("2025-10-04.jsonl", 0)]
+        assert summary["total_events"] == 960
+        assert_matches_scan(collector, summary)
+
+    def test_partial_line_left_for_next_refresh(self, collector):
+        collector.generate_summary()
+        last = collector.events_dir / "2025-10-03.jsonl"
+        event = json.dumps(make_events(1, 1759276800 + 2.9 * DAY)[0])
+        with open(last, "a") as f:
+            f.write(event[:10])
+
+        assert collector.generate_summary()["total_events"] == 900
+
+        with open(last, "a") as f:
+            f.write(event[10:] + "\n")
+        assert collector.generate_summary()["total_events"] == 901
+
+    def test_closed_days_compacted(self, collector, monkeypatch):
+        collector.generate_summary()
+        segments = sorted(p.name for p in collector.store.segments_dir.glob("*.pkl"))
+        assert segments == ["2025-10-01.pkl", "2025-10-02.pkl"]
+
+        collector.store.path.unlink()
+        reads = []
+        original = TelemetryStore._read_events
+        monkeypatch.setattr(TelemetryStore, "_read_events", staticmethod(
+            lambda path, offset: reads.append(path.name) or original(path, offset)))
+
+        assert_matches_scan(collector, collector.generate_summary())
+        assert reads == ["2025-10-03.jsonl"]
+
+    @pytest.mark.parametrize("change", ["rewrite", "truncate", "insert", "delete", "grow_closed"])
+    def test_rebuilt_when_files_change(self, collector, change):
+        collector.generate_summary()
+        first = collector.events_dir / "2025-10-01.jsonl"
+        last = collector.events_dir / "2025-10-03.jsonl"
+
+        if change == "rewrite":
+            events = collector.load_events("2025-10-01")
+            events[0]["agent_name"] = "renamed-agent"
+            write_day(collector, "2025-10-01", events, mode="w")
+            bump_mtime(first)
+        elif change == "truncate":
+            write_day(collector, "2025-10-03", make_events(5, 1759276800 + 2 * DAY), mode="w")
+        elif change == "insert":
+            write_day(collector, "2025-09-30", make_events(20, 1759276800 - DAY, seed=9))
+        elif change == "delete":
+            last.unlink()
+        else:
+            write_day(collector, "2025-10-01", make_events(5, 1759276800 + 0.9 * DAY, seed=10))
+            bump_mtime(first)
+
+        summary = collector.generate_summary()
+
+        assert_matches_scan(collector, summary)
+        assert collector.generate_summary() == summary
+
+    def test_corrupt_checkpoint_ignored(self, collector):
+        expected = collector.generate_summary()
+        collector.store.path.write_bytes(b"not a pickle")
+
+        assert collector.generate_summary() == expected
+
+    def test_without_numpy(self, collector, monkeypatch):
+        monkeypatch.setattr(telemetry, "HAS_NUMPY", False)
+
+        fallback = TelemetryCollector(collector.base_dir)
+
+        assert fallback.store is None
+        assert fallback.generate_summary() == collector._summary_from_events(collector.load_events())
+
+
+def sketch_of(values) -> DurationSketch:
+    sketch = DurationSketch()
+    sketch.add(values)
+    return sketch
+
+
+class TestDurationSketch:
+    """Test the mergeable quantile sketch."""
+
+    QUANTILES = [0, 0.01, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 0.999, 1]
+
+    @pytest.mark.parametrize("distribution", ["lognormal", "uniform", "with_zeros", "constant"])
+    def test_accuracy_against_exact_sort(self, distribution):
+        rng = np.random.default_rng(0)
+        values = {
+            "lognormal": rng.lognormal(2.0, 1.5, 20000),
+            "uniform": rng.uniform(0.001, 600, 20000),
+            "with_zeros": np.where(rng.random(20000) < 0.3, 0.0, rng.exponential(5.0, 20000)),
+            "constant": np.full(100, 4.2),
+        }[distribution]
+        sketch = sketch_of(values)
+        exact = np.sort(values)
+
+        assert sketch.count == len(values)
+        for q in self.QUANTILES:
+            assert_within_accuracy(sketch.quantile(q), exact, q)
+
+    def test_merge_equals_sketch_of_union(self):
+        rng = np.random.default_rng(1)
+        a, b = rng.lognormal(1.0, 1.0, 500), rng.lognormal(3.0, 0.5, 700)
+        merged = sketch_of(a)
+        merged.merge(sketch_of(b))
+
+        assert merged.to_state() == sketch_of(np.concatenate([a, b])).to_state()
+
+    def test_bounded_buckets(self, monkeypatch):
+        monkeypatch.setattr(DurationSketch, "MAX_BUCKETS", 256)
+        values = np.geomspace(1e-6, 1e6, 5000)
+        sketch = sketch_of(values)
+
+        # Low buckets are folded; high quantiles keep their accuracy
+        assert len(sketch.buckets) == 256
+        for q in (0.9, 0.95, 0.99, 1):
+            assert_within_accuracy(sketch.quantile(q), values, q)
+
+    def test_empty_and_state_roundtrip(self):
+        assert DurationSketch().quantile(0.5) == 0.0
+
+        sketch = sketch_of([1.0, 2.0, 3.0])
+        restored = DurationSketch.from_state(sketch.to_state())
+        assert restored.to_state() == sketch.to_state()
+        assert restored.quantile(0.5) == sketch.quantile(0.5)
+
+
+class TestDurationPercentiles:
+    """Test windowed percentile queries."""
+
+    @pytest.mark.parametrize("window", [
+        {},
+        {"agent_name": "db-tuner"},
+        {"command_name": "/review"},
+        {"start": "2025-10-02"},
+        {"start": "2025-10-02", "end": "2025-10-02", "agent_name": "the-critic"},
+        {"start": "2025-10-03", "command_name": "/review"},
+    ])
+    def test_matches_exact_window(self, collector, monkeypatch, window):
+        write_day(collector, "2025-10-03", [
+            {"timestamp": 1759276800 + 2.5 * DAY, "event_type": "command_completed",
+             "command_name": "/review", "duration_seconds": 30.0 + i}
+            for i in range(20)
+        ])
+        approx = collector.duration_percentiles((10, 50, 95, 99), **window)
+        monkeypatch.setattr(telemetry, "HAS_NUMPY", False)
+        exact = TelemetryCollector(collector.base_dir)
+
+        durations = sorted(
+            e["duration_seconds"]
+            for day in ("2025-10-01", "2025-10-02", "2025-10-03")
+            if window.get("start", day) <= day <= window.get("end", day)
+            for e in exact.load_events(day)
+            if e.get("duration_seconds") is not None
+            and e.get("agent_name") == window.get("agent_name", e.get("agent_name"))
+            and e.get("command_name") == window.get("command_name", e.get("command_name"))
+        )
+        assert durations
+        assert exact.duration_percentiles((10, 50, 95, 99), **window) == {
+            p: exact._percentile(durations, p) for p in (10, 50, 95, 99)
+        }
+        for p, value in approx.items():
+            assert_within_accuracy(value, durations, p / 100)
+
+    def test_empty_window(self, collector):
+        assert collector.duration_percentiles((50,), agent_name="unknown") == {50: 0.0}
+        assert collector.duration_percentiles((50,), start="2030-01-01") == {50: 0.0}
+
+    def test_day_sketches_persisted(self, collector):
+        collector.generate_summary()
+        checkpoint = collector.store.load()
+
+        assert sorted(checkpoint.day_sketches) == ["2025-10-01", "2025-10-02", "2025-10-03"]
+        assert checkpoint.duration_sketch.count == sum(
+            DurationSketch.unpack_one(packed, "all").count for packed in checkpoint.day_sketches.values()
+        )
+
+    def test_batch_sketches_match_per_group_sketches(self):
+        columns = EventColumns.from_events(make_events(500, 1759276800, seed=3))
+        has_duration = ~np.isnan(columns.duration)
+        durations = columns.duration[has_duration]
+
+        sketches = DurationSketch.unpack(columns.duration_sketches())
+
+        assert sketches["all"].to_state() == sketch_of(durations).to_state()
+        agents = columns.agent[has_duration]
+        assert {name: sketch.to_state() for name, sketch in sketches["agents"].items()} == {
+            name: sketch_of(durations[agents == i]).to_state()
+            for i, name in enumerate(columns.agent_names) if (agents == i).any()
+        }
+        assert "/review" not in sketches["commands"]  # Commands carry no durations here
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
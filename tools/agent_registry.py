@@ -10,14 +10,21 @@ Design Goals:
 - Semantic search: Find agents by capability, not just keywords
 - Performance tracking: Integrate with telemetry for quality metrics
 - Extensible: Easy to add new index types and search strategies
+- Fast startup: Parsed agent files cached on disk, reparsed only when changed
+- Indexed search: n-gram substring lookup, BM25 keyword weights, LRU results
 """
 
+import hashlib
+import heapq
+import math
+import os
+import pickle
 import re
 import yaml
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple
-from dataclasses import dataclass, field
-from collections import defaultdict
+from typing import Any, Dict, List, Set, Optional, Tuple
+from dataclasses import dataclass, field, asdict
+from collections import OrderedDict, defaultdict
 
 
 @dataclass
@@ -37,6 +44,118 @@ class AgentMetadata:
     domains: Set[str] = field(default_factory=set)
 
 
+class NGramIndex:
+    """
+    Substring lookup through an n-gram inverted index.
+
+    find() intersects the postings of the query's two rarest n-grams and
+    verifies the survivors, so a lookup touches only entries sharing those
+    n-grams with the query instead of scanning all of them.
+    """
+
+    def __init__(self, n: int = 3):
+        """Initialize an empty index of n-grams"""
+        self.n = n
+        self.texts: Dict[str, str] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+
+    def add(self, key: str, text: str):
+        """Index text under key"""
+        self.texts[key] = text
+        for gram in {text[i:i + self.n] for i in range(len(text) - self.n + 1)}:
+            self.postings[gram].add(key)
+
+    def find(self, query: str) -> Set[str]:
+        """Keys whose text contains query"""
+        if len(query) < self.n:
+            # Too short for an n-gram; nearly everything matches anyway
+            return {key for key, text in self.texts.items() if query in text}
+
+        grams = {query[i:i + self.n] for i in range(len(query) - self.n + 1)}
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        # Verifying a candidate is one substring test; intersecting further
+        # postings costs more than it saves
+        candidates = postings[0] & postings[1] if len(postings) > 1 else postings[0]
+        return {key for key in candidates if query in self.texts[key]}
+
+
+# Cached parse of one agent file: (mtime_ns, size, AgentMetadata fields or None)
+CacheEntry = Tuple[int, int, Optional[Dict[str, Any]]]
+
+
+class RegistryIndexCache:
+    """
+    On-disk cache of parsed agent files under ``.ail/registry/``.
+
+    Stores each agent file's parsed metadata with the file's mtime and size,
+    so a registry only reparses files that changed. A versioned pickle of
+    plain data keyed by agents directory, replaced atomically on save.
+    """
+
+    VERSION = 1
+    FILENAME = "agent_index.pkl"
+
+    def __init__(self, agents_dir: Path, store_dir: Path):
+        """Initialize cache for an agents directory"""
+        self.agents_dir = Path(agents_dir).resolve()
+        self.store_dir = Path(store_dir)
+
+    @property
+    def path(self) -> Path:
+        """Path of the cache file"""
+        return self.store_dir / self.FILENAME
+
+    def exists(self) -> bool:
+        """Check if a stored index is available"""
+        return self.path.exists()
+
+    def load(self, fingerprint: str) -> Dict[str, CacheEntry]:
+        """
+        Load cached entries by file name.
+
+        Returns an empty dict if nothing is stored, or the cache is unreadable,
+        from another version or agents directory, or was derived with other
+        patterns (fingerprint).
+        """
+        if not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load registry cache {self.path}: {e}")
+            return {}
+
+        if (not isinstance(data, dict) or data.get('version') != self.VERSION
+                or data.get('agents_dir') != str(self.agents_dir)
+                or data.get('fingerprint') != fingerprint):
+            return {}
+        return data['entries']
+
+    def save(self, entries: Dict[str, CacheEntry], fingerprint: str):
+        """Persist entries atomically (write to a temp file, then rename)"""
+        data = {
+            'version': self.VERSION,
+            'agents_dir': str(self.agents_dir),
+            'fingerprint': fingerprint,
+            'entries': entries,
+        }
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write registry cache {self.path}: {e}")
+
+    def clear(self):
+        """Delete the stored index"""
+        if self.path.exists():
+            self.path.unlink()
+
+
 class AgentRegistry:
     """
     Fast agent discovery through multi-index lookup.
@@ -46,6 +165,15 @@ class AgentRegistry:
     - keyword_index: keyword -> [agents]
     - domain_index: domain -> [agents]
     - name_index: agent_name -> AgentMetadata
+
+    Parsed agent files are cached in a RegistryIndexCache (``cache_dir``,
+    or the repository's ``.ail/registry/`` for the default agents
+    directory) and validated by per-file mtime and size, so construction
+    only parses changed files.
+
+    search() uses n-gram indices over names and descriptions and BM25
+    keyword weights, built on the first search, plus an LRU of recent
+    results. Call refresh_search_index() after changing name_index.
     """
 
     # Domain classifications (can be extended)
@@ -74,14 +202,54 @@ class AgentRegistry:
         "migration": ["migrate", "upgrade", "transition", "legacy"],
     }
 
-    def __init__(self, agents_dir: Optional[Path] = None):
-        """Initialize agent registry"""
+    # Keyword extraction: words (alphanumeric + hyphens) longer than
+    # MIN_KEYWORD_LENGTH that are not stopwords
+    WORD_PATTERN = re.compile(r'\b[a-z0-9][a-z0-9-]*\b')
+    STOPWORDS = frozenset({
+        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+        "of", "with", "by", "from", "as", "is", "was", "are", "be", "this",
+        "that", "it", "use", "using", "when", "will", "can", "could", "should",
+    })
+    MIN_KEYWORD_LENGTH = 3
+
+    # Characters of the content body that derived fields are extracted from
+    PREVIEW_CHARS = 500
+
+    # BM25 parameters and scale of keyword weights (a rare keyword appearing
+    # once in an average-length agent scores KEYWORD_WEIGHT)
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    KEYWORD_WEIGHT = 2.0
+
+    # Recent search results kept
+    SEARCH_CACHE_SIZE = 256
+
+    def __init__(self, agents_dir: Optional[Path] = None,
+                 cache_dir: Optional[Path] = None, use_cache: bool = True):
+        """
+        Initialize agent registry.
+
+        Args:
+            agents_dir: Directory of agent markdown files (default: repository agents/)
+            cache_dir: Directory for the parsed index (default: the
+                repository's .ail/registry for the default agents_dir; other
+                agents directories are only cached when one is given)
+            use_cache: Set False to parse every agent file without a cache
+        """
         if agents_dir is None:
             # Default to repository agents directory
             script_dir = Path(__file__).parent.parent
             agents_dir = script_dir / "agents"
+            if cache_dir is None:
+                cache_dir = script_dir / ".ail" / "registry"
 
         self.agents_dir = Path(agents_dir)
+        self.cache: Optional[RegistryIndexCache] = None
+        if use_cache and cache_dir is not None:
+            self.cache = RegistryIndexCache(self.agents_dir, Path(cache_dir))
+
+        # Files parsed vs. taken from the cache by the last index build
+        self.cache_stats = {"parsed": 0, "cached": 0}
 
         # Initialize indices
         self.name_index: Dict[str, AgentMetadata] = {}
@@ -92,6 +260,12 @@ class AgentRegistry:
         # Performance metrics (from telemetry if available)
         self.performance_metrics: Dict[str, Dict] = {}
 
+        # Search indices (built on first search) and recent results
+        self._name_grams: Optional[NGramIndex] = None
+        self._description_grams: Optional[NGramIndex] = None
+        self._keyword_weights: Dict[str, List[Tuple[str, float]]] = {}
+        self._search_cache: OrderedDict = OrderedDict()
+
         # Build indices
         self._build_indices()
 
@@ -111,18 +285,13 @@ class AgentRegistry:
         # Combine and normalize
         text = (description + " " + content).lower()
 
-        # Remove common words
-        stopwords = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-                     "of", "with", "by", "from", "as", "is", "was", "are", "be", "this",
-                     "that", "it", "use", "using", "when", "will", "can", "could", "should"}
-
         # Extract words (alphanumeric + hyphens)
-        words = re.findall(r'\b[a-z0-9][a-z0-9-]*\b', text)
+        words = self.WORD_PATTERN.findall(text)
 
-        # Filter and collect important keywords
+        # Filter out short and common words
         keywords = set()
         for word in words:
-            if len(word) > 2 and word not in stopwords:
+            if len(word) >= self.MIN_KEYWORD_LENGTH and word not in self.STOPWORDS:
                 keywords.add(word)
 
         return keywords
@@ -159,9 +328,9 @@ class AgentRegistry:
             if not metadata_dict or 'name' not in metadata_dict:
                 return None
 
-            # Get content body (first 500 chars for analysis)
+            # Get content body (first PREVIEW_CHARS chars for analysis)
             content_body = parts[2].strip()
-            content_preview = content_body[:500]
+            content_preview = content_body[:self.PREVIEW_CHARS]
 
             # Create metadata object
             agent = AgentMetadata(
@@ -191,18 +360,55 @@ class AgentRegistry:
             print(f"Warning: Could not parse {filepath.name}: {e}")
             return None
 
+    def _cache_fingerprint(self) -> str:
+        """Fingerprint of the patterns and settings derived fields depend on"""
+        patterns = repr((
+            self.DOMAINS, self.CAPABILITY_PATTERNS, sorted(self.STOPWORDS),
+            self.WORD_PATTERN.pattern, self.MIN_KEYWORD_LENGTH, self.PREVIEW_CHARS,
+        ))
+        return hashlib.sha256(patterns.encode()).hexdigest()
+
     def _build_indices(self):
-        """Build all indices from agent files"""
+        """Build all indices from agent files, reparsing only changed ones"""
         # Find all agent markdown files
-        agent_files = sorted(self.agents_dir.glob("*.md"))
-
-        for filepath in agent_files:
+        try:
+            with os.scandir(self.agents_dir) as it:
+                agent_files = sorted(
+                    (entry for entry in it if entry.name.endswith(".md")),
+                    key=lambda entry: entry.name,
+                )
+        except OSError:
+            agent_files = []
+
+        fingerprint = self._cache_fingerprint()
+        cached = self.cache.load(fingerprint) if self.cache else {}
+        entries: Dict[str, CacheEntry] = {}
+
+        for file_entry in agent_files:
             # Skip template files
-            if "template" in filepath.name.lower():
+            if "template" in file_entry.name.lower():
                 continue
 
-            # Parse agent file
-            agent = self._parse_agent_file(filepath)
+            try:
+                if not file_entry.is_file():
+                    continue
+                stat = file_entry.stat()
+            except OSError:
+                continue
+
+            # Parse agent file unless the cached parse is still current
+            filepath = self.agents_dir / file_entry.name
+            entry = cached.get(file_entry.name)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                fields = entry[2]
+                agent = AgentMetadata(**{**fields, 'file_path': filepath}) if fields else None
+                self.cache_stats["cached"] += 1
+            else:
+                agent = self._parse_agent_file(filepath)
+                self.cache_stats["parsed"] += 1
+                entry = (stat.st_mtime_ns, stat.st_size, asdict(agent) if agent else None)
+            entries[file_entry.name] = entry
+
             if not agent:
                 continue
 
@@ -221,6 +427,9 @@ class AgentRegistry:
             for domain in agent.domains:
                 self.domain_index[domain].append(agent.name)
 
+        if self.cache and (self.cache_stats["parsed"] or entries.keys() != cached.keys()):
+            self.cache.save(entries, fingerprint)
+
     def find_by_capability(self, capability: str) -> List[str]:
         """Find agents by capability (O(1) lookup)"""
         return self.capability_index.get(capability.lower(), [])
@@ -233,6 +442,53 @@ class AgentRegistry:
         """Find agents by domain (O(1) lookup)"""
         return self.domain_index.get(domain.lower(), [])
 
+    def refresh_search_index(self):
+        """Drop the search indices and cached results (rebuilt on next search)"""
+        self._name_grams = None
+        self._description_grams = None
+        self._keyword_weights = {}
+        self._search_cache.clear()
+
+    def _build_search_index(self):
+        """Build n-gram indices and BM25 keyword weights from name_index"""
+        self._name_grams = NGramIndex()
+        self._description_grams = NGramIndex()
+        term_counts: Dict[str, Dict[str, int]] = {}
+
+        for agent_name, agent in self.name_index.items():
+            self._name_grams.add(agent_name, agent_name.lower())
+            self._description_grams.add(agent_name, agent.description.lower())
+
+            # Term frequencies over the text keywords were extracted from
+            text = (agent.description + " " + agent.content_preview).lower()
+            counts: Dict[str, int] = defaultdict(int)
+            for word in self.WORD_PATTERN.findall(text):
+                if word in agent.keywords:
+                    counts[word] += 1
+            term_counts[agent_name] = counts
+
+        n_agents = len(term_counts)
+        if not n_agents:
+            self._keyword_weights = {}
+            return
+        lengths = {name: sum(counts.values()) for name, counts in term_counts.items()}
+        avg_length = max(sum(lengths.values()) / n_agents, 1.0)
+        doc_freq: Dict[str, int] = defaultdict(int)
+        for counts in term_counts.values():
+            for word in counts:
+                doc_freq[word] += 1
+
+        max_idf = math.log(1 + (n_agents - 0.5) / 1.5)  # Keyword in one agent
+        k1, b = self.BM25_K1, self.BM25_B
+        weights: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+        for agent_name, counts in term_counts.items():
+            norm = k1 * (1 - b + b * lengths[agent_name] / avg_length)
+            for word, tf in counts.items():
+                idf = math.log(1 + (n_agents - doc_freq[word] + 0.5) / (doc_freq[word] + 0.5))
+                weight = (idf / max_idf) * tf * (k1 + 1) / (tf + norm)
+                weights[word].append((agent_name, self.KEYWORD_WEIGHT * weight))
+        self._keyword_weights = dict(weights)
+
     def search(self, query: str, max_results: int = 10) -> List[Tuple[str, float]]:
         """
         Semantic search across all indices.
@@ -240,7 +496,15 @@ class AgentRegistry:
         Returns list of (agent_name, relevance_score) tuples.
         """
         query_lower = query.lower()
-        query_words = set(re.findall(r'\b[a-z0-9][a-z0-9-]*\b', query_lower))
+        cache_key = (query_lower, max_results)
+        if cache_key in self._search_cache:
+            self._search_cache.move_to_end(cache_key)
+            return list(self._search_cache[cache_key])
+
+        if self._name_grams is None:
+            self._build_search_index()
+
+        query_words = set(self.WORD_PATTERN.findall(query_lower))
 
         # Scoring: agent_name -> score
         scores: Dict[str, float] = defaultdict(float)
@@ -250,9 +514,8 @@ class AgentRegistry:
             scores[query_lower] += 10.0
 
         # 2. Name substring match
-        for agent_name in self.name_index:
-            if query_lower in agent_name.lower():
-                scores[agent_name] += 8.0
+        for agent_name in self._name_grams.find(query_lower):
+            scores[agent_name] += 8.0
 
         # 3. Capability matches
         for capability in self.capability_index:
@@ -266,20 +529,22 @@ class AgentRegistry:
                 for agent_name in self.domain_index[domain]:
                     scores[agent_name] += 4.0
 
-        # 5. Keyword matches
+        # 5. Keyword matches, BM25-weighted
         for word in query_words:
-            if word in self.keyword_index:
-                for agent_name in self.keyword_index[word]:
-                    scores[agent_name] += 2.0
+            for agent_name, weight in self._keyword_weights.get(word, ()):
+                scores[agent_name] += weight
 
         # 6. Description substring match
-        for agent_name, agent in self.name_index.items():
-            if query_lower in agent.description.lower():
-                scores[agent_name] += 3.0
+        for agent_name in self._description_grams.find(query_lower):
+            scores[agent_name] += 3.0
+
+        # Top results by score (ties by name)
+        ranked = heapq.nsmallest(max_results, scores.items(), key=lambda x: (-x[1], x[0]))
 
-        # Sort by score and return top results
-        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        return ranked[:max_results]
+        self._search_cache[cache_key] = ranked
+        if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return list(ranked)
 
     def get_agent(self, agent_name: str) -> Optional[AgentMetadata]:
         """Get agent metadata by name (O(1) lookup)"""
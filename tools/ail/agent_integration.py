@@ -426,6 +426,40 @@ def get_context_from_input(
     )
 
 
+def get_contexts_from_inputs(
+    provider: ArchaeologyContextProvider,
+    agent_inputs: List[str],
+    repo_path: Optional[str] = None,
+) -> List[Optional[ArchaeologicalContext]]:
+    """
+    Batched get_context_from_input: answer many agent inputs in one provider call.
+
+    Cache misses are embedded and searched together (see
+    ArchaeologyContextProvider.get_contexts), so a review sweep costs one
+    model call instead of one per question.
+
+    Args:
+        provider: Initialized ArchaeologyContextProvider
+        agent_inputs: Agent natural language inputs
+        repo_path: Repository path for file validation (optional)
+
+    Returns:
+        ArchaeologicalContext per input, in input order; None where no file
+        path could be extracted
+    """
+    if repo_path is None:
+        repo_path = str(provider.repo_path)
+
+    queries = [create_agent_query(agent_input, repo_path, auto_detect=True)
+               for agent_input in agent_inputs]
+    answerable = [query for query in queries if query['file_path']]
+    contexts = iter(provider.get_contexts_sync(
+        [(query['file_path'], query['question']) for query in answerable]
+    ) if answerable else [])
+
+    return [next(contexts) if query['file_path'] else None for query in queries]
+
+
 def main():
     """CLI entry point for testing integration helpers."""
     import sys
@@ -466,7 +500,8 @@ def main():
 
         from .context_provider import ArchaeologyContextProvider
 
-        provider = ArchaeologyContextProvider(repo_path=repo_path)
+        # Repeated CLI runs warm-start from the last one's cache
+        provider = ArchaeologyContextProvider(repo_path=repo_path, persist_cache=True)
         context = get_context_from_input(provider, agent_input, repo_path)
 
         if context:
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Archaeological Intelligence Layer.
+
+Times AIL query paths against synthetic repositories so performance changes
+can be compared with real numbers. Uses the sentence-transformers model when
+installed; otherwise FAISS runs on the zero embeddings the generator degrades to.
+
+Usage:
+    python tools/ail/benchmarks.py batch --questions 100
+    python tools/ail/benchmarks.py retrieval --queries 500
+    python tools/ail/benchmarks.py embedding --commits 100000 --workers 1 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from code_archaeology import (
+    Commit,
+    EnrichedCommit,
+    FileCommitIndex,
+    GitArchaeologist,
+    RepositoryHistory,
+)
+from code_archaeology.benchmarks import build_synthetic_repo, SYNTHETIC_WORDS
+from tools.ail.context_provider import ArchaeologyContextProvider
+from tools.ail.embeddings import EmbeddingConfig, EmbeddingGenerator, HAS_SENTENCE_TRANSFORMERS
+from tools.ail.faiss_index import FAISSConfig, FAISSIndex
+
+
+REVIEW_TEMPLATES = [
+    "Why was the {0} logic changed?",
+    "Who introduced the {0} handling?",
+    "What problem did the {0} refactor solve?",
+    "When did {0} support start?",
+    "How has the {0} code evolved?",
+]
+
+
+def generate_review_sweep(n_questions: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """
+    Generate a review sweep: distinct (file_path, question) pairs.
+
+    Args:
+        n_questions: Number of questions
+        seed: Random seed for reproducible sweeps
+
+    Returns:
+        List of (file_path, question) tuples
+    """
+    import random
+
+    rng = random.Random(seed)
+    sweep = []
+    for i in range(n_questions):
+        word = rng.choice(SYNTHETIC_WORDS)
+        template = REVIEW_TEMPLATES[i % len(REVIEW_TEMPLATES)]
+        sweep.append((f"src/{word}/module_{i}.py", template.format(word)))
+    return sweep
+
+
+def _new_provider(repo_path: Path) -> ArchaeologyContextProvider:
+    """Create a provider with components and FAISS already initialized."""
+    provider = ArchaeologyContextProvider(repo_path=str(repo_path), max_query_time_s=60.0)
+    provider._initialize_components()
+    provider._initialize_faiss()
+    return provider
+
+
+def benchmark_batch(repo_path: Path, n_questions: int) -> Dict[str, Dict[str, float]]:
+    """
+    Compare a sweep of get_context_sync calls with one get_contexts_sync call.
+
+    Both runs start from cold caches on separately initialized providers.
+
+    Args:
+        repo_path: Repository to query
+        n_questions: Questions in the sweep
+
+    Returns:
+        Dictionary with timings for each mode
+    """
+    sweep = generate_review_sweep(n_questions)
+
+    sequential_provider = _new_provider(repo_path)
+    start = time.perf_counter()
+    sequential = [sequential_provider.get_context_sync(path, q) for path, q in sweep]
+    sequential_s = time.perf_counter() - start
+
+    batch_provider = _new_provider(repo_path)
+    start = time.perf_counter()
+    batched = batch_provider.get_contexts_sync(sweep)
+    batch_s = time.perf_counter() - start
+
+    assert [c.answer for c in batched] == [c.answer for c in sequential]
+
+    return {
+        'sequential': {'seconds': sequential_s, 'qps': n_questions / sequential_s},
+        'batch': {'seconds': batch_s, 'qps': n_questions / batch_s},
+        'speedup': sequential_s / max(batch_s, 1e-9),
+    }
+
+
+def _print_batch(results: Dict[str, Dict[str, float]], n_questions: int) -> None:
+    print("\n=== Batched Context Benchmark ===")
+    print(f"Embedding model: {'sentence-transformers' if HAS_SENTENCE_TRANSFORMERS else 'unavailable (zero vectors)'}")
+    print(f"get_context_sync x {n_questions}: {results['sequential']['seconds'] * 1000:.0f}ms "
+          f"({results['sequential']['qps']:.0f} questions/s)")
+    print(f"get_contexts_sync (1 batch):   {results['batch']['seconds'] * 1000:.0f}ms "
+          f"({results['batch']['qps']:.0f} questions/s)")
+    print(f"Speedup: {results['speedup']:.1f}x")
+
+
+def synthetic_commit_vectors(history: RepositoryHistory, dimension: int = 384,
+                             seed: int = 11
+                             ) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+    """
+    Give commits and files topic vectors standing in for sentence embeddings.
+
+    Each file gets its directory's topic plus its own direction; a commit is
+    the mean of its files plus one of the question-style topics (what its
+    message is about) and noise. Queries mix a weak file signal with a strong
+    question topic, which is what pulls unrelated commits into a global search.
+
+    Args:
+        history: Analyzed history of the synthetic repository
+        dimension: Embedding dimension
+        seed: Random seed
+
+    Returns:
+        (file path -> file vector, commit vectors aligned with history.commits,
+        question topic vectors)
+    """
+    rng = np.random.default_rng(seed)
+    directories = {path.rsplit('/', 1)[0] for path in history.file_history}
+    topics = {d: rng.standard_normal(dimension) for d in sorted(directories)}
+    question_topics = rng.standard_normal((len(REVIEW_TEMPLATES), dimension))
+
+    file_vectors = {
+        path: topics[path.rsplit('/', 1)[0]] + rng.standard_normal(dimension)
+        for path in sorted(history.file_history)
+    }
+    commit_vectors = np.empty((len(history.commits), dimension), dtype=np.float32)
+    for row, commit in enumerate(history.commits):
+        files = [file_vectors[p] for p in commit.files_changed if p in file_vectors]
+        base = np.mean(files, axis=0) if files else np.zeros(dimension)
+        commit_vectors[row] = (base + 1.5 * question_topics[rng.integers(len(question_topics))]
+                               + 0.8 * rng.standard_normal(dimension))
+    return file_vectors, commit_vectors, question_topics
+
+
+def benchmark_retrieval(repo_path: Path, n_queries: int, k: int = 20,
+                        seed: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Compare global FAISS search with file-scoped retrieval.
+
+    Measures per-query latency and file recall@10: the share of the top 10
+    hits (capped at the file's commit count) that actually touched the file,
+    following renames as the provider does.
+
+    Args:
+        repo_path: Repository to analyze
+        n_queries: Queries to run, one per randomly chosen file
+        k: Hits retrieved per query (the provider uses 20)
+        seed: Random seed for file and question choice
+
+    Returns:
+        Dictionary with latency and recall for each mode
+    """
+    history = GitArchaeologist(str(repo_path)).analyze_repo()
+    file_vectors, commit_vectors, question_topics = synthetic_commit_vectors(history)
+
+    index = FAISSIndex(FAISSConfig(auto_optimize=False))
+    index.add_documents(commit_vectors, [f"commit_{c.sha}" for c in history.commits])
+    sha_of = {idx: doc_id[len("commit_"):] for idx, doc_id in index.metadata.items()}
+
+    start = time.perf_counter()
+    file_index = FileCommitIndex(history)
+    build_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(seed)
+    paths = sorted(file_vectors)
+    queries = []
+    for _ in range(n_queries):
+        path = paths[rng.integers(len(paths))]
+        query = (0.6 * file_vectors[path] + 1.5 * question_topics[rng.integers(len(question_topics))]
+                 + 0.5 * rng.standard_normal(len(file_vectors[path]))).astype(np.float32)
+        queries.append((path, query))
+
+    min_count = ArchaeologyContextProvider.FILE_SCOPE_MIN_CANDIDATES
+
+    def scoped_search(path: str, query: np.ndarray) -> List[Tuple[int, float]]:
+        shas = file_index.candidate_shas(path, min_count)
+        candidates = [index.doc_to_idx[f"commit_{sha}"] for sha in shas
+                      if f"commit_{sha}" in index.doc_to_idx]
+        hits = index.search_ids_within(query, candidates, k=k)
+        if len(candidates) < min_count:
+            hits = ArchaeologyContextProvider._merge_hits(hits, index.search_ids(query, k=k), k)
+        return hits
+
+    modes = {
+        'global': lambda path, query: index.search_ids(query, k=k),
+        'file_scoped': scoped_search,
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for mode, search in modes.items():
+        latencies = []
+        recalls = []
+        for path, query in queries:
+            start = time.perf_counter()
+            hits = search(path, query)
+            latencies.append(time.perf_counter() - start)
+
+            touched = set(file_index.commits_for_file(path))
+            top = [sha_of[idx] for idx, _ in hits[:10]]
+            recalls.append(sum(sha in touched for sha in top) / min(10, len(touched)))
+
+        results[mode] = {
+            'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+            'p95_ms': float(np.percentile(latencies, 95)) * 1000,
+            'recall_at_10': float(np.mean(recalls)),
+        }
+
+    results['file_index'] = {'build_ms': build_s * 1000, 'files': len(file_index.file_commits)}
+    return results
+
+
+def _print_retrieval(results: Dict[str, Dict[str, float]], n_commits: int, n_queries: int) -> None:
+    print("\n=== File-Scoped Retrieval Benchmark ===")
+    print(f"{n_commits} commits, {n_queries} queries, synthetic topic embeddings")
+    print(f"File index: {results['file_index']['files']} files, "
+          f"built in {results['file_index']['build_ms']:.1f}ms")
+    print(f"{'Mode':<14}{'p50':>10}{'p95':>10}{'recall@10':>12}")
+    for mode in ('global', 'file_scoped'):
+        r = results[mode]
+        print(f"{mode:<14}{r['p50_ms']:>8.3f}ms{r['p95_ms']:>8.3f}ms{r['recall_at_10']:>12.2f}")
+
+
+def synthetic_enriched_commits(n_commits: int, seed: int = 5) -> List[EnrichedCommit]:
+    """
+    Generate commits in memory, shaped like build_synthetic_repo's history.
+
+    Args:
+        n_commits: Number of commits
+        seed: Random seed for reproducible commits
+
+    Returns:
+        List of EnrichedCommit without GitHub data
+    """
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    commits = []
+    for i in range(n_commits):
+        words = rng.sample(SYNTHETIC_WORDS, 4)
+        commit = Commit(
+            sha=f"{i:040x}",
+            message=f"{words[0]} {words[1]} in {words[2]}\n\nUpdate {words[3]} handling (#{i % 997 + 1}).",
+            author=f"Dev {i % 20}",
+            email=f"dev{i % 20}@example.com",
+            date=start + timedelta(minutes=i),
+            parents=[],
+            files_changed=[f"src/{rng.choice(SYNTHETIC_WORDS)}/module_{rng.randrange(500)}.py"
+                           for _ in range(3)],
+        )
+        commits.append(EnrichedCommit(commit=commit))
+    return commits
+
+
+def benchmark_embedding(n_commits: int, worker_counts: List[int]) -> Dict[int, Dict[str, float]]:
+    """
+    Time a cold embedding pass over a history for several worker counts.
+
+    Each run uses a fresh generator without a cache, so every commit is
+    encoded, and consumes embeddings block by block as the FAISS build does.
+
+    Args:
+        n_commits: Commits to embed
+        worker_counts: Encoding process counts to compare
+
+    Returns:
+        Worker count -> {'seconds', 'commits_per_s', 'speedup'}
+    """
+    commits = synthetic_enriched_commits(n_commits)
+    results: Dict[int, Dict[str, float]] = {}
+    for workers in worker_counts:
+        generator = EmbeddingGenerator(EmbeddingConfig(num_workers=workers))
+        start = time.perf_counter()
+        embedded = sum(len(doc_ids) for _, doc_ids in generator.iter_commit_embeddings(commits))
+        seconds = time.perf_counter() - start
+        assert embedded == n_commits
+        results[workers] = {'seconds': seconds, 'commits_per_s': n_commits / seconds}
+
+    baseline = results[worker_counts[0]]['seconds']
+    for timing in results.values():
+        timing['speedup'] = baseline / max(timing['seconds'], 1e-9)
+    return results
+
+
+def _print_embedding(results: Dict[int, Dict[str, float]], n_commits: int) -> None:
+    print("\n=== Cold Embedding Benchmark ===")
+    print(f"{n_commits} commits, {os.cpu_count()} CPUs")
+    for workers, timing in results.items():
+        print(f"{workers:>3} worker(s): {timing['seconds']:.1f}s "
+              f"({timing['commits_per_s']:.0f} commits/s, {timing['speedup']:.2f}x)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Archaeological Intelligence Layer benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    batch = subparsers.add_parser('batch', help='Batched vs per-question context retrieval')
+    batch.add_argument('--questions', type=int, default=100,
+                       help='Questions in the review sweep (default: 100)')
+    batch.add_argument('--commits', type=int, default=2000,
+                       help='Synthetic commits to generate (default: 2000)')
+
+    retrieval = subparsers.add_parser('retrieval',
+                                      help='Global vs file-scoped FAISS retrieval')
+    retrieval.add_argument('--queries', type=int, default=500,
+                           help='File questions to run (default: 500)')
+    retrieval.add_argument('--commits', type=int, default=5000,
+                           help='Synthetic commits to generate (default: 5000)')
+
+    embedding = subparsers.add_parser('embedding',
+                                      help='Cold commit embedding time by worker processes')
+    embedding.add_argument('--commits', type=int, default=100000,
+                           help='Synthetic commits to embed (default: 100000)')
+    embedding.add_argument('--workers', type=int, nargs='+',
+                           default=sorted({1, os.cpu_count() or 1}),
+                           help='Worker counts to compare, first is the baseline '
+                                '(default: 1 and CPU count)')
+
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    if args.benchmark == 'batch':
+        with tempfile.TemporaryDirectory() as tmpdir:
+            print(f"Building synthetic repository with {args.commits} commits...")
+            repo_path = build_synthetic_repo(Path(tmpdir) / 'repo', args.commits)
+            # Silence per-stage progress output from history analysis
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = benchmark_batch(repo_path, args.questions)
+            _print_batch(results, args.questions)
+
+    elif args.benchmark == 'retrieval':
+        with tempfile.TemporaryDirectory() as tmpdir:
+            print(f"Building synthetic repository with {args.commits} commits...")
+            repo_path = build_synthetic_repo(Path(tmpdir) / 'repo', args.commits)
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = benchmark_retrieval(repo_path, args.queries)
+            _print_retrieval(results, args.commits, args.queries)
+
+    elif args.benchmark == 'embedding':
+        if not HAS_SENTENCE_TRANSFORMERS:
+            print("The embedding benchmark needs sentence-transformers installed.")
+            return 1
+        _print_embedding(benchmark_embedding(args.commits, args.workers), args.commits)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Persistent snapshot of the two-tier context cache.
+
+The L1 (exact-match) and L2 (semantic) caches live in memory, so every CLI
+invocation would start cold. This module stores both tiers on disk so a new
+provider can warm-start from the previous process.
+
+Features:
+- One file with L1 entries, L2 entries and the L2 embedding matrix
+- Cached answers stored once and referenced from both tiers
+- Atomic writes (temp file + rename), safe against concurrent readers
+- Snapshot and entries tagged with the HEAD SHA they were computed against
+- Plain data only, independent of how the ``ail`` package was imported
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheSnapshot:
+    """Contents of a cache snapshot as plain data."""
+
+    head_sha: Optional[str]                  # HEAD when the snapshot was written
+    results: List[Dict[str, Any]]            # Cached answers (ArchaeologicalContext.to_dict())
+    l1_entries: List[Tuple[str, int]]        # (cache_key, result index), oldest first
+    l2_entries: List[Dict[str, Any]] = field(default_factory=list)  # Entry metadata + result index
+    l2_embeddings: Optional[Any] = None      # float32 matrix, one row per L2 entry
+    embedding_provider: str = ""             # "<provider class>:<dimension>" of the L2 rows
+
+    @property
+    def size(self) -> int:
+        """Number of cached answers in the snapshot."""
+        return len(self.results)
+
+
+class CacheSnapshotStore:
+    """
+    On-disk store for cache snapshots under ``.ail/cache/``.
+
+    Mirrors ``HistoryStore``: a versioned pickle keyed by repository path,
+    replaced atomically on every save.
+    """
+
+    VERSION = 1
+    FILENAME = "context_cache.pkl"
+
+    def __init__(self, repo_path: str, store_dir: Optional[Path] = None):
+        """
+        Initialize the snapshot store.
+
+        Args:
+            repo_path: Path to the git repository
+            store_dir: Directory for the snapshot (default: <repo>/.ail/cache)
+        """
+        self.repo_path = Path(repo_path).resolve()
+        self.store_dir = Path(store_dir) if store_dir else self.repo_path / '.ail' / 'cache'
+
+    @property
+    def path(self) -> Path:
+        """Path of the snapshot file."""
+        return self.store_dir / self.FILENAME
+
+    def exists(self) -> bool:
+        """Check if a snapshot is available."""
+        return self.path.exists()
+
+    def load(self) -> Optional[CacheSnapshot]:
+        """
+        Load the stored snapshot.
+
+        Returns:
+            CacheSnapshot, or None if nothing is stored or the file is
+            unreadable or from an incompatible version
+        """
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load cache snapshot {self.path}: {e}")
+            return None
+
+        if (not isinstance(data, dict) or data.get('version') != self.VERSION
+                or data.get('repo_path') != str(self.repo_path)):
+            return None
+
+        embeddings = data.get('l2_embeddings')
+        if embeddings is not None and HAS_NUMPY:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        return CacheSnapshot(
+            head_sha=data.get('head_sha'),
+            results=list(data['results']),
+            l1_entries=[tuple(entry) for entry in data['l1_entries']],
+            l2_entries=list(data.get('l2_entries', [])),
+            l2_embeddings=embeddings,
+            embedding_provider=data.get('embedding_provider', ""),
+        )
+
+    def save(self, snapshot: CacheSnapshot) -> None:
+        """
+        Persist a snapshot atomically (write to a temp file, then rename).
+
+        Args:
+            snapshot: CacheSnapshot to store
+        """
+        data = {
+            'version': self.VERSION,
+            'repo_path': str(self.repo_path),
+            'head_sha': snapshot.head_sha,
+            'results': snapshot.results,
+            'l1_entries': snapshot.l1_entries,
+            'l2_entries': snapshot.l2_entries,
+            'l2_embeddings': snapshot.l2_embeddings,
+            'embedding_provider': snapshot.embedding_provider,
+        }
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        # Unique temp name so concurrent writers never interleave in one file
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Delete the stored snapshot."""
+        if self.path.exists():
+            self.path.unlink()
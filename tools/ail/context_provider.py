@@ -9,14 +9,18 @@ intelligent caching and error handling.
 from __future__ import annotations
 
 import asyncio
+import atexit
 import hashlib
 import logging
+import subprocess
+import threading
 import time
+import weakref
 from collections import OrderedDict
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Callable, Set
 
 try:
     import numpy as np
@@ -31,6 +35,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from code_archaeology import (
     GitArchaeologist,
     GitHubArchaeologist,
+    HistoryStore,
+    FileCommitIndex,
+    BlameIndex,
     ContextSynthesizer,
     SearchableIndex,
     Answer,
@@ -42,7 +49,9 @@ from code_archaeology import (
 )
 
 # Import two-tier caching components
-from tools.ail.semantic_cache import SemanticCache
+from tools.ail.cache_snapshot import CacheSnapshot, CacheSnapshotStore
+from tools.ail.semantic_cache import SemanticCache, SemanticCacheEntry
+from tools.ail.single_flight import SingleFlight, SingleFlightStats
 from tools.ail.two_tier_cache import TwoTierCache
 
 # Import FAISS components (Sprint 2)
@@ -89,6 +98,11 @@ class ContextSource:
             url=citation.url,
         )
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> ContextSource:
+        """Create ContextSource from its ``asdict`` form."""
+        return cls(**data)
+
 
 @dataclass
 class ArchaeologicalContext:
@@ -104,6 +118,21 @@ class ArchaeologicalContext:
     timestamp: datetime = field(default_factory=datetime.now)
     cache_level: str = ""  # "L1", "L2", or "" for no cache
     similarity_score: float = 0.0  # 1.0 for L1, 0.85-1.0 for L2
+    head_sha: str = ""  # Repository HEAD the answer was computed against
+    line_range: Optional[Tuple[int, int]] = None  # Lines asked about (1-based, inclusive)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain data for the cache snapshot."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> ArchaeologicalContext:
+        """Create ArchaeologicalContext from ``to_dict`` output."""
+        data = dict(data)
+        data['sources'] = [ContextSource.from_dict(source) for source in data['sources']]
+        if data.get('line_range') is not None:
+            data['line_range'] = tuple(data['line_range'])
+        return cls(**data)
 
     @property
     def has_high_confidence(self) -> bool:
@@ -117,8 +146,11 @@ class ArchaeologicalContext:
 
     def to_markdown(self) -> str:
         """Format context as markdown for agent consumption."""
+        location = self.file_path
+        if self.line_range:
+            location += f" (lines {self.line_range[0]}-{self.line_range[1]})"
         lines = [
-            f"# Archaeological Context: {self.file_path}",
+            f"# Archaeological Context: {location}",
             f"**Question**: {self.question}",
             "",
             f"## Answer (Confidence: {self.confidence:.1%})",
@@ -229,6 +261,21 @@ class LRUCache:
             if len(self.cache) > self.max_size:
                 self.cache.popitem(last=False)
 
+    def remove_where(self, predicate: Callable[[ArchaeologicalContext], bool]) -> int:
+        """
+        Remove entries whose context matches a predicate.
+
+        Args:
+            predicate: Returns True for contexts to remove
+
+        Returns:
+            Number of entries removed
+        """
+        doomed = [key for key, value in self.cache.items() if predicate(value)]
+        for key in doomed:
+            del self.cache[key]
+        return len(doomed)
+
     def clear(self) -> None:
         """Clear all cache entries."""
         self.cache.clear()
@@ -255,6 +302,17 @@ class ArchaeologyContextProvider:
     - Comprehensive error handling
     """
 
+    # FAISS queries score commits touching the queried file (widened to its
+    # directories); below this many candidates the global search fills in
+    FILE_SCOPE_MIN_CANDIDATES = 10
+
+    # Commits owning the queried lines rank first, scored from this floor up
+    # to 1.0 by the share of the lines they own
+    LINE_OWNER_MIN_SCORE = 0.75
+
+    # Queries check whether HEAD moved (e.g. after a pull) at most this often
+    HEAD_CHECK_INTERVAL_S = 2.0
+
     def __init__(
         self,
         repo_path: str,
@@ -266,6 +324,11 @@ class ArchaeologyContextProvider:
         enable_semantic_cache: bool = True,
         semantic_cache_size: int = 500,
         similarity_threshold: float = 0.85,
+        history_dir: Optional[str] = None,
+        coalesce_near_duplicates: bool = False,
+        persist_cache: bool = False,
+        cache_dir: Optional[str] = None,
+        blame_dir: Optional[str] = None,
     ):
         """
         Initialize the archaeology context provider.
@@ -280,6 +343,17 @@ class ArchaeologyContextProvider:
             enable_semantic_cache: Enable L2 semantic cache (default: True)
             semantic_cache_size: Maximum L2 cache entries (default: 500)
             similarity_threshold: L2 similarity threshold (default: 0.85)
+            history_dir: Directory for the persisted history store
+                (default: <repo>/.ail/history)
+            coalesce_near_duplicates: Let concurrent misses join an in-flight
+                query about the same file that is L2-similar, not only an
+                identical one (default: False)
+            persist_cache: Warm-start L1/L2 from a snapshot of the previous
+                process and save one at exit (default: False)
+            cache_dir: Directory for the cache snapshot
+                (default: <repo>/.ail/cache)
+            blame_dir: Directory for the line blame index, built on the
+                first question about a line range (default: <repo>/.ail/blame)
         """
         self.repo_path = Path(repo_path).resolve()
         self.max_query_time_s = max_query_time_s
@@ -297,7 +371,7 @@ class ArchaeologyContextProvider:
             try:
                 # L2 cache will initialize its own embedding provider lazily
                 self.l2_cache = SemanticCache(
-                    embedding_provider=None,  # Will auto-initialize SimpleEmbeddingProvider
+                    embedding_provider=None,  # Hashing embeddings until a sentence model loads
                     max_entries=semantic_cache_size,
                     similarity_threshold=similarity_threshold,
                     ttl_seconds=3600,
@@ -314,6 +388,12 @@ class ArchaeologyContextProvider:
             l2_enabled=enable_semantic_cache,
         )
 
+        # Concurrent identical (optionally L2-similar) misses share one backend query
+        self._single_flight = SingleFlight(
+            semantic_cache=self.l2_cache,
+            near_duplicates=coalesce_near_duplicates,
+        )
+
         # Statistics (maintain backward compatibility)
         self.stats = CacheStats(max_cache_size=cache_size)
 
@@ -322,6 +402,11 @@ class ArchaeologyContextProvider:
         self._github_archaeologist: Optional[GitHubArchaeologist] = None
         self._context_synthesizer: Optional[ContextSynthesizer] = None
         self._searchable_index: Optional[SearchableIndex] = None
+        self._file_index: Optional[FileCommitIndex] = None
+        self._history_store = HistoryStore(str(self.repo_path), history_dir)
+        self._blame_index = BlameIndex(str(self.repo_path), blame_dir)
+        self._blame_loaded = False
+        self._blame_lock = threading.Lock()
 
         # FAISS components (Sprint 2)
         self._embedding_generator: Optional[EmbeddingGenerator] = None
@@ -338,8 +423,31 @@ class ArchaeologyContextProvider:
         self._initialized = False
         self._init_error: Optional[str] = None
 
+        # Cache snapshot: answers are tagged with the HEAD they were computed against
+        self._head_sha = self._read_head_sha()
+        self._history: Optional[RepositoryHistory] = None
+        self._snapshot_store: Optional[CacheSnapshotStore] = None
+        self._cache_dirty = False
+        self._cache_needs_validation = False  # Entries from another HEAD await invalidation
+        self._head_checked_at = time.monotonic()
+        if persist_cache:
+            self._snapshot_store = CacheSnapshotStore(str(self.repo_path), cache_dir)
+            self.load_cache_snapshot()
+            atexit.register(_save_cache_snapshot_at_exit, weakref.ref(self))
+
         logger.info(f"ArchaeologyContextProvider initialized for: {self.repo_path}")
 
+    def _read_head_sha(self) -> str:
+        """SHA of the repository HEAD, or "" if it cannot be resolved."""
+        try:
+            result = subprocess.run(
+                ['git', '-C', str(self.repo_path), 'rev-parse', '--verify', '-q', 'HEAD'],
+                capture_output=True, text=True, check=False,
+            )
+        except OSError:
+            return ""
+        return result.stdout.strip()
+
     def _initialize_components(self) -> bool:
         """
         Lazy initialization of CCA components.
@@ -356,63 +464,259 @@ class ArchaeologyContextProvider:
         try:
             logger.info("Initializing CCA components...")
 
-            # Initialize Git Archaeologist
+            # Load persisted history, read only commits added since last run
+            # and evict cached answers those commits affect
             logger.info("Loading git history...")
+            history = self._history
+            if history is None or self._read_head_sha() != self._head_sha:
+                history = self._refresh_history()
+            self._build_searchable_index(history)
+
+            self._initialized = True
+            logger.info("CCA components initialized successfully")
+            return True
+
+        except Exception as e:
+            self._init_error = str(e)
+            logger.error(f"Failed to initialize CCA components: {e}")
+            return False
+
+    def _refresh_history(self) -> RepositoryHistory:
+        """
+        Bring the repository history up to HEAD and invalidate affected cache entries.
+
+        Returns:
+            RepositoryHistory covering the current HEAD
+        """
+        if self._git_archaeologist is None:
             self._git_archaeologist = GitArchaeologist(str(self.repo_path))
 
-            # Analyze repository (limit to recent commits for performance)
-            history = self._git_archaeologist.analyze_repo(limit=500)
-            logger.info(f"Analyzed {history.total_commits} commits")
+        # Read HEAD first: history may then cover more, never less, than the tag
+        head_sha = self._read_head_sha()
+        history, new_commits = self._git_archaeologist.analyze_repo_incremental(
+            self._history_store
+        )
+        logger.info(f"Loaded {history.total_commits} commits ({len(new_commits)} new)")
+
+        self._history = history
+        self._head_sha = head_sha
+        self.invalidate_stale_entries(history)
+        return history
+
+    def _validate_cache(self) -> None:
+        """Check answers restored from another HEAD before serving them."""
+        try:
+            self._refresh_history()
+        except Exception as e:
+            logger.warning(f"Could not load history to validate cache, dropping older answers: {e}")
+            self._cache_needs_validation = False
+            self.cache.invalidate(lambda context: context.head_sha != self._head_sha)
+            self.stats.cache_size = self.l1_cache.size
+
+    def _check_head(self) -> None:
+        """Refresh history if HEAD moved, checking at most every HEAD_CHECK_INTERVAL_S."""
+        now = time.monotonic()
+        if now - self._head_checked_at < self.HEAD_CHECK_INTERVAL_S:
+            return
+        self._head_checked_at = now
+        if self._read_head_sha() == self._head_sha:
+            return
+        try:
+            evicted = self.refresh_history()
+            logger.info(f"HEAD moved to {self._head_sha[:8]}: evicted {evicted} cache entries")
+        except Exception as e:
+            logger.warning(f"History refresh after HEAD change failed: {e}")
+
+    def refresh_history(self) -> int:
+        """
+        Pick up commits added since the history was loaded (e.g. after a pull).
+
+        Queries call this themselves when they notice HEAD moved (checked at
+        most every HEAD_CHECK_INTERVAL_S); call it directly to pick up new
+        commits immediately.
+
+        Only cached answers about touched files, or citing commits in those
+        files' history, are evicted; the search index is rebuilt if
+        components were already initialized, and new commits are embedded
+        into the FAISS index if it was loaded.
+
+        Returns:
+            Number of cache entries evicted
+        """
+        if self._read_head_sha() == self._head_sha and not self._cache_needs_validation:
+            return 0
+
+        before = self.l1_cache.size + (self.l2_cache.size if self.l2_cache else 0)
+        history = self._refresh_history()
+        if self._initialized:
+            self._build_searchable_index(history)
+            if self._faiss_initialized:
+                self._sync_faiss_index()
+        after = self.l1_cache.size + (self.l2_cache.size if self.l2_cache else 0)
+        return before - after
+
+    def invalidate_stale_entries(self, history: RepositoryHistory) -> int:
+        """
+        Evict cached answers affected by commits since the HEAD they were computed at.
+
+        For each older HEAD tag, the commits reachable from the current HEAD
+        but not from it are read. An answer is evicted if its file was touched
+        by those commits, or it cites a commit in a touched file's history
+        (``history.file_history``) or a commit no longer in history. Other
+        answers are retagged with the current HEAD and stay cached.
+
+        Args:
+            history: RepositoryHistory at the current HEAD
+
+        Returns:
+            Number of cache entries (L1 + L2) evicted
+        """
+        self._cache_needs_validation = False
+        stale = [r for r in self.cache.results() if r.head_sha != self._head_sha]
+        if not stale:
+            return 0
+
+        known_shas = {c.sha for c in history.commits}
+        changes: Dict[str, Optional[Tuple[Set[str], Set[str]]]] = {}
+        for head_sha in {r.head_sha for r in stale}:
+            changes[head_sha] = self._changes_since(head_sha, history)
+
+        def affected(context: ArchaeologicalContext) -> bool:
+            change = changes[context.head_sha]
+            if change is None:
+                return True
+            touched_files, touched_shas = change
+            return (
+                self._repo_relative_path(context.file_path) in touched_files
+                or any(
+                    source.commit_sha in touched_shas or source.commit_sha not in known_shas
+                    for source in context.sources
+                )
+            )
+
+        doomed = {id(context) for context in stale if affected(context)}
+        l1_removed, l2_removed = self.cache.invalidate(lambda context: id(context) in doomed)
+        for context in stale:
+            context.head_sha = self._head_sha
+        self.stats.cache_size = self.l1_cache.size
+        self._cache_dirty = True
+
+        logger.info(f"Cache invalidation at HEAD {self._head_sha[:8]}: kept "
+                    f"{len(stale) - len(doomed)} of {len(stale)} older answers "
+                    f"(evicted {l1_removed} L1 / {l2_removed} L2 entries)")
+        return l1_removed + l2_removed
+
+    def _changes_since(
+        self,
+        head_sha: str,
+        history: RepositoryHistory,
+    ) -> Optional[Tuple[Set[str], Set[str]]]:
+        """
+        Files touched since ``head_sha`` and the commits in their history.
+
+        Returns:
+            (touched files, SHAs from those files' history), or None if
+            ``head_sha`` is unknown and everything computed at it is suspect
+        """
+        if not head_sha or self._git_archaeologist is None:
+            return None
+
+        try:
+            delta = list(self._git_archaeologist.iter_commits(
+                revisions=[self._head_sha or 'HEAD', '--not', head_sha]
+            ))
+        except subprocess.CalledProcessError:
+            return None
+
+        touched_files = {path for commit in delta for path in commit.files_changed}
+        touched_shas = {
+            commit.sha
+            for path in touched_files
+            for commit in history.file_history.get(path, [])
+        }
+        return touched_files, touched_shas
+
+    def _repo_relative_path(self, file_path: str) -> str:
+        """Normalize a queried path to the repo-relative POSIX form git reports."""
+        path = Path(file_path)
+        if path.is_absolute():
+            try:
+                path = path.resolve().relative_to(self.repo_path)
+            except ValueError:
+                return path.as_posix()
+        return path.as_posix()
 
-            # Initialize GitHub Archaeologist if configured
-            enriched_history = None
-            if self.github_owner and self.github_repo:
-                logger.info("Enriching with GitHub data...")
+    def _build_searchable_index(self, history: RepositoryHistory) -> None:
+        """
+        Enrich history (with GitHub data when configured) and index it for search.
+
+        Args:
+            history: Repository history to index
+        """
+        # Initialize GitHub Archaeologist if configured
+        enriched_history = None
+        if self.github_owner and self.github_repo:
+            logger.info("Enriching with GitHub data...")
+            if self._github_archaeologist is None:
+                # Kept across refreshes so fetched PRs and issues stay memoized
                 self._github_archaeologist = GitHubArchaeologist(
                     owner=self.github_owner,
                     repo=self.github_repo,
                     token=self.github_token,
+                    cache_dir=str(self.repo_path / '.ail' / 'github'),
                 )
-                enriched_history = self._github_archaeologist.enrich_history(
-                    history, limit=100  # Limit to avoid rate limits
-                )
-            else:
-                logger.info("GitHub integration not configured, using git data only")
-                # Create minimal enriched history without GitHub data
-                enriched_commits = [EnrichedCommit(commit=c) for c in history.commits]
-                enriched_history = EnrichedHistory(
-                    base_history=history,
-                    enriched_commits=enriched_commits,
-                    pull_requests={},
-                    issues={},
-                    commit_to_pr={},
-                )
-
-            # Initialize Context Synthesizer
-            logger.info("Building searchable index...")
-            self._context_synthesizer = ContextSynthesizer(
-                embedding_provider=SimpleEmbeddingProvider(max_features=512)
+            authenticated = bool(self._github_archaeologist.client.token)
+            enriched_history = self._github_archaeologist.enrich_history(
+                history, limit=100,  # Limit to avoid rate limits
+                # Batched GraphQL queries when authenticated (REST otherwise)
+                bulk=authenticated,
+                # Refreshing the commit -> PR map reads every PR closed since
+                # the last run, too many requests for the unauthenticated limit
+                commit_map=authenticated,
             )
-            self._searchable_index = self._context_synthesizer.build_searchable_index(
-                enriched_history
+        else:
+            logger.info("GitHub integration not configured, using git data only")
+            # Create minimal enriched history without GitHub data
+            enriched_commits = [EnrichedCommit(commit=c) for c in history.commits]
+            enriched_history = EnrichedHistory(
+                base_history=history,
+                enriched_commits=enriched_commits,
+                pull_requests={},
+                issues={},
+                commit_to_pr={},
             )
 
-            self._initialized = True
-            logger.info("CCA components initialized successfully")
-            return True
+        # Initialize Context Synthesizer
+        logger.info("Building searchable index...")
+        self._context_synthesizer = ContextSynthesizer(
+            embedding_provider=SimpleEmbeddingProvider(max_features=512)
+        )
+        self._searchable_index = self._context_synthesizer.build_searchable_index(
+            enriched_history
+        )
+        self._file_index = FileCommitIndex(history)
 
-        except Exception as e:
-            self._init_error = str(e)
-            logger.error(f"Failed to initialize CCA components: {e}")
-            return False
+    def _batch_query(self, item: Tuple) -> Tuple[str, str, Optional[Tuple[int, int]]]:
+        """Unpack a get_contexts item into (file_path, question, line_range)."""
+        file_path, question, *rest = item
+        line_range = rest[0] if rest else None
+        if line_range is not None:
+            line_range = self._check_line_range(line_range)
+        return file_path, question, line_range
 
-    def _generate_cache_key(self, file_path: str, question: str) -> str:
+    def _generate_cache_key(
+        self,
+        file_path: str,
+        question: str,
+        line_range: Optional[Tuple[int, int]] = None,
+    ) -> str:
         """
-        Generate cache key from file path and question.
+        Generate cache key from file path, question and line range.
 
         Args:
             file_path: File path being queried
             question: Natural language question
+            line_range: Lines being queried, if any
 
         Returns:
             Cache key (hash of normalized inputs)
@@ -423,12 +727,34 @@ class ArchaeologyContextProvider:
 
         # Generate hash
         key_input = f"{normalized_path}::{normalized_question}"
+        if line_range is not None:
+            key_input += f"::{line_range[0]}-{line_range[1]}"
         return hashlib.sha256(key_input.encode()).hexdigest()
 
+    @staticmethod
+    def _cache_scope(file_path: str, line_range: Optional[Tuple[int, int]]) -> str:
+        """
+        Name under which L2 and in-flight queries are grouped.
+
+        Questions about a line range only match others about the same lines.
+        """
+        if line_range is None:
+            return file_path
+        return f"{file_path}#L{line_range[0]}-L{line_range[1]}"
+
+    @staticmethod
+    def _check_line_range(line_range: Tuple[int, int]) -> Tuple[int, int]:
+        """Validate a (start, end) line range, 1-based and inclusive."""
+        start, end = (int(line) for line in line_range)
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid line range: {line_range}")
+        return start, end
+
     async def get_context(
         self,
         file_path: str,
         question: str,
+        line_range: Optional[Tuple[int, int]] = None,
     ) -> ArchaeologicalContext:
         """
         Get archaeological context for a file and question.
@@ -436,18 +762,29 @@ class ArchaeologyContextProvider:
         Args:
             file_path: Path to file (relative to repo root)
             question: Natural language question about the file
+            line_range: (start, end) lines the question is about, 1-based
+                and inclusive; the commits that last changed those lines
+                (per ``git blame`` at HEAD) are ranked first
 
         Returns:
             ArchaeologicalContext with answer and sources
         """
         start_time = time.time()
 
+        if line_range is not None:
+            line_range = self._check_line_range(line_range)
+
+        if self._cache_needs_validation:
+            self._validate_cache()
+        self._check_head()
+
         # Update stats
         self.stats.total_queries += 1
 
         # Check two-tier cache
-        cache_key = self._generate_cache_key(file_path, question)
-        cached_result = self.cache.get(file_path, question, cache_key)
+        cache_key = self._generate_cache_key(file_path, question, line_range)
+        scope = self._cache_scope(file_path, line_range)
+        cached_result = self.cache.get(scope, question, cache_key)
 
         if cached_result:
             result, cache_level, similarity = cached_result
@@ -468,6 +805,49 @@ class ArchaeologyContextProvider:
         self.stats.misses += 1
         logger.debug(f"Cache miss for: {file_path}")
 
+        # Wait for an in-flight query for the same question instead of repeating it
+        flight, similarity = self._single_flight.join(cache_key, scope, question)
+        if flight is not None:
+            logger.debug(f"Joined in-flight query for: {file_path} (similarity={similarity:.3f})")
+            context = await asyncio.wrap_future(flight)
+            return replace(
+                context,
+                question=question,
+                query_time_ms=(time.time() - start_time) * 1000,
+                similarity_score=similarity,
+            )
+
+        try:
+            context = await self._fetch_context(
+                file_path, question, cache_key, start_time, line_range
+            )
+        except BaseException as e:
+            self._single_flight.fail(cache_key, e)
+            raise
+        self._single_flight.complete(cache_key, context)
+        return context
+
+    async def _fetch_context(
+        self,
+        file_path: str,
+        question: str,
+        cache_key: str,
+        start_time: float,
+        line_range: Optional[Tuple[int, int]] = None,
+    ) -> ArchaeologicalContext:
+        """
+        Run the backend query for a cache miss and cache the result.
+
+        Args:
+            file_path: Path to file (relative to repo root)
+            question: Natural language question about the file
+            cache_key: Cache key for the question
+            start_time: time.time() when the request started
+            line_range: Lines the question is about, if any
+
+        Returns:
+            ArchaeologicalContext with answer and sources
+        """
         # Initialize components if needed
         if not self._initialize_components():
             # Return error context
@@ -483,10 +863,15 @@ class ArchaeologyContextProvider:
             )
             return error_context
 
+        if line_range is not None:
+            # Built or refreshed outside the query timeout, like the history
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self._ensure_blame_index)
+
         try:
             # Query with timeout
             answer = await asyncio.wait_for(
-                self._query_archaeology(file_path, question),
+                self._query_archaeology(file_path, question, line_range),
                 timeout=self.max_query_time_s,
             )
 
@@ -500,10 +885,13 @@ class ArchaeologyContextProvider:
                 confidence=answer.confidence,
                 cached=False,
                 query_time_ms=query_time_ms,
+                head_sha=self._head_sha,
+                line_range=line_range,
             )
 
             # Cache result in both tiers
-            self.cache.put(file_path, question, cache_key, context)
+            self.cache.put(self._cache_scope(file_path, line_range), question, cache_key, context)
+            self._cache_dirty = True
             self.stats.cache_size = self.l1_cache.size
 
             # Update average query time
@@ -543,25 +931,103 @@ class ArchaeologyContextProvider:
             )
             return error_context
 
-    async def _query_archaeology(self, file_path: str, question: str) -> Answer:
+    async def _query_archaeology(
+        self,
+        file_path: str,
+        question: str,
+        line_range: Optional[Tuple[int, int]] = None,
+    ) -> Answer:
         """
         Query the archaeology system with FAISS enhancement.
 
         Args:
             file_path: File path to query
             question: Natural language question
+            line_range: Lines the question is about, if any
 
         Returns:
             Answer from CCA system
         """
+        line_owners = self._line_owners(file_path, line_range) if line_range else []
+
         # Try FAISS first if enabled
         if self._faiss_enabled and self._initialize_faiss():
             try:
-                return await self._query_with_faiss(file_path, question)
+                return await self._query_with_faiss(file_path, question, line_owners)
             except Exception as e:
                 logger.warning(f"FAISS query failed, falling back to original search: {e}")
 
+        # The commits owning the lines answer the question without a history search
+        if line_owners:
+            return self._synthesize_answer_from_commits(
+                question, line_owners, file_path, reasoning="Line blame"
+            )
+
         # Fallback to original search
+        return await self._query_without_faiss(file_path, question)
+
+    def _ensure_blame_index(self) -> None:
+        """Load the line blame index and bring it up to the history HEAD."""
+        with self._blame_lock:
+            index = self._blame_index
+            try:
+                if not self._blame_loaded:
+                    index.load()
+                    self._blame_loaded = True
+                if index.head_sha == self._head_sha:
+                    return
+                start = time.time()
+                blamed = index.refresh()
+                if blamed:
+                    index.save()
+                logger.info(f"Blame index at HEAD {str(index.head_sha)[:8]}: blamed {blamed} "
+                            f"files in {(time.time() - start) * 1000:.0f}ms")
+            except Exception as e:
+                logger.warning(f"Blame index refresh failed: {e}")
+
+    def _line_owners(
+        self,
+        file_path: str,
+        line_range: Tuple[int, int],
+    ) -> List[Tuple[EnrichedCommit, float]]:
+        """
+        Get the commits that last changed a range of lines, as scored hits.
+
+        Args:
+            file_path: File path being queried
+            line_range: (start, end) lines, 1-based and inclusive
+
+        Returns:
+            List of (EnrichedCommit, score) tuples, most lines owned first
+        """
+        enriched_history = getattr(self._searchable_index, 'enriched_history', None)
+        if enriched_history is None:
+            return []
+
+        owners = self._blame_index.commits_for_lines(
+            self._repo_relative_path(file_path), *line_range
+        )
+        total = sum(lines for _, lines in owners)
+        hits = []
+        for sha, lines in owners:
+            commit = enriched_history.get_commit(sha)
+            if commit is not None:
+                share = lines / total
+                hits.append((commit, self.LINE_OWNER_MIN_SCORE
+                             + (1.0 - self.LINE_OWNER_MIN_SCORE) * share))
+        return hits
+
+    async def _query_without_faiss(self, file_path: str, question: str) -> Answer:
+        """
+        Query the original (non-FAISS) context synthesizer search.
+
+        Args:
+            file_path: File path to query
+            question: Natural language question
+
+        Returns:
+            Answer from CCA system
+        """
         # Enhance question with file context
         enhanced_question = f"For file '{file_path}': {question}"
 
@@ -599,6 +1065,10 @@ class ArchaeologyContextProvider:
             )
             self._embedding_generator = EmbeddingGenerator(embed_config)
 
+            # Share the sentence model with the L2 cache (paraphrase-aware)
+            if self.l2_cache and self.l2_cache.enabled and self._embedding_generator.is_loaded:
+                self.l2_cache.set_embedding_provider(self._embedding_generator)
+
             # Initialize FAISS index
             faiss_config = FAISSConfig(
                 index_path=self.repo_path / '.ail' / 'faiss' / 'index.bin',
@@ -613,6 +1083,9 @@ class ArchaeologyContextProvider:
             else:
                 self._build_faiss_index()
 
+            # A stored index may predate commits read since it was saved
+            self._sync_faiss_index()
+
             self._faiss_initialized = True
             return True
 
@@ -636,17 +1109,11 @@ class ArchaeologyContextProvider:
             logger.warning("No enriched history available")
             return
 
-        # Process commits in batches
-        batch_size = 100
-        enriched_commits = enriched_history.enriched_commits
-
-        for i in range(0, len(enriched_commits), batch_size):
-            batch = enriched_commits[i:i+batch_size]
-
-            # Generate embeddings
-            embeddings, doc_ids = self._embedding_generator.embed_commits(batch)
-
-            # Add to FAISS index
+        # Embeddings stream back in commit order (encoded by worker processes
+        # for large histories) and are indexed while the rest are encoded
+        for embeddings, doc_ids in self._embedding_generator.iter_commit_embeddings(
+            enriched_history.enriched_commits
+        ):
             self._faiss_index.add_documents(embeddings, doc_ids)
 
         # Save index and cache
@@ -655,13 +1122,49 @@ class ArchaeologyContextProvider:
 
         logger.info(f"Built FAISS index with {self._faiss_index.size} documents")
 
-    async def _query_with_faiss(self, file_path: str, question: str) -> Answer:
+    def _sync_faiss_index(self) -> None:
+        """Embed commits missing from the FAISS index and re-link ids to the current history."""
+        enriched_history = getattr(self._searchable_index, 'enriched_history', None)
+        if enriched_history is None or self._faiss_index is None:
+            return
+
+        doc_to_idx = self._faiss_index.doc_to_idx
+        new_commits = [
+            commit for commit in enriched_history.enriched_commits
+            if f"commit_{commit.commit.sha}" not in doc_to_idx
+        ]
+        # Without a model they would be stored as zero vectors, never re-embedded
+        if new_commits and self._embedding_generator.is_loaded:
+            for embeddings, doc_ids in self._embedding_generator.iter_commit_embeddings(new_commits):
+                self._faiss_index.add_documents(embeddings, doc_ids)
+            self._faiss_index.save()
+            self._embedding_generator.save_cache()
+            logger.info(f"Added {len(new_commits)} new commits to FAISS index")
+
+        self._link_faiss_ids()
+
+    def _link_faiss_ids(self) -> None:
+        """Map FAISS integer ids to enriched commits for constant-time hit resolution."""
+        enriched_history = getattr(self._searchable_index, 'enriched_history', None)
+        if enriched_history is None or self._faiss_index is None:
+            return
+
+        linked = enriched_history.link_faiss_ids(self._faiss_index.metadata)
+        logger.debug(f"Linked {linked} FAISS ids to commits")
+
+    async def _query_with_faiss(
+        self,
+        file_path: str,
+        question: str,
+        line_owners: Optional[List[Tuple[EnrichedCommit, float]]] = None,
+    ) -> Answer:
         """
         Query using FAISS semantic search.
 
         Args:
             file_path: File path being queried
             question: Natural language question
+            line_owners: Commits owning the queried lines, ranked first
 
         Returns:
             Answer synthesized from relevant commits
@@ -670,29 +1173,143 @@ class ArchaeologyContextProvider:
         query_text = f"File: {file_path} Question: {question}"
         query_embedding = self._embedding_generator.embed_query(query_text)
 
-        # Search with FAISS
-        results = self._faiss_index.search(query_embedding, k=20)
+        # Search with FAISS, scoped to commits touching the file when indexed
+        candidates = self._file_candidate_ids(file_path)
+        if candidates is None:
+            results = self._faiss_index.search_ids(query_embedding, k=20)
+        else:
+            results = self._faiss_index.search_ids_within(query_embedding, candidates, k=20)
+            if len(candidates) < self.FILE_SCOPE_MIN_CANDIDATES:
+                results = self._merge_hits(
+                    results, self._faiss_index.search_ids(query_embedding, k=20), k=20
+                )
 
-        if not results:
+        if not results and not line_owners:
             # Fallback to original search if no FAISS results
             raise ValueError("No FAISS results found")
 
+        return self._answer_from_faiss_hits(file_path, question, results, line_owners)
+
+    async def _query_with_faiss_batch(
+        self,
+        items: List[Tuple[str, str]],
+        line_owners: Optional[List[List[Tuple[EnrichedCommit, float]]]] = None,
+    ) -> List[Optional[Answer]]:
+        """
+        Query FAISS for several questions with one embedding call and one search.
+
+        Args:
+            items: List of (file_path, question) tuples
+            line_owners: Per item, commits owning the queried lines, ranked first
+
+        Returns:
+            List aligned with ``items``; None where FAISS found nothing
+        """
+        query_texts = [f"File: {file_path} Question: {question}" for file_path, question in items]
+        query_embeddings = self._embedding_generator.embed_queries(query_texts)
+
+        candidate_ids = [self._file_candidate_ids(file_path) for file_path, _ in items]
+
+        # One global search for the queries without enough file-scoped candidates
+        global_rows = [
+            row for row, candidates in enumerate(candidate_ids)
+            if candidates is None or len(candidates) < self.FILE_SCOPE_MIN_CANDIDATES
+        ]
+        global_hits: Dict[int, List[Tuple[int, float]]] = {}
+        if global_rows:
+            batch_results = self._faiss_index.search_batch(
+                np.asarray(query_embeddings)[global_rows], k=20
+            )
+            for row, results in zip(global_rows, batch_results):
+                global_hits[row] = [
+                    (self._faiss_index.doc_to_idx[doc_id], score)
+                    for doc_id, score in results
+                    if doc_id in self._faiss_index.doc_to_idx
+                ]
+
+        answers: List[Optional[Answer]] = []
+        for row, (file_path, question) in enumerate(items):
+            candidates = candidate_ids[row]
+            if candidates is None:
+                hits = global_hits[row]
+            else:
+                hits = self._faiss_index.search_ids_within(query_embeddings[row], candidates, k=20)
+                if row in global_hits:
+                    hits = self._merge_hits(hits, global_hits[row], k=20)
+            owners = line_owners[row] if line_owners else []
+            answers.append(
+                self._answer_from_faiss_hits(file_path, question, hits, owners)
+                if hits or owners else None
+            )
+
+        return answers
+
+    def _file_candidate_ids(self, file_path: str) -> Optional[List[int]]:
+        """
+        Get FAISS ids of the commits that touched a file or its directories.
+
+        Args:
+            file_path: File path being queried
+
+        Returns:
+            Candidate FAISS ids, or None when no file index has been built
+        """
+        if self._file_index is None:
+            return None
+
+        doc_to_idx = self._faiss_index.doc_to_idx
+        shas = self._file_index.candidate_shas(
+            self._repo_relative_path(file_path), self.FILE_SCOPE_MIN_CANDIDATES
+        )
+        return [doc_to_idx[f"commit_{sha}"] for sha in shas if f"commit_{sha}" in doc_to_idx]
+
+    @staticmethod
+    def _merge_hits(
+        scoped: List[Tuple[int, float]],
+        global_hits: List[Tuple[int, float]],
+        k: int
+    ) -> List[Tuple[int, float]]:
+        """Append global hits after file-scoped ones, without duplicates, up to k."""
+        merged = dict(scoped)
+        for faiss_id, score in global_hits:
+            merged.setdefault(faiss_id, score)
+        return list(merged.items())[:k]
+
+    def _answer_from_faiss_hits(
+        self,
+        file_path: str,
+        question: str,
+        results: List[Tuple[int, float]],
+        line_owners: Optional[List[Tuple[EnrichedCommit, float]]] = None,
+    ) -> Answer:
+        """
+        Synthesize an answer from (faiss_id, score) search hits.
+
+        Args:
+            file_path: File path being queried
+            question: Natural language question
+            results: FAISS hits, best first
+            line_owners: Commits owning the queried lines, placed before
+                the search hits
+
+        Returns:
+            Answer synthesized from relevant commits
+        """
         # Retrieve full commit data for top results
         enriched_history = getattr(self._searchable_index, 'enriched_history', None)
         if not enriched_history:
             raise ValueError("No enriched history available")
 
-        relevant_commits = []
-        for doc_id, score in results[:10]:
-            # Extract commit SHA from document ID
-            if doc_id.startswith("commit_"):
-                commit_sha = doc_id.replace("commit_", "")
-
-                # Find commit in enriched history
-                for commit in enriched_history.enriched_commits:
-                    if commit.commit.sha == commit_sha:
-                        relevant_commits.append((commit, score))
-                        break
+        relevant_commits = list(line_owners or [])[:10]
+        seen = {commit.commit.sha for commit, _ in relevant_commits}
+        for faiss_id, score in results[:10]:
+            if len(relevant_commits) >= 10:
+                break
+            # Constant-time lookup from FAISS id to commit
+            commit = enriched_history.get_commit_by_faiss_id(faiss_id)
+            if commit is not None and commit.commit.sha not in seen:
+                seen.add(commit.commit.sha)
+                relevant_commits.append((commit, score))
 
         # Synthesize answer from relevant commits
         answer = self._synthesize_answer_from_commits(
@@ -705,7 +1322,8 @@ class ArchaeologyContextProvider:
         self,
         question: str,
         relevant_commits: List[Tuple[EnrichedCommit, float]],
-        file_path: str
+        file_path: str,
+        reasoning: str = "FAISS semantic search",
     ) -> Answer:
         """
         Synthesize answer from FAISS-retrieved commits.
@@ -714,6 +1332,7 @@ class ArchaeologyContextProvider:
             question: Original question
             relevant_commits: List of (EnrichedCommit, score) tuples
             file_path: File being queried
+            reasoning: How the commits were found
 
         Returns:
             Synthesized answer
@@ -757,16 +1376,22 @@ class ArchaeologyContextProvider:
             answer=answer_text,
             citations=citations,
             confidence=confidence,
-            reasoning="FAISS semantic search",
+            reasoning=reasoning,
         )
 
-    def get_context_sync(self, file_path: str, question: str) -> ArchaeologicalContext:
+    def get_context_sync(
+        self,
+        file_path: str,
+        question: str,
+        line_range: Optional[Tuple[int, int]] = None,
+    ) -> ArchaeologicalContext:
         """
         Synchronous version of get_context.
 
         Args:
             file_path: Path to file (relative to repo root)
             question: Natural language question about the file
+            line_range: (start, end) lines the question is about, if any
 
         Returns:
             ArchaeologicalContext with answer and sources
@@ -779,14 +1404,365 @@ class ArchaeologyContextProvider:
             asyncio.set_event_loop(loop)
 
         # Run async function
-        return loop.run_until_complete(self.get_context(file_path, question))
+        return loop.run_until_complete(self.get_context(file_path, question, line_range))
+
+    async def get_contexts(
+        self,
+        batch: List[Tuple],
+    ) -> List[ArchaeologicalContext]:
+        """
+        Get archaeological context for many (file_path, question) pairs.
+
+        The whole batch is checked against L1/L2 first (L2 embeds all L1
+        misses in one call). Remaining misses are embedded in a single model
+        call and searched with a single FAISS batch search; only questions
+        FAISS cannot answer fall back to per-question search. Duplicate
+        questions in a batch are answered once, and misses already being
+        answered by a concurrent call wait for that answer.
+
+        Args:
+            batch: List of (file_path, question) or (file_path, question,
+                line_range) tuples; line_range is as for get_context
+
+        Returns:
+            ArchaeologicalContext per input, in input order
+        """
+        start_time = time.time()
+
+        queries = [self._batch_query(item) for item in batch]
+
+        if self._cache_needs_validation:
+            self._validate_cache()
+        self._check_head()
+
+        cache_keys = [self._generate_cache_key(*query) for query in queries]
+        scopes = [self._cache_scope(file_path, line_range) for file_path, _, line_range in queries]
+        cached_results = self.cache.get_batch([
+            (scope, question, cache_key)
+            for scope, (_, question, _), cache_key in zip(scopes, queries, cache_keys)
+        ])
+
+        contexts: List[Optional[ArchaeologicalContext]] = [None] * len(batch)
+        misses: Dict[str, List[int]] = {}  # cache_key -> positions asking it
+
+        for position, (cache_key, cached_result) in enumerate(zip(cache_keys, cached_results)):
+            self.stats.total_queries += 1
+
+            if cached_result:
+                result, cache_level, similarity = cached_result
+                self.stats.hits += 1
+                result.cached = True
+                result.query_time_ms = (time.time() - start_time) * 1000
+                result.cache_level = cache_level
+                result.similarity_score = similarity
+                contexts[position] = result
+            else:
+                self.stats.misses += 1
+                misses.setdefault(cache_key, []).append(position)
+
+        self.stats.cache_size = self.l1_cache.size
+        if not misses:
+            return contexts
+
+        # Misses in flight elsewhere are awaited; the rest are queried here
+        followers: Dict[str, Tuple[Any, float]] = {}
+        for cache_key, positions in misses.items():
+            question = queries[positions[0]][1]
+            flight, similarity = self._single_flight.join(cache_key, scopes[positions[0]], question)
+            if flight is not None:
+                followers[cache_key] = (flight, similarity)
+        leaders = {key: positions for key, positions in misses.items() if key not in followers}
+
+        items = [queries[positions[0]] for positions in leaders.values()]
+        logger.debug(f"Batch: {len(batch) - sum(map(len, misses.values()))} cache hits, "
+                     f"{len(items)} unique misses, {len(followers)} joined in flight")
+
+        try:
+            if not items:
+                answers: List[Any] = []
+            elif not self._initialize_components():
+                answers = [
+                    RuntimeError(f"Archaeological context unavailable: {self._init_error}")
+                ] * len(items)
+            else:
+                line_ranges = [line_range for _, _, line_range in items]
+                if any(line_ranges):
+                    # Built or refreshed outside the query timeout, like the history
+                    loop = asyncio.get_event_loop()
+                    await loop.run_in_executor(None, self._ensure_blame_index)
+                answers = await self._query_archaeology_batch(
+                    [(file_path, question) for file_path, question, _ in items], line_ranges
+                )
+        except BaseException as e:
+            for cache_key in leaders:
+                self._single_flight.fail(cache_key, e)
+            raise
+
+        query_time_ms = (time.time() - start_time) * 1000
+        for (cache_key, positions), (file_path, question, line_range), answer in zip(
+            leaders.items(), items, answers
+        ):
+            if not isinstance(answer, BaseException):
+                context = ArchaeologicalContext(
+                    file_path=file_path,
+                    question=question,
+                    answer=answer.answer,
+                    sources=[ContextSource.from_citation(c) for c in answer.citations],
+                    confidence=answer.confidence,
+                    cached=False,
+                    query_time_ms=query_time_ms,
+                    head_sha=self._head_sha,
+                    line_range=line_range,
+                )
+                self.cache.put(self._cache_scope(file_path, line_range), question, cache_key, context)
+                self._cache_dirty = True
+            else:
+                if isinstance(answer, asyncio.TimeoutError):
+                    message = (f"Query timeout after {self.max_query_time_s}s. "
+                               f"Try a more specific question.")
+                elif isinstance(answer, RuntimeError):
+                    message = str(answer)
+                else:
+                    message = f"Error retrieving context: {answer}"
+                context = ArchaeologicalContext(
+                    file_path=file_path,
+                    question=question,
+                    answer=message,
+                    sources=[],
+                    confidence=0.0,
+                    cached=False,
+                    query_time_ms=query_time_ms,
+                )
+
+            self._single_flight.complete(cache_key, context)
+            for position in positions:
+                contexts[position] = context
+
+        for cache_key, (flight, similarity) in followers.items():
+            context = await asyncio.wrap_future(flight)
+            for position in misses[cache_key]:
+                question = queries[position][1]
+                contexts[position] = replace(
+                    context,
+                    question=question,
+                    query_time_ms=(time.time() - start_time) * 1000,
+                    similarity_score=similarity,
+                )
+
+        query_time_ms = (time.time() - start_time) * 1000
+        self.stats.cache_size = self.l1_cache.size
+        total_time = self.stats.avg_query_time_ms * (self.stats.total_queries - len(batch))
+        self.stats.avg_query_time_ms = (
+            (total_time + query_time_ms * len(batch)) / self.stats.total_queries
+        )
+
+        logger.info(f"Context retrieved for {len(batch)} questions in {query_time_ms:.0f}ms")
+        return contexts
+
+    async def _query_archaeology_batch(
+        self,
+        items: List[Tuple[str, str]],
+        line_ranges: Optional[List[Optional[Tuple[int, int]]]] = None,
+    ) -> List[Any]:
+        """
+        Answer several cache-missed questions.
+
+        Args:
+            items: List of (file_path, question) tuples
+            line_ranges: Lines each question is about (None entries for
+                whole-file questions)
+
+        Returns:
+            List aligned with ``items`` of Answer objects, or the exception
+            raised for that question
+        """
+        answers: List[Any] = [None] * len(items)
+        line_owners = [
+            self._line_owners(file_path, line_range) if line_range else []
+            for (file_path, _), line_range in zip(items, line_ranges or [None] * len(items))
+        ]
+
+        if self._faiss_enabled and self._initialize_faiss():
+            try:
+                answers = await asyncio.wait_for(
+                    self._query_with_faiss_batch(items, line_owners),
+                    timeout=self.max_query_time_s,
+                )
+            except Exception as e:
+                logger.warning(f"Batched FAISS query failed, falling back to original search: {e}")
+
+        # Per-question fallback for anything FAISS could not answer
+        for position, (file_path, question) in enumerate(items):
+            if answers[position] is not None:
+                continue
+            if line_owners[position]:
+                answers[position] = self._synthesize_answer_from_commits(
+                    question, line_owners[position], file_path, reasoning="Line blame"
+                )
+                continue
+            try:
+                answers[position] = await asyncio.wait_for(
+                    self._query_without_faiss(file_path, question),
+                    timeout=self.max_query_time_s,
+                )
+            except Exception as e:
+                logger.warning(f"Error querying context for {file_path}: {e}")
+                answers[position] = e
+
+        return answers
+
+    def get_contexts_sync(self, batch: List[Tuple]) -> List[ArchaeologicalContext]:
+        """
+        Synchronous version of get_contexts.
+
+        Args:
+            batch: List of (file_path, question) or (file_path, question,
+                line_range) tuples
+
+        Returns:
+            ArchaeologicalContext per input, in input order
+        """
+        # Create event loop if needed
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+
+        return loop.run_until_complete(self.get_contexts(batch))
 
     def clear_cache(self) -> None:
         """Clear the context cache (both L1 and L2)."""
         self.cache.clear()
         self.stats.cache_size = 0
+        self._cache_dirty = True
         logger.info("Cache cleared")
 
+    def save_cache_snapshot(self) -> bool:
+        """
+        Write L1 and L2 (entries plus embedding matrix) to the snapshot store.
+
+        Called automatically at interpreter exit when the cache changed.
+
+        Returns:
+            True if a snapshot was written
+        """
+        if self._snapshot_store is None:
+            return False
+
+        results: List[Dict[str, Any]] = []
+        result_index: Dict[int, int] = {}  # id(context) -> position in results
+
+        def index_of(context: ArchaeologicalContext) -> int:
+            position = result_index.get(id(context))
+            if position is None:
+                position = result_index[id(context)] = len(results)
+                results.append(context.to_dict())
+            return position
+
+        l1_entries = [
+            (cache_key, index_of(context))
+            for cache_key, context in list(self.l1_cache.cache.items())
+        ]
+
+        l2_entries: List[Dict[str, Any]] = []
+        l2_embeddings = None
+        embedding_provider = ""
+        if self.l2_cache is not None and self.l2_cache.enabled:
+            entries, l2_embeddings = self.l2_cache.export_entries()
+            embedding_provider = self.l2_cache.provider_signature
+            l2_entries = [
+                {
+                    'query_text': entry.query_text,
+                    'file_path': entry.file_path,
+                    'result': index_of(entry.cached_result),
+                    'access_count': entry.access_count,
+                    'created_at': entry.created_at.timestamp(),
+                    'last_accessed': entry.last_accessed.timestamp(),
+                }
+                for entry in entries
+            ]
+
+        try:
+            self._snapshot_store.save(CacheSnapshot(
+                head_sha=self._head_sha,
+                results=results,
+                l1_entries=l1_entries,
+                l2_entries=l2_entries,
+                l2_embeddings=l2_embeddings,
+                embedding_provider=embedding_provider,
+            ))
+        except Exception as e:
+            logger.warning(f"Failed to save cache snapshot: {e}")
+            return False
+
+        self._cache_dirty = False
+        logger.info(f"Saved cache snapshot: {len(l1_entries)} L1, {len(l2_entries)} L2 entries")
+        return True
+
+    def load_cache_snapshot(self) -> int:
+        """
+        Warm-start L1 and L2 from the snapshot store.
+
+        Answers computed against another HEAD are kept but checked against
+        the commits since that HEAD before the next lookup (see
+        ``invalidate_stale_entries``). L2 rows are reused when the embedding
+        provider matches and re-embedded otherwise.
+
+        Returns:
+            Number of cached answers restored
+        """
+        if self._snapshot_store is None:
+            return 0
+
+        snapshot = self._snapshot_store.load()
+        if snapshot is None:
+            return 0
+
+        try:
+            results = [ArchaeologicalContext.from_dict(data) for data in snapshot.results]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache snapshot: {e}")
+            return 0
+
+        def usable(position: int) -> bool:
+            return bool(self._head_sha) and bool(results[position].head_sha)
+
+        for cache_key, position in snapshot.l1_entries:
+            if usable(position):
+                self.l1_cache.put(cache_key, results[position])
+
+        if self.l2_cache is not None and self.l2_cache.enabled and snapshot.l2_entries:
+            keep = [i for i, entry in enumerate(snapshot.l2_entries) if usable(entry['result'])]
+            embeddings = None
+            if (snapshot.l2_embeddings is not None
+                    and snapshot.embedding_provider == self.l2_cache.provider_signature):
+                embeddings = snapshot.l2_embeddings[keep]
+            self.l2_cache.restore_entries(
+                [
+                    SemanticCacheEntry(
+                        query_text=snapshot.l2_entries[i]['query_text'],
+                        file_path=snapshot.l2_entries[i]['file_path'],
+                        cached_result=results[snapshot.l2_entries[i]['result']],
+                        embedding=None,
+                        access_count=snapshot.l2_entries[i]['access_count'],
+                        created_at=datetime.fromtimestamp(snapshot.l2_entries[i]['created_at']),
+                        last_accessed=datetime.fromtimestamp(snapshot.l2_entries[i]['last_accessed']),
+                    )
+                    for i in keep
+                ],
+                embeddings,
+            )
+
+        restored = sum(1 for position in range(len(results)) if usable(position))
+        self.stats.cache_size = self.l1_cache.size
+        self._cache_needs_validation = any(
+            r.head_sha != self._head_sha for r in self.cache.results()
+        )
+        logger.info(f"Restored {restored}/{len(results)} cached answers from snapshot "
+                    f"(HEAD {self._head_sha[:8]})")
+        return restored
+
     def get_cache_stats(self) -> CacheStats:
         """
         Get cache performance statistics.
@@ -802,9 +1778,22 @@ class ArchaeologyContextProvider:
 
         Returns:
             Dictionary with comprehensive cache statistics including
-            L1, L2, and combined metrics
+            L1, L2, and combined metrics, plus backend queries saved by
+            request coalescing
+        """
+        stats = self.cache.get_combined_stats()
+        stats['backend_queries'] = self._single_flight.stats.backend_queries
+        stats['backend_queries_saved'] = self._single_flight.stats.queries_saved
+        return stats
+
+    def get_single_flight_stats(self) -> SingleFlightStats:
         """
-        return self.cache.get_combined_stats()
+        Get request coalescing statistics.
+
+        Returns:
+            SingleFlightStats with backend queries run and saved
+        """
+        return self._single_flight.stats
 
     def is_initialized(self) -> bool:
         """Check if provider is initialized."""
@@ -815,6 +1804,14 @@ class ArchaeologyContextProvider:
         return self._init_error
 
 
+def _save_cache_snapshot_at_exit(provider_ref: weakref.ref) -> None:
+    """Save a live provider's cache snapshot if it changed (atexit hook)."""
+    provider = provider_ref()
+    if provider is None or not provider._cache_dirty or not provider.repo_path.exists():
+        return
+    provider.save_cache_snapshot()
+
+
 def main():
     """CLI entry point for testing."""
     import sys
@@ -829,8 +1826,8 @@ def main():
     file_path = sys.argv[2]
     question = " ".join(sys.argv[3:])
 
-    # Initialize provider
-    provider = ArchaeologyContextProvider(repo_path=repo_path)
+    # Initialize provider; repeated CLI runs warm-start from the last one's cache
+    provider = ArchaeologyContextProvider(repo_path=repo_path, persist_cache=True)
 
     # Get context
     print(f"\nQuerying archaeological context...")
@@ -3,7 +3,8 @@ Embedding generation for archaeological content.
 
 This module provides the EmbeddingGenerator class that creates semantic embeddings
 for commits, PRs, and issues using sentence-transformers, with intelligent caching
-and batch processing for optimal performance.
+and batch processing for optimal performance. Large uncached batches are split
+across worker processes that each load the model once.
 """
 
 from __future__ import annotations
@@ -11,10 +12,15 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import multiprocessing
+import os
 import pickle
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterator
 import numpy as np
 
 try:
@@ -46,6 +52,10 @@ class EmbeddingConfig:
     normalize: bool = True
     device: str = "cpu"
     show_progress: bool = False
+    num_workers: Optional[int] = None  # Encoding processes (None: one per CPU)
+    worker_chunk_size: int = 1024  # Texts per worker task
+    worker_start_method: str = "spawn"  # Safe with torch thread pools; "fork" starts faster
+    cache_checkpoint_s: float = 60.0  # Save the cache this often during long builds
 
     def __post_init__(self):
         """Validate and set up configuration."""
@@ -53,12 +63,42 @@ class EmbeddingConfig:
             self.cache_dir = Path(self.cache_dir)
 
 
+# Model loaded once per worker process by _init_embedding_worker
+_worker_model = None
+
+
+def _init_embedding_worker(model_name: str, device: str, max_sequence_length: int,
+                           n_threads: int) -> None:
+    """Load the sentence model in a worker process (pool initializer)."""
+    global _worker_model
+    try:
+        import torch
+        torch.set_num_threads(n_threads)
+    except ImportError:
+        pass
+    _worker_model = SentenceTransformer(model_name, device=device)
+    _worker_model.max_seq_length = max_sequence_length
+
+
+def _encode_in_worker(texts: List[str], batch_size: int, normalize: bool) -> np.ndarray:
+    """Encode one chunk of texts with the worker's model (pool task)."""
+    embeddings = _worker_model.encode(
+        texts,
+        batch_size=batch_size,
+        normalize_embeddings=normalize,
+        show_progress_bar=False,
+    )
+    return np.asarray(embeddings, dtype=np.float32)
+
+
 class EmbeddingGenerator:
     """
     Generate embeddings for code archaeology content.
 
     Features:
     - Batch processing for efficiency
+    - Large uncached batches encoded by a pool of worker processes,
+      streamed back in order
     - Caching of computed embeddings
     - Content-aware text preparation
     - Memory-efficient processing
@@ -140,6 +180,44 @@ class EmbeddingGenerator:
 
         return embeddings, doc_ids
 
+    def iter_commit_embeddings(
+        self,
+        commits: List[EnrichedCommit],
+        use_cache: bool = True
+    ) -> Iterator[Tuple[np.ndarray, List[str]]]:
+        """
+        Generate embeddings for commits as consecutive blocks, in commit order.
+
+        Uncached commits are encoded in chunks (by worker processes when
+        there are enough of them) and each block is yielded as soon as its
+        chunk is done, so callers can index while encoding continues. New
+        embeddings enter the cache as they arrive; with a cache directory
+        the cache is also saved every ``cache_checkpoint_s`` seconds, so an
+        interrupted build resumes where it stopped.
+
+        Args:
+            commits: List of enriched commits
+            use_cache: Whether to use cached embeddings
+
+        Yields:
+            Tuples of (embeddings array, document IDs)
+        """
+        doc_ids = [f"commit_{c.commit.sha}" for c in commits]
+        if not self._model_loaded:
+            logger.warning("Model not loaded, returning zero embeddings")
+            if commits:
+                yield np.zeros((len(commits), self.config.dimension), dtype=np.float32), doc_ids
+            return
+
+        texts = [self._prepare_commit_text(commit) for commit in commits]
+        last_checkpoint = time.time()
+        for start, embeddings in self._iter_embeddings(texts, doc_ids, use_cache):
+            yield embeddings, doc_ids[start:start + len(embeddings)]
+            if self.config.cache_dir and \
+                    time.time() - last_checkpoint >= self.config.cache_checkpoint_s:
+                self.save_cache()
+                last_checkpoint = time.time()
+
     def embed_query(self, query: str) -> np.ndarray:
         """
         Generate embedding for a query.
@@ -169,6 +247,34 @@ class EmbeddingGenerator:
             logger.error(f"Failed to generate query embedding: {e}")
             return np.zeros((self.config.dimension,), dtype=np.float32)
 
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for several queries in one model call.
+
+        Applies the same context marker as ``embed_query``.
+
+        Args:
+            queries: Natural language queries
+
+        Returns:
+            Array of query embeddings (n_queries, dimension)
+        """
+        if not self._model_loaded:
+            logger.warning("Model not loaded, returning zero embeddings")
+            return np.zeros((len(queries), self.config.dimension), dtype=np.float32)
+
+        try:
+            embeddings = self.model.encode(
+                [f"Question: {query}" for query in queries],
+                batch_size=self.config.batch_size,
+                normalize_embeddings=self.config.normalize,
+                show_progress_bar=False
+            )
+            return np.asarray(embeddings, dtype=np.float32).reshape(len(queries), -1)
+        except Exception as e:
+            logger.error(f"Failed to generate query embeddings: {e}")
+            return np.zeros((len(queries), self.config.dimension), dtype=np.float32)
+
     def embed_batch(self, texts: List[str], use_cache: bool = True) -> np.ndarray:
         """
         Generate embeddings for multiple texts efficiently.
@@ -189,6 +295,31 @@ class EmbeddingGenerator:
 
         return self._batch_embed(texts, doc_ids, use_cache)
 
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts without caching (EmbeddingProvider interface).
+
+        Lets the loaded sentence model be shared with the semantic cache,
+        whose ad-hoc query texts should not grow the persistent cache.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            Array of embeddings
+        """
+        return self.embed_batch(texts, use_cache=False)
+
+    @property
+    def dimension(self) -> int:
+        """Embedding dimension."""
+        return self.config.dimension
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the sentence-transformers model is loaded."""
+        return self._model_loaded
+
     def _prepare_commit_text(self, commit: EnrichedCommit) -> str:
         """
         Prepare rich text representation of commit.
@@ -264,51 +395,133 @@ class EmbeddingGenerator:
         Returns:
             Array of embeddings
         """
-        embeddings = []
-        uncached_texts = []
-        uncached_indices = []
+        blocks = [block for _, block in self._iter_embeddings(texts, doc_ids, use_cache)]
+        if not blocks:
+            return np.array([], dtype=np.float32)
+        return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
 
-        # Check cache
-        for i, (text, doc_id) in enumerate(zip(texts, doc_ids)):
+    def _iter_embeddings(
+        self,
+        texts: List[str],
+        doc_ids: List[str],
+        use_cache: bool
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Embed texts as consecutive blocks, encoding only cache misses.
+
+        Each block ends at the last text of an encoded chunk (or at the end
+        of the input), filling cached texts in between from the cache. New
+        embeddings are cached as their chunk arrives.
+
+        Args:
+            texts: List of texts to embed
+            doc_ids: List of document IDs
+            use_cache: Whether to use cached embeddings
+
+        Yields:
+            Tuples of (position of the block's first text, embeddings)
+        """
+        uncached_indices = []
+        for i, doc_id in enumerate(doc_ids):
             if use_cache and doc_id in self._cache:
-                embeddings.append((i, self._cache[doc_id]))
                 self._cache_hits += 1
             else:
-                uncached_texts.append(text)
                 uncached_indices.append(i)
                 self._cache_misses += 1
 
-        # Generate new embeddings
-        if uncached_texts:
-            try:
-                new_embeddings = self.model.encode(
-                    uncached_texts,
-                    batch_size=self.config.batch_size,
-                    normalize_embeddings=self.config.normalize,
-                    show_progress_bar=self.config.show_progress
-                )
+        done = 0
+        encoded = 0
+        for new_embeddings, ok in self._encode_stream([texts[i] for i in uncached_indices]):
+            indices = uncached_indices[encoded:encoded + len(new_embeddings)]
+            encoded += len(indices)
+            new_rows = dict(zip(indices, new_embeddings))
+            if ok:
+                # Update cache
+                for idx, embedding in new_rows.items():
+                    self._cache[doc_ids[idx]] = embedding
 
-                # Ensure float32 type
-                new_embeddings = new_embeddings.astype(np.float32)
+            end = indices[-1] + 1
+            yield done, np.array(
+                [new_rows[i] if i in new_rows else self._cache[doc_ids[i]] for i in range(done, end)],
+                dtype=np.float32,
+            )
+            done = end
 
-                # Update cache
-                for idx, embedding, text in zip(
-                    uncached_indices, new_embeddings, uncached_texts
-                ):
-                    doc_id = doc_ids[idx]
-                    self._cache[doc_id] = embedding
-                    embeddings.append((idx, embedding))
+        if done < len(texts):
+            yield done, np.array(
+                [self._cache[doc_id] for doc_id in doc_ids[done:]], dtype=np.float32
+            )
+
+    def _encode_stream(self, texts: List[str]) -> Iterator[Tuple[np.ndarray, bool]]:
+        """
+        Encode texts chunk by chunk, in order.
 
+        With more than one chunk and more than one worker, chunks go to a
+        process pool whose workers each load the model once; at most two
+        chunks per worker are in flight so finished results are not held
+        back unboundedly. If the pool fails, the remaining chunks are
+        encoded in this process.
+
+        Args:
+            texts: Texts to encode
+
+        Yields:
+            Tuples of (embeddings for the next chunk, whether encoding
+            succeeded); failed chunks are zero embeddings
+        """
+        size = max(1, self.config.worker_chunk_size)
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        workers = min(self.config.num_workers or os.cpu_count() or 1, len(chunks))
+
+        position = 0
+        if workers > 1:
+            context = multiprocessing.get_context(self.config.worker_start_method)
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=_init_embedding_worker,
+                initargs=(
+                    self.config.model_name,
+                    self.config.device,
+                    self.config.max_sequence_length,
+                    max(1, (os.cpu_count() or 1) // workers),
+                ),
+            )
+            pending = deque()
+            try:
+                while position < len(chunks):
+                    while len(pending) < 2 * workers and position + len(pending) < len(chunks):
+                        pending.append(executor.submit(
+                            _encode_in_worker,
+                            chunks[position + len(pending)],
+                            self.config.batch_size,
+                            self.config.normalize,
+                        ))
+                    embeddings = pending.popleft().result()
+                    position += 1
+                    yield embeddings, True
             except Exception as e:
-                logger.error(f"Failed to generate embeddings: {e}")
-                # Return zero embeddings for failed items
-                for idx in uncached_indices:
-                    embedding = np.zeros((self.config.dimension,), dtype=np.float32)
-                    embeddings.append((idx, embedding))
+                logger.warning(f"Embedding workers failed, encoding in-process: {e}")
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
 
-        # Sort by original index and extract embeddings
-        embeddings.sort(key=lambda x: x[0])
-        return np.array([e[1] for e in embeddings], dtype=np.float32)
+        for chunk in chunks[position:]:
+            yield self._encode_local(chunk)
+
+    def _encode_local(self, texts: List[str]) -> Tuple[np.ndarray, bool]:
+        """Encode texts with this process's model; zero embeddings on failure."""
+        try:
+            new_embeddings = self.model.encode(
+                texts,
+                batch_size=self.config.batch_size,
+                normalize_embeddings=self.config.normalize,
+                show_progress_bar=self.config.show_progress
+            )
+            # Ensure float32 type
+            return np.asarray(new_embeddings, dtype=np.float32), True
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings: {e}")
+            return np.zeros((len(texts), self.config.dimension), dtype=np.float32), False
 
     def _get_cache_key(self, text: str) -> str:
         """
@@ -332,8 +545,11 @@ class EmbeddingGenerator:
             cache_file = self.config.cache_dir / "embeddings.pkl"
             cache_file.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(cache_file, 'wb') as f:
+            # Checkpoints may be interrupted; never leave a truncated cache
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'wb') as f:
                 pickle.dump(self._cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
 
             logger.info(f"Saved {len(self._cache)} cached embeddings to {cache_file}")
 
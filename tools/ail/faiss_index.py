@@ -4,16 +4,22 @@ FAISS index management for semantic search.
 This module provides the FAISSIndex class that manages FAISS indexes for efficient
 similarity search across embeddings, with support for multiple index types,
 incremental updates, and persistent storage.
+
+Vectors are also kept in a compact float32 store (``vectors.npy`` next to
+``index.bin``, memory-mapped on load) so the index can be compacted after
+removals and updates without re-embedding any documents.
 """
 
 from __future__ import annotations
 
 import logging
+import os
 import pickle
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Callable, Iterable
 import numpy as np
 
 try:
@@ -47,10 +53,12 @@ class FAISSConfig:
     # Storage
     index_path: Optional[Path] = None
     metadata_path: Optional[Path] = None
+    vectors_path: Optional[Path] = None  # default: vectors.npy next to index_path
 
     # Performance
-    auto_optimize: bool = True
+    auto_optimize: bool = True  # compact in the background past the tombstone threshold
     max_memory_mb: int = 100
+    compaction_threshold: float = 0.2  # fraction of stored vectors that are dead
 
     def __post_init__(self):
         """Validate and set up configuration."""
@@ -58,6 +66,10 @@ class FAISSConfig:
             self.index_path = Path(self.index_path)
         if self.metadata_path:
             self.metadata_path = Path(self.metadata_path)
+        if self.vectors_path:
+            self.vectors_path = Path(self.vectors_path)
+        elif self.index_path:
+            self.vectors_path = self.index_path.with_name("vectors.npy")
 
 
 class FAISSIndex:
@@ -66,7 +78,8 @@ class FAISSIndex:
 
     Features:
     - Multiple index types (HNSW, Flat, IVF)
-    - Incremental updates
+    - Incremental updates, in-place replacement and removal
+    - Compaction from a stored float32 vector matrix
     - Persistence and loading
     - Metadata management
     - Graceful degradation when FAISS unavailable
@@ -84,6 +97,19 @@ class FAISSIndex:
         self.metadata: Dict[int, str] = {}  # idx -> document_id
         self.doc_to_idx: Dict[str, int] = {}  # document_id -> idx
 
+        # Vector store: row i holds the vector for FAISS id _vector_ids[i].
+        # Rows of removed or replaced documents stay until compaction.
+        self._vectors: np.ndarray = np.empty((0, self.config.dimension), dtype=np.float32)
+        self._vector_ids: np.ndarray = np.empty(0, dtype=np.int64)
+        self._n_vectors: int = 0
+        self._row_of: Dict[int, int] = {}  # idx -> row in vector store
+        self._next_id: int = 0
+
+        # Mutations take the lock; compaction builds outside it and swaps in
+        self._lock = threading.RLock()
+        self._generation: int = 0  # bumped on every mutation
+        self._compaction_thread: Optional[threading.Thread] = None
+
         # Performance tracking
         self._last_rebuild: Optional[datetime] = None
         self._total_searches: int = 0
@@ -188,55 +214,121 @@ class FAISSIndex:
         if len(embeddings) != len(document_ids):
             raise ValueError("Embeddings and IDs must have same length")
 
-        # Ensure float32 type
-        embeddings = embeddings.astype(np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[1] != self.config.dimension:
+            raise ValueError(
+                f"Expected embeddings of shape (n, {self.config.dimension}), got {embeddings.shape}"
+            )
+
+        # Ensure float32 type (copy so normalization never touches the caller's array)
+        embeddings = np.array(embeddings, dtype=np.float32)
 
         # Normalize for cosine similarity
         if self.config.metric == "cosine":
             faiss.normalize_L2(embeddings)
 
-        # Generate sequential IDs
-        start_idx = len(self.metadata)
-        ids = np.arange(start_idx, start_idx + len(embeddings), dtype=np.int64)
-
-        try:
-            # Train index if needed (for IVF)
-            if self.config.index_type == "IndexIVFFlat":
-                base_index = self.index.index  # Get base index from IDMap
-                if not base_index.is_trained:
-                    logger.info("Training IVF index...")
-                    base_index.train(embeddings)
-
-            # Add to index
-            self.index.add_with_ids(embeddings, ids)
+        with self._lock:
+            # Generate sequential IDs (never reused, so removals cannot collide)
+            start_idx = self._next_id
+            ids = np.arange(start_idx, start_idx + len(embeddings), dtype=np.int64)
+
+            try:
+                # Train index if needed (for IVF)
+                if self.config.index_type == "IndexIVFFlat":
+                    base_index = self.index.index  # Get base index from IDMap
+                    if not base_index.is_trained:
+                        logger.info("Training IVF index...")
+                        base_index.train(embeddings)
+
+                # Add to index
+                self.index.add_with_ids(embeddings, ids)
+                self._append_vectors(embeddings, ids)
+                self._next_id = start_idx + len(embeddings)
+
+                # Update metadata (re-added documents replace their old vector)
+                for idx, doc_id in zip(ids, document_ids):
+                    if doc_id in self.doc_to_idx:
+                        self._drop_id(self.doc_to_idx[doc_id])
+                    self.metadata[int(idx)] = doc_id
+                    self.doc_to_idx[doc_id] = int(idx)
+
+                self._generation += 1
+                self._additions_since_rebuild += len(embeddings)
+                logger.info(f"Added {len(embeddings)} documents to index (total: {self.index.ntotal})")
+
+            except Exception as e:
+                logger.error(f"Failed to add documents to index: {e}")
+
+        self.needs_optimization()
+
+    def _append_vectors(self, vectors: np.ndarray, ids: np.ndarray) -> None:
+        """Append rows to the vector store, growing capacity geometrically."""
+        needed = self._n_vectors + len(vectors)
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors), 64)
+            grown = np.empty((capacity, self.config.dimension), dtype=np.float32)
+            grown[:self._n_vectors] = self._vectors[:self._n_vectors]
+            grown_ids = np.empty(capacity, dtype=np.int64)
+            grown_ids[:self._n_vectors] = self._vector_ids[:self._n_vectors]
+            self._vectors, self._vector_ids = grown, grown_ids
+
+        self._vectors[self._n_vectors:needed] = vectors
+        self._vector_ids[self._n_vectors:needed] = ids
+        for offset, idx in enumerate(ids):
+            self._row_of[int(idx)] = self._n_vectors + offset
+        self._n_vectors = needed
 
-            # Update metadata
-            for idx, doc_id in zip(ids, document_ids):
-                self.metadata[int(idx)] = doc_id
-                self.doc_to_idx[doc_id] = int(idx)
-
-            self._additions_since_rebuild += len(embeddings)
-            logger.info(f"Added {len(embeddings)} documents to index (total: {self.index.ntotal})")
+    @property
+    def _vectors_path(self) -> Optional[Path]:
+        """Path of the stored vector matrix."""
+        if self.config.vectors_path:
+            return self.config.vectors_path
+        if self.config.index_path:
+            return self.config.index_path.with_name("vectors.npy")
+        return None
+
+    def _supports_remove(self) -> bool:
+        """Whether the base index can delete vectors (HNSW graphs cannot)."""
+        return self.config.index_type != "IndexHNSWFlat"
+
+    def _drop_id(self, idx: int) -> None:
+        """Tombstone a FAISS id: forget its document and evict it if possible."""
+        self.metadata.pop(idx, None)
+        if self._supports_remove():
+            self.index.remove_ids(np.array([idx], dtype=np.int64))
 
-        except Exception as e:
-            logger.error(f"Failed to add documents to index: {e}")
+    @property
+    def _dead_in_index(self) -> int:
+        """Vectors still held by the FAISS index that map to no document."""
+        if not self.index:
+            return 0
+        return max(self.index.ntotal - len(self.metadata), 0)
 
-    def search(
+    @property
+    def tombstone_ratio(self) -> float:
+        """Fraction of stored vectors that belong to removed or replaced documents."""
+        stored = max(self._n_vectors, self.index.ntotal if self.index else 0)
+        if stored == 0:
+            return 0.0
+        return (stored - len(self.metadata)) / stored
+
+    def _search_raw(
         self,
         query_embedding: np.ndarray,
-        k: int = 10,
-        filter_ids: Optional[List[str]] = None
-    ) -> List[Tuple[str, float]]:
+        k: int,
+        fetch_k: Optional[int] = None,
+        keep: Optional[Callable[[int], bool]] = None
+    ) -> List[Tuple[int, float]]:
         """
-        Search for similar documents.
+        Run one query against the index, returning live FAISS ids.
 
         Args:
             query_embedding: Query vector
             k: Number of results
-            filter_ids: Optional list of document IDs to search within
+            fetch_k: Candidates to request before filtering (default: k)
+            keep: Optional predicate on FAISS ids; rejected hits are skipped
 
         Returns:
-            List of (document_id, similarity_score) tuples
+            List of (faiss_id, similarity_score) tuples, best first
         """
         if not self._faiss_available or self.index is None:
             logger.warning("FAISS index not available")
@@ -259,42 +351,25 @@ class FAISSIndex:
             query_embedding = query_embedding.reshape(1, -1)
 
         try:
-            # Search
-            # Request more results if we need to filter
-            search_k = min(k * 3 if filter_ids else k, self.index.ntotal)
+            # Skip past vectors of removed documents still in the index
+            search_k = min((fetch_k or k) + self._dead_in_index, self.index.ntotal)
             distances, indices = self.index.search(query_embedding, search_k)
 
-            # Convert to results
             results = []
             for dist, idx in zip(distances[0], indices[0]):
-                if idx < 0:  # Invalid index
+                if idx < 0 or idx not in self.metadata:
                     continue
-
-                if idx not in self.metadata:
-                    logger.warning(f"Index {idx} not found in metadata")
-                    continue
-
-                doc_id = self.metadata[idx]
-
-                # Apply filter if specified
-                if filter_ids and doc_id not in filter_ids:
+                if keep is not None and not keep(int(idx)):
                     continue
 
-                # Convert distance to similarity score
-                if self.config.metric == "cosine":
-                    # For cosine with normalized vectors, distance is 1 - cosine_similarity
-                    # With inner product on normalized vectors, distance IS the similarity
-                    similarity = float(dist)
-                elif self.config.metric == "l2":
-                    # Convert L2 distance to similarity
+                # Convert distance to similarity score; cosine (inner product
+                # on normalized vectors) and inner product already are one
+                if self.config.metric == "l2":
                     similarity = 1.0 / (1.0 + float(dist))
                 else:
-                    # Inner product is already similarity
                     similarity = float(dist)
 
-                results.append((doc_id, similarity))
-
-                # Stop if we have enough results
+                results.append((int(idx), similarity))
                 if len(results) >= k:
                     break
 
@@ -305,6 +380,107 @@ class FAISSIndex:
             logger.error(f"Failed to search index: {e}")
             return []
 
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        k: int = 10,
+        filter_ids: Optional[List[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Search for similar documents.
+
+        Args:
+            query_embedding: Query vector
+            k: Number of results
+            filter_ids: Optional list of document IDs to search within
+
+        Returns:
+            List of (document_id, similarity_score) tuples
+        """
+        keep = None
+        if filter_ids:
+            wanted = set(filter_ids)
+
+            def keep(idx: int) -> bool:
+                return self.metadata.get(idx) in wanted
+
+        # Request more results if we need to filter
+        hits = self._search_raw(
+            query_embedding, k, fetch_k=k * 3 if filter_ids else k, keep=keep
+        )
+        return [(self.metadata[idx], score) for idx, score in hits]
+
+    def search_ids(
+        self,
+        query_embedding: np.ndarray,
+        k: int = 10
+    ) -> List[Tuple[int, float]]:
+        """
+        Search for similar documents, returning FAISS integer ids.
+
+        Callers that keep an id -> object table (e.g. EnrichedHistory after
+        link_faiss_ids) can resolve hits without going through document ids.
+
+        Args:
+            query_embedding: Query vector
+            k: Number of results
+
+        Returns:
+            List of (faiss_id, similarity_score) tuples
+        """
+        return self._search_raw(query_embedding, k)
+
+    def search_ids_within(
+        self,
+        query_embedding: np.ndarray,
+        ids: Iterable[int],
+        k: int = 10
+    ) -> List[Tuple[int, float]]:
+        """
+        Search only among the given FAISS ids, scoring them exactly.
+
+        Scores come from the vector store, so a candidate subset of a few
+        hundred rows costs one small matrix product instead of an index
+        scan. Scores are on the same scale as search_ids. Ids that are not
+        live documents are ignored.
+
+        Args:
+            query_embedding: Query vector
+            ids: Candidate FAISS ids
+            k: Number of results
+
+        Returns:
+            List of (faiss_id, similarity_score) tuples, best first
+        """
+        if not self._faiss_available or self.index is None:
+            logger.warning("FAISS index not available")
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1).copy()
+        if self.config.metric == "cosine":
+            faiss.normalize_L2(query)
+
+        with self._lock:
+            live_ids = [
+                int(idx) for idx in dict.fromkeys(ids)
+                if idx in self.metadata and idx in self._row_of
+            ]
+            if not live_ids or k <= 0:
+                return []
+            rows = np.fromiter((self._row_of[idx] for idx in live_ids), dtype=np.int64)
+            vectors = self._vectors[rows]
+
+        if self.config.metric == "l2":
+            distances = ((vectors - query) ** 2).sum(axis=1)
+            scores = 1.0 / (1.0 + distances)
+        else:
+            scores = vectors @ query[0]
+
+        # Stable sort keeps candidate order among equal scores
+        order = np.argsort(-scores, kind='stable')[:k]
+        self._total_searches += 1
+        return [(live_ids[i], float(scores[i])) for i in order]
+
     def search_batch(
         self,
         query_embeddings: np.ndarray,
@@ -338,7 +514,8 @@ class FAISSIndex:
 
         try:
             # Batch search
-            distances, indices = self.index.search(query_embeddings, k)
+            search_k = min(k + self._dead_in_index, self.index.ntotal)
+            distances, indices = self.index.search(query_embeddings, search_k)
 
             # Convert to results
             all_results = []
@@ -359,6 +536,8 @@ class FAISSIndex:
                         similarity = float(dist)
 
                     results.append((doc_id, similarity))
+                    if len(results) >= k:
+                        break
 
                 all_results.append(results)
 
@@ -377,14 +556,15 @@ class FAISSIndex:
         """
         Update a single document's embedding.
 
-        Note: FAISS doesn't support efficient in-place updates for most index types.
-        This method adds the document as new if not exists, or logs a warning if update needed.
+        Flat and IVF indexes replace the vector in place under the same id.
+        HNSW graphs cannot delete nodes, so the new vector gets a fresh id and
+        the old one becomes a tombstone until the next compaction.
 
         Args:
             document_id: Document ID to update
             new_embedding: New embedding vector
         """
-        if not self._faiss_available:
+        if not self._faiss_available or self.index is None:
             return
 
         if document_id not in self.doc_to_idx:
@@ -395,30 +575,48 @@ class FAISSIndex:
             )
             return
 
-        # FAISS doesn't support in-place updates efficiently
-        # Mark for rebuild if this becomes common
-        self._additions_since_rebuild += 1
-        logger.warning(
-            f"Document update for {document_id} requires index rebuild. "
-            f"Consider calling rebuild() after batch updates."
-        )
+        if not self._supports_remove():
+            # add_documents tombstones the document's previous id
+            self.add_documents(new_embedding.reshape(1, -1), [document_id])
+            return
+
+        vector = np.array(new_embedding, dtype=np.float32).reshape(1, -1)
+        if self.config.metric == "cosine":
+            faiss.normalize_L2(vector)
+
+        with self._lock:
+            idx = self.doc_to_idx[document_id]
+            ids = np.array([idx], dtype=np.int64)
+            self.index.remove_ids(ids)
+            self.index.add_with_ids(vector, ids)
+            self._vectors[self._row_of[idx]] = vector[0]
+            self._generation += 1
+            self._additions_since_rebuild += 1
 
     def remove_document(self, document_id: str) -> None:
         """
         Remove a document from the index.
 
-        Note: FAISS remove is expensive. This marks for rebuild rather than immediate removal.
+        The document disappears from search results immediately. Its stored
+        vector (and, for HNSW, its graph node) is a tombstone reclaimed by
+        compaction, which starts in the background past the threshold.
 
         Args:
             document_id: Document ID to remove
         """
-        if document_id in self.doc_to_idx:
-            idx = self.doc_to_idx[document_id]
-            # Mark for removal (actual removal happens on rebuild)
-            del self.metadata[idx]
-            del self.doc_to_idx[document_id]
+        with self._lock:
+            if document_id not in self.doc_to_idx:
+                return
+            idx = self.doc_to_idx.pop(document_id)
+            if self.index is not None:
+                self._drop_id(idx)
+            else:
+                self.metadata.pop(idx, None)
+            self._generation += 1
             self._additions_since_rebuild += 1
-            logger.info(f"Marked {document_id} for removal (rebuild required)")
+            logger.debug(f"Removed {document_id} (tombstone ratio: {self.tombstone_ratio:.1%})")
+
+        self.needs_optimization()
 
     def save(self) -> None:
         """Save index and metadata to disk."""
@@ -434,8 +632,17 @@ class FAISSIndex:
             # Create directory
             self.config.index_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Save FAISS index
-            faiss.write_index(self.index, str(self.config.index_path))
+            with self._lock:
+                # Save FAISS index
+                faiss.write_index(self.index, str(self.config.index_path))
+
+                # Save vector store atomically (a mapped old file stays valid)
+                vectors_path = self._vectors_path
+                tmp_path = vectors_path.with_suffix('.tmp')
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, self._vectors[:self._n_vectors])
+                os.replace(tmp_path, vectors_path)
+                vector_ids = self._vector_ids[:self._n_vectors].copy()
 
             # Save metadata
             if self.config.metadata_path:
@@ -444,6 +651,8 @@ class FAISSIndex:
                     pickle.dump({
                         'metadata': self.metadata,
                         'doc_to_idx': self.doc_to_idx,
+                        'vector_ids': vector_ids,
+                        'next_id': self._next_id,
                         'config': self.config,
                         'stats': {
                             'last_rebuild': self._last_rebuild,
@@ -472,6 +681,7 @@ class FAISSIndex:
             self.index = faiss.read_index(str(self.config.index_path))
 
             # Load metadata
+            data: Dict[str, Any] = {}
             if self.config.metadata_path and self.config.metadata_path.exists():
                 with open(self.config.metadata_path, 'rb') as f:
                     data = pickle.load(f)
@@ -484,6 +694,9 @@ class FAISSIndex:
                     self._total_searches = stats.get('total_searches', 0)
                     self._additions_since_rebuild = stats.get('additions_since_rebuild', 0)
 
+            self._load_vectors(data.get('vector_ids'))
+            self._next_id = data.get('next_id', max(self.metadata, default=-1) + 1)
+
             logger.info(f"Loaded index with {self.index.ntotal} vectors from {self.config.index_path}")
 
         except Exception as e:
@@ -491,34 +704,122 @@ class FAISSIndex:
             # Re-initialize empty index
             self._initialize_index()
 
+    def _load_vectors(self, vector_ids: Optional[np.ndarray]) -> None:
+        """
+        Map the stored vector matrix, or recover it from the loaded index.
+
+        The matrix is mapped copy-on-write: in-place updates stay in memory
+        until the next save. Indexes saved before the vector store existed
+        are migrated by reconstructing their vectors.
+        """
+        path = self._vectors_path
+        vectors = None
+
+        if vector_ids is not None and path and path.exists():
+            vectors = np.load(path, mmap_mode='c')
+            if vectors.shape != (len(vector_ids), self.config.dimension):
+                logger.warning(f"Vector store {path} does not match metadata, reconstructing")
+                vectors = None
+
+        if vectors is None:
+            try:
+                vector_ids = faiss.vector_to_array(self.index.id_map).astype(np.int64)
+                base_index = faiss.downcast_index(self.index.index)
+                if hasattr(base_index, 'make_direct_map'):
+                    base_index.make_direct_map()
+                vectors = base_index.reconstruct_n(0, base_index.ntotal)
+            except Exception as e:
+                logger.warning(f"Could not reconstruct vectors from index: {e}")
+                vector_ids = np.empty(0, dtype=np.int64)
+                vectors = np.empty((0, self.config.dimension), dtype=np.float32)
+
+        self._vectors = vectors
+        self._vector_ids = np.asarray(vector_ids, dtype=np.int64)
+        self._n_vectors = len(self._vector_ids)
+        self._row_of = {int(idx): row for row, idx in enumerate(self._vector_ids)}
+
+    def _build_compacted(self) -> Tuple[Any, np.ndarray, np.ndarray]:
+        """
+        Build a fresh index holding only live documents.
+
+        Returns:
+            Tuple of (FAISS index, vectors, ids); ids are unchanged so callers
+            holding FAISS ids (e.g. EnrichedHistory) stay valid
+        """
+        with self._lock:
+            live_ids = np.fromiter(
+                (idx for idx in sorted(self.metadata) if idx in self._row_of),
+                dtype=np.int64,
+            )
+            rows = np.fromiter((self._row_of[int(idx)] for idx in live_ids), dtype=np.int64)
+            vectors = np.ascontiguousarray(self._vectors[rows], dtype=np.float32)
+
+        index = faiss.IndexIDMap(self._create_base_index(self.config.dimension))
+        if len(vectors):
+            if self.config.index_type == "IndexIVFFlat":
+                index.index.train(vectors)
+            index.add_with_ids(vectors, live_ids)
+        return index, vectors, live_ids
+
     def rebuild(self) -> None:
         """
-        Rebuild the index from scratch.
+        Rebuild the index from the stored vectors, dropping tombstones.
 
-        This is useful after multiple updates/removals or for optimization.
+        The new index is built without holding the lock so searches and
+        reads continue; if documents change meanwhile, the build is redone
+        under the lock.
         """
+        if not self._faiss_available:
+            return
+
         logger.info("Rebuilding index...")
 
-        # Save current documents
-        doc_embeddings = []
-        doc_ids = []
+        generation = self._generation
+        index, vectors, ids = self._build_compacted()
+
+        with self._lock:
+            if self._generation != generation:
+                index, vectors, ids = self._build_compacted()
+
+            dropped = [idx for idx in self.metadata if idx not in self._row_of]
+            for idx in dropped:
+                # No stored vector to rebuild from (e.g. unreadable legacy index)
+                self.doc_to_idx.pop(self.metadata.pop(idx), None)
+            if dropped:
+                logger.warning(f"Dropped {len(dropped)} documents without stored vectors")
 
-        if self.index and self.index.ntotal > 0:
-            # Extract all valid documents
-            for idx, doc_id in self.metadata.items():
-                # Reconstruct would require storing embeddings
-                logger.warning("Index rebuild requires stored embeddings (not implemented)")
-                break
+            removed = self._n_vectors - len(ids)
+            self.index = index
+            self._vectors = vectors
+            self._vector_ids = ids
+            self._n_vectors = len(ids)
+            self._row_of = {int(idx): row for row, idx in enumerate(ids)}
+            self._generation += 1
 
-        # Re-initialize index
-        self._initialize_index()
+            self._last_rebuild = datetime.now()
+            self._additions_since_rebuild = 0
 
-        # Re-add documents if we had stored embeddings
-        # (This would require storing embeddings separately)
+        logger.info(f"Index rebuild complete ({len(ids)} documents, {removed} tombstones removed)")
 
-        self._last_rebuild = datetime.now()
-        self._additions_since_rebuild = 0
-        logger.info("Index rebuild complete")
+    def compact_in_background(self) -> Optional[threading.Thread]:
+        """
+        Start compaction on a daemon thread unless one is already running.
+
+        Returns:
+            The compaction thread (running or newly started), or None if
+            FAISS is unavailable
+        """
+        if not self._faiss_available:
+            return None
+
+        with self._lock:
+            if self._compaction_thread and self._compaction_thread.is_alive():
+                return self._compaction_thread
+            self._compaction_thread = threading.Thread(
+                target=self.rebuild, name="faiss-compaction", daemon=True
+            )
+            self._compaction_thread.start()
+            return self._compaction_thread
 
     def optimize(self) -> None:
         """
@@ -547,7 +848,7 @@ class FAISSIndex:
     def size(self) -> int:
         """Number of documents in index."""
         if self.index:
-            return self.index.ntotal
+            return len(self.metadata)
         return 0
 
     def get_memory_usage(self) -> Dict[str, float]:
@@ -576,10 +877,14 @@ class FAISSIndex:
         # Estimate metadata memory
         metadata_bytes = len(self.metadata) * 100  # ~100 bytes per entry
 
+        # Stored vectors (memory-mapped after load, so only touched pages are resident)
+        vectors_bytes = self._n_vectors * (self.config.dimension * 4 + 8)
+
         return {
             'index_mb': index_bytes / (1024 * 1024),
             'metadata_mb': metadata_bytes / (1024 * 1024),
-            'total_mb': (index_bytes + metadata_bytes) / (1024 * 1024)
+            'vectors_mb': vectors_bytes / (1024 * 1024),
+            'total_mb': (index_bytes + metadata_bytes + vectors_bytes) / (1024 * 1024)
         }
 
     def get_stats(self) -> Dict[str, Any]:
@@ -599,6 +904,7 @@ class FAISSIndex:
             'searches_performed': self._total_searches,
             'last_rebuild': self._last_rebuild.isoformat() if self._last_rebuild else None,
             'additions_since_rebuild': self._additions_since_rebuild,
+            'tombstone_ratio': self.tombstone_ratio,
             'needs_optimization': self.needs_optimization(),
             'memory_mb': memory_stats['total_mb'],
             'faiss_available': self._faiss_available,
@@ -608,9 +914,17 @@ class FAISSIndex:
         """
         Check if index needs optimization.
 
+        Once tombstones pass ``config.compaction_threshold`` this also starts
+        background compaction when ``config.auto_optimize`` is set.
+
         Returns:
             True if optimization recommended
         """
+        if self.tombstone_ratio > self.config.compaction_threshold:
+            if self.config.auto_optimize:
+                self.compact_in_background()
+            return True
+
         # Suggest optimization after many additions
         if self._additions_since_rebuild > self.size * 0.2:  # >20% changes
             return True
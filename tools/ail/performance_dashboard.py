@@ -134,12 +134,14 @@ class AILPerformanceDashboard:
         'frontend-performance-specialist',
     ]
 
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", persist_cache: bool = False):
         """
         Initialize the performance dashboard.
 
         Args:
             repo_path: Path to the repository
+            persist_cache: Warm-start the context provider's cache from the
+                previous run and save it at exit
         """
         self.repo_path = Path(repo_path).resolve()
         self.ail_path = self.repo_path / "tools" / "ail"
@@ -152,7 +154,8 @@ class AILPerformanceDashboard:
                 self.context_provider = ArchaeologyContextProvider(
                     repo_path=str(self.repo_path),
                     cache_size=1000,
-                    enable_semantic_cache=True
+                    enable_semantic_cache=True,
+                    persist_cache=persist_cache,
                 )
             except Exception as e:
                 print(f"{Colors.YELLOW}Warning: Could not initialize context provider: {e}{Colors.RESET}")
@@ -644,7 +647,7 @@ Examples:
     args = parser.parse_args()
 
     # Initialize dashboard
-    dashboard = AILPerformanceDashboard(repo_path=args.repo_path)
+    dashboard = AILPerformanceDashboard(repo_path=args.repo_path, persist_cache=True)
 
     # Run in appropriate mode
     if args.watch:
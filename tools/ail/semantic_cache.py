@@ -7,6 +7,8 @@ meaning but different wording, targeting 20%+ additional cache hits.
 
 Features:
 - FAISS IndexFlatIP for fast similarity search (<50ms)
+- Fixed-dimension hashing embeddings by default, or a shared sentence embedder
+- Lookups restricted to entries cached for the same file
 - Configurable similarity threshold (default 0.85)
 - Hybrid LRU+LFU eviction policy
 - Thread-safe operations
@@ -24,7 +26,7 @@ import time
 import logging
 import re
 import threading
-from typing import Optional, Tuple, Dict, Any, List
+from typing import Optional, Tuple, Dict, Any, List, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -132,7 +134,8 @@ class SemanticCache:
         Initialize semantic cache.
 
         Args:
-            embedding_provider: Provider for query embeddings (reuses CCA's)
+            embedding_provider: Provider for query embeddings
+                (default: CCA's HashingEmbeddingProvider)
             max_entries: Maximum cache entries (default: 500)
             similarity_threshold: Minimum similarity for hit (default: 0.85)
             ttl_seconds: Time-to-live for entries (default: 3600 = 1 hour)
@@ -153,32 +156,29 @@ class SemanticCache:
         self.similarity_threshold = similarity_threshold
         self.ttl_seconds = ttl_seconds
 
-        # Embedding provider (reuse CCA's SimpleEmbeddingProvider)
+        # Embedding provider (stateless hashing vectorizer unless one is shared)
         if embedding_provider is None:
             try:
-                from code_archaeology import SimpleEmbeddingProvider
-                self.embedding_provider = SimpleEmbeddingProvider(max_features=512)
+                from code_archaeology import HashingEmbeddingProvider
+                self.embedding_provider = HashingEmbeddingProvider(n_features=512)
             except ImportError:
-                logger.warning("SimpleEmbeddingProvider not available, disabling semantic cache")
+                logger.warning("HashingEmbeddingProvider not available, disabling semantic cache")
                 self.enabled = False
                 return
         else:
             self.embedding_provider = embedding_provider
 
-        # Determine embedding dimension
-        try:
-            test_embedding = self.embedding_provider.embed(["test"])[0]
-            dimension = len(test_embedding)
-        except Exception:
-            dimension = 512  # Default fallback
-
         # Initialize FAISS index (inner product for cosine similarity)
+        dimension = self._provider_dimension(self.embedding_provider)
         self.index = faiss.IndexFlatIP(dimension)
         self.dimension = dimension
 
         # Storage for cache entries (list indexed by FAISS index ID)
         self.entries: List[SemanticCacheEntry] = []
 
+        # FAISS IDs per file, so lookups only compare queries about the same file
+        self._file_ids: Dict[str, List[int]] = {}
+
         # Statistics
         self.stats = SemanticCacheStats()
 
@@ -190,6 +190,46 @@ class SemanticCache:
             f"threshold={similarity_threshold}, ttl={ttl_seconds}s, dim={dimension}"
         )
 
+    @staticmethod
+    def _provider_dimension(provider: Any) -> int:
+        """
+        Determine the embedding dimension of a provider.
+
+        A declared integer ``dimension`` is trusted as-is. Embedding a probe
+        text is only a fallback: providers that fit a vocabulary on their first
+        call would otherwise freeze it to the probe.
+        """
+        dimension = getattr(provider, 'dimension', None)
+        if isinstance(dimension, int) and dimension > 0:
+            return dimension
+
+        try:
+            probed = len(provider.embed(["why was this code changed"])[0])
+            if probed > 0:
+                return probed
+        except Exception:
+            pass
+        return 512  # Default fallback
+
+    def set_embedding_provider(self, embedding_provider: Any) -> None:
+        """
+        Switch to another embedding provider (e.g. a shared sentence embedder).
+
+        Cached entries are dropped because embeddings from different providers
+        are not comparable.
+
+        Args:
+            embedding_provider: Provider with ``embed(texts)`` and ``dimension``
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.embedding_provider = embedding_provider
+            self.dimension = self._provider_dimension(embedding_provider)
+            self._rebuild_index([])
+            logger.info(f"Semantic cache switched embedding provider (dim={self.dimension})")
+
     def normalize_query(self, query: str) -> str:
         """
         Normalize query for better similarity matching.
@@ -243,102 +283,142 @@ class SemanticCache:
         Returns:
             Tuple of (cached_result, similarity_score) if hit, None if miss
         """
-        if not self.enabled:
-            return None
-
-        start_time = time.time()
+        return self.get_batch([(file_path, query)])[0]
 
-        with self._lock:
-            self.stats.total_queries += 1
+    def get_batch(
+        self,
+        items: List[Tuple[str, str]]
+    ) -> List[Optional[Tuple[Any, float]]]:
+        """
+        Query semantic cache for several (file_path, query) pairs at once.
 
-            # Empty cache
-            if len(self.entries) == 0:
-                self.stats.misses += 1
-                return None
+        All queries that can possibly hit are embedded in a single
+        ``embed`` call.
 
-            # Normalize query
-            normalized_query = self.normalize_query(query)
+        Args:
+            items: List of (file_path, query) tuples
 
-            # Create composite query for embedding (include file context)
-            composite_query = f"{file_path}: {normalized_query}"
+        Returns:
+            List aligned with ``items`` of (cached_result, similarity_score)
+            for hits and None for misses
+        """
+        results: List[Optional[Tuple[Any, float]]] = [None] * len(items)
+        if not self.enabled:
+            return results
 
-            # Generate embedding
-            try:
-                query_embedding = self.embedding_provider.embed([composite_query])[0]
+        start_time = time.time()
 
-                # Normalize for cosine similarity (IndexFlatIP expects normalized)
-                norm = np.linalg.norm(query_embedding)
-                if norm > 0:
-                    query_embedding = query_embedding / norm
-                else:
-                    logger.warning("Zero norm embedding, skipping semantic cache")
+        with self._lock:
+            # Only entries for the same file can answer a query
+            pending = []
+            for position, (file_path, query) in enumerate(items):
+                self.stats.total_queries += 1
+                file_ids = self._file_ids.get(file_path)
+                if not file_ids:
                     self.stats.misses += 1
-                    return None
+                    continue
+                pending.append((position, file_ids, self.normalize_query(query)))
+
+            if not pending:
+                return results
 
+            # Generate embeddings
+            try:
+                embeddings = self.embedding_provider.embed([query for _, _, query in pending])
+                if len(embeddings) != len(pending):
+                    raise ValueError(f"expected {len(pending)} embeddings, got {len(embeddings)}")
             except Exception as e:
                 logger.warning(f"Failed to generate embedding: {e}")
-                self.stats.misses += 1
-                return None
+                self.stats.misses += len(pending)
+                return results
 
-            # Search FAISS index (top-1 result)
-            try:
-                scores, indices = self.index.search(
-                    query_embedding.reshape(1, -1).astype('float32'),
-                    k=1
-                )
+            for (position, file_ids, _), query_embedding in zip(pending, embeddings):
+                results[position] = self._match(file_ids, query_embedding, start_time)
 
-                if len(indices[0]) == 0 or indices[0][0] == -1:
-                    self.stats.misses += 1
-                    return None
+            return results
 
-                top_score = float(scores[0][0])
-                top_idx = int(indices[0][0])
+    def _match(
+        self,
+        file_ids: List[int],
+        query_embedding: np.ndarray,
+        start_time: float
+    ) -> Optional[Tuple[Any, float]]:
+        """
+        Find the best cached entry among ``file_ids`` for one query embedding.
 
-            except Exception as e:
-                logger.warning(f"FAISS search failed: {e}")
-                self.stats.misses += 1
-                return None
+        Caller must hold the lock. Updates hit/miss statistics.
+        """
+        # Normalize for cosine similarity (IndexFlatIP expects normalized)
+        query_embedding = np.asarray(query_embedding, dtype='float32')
+        norm = np.linalg.norm(query_embedding)
+        if norm > 0:
+            query_embedding = query_embedding / norm
+        else:
+            logger.warning("Zero norm embedding, skipping semantic cache")
+            self.stats.misses += 1
+            return None
 
-            # Check similarity threshold
-            if top_score < self.similarity_threshold:
-                self.stats.misses += 1
-                lookup_time_ms = (time.time() - start_time) * 1000
-                logger.debug(
-                    f"Semantic cache miss: score={top_score:.3f} < "
-                    f"threshold={self.similarity_threshold}"
-                )
-                return None
+        # Search FAISS index (top-1 result among this file's entries)
+        try:
+            selector = faiss.IDSelectorBatch(np.asarray(file_ids, dtype='int64'))
+            params = faiss.SearchParameters(sel=selector)
+            scores, indices = self.index.search(
+                query_embedding.reshape(1, -1).astype('float32'),
+                k=1,
+                params=params,
+            )
 
-            # Check TTL expiration
-            entry = self.entries[top_idx]
-            if entry.is_expired(self.ttl_seconds):
+            if len(indices[0]) == 0 or indices[0][0] == -1:
                 self.stats.misses += 1
-                logger.debug(f"Semantic cache entry expired: age={entry.age_seconds:.0f}s")
-                # Note: Expired entries removed during next eviction cycle
                 return None
 
-            # Cache hit!
-            self.stats.hits += 1
-            self.stats.avg_similarity = (
-                (self.stats.avg_similarity * (self.stats.hits - 1) + top_score)
-                / self.stats.hits
-            )
-
-            # Update entry metadata
-            entry.access_count += 1
-            entry.last_accessed = datetime.now()
+            top_score = float(scores[0][0])
+            top_idx = int(indices[0][0])
 
-            # Update stats
-            lookup_time_ms = (time.time() - start_time) * 1000
-            total_time = self.stats.avg_lookup_time_ms * (self.stats.total_queries - 1)
-            self.stats.avg_lookup_time_ms = (total_time + lookup_time_ms) / self.stats.total_queries
+        except Exception as e:
+            logger.warning(f"FAISS search failed: {e}")
+            self.stats.misses += 1
+            return None
 
+        # Check similarity threshold
+        if top_score < self.similarity_threshold:
+            self.stats.misses += 1
             logger.debug(
-                f"Semantic cache HIT: similarity={top_score:.3f}, "
-                f"time={lookup_time_ms:.1f}ms"
+                f"Semantic cache miss: score={top_score:.3f} < "
+                f"threshold={self.similarity_threshold}"
             )
+            return None
+
+        # Check TTL expiration
+        entry = self.entries[top_idx]
+        if entry.is_expired(self.ttl_seconds):
+            self.stats.misses += 1
+            logger.debug(f"Semantic cache entry expired: age={entry.age_seconds:.0f}s")
+            # Note: Expired entries removed during next eviction cycle
+            return None
+
+        # Cache hit!
+        self.stats.hits += 1
+        self.stats.avg_similarity = (
+            (self.stats.avg_similarity * (self.stats.hits - 1) + top_score)
+            / self.stats.hits
+        )
+
+        # Update entry metadata
+        entry.access_count += 1
+        entry.last_accessed = datetime.now()
+
+        # Update stats
+        lookup_time_ms = (time.time() - start_time) * 1000
+        total_time = self.stats.avg_lookup_time_ms * (self.stats.total_queries - 1)
+        self.stats.avg_lookup_time_ms = (total_time + lookup_time_ms) / self.stats.total_queries
+
+        logger.debug(
+            f"Semantic cache HIT: similarity={top_score:.3f}, "
+            f"time={lookup_time_ms:.1f}ms"
+        )
 
-            return (entry.cached_result, top_score)
+        return (entry.cached_result, top_score)
 
     def put(
         self,
@@ -365,12 +445,9 @@ class SemanticCache:
             # Normalize query
             normalized_query = self.normalize_query(query)
 
-            # Create composite query
-            composite_query = f"{file_path}: {normalized_query}"
-
-            # Generate embedding
+            # Generate embedding (file identity is matched exactly, not embedded)
             try:
-                query_embedding = self.embedding_provider.embed([composite_query])[0]
+                query_embedding = self.embedding_provider.embed([normalized_query])[0]
 
                 # Normalize for cosine similarity
                 norm = np.linalg.norm(query_embedding)
@@ -400,6 +477,7 @@ class SemanticCache:
                 return
 
             # Add to entries list
+            self._file_ids.setdefault(file_path, []).append(len(self.entries))
             self.entries.append(entry)
             self.stats.cache_size = len(self.entries)
 
@@ -485,8 +563,120 @@ class SemanticCache:
 
         # Update entries list
         self.entries = new_entries
+        self._file_ids = {}
+        for idx, entry in enumerate(new_entries):
+            self._file_ids.setdefault(entry.file_path, []).append(idx)
         self.stats.cache_size = len(self.entries)
 
+    def remove_where(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Remove entries whose cached result matches a predicate.
+
+        Args:
+            predicate: Called with each cached result; True removes the entry
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.enabled:
+            return 0
+
+        with self._lock:
+            keep = [
+                i for i, entry in enumerate(self.entries)
+                if not predicate(entry.cached_result)
+            ]
+            removed = len(self.entries) - len(keep)
+            if removed:
+                self._rebuild_index(keep)
+            return removed
+
+    @property
+    def provider_signature(self) -> str:
+        """Identity of the embedding space ("<provider class>:<dimension>")."""
+        if not self.enabled:
+            return ""
+        return f"{type(self.embedding_provider).__name__}:{self.dimension}"
+
+    def export_entries(self) -> Tuple[List[SemanticCacheEntry], Optional[np.ndarray]]:
+        """
+        Snapshot the cache contents.
+
+        Returns:
+            (entries, embeddings) where row i of the float32 matrix is the
+            unit embedding of entry i; ([], None) when disabled
+        """
+        if not self.enabled:
+            return [], None
+
+        with self._lock:
+            entries = list(self.entries)
+            if entries:
+                embeddings = np.array([e.embedding for e in entries], dtype='float32')
+            else:
+                embeddings = np.zeros((0, self.dimension), dtype='float32')
+            return entries, embeddings
+
+    def restore_entries(
+        self,
+        entries: List[SemanticCacheEntry],
+        embeddings: Optional[np.ndarray] = None,
+    ) -> int:
+        """
+        Replace the cache contents with previously exported entries.
+
+        Expired entries are skipped and only the most recently used
+        ``max_entries`` are kept. If ``embeddings`` is missing or has another
+        dimension, the entries' normalized queries are re-embedded with the
+        current provider in one call.
+
+        Args:
+            entries: Entries to restore (``embedding`` may be unset)
+            embeddings: Matrix with one embedding row per entry
+
+        Returns:
+            Number of entries restored
+        """
+        if not self.enabled:
+            return 0
+
+        if not entries:
+            self.clear()
+            return 0
+
+        if embeddings is None or embeddings.shape != (len(entries), self.dimension):
+            try:
+                embeddings = self.embedding_provider.embed([e.query_text for e in entries])
+            except Exception as e:
+                logger.warning(f"Failed to re-embed restored cache entries: {e}")
+                return 0
+
+        embeddings = np.asarray(embeddings, dtype='float32').reshape(len(entries), -1)
+        if embeddings.shape[1] != self.dimension:
+            logger.warning(f"Restored embeddings have dimension {embeddings.shape[1]}, "
+                           f"expected {self.dimension}")
+            return 0
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms > 0, norms, 1.0)
+
+        keep = [
+            i for i in range(len(entries))
+            if norms[i, 0] > 0 and not entries[i].is_expired(self.ttl_seconds)
+        ]
+        keep = sorted(keep, key=lambda i: entries[i].last_accessed)[-self.max_entries:]
+        keep.sort()
+
+        with self._lock:
+            self.entries = []
+            for i in keep:
+                entries[i].embedding = embeddings[i]
+                self.entries.append(entries[i])
+            self._rebuild_index(list(range(len(self.entries))))
+
+        logger.info(f"Restored {len(self.entries)} semantic cache entries")
+        return len(self.entries)
+
     def clear(self) -> None:
         """Clear all cache entries."""
         if not self.enabled:
@@ -495,6 +685,7 @@ class SemanticCache:
         with self._lock:
             self.index = faiss.IndexFlatIP(self.dimension)
             self.entries = []
+            self._file_ids = {}
             self.stats.cache_size = 0
             logger.info("Semantic cache cleared")
 
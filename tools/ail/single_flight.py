@@ -0,0 +1,192 @@
+"""
+Single-flight coalescing of concurrent cache misses.
+
+When several agents ask the same question at the same time, all of them miss
+the cache. This module lets the first caller (the leader) run the backend
+query while the others wait on its future, so each distinct question reaches
+the archaeology backend once.
+
+Features:
+- Exact coalescing keyed by the provider's cache key
+- Optional near-duplicate mode: join an in-flight query about the same file
+  whose wording is L2-similar (uses the semantic cache's embeddings/threshold)
+- Works across threads and event loops (concurrent.futures.Future)
+- Statistics on backend queries saved
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SingleFlightStats:
+    """Statistics for request coalescing."""
+
+    backend_queries: int = 0     # Misses that ran a backend query (leaders)
+    coalesced: int = 0           # Waiters on an identical in-flight query
+    near_duplicates: int = 0     # Waiters on an L2-similar in-flight query
+
+    @property
+    def queries_saved(self) -> int:
+        """Backend queries avoided by waiting on an in-flight query."""
+        return self.coalesced + self.near_duplicates
+
+    @property
+    def saved_rate(self) -> float:
+        """Fraction of cache misses that did not reach the backend."""
+        total = self.backend_queries + self.queries_saved
+        if total == 0:
+            return 0.0
+        return self.queries_saved / total
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        return {
+            'backend_queries': self.backend_queries,
+            'coalesced': self.coalesced,
+            'near_duplicates': self.near_duplicates,
+            'queries_saved': self.queries_saved,
+            'saved_rate': f"{self.saved_rate:.1%}",
+        }
+
+
+@dataclass
+class _Flight:
+    """An in-flight backend query."""
+
+    future: Future
+    file_path: str
+    embedding: Optional[Any] = None  # Unit query embedding (near-duplicate mode)
+
+
+class SingleFlight:
+    """
+    Registry of in-flight backend queries.
+
+    Usage:
+        future, similarity = flights.join(key, file_path, query)
+        if future is not None:            # follower
+            result = await asyncio.wrap_future(future)
+        else:                             # leader
+            try:
+                result = ...
+                flights.complete(key, result)
+            except BaseException as e:
+                flights.fail(key, e)
+                raise
+    """
+
+    def __init__(self, semantic_cache: Optional[Any] = None, near_duplicates: bool = False):
+        """
+        Initialize single-flight registry.
+
+        Args:
+            semantic_cache: SemanticCache whose embedding provider, query
+                normalization and similarity threshold define near-duplicates
+            near_duplicates: Join in-flight L2-similar queries (default: False)
+        """
+        self.semantic_cache = semantic_cache
+        self.near_duplicates = bool(
+            near_duplicates and HAS_NUMPY
+            and semantic_cache is not None and semantic_cache.enabled
+        )
+        self.stats = SingleFlightStats()
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def join(self, key: str, file_path: str, query: str) -> Tuple[Optional[Future], float]:
+        """
+        Join an in-flight query or register the caller as leader for ``key``.
+
+        Args:
+            key: Exact cache key of the query
+            file_path: File path being queried
+            query: Natural language query
+
+        Returns:
+            (future, similarity) for a follower, where similarity is 1.0 for
+            an identical query; (None, 0.0) if the caller is now the leader
+            and must call complete() or fail()
+        """
+        # Embed outside the lock; only needed to match near-duplicates
+        embedding = self._embed(query) if self.near_duplicates else None
+
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.stats.coalesced += 1
+                return flight.future, 1.0
+
+            if embedding is not None:
+                match = self._find_similar(file_path, embedding)
+                if match is not None:
+                    self.stats.near_duplicates += 1
+                    return match
+
+            self._flights[key] = _Flight(future=Future(), file_path=file_path, embedding=embedding)
+            self.stats.backend_queries += 1
+            return None, 0.0
+
+    def complete(self, key: str, result: Any) -> None:
+        """Publish the leader's result to all waiters and end the flight."""
+        with self._lock:
+            flight = self._flights.pop(key, None)
+        if flight is not None:
+            flight.future.set_result(result)
+
+    def fail(self, key: str, error: BaseException) -> None:
+        """Propagate the leader's exception to all waiters and end the flight."""
+        with self._lock:
+            flight = self._flights.pop(key, None)
+        if flight is not None:
+            flight.future.set_exception(error)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of backend queries currently running."""
+        return len(self._flights)
+
+    def _embed(self, query: str) -> Optional[Any]:
+        """Unit embedding of the normalized query, or None on failure."""
+        cache = self.semantic_cache
+        try:
+            embedding = np.asarray(
+                cache.embedding_provider.embed([cache.normalize_query(query)])[0],
+                dtype=np.float32,
+            )
+        except Exception as e:
+            logger.debug(f"Near-duplicate embedding failed: {e}")
+            return None
+
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else None
+
+    def _find_similar(self, file_path: str, embedding: Any) -> Optional[Tuple[Future, float]]:
+        """Most similar in-flight query for the same file above the threshold."""
+        candidates: List[_Flight] = [
+            flight for flight in self._flights.values()
+            if flight.file_path == file_path and flight.embedding is not None
+            and flight.embedding.shape == embedding.shape
+        ]
+        if not candidates:
+            return None
+
+        similarities = np.stack([flight.embedding for flight in candidates]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.semantic_cache.similarity_threshold:
+            return None
+        return candidates[best].future, float(similarities[best])
@@ -14,7 +14,7 @@ Features:
 from __future__ import annotations
 
 import logging
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List, Callable
 from dataclasses import dataclass
 
 from tools.ail.semantic_cache import SemanticCache
@@ -173,6 +173,53 @@ class TwoTierCache:
         # Both caches missed
         return None
 
+    def get_batch(
+        self,
+        items: List[Tuple[str, str, str]]
+    ) -> List[Optional[Tuple[Any, str, float]]]:
+        """
+        Get several entries from the two-tier cache.
+
+        L1 is checked per item; all L1 misses go to L2 in one batch so their
+        queries are embedded together.
+
+        Args:
+            items: List of (file_path, query, cache_key) tuples
+
+        Returns:
+            List aligned with ``items`` of (result, cache_level,
+            similarity_score) tuples or None
+        """
+        results: List[Optional[Tuple[Any, str, float]]] = [None] * len(items)
+        l1_misses = []
+
+        for position, (file_path, query, cache_key) in enumerate(items):
+            l1_result = self.l1_cache.get(cache_key)
+            if l1_result:
+                self.stats.l1_hits += 1
+                results[position] = (l1_result, "L1", 1.0)
+            else:
+                self.stats.l1_misses += 1
+                l1_misses.append(position)
+
+        if l1_misses and self.l2_cache and self.l2_cache.enabled:
+            l2_results = self.l2_cache.get_batch(
+                [(items[position][0], items[position][1]) for position in l1_misses]
+            )
+            for position, l2_result in zip(l1_misses, l2_results):
+                if l2_result:
+                    result, similarity = l2_result
+                    self.stats.l2_hits += 1
+
+                    # Promote to L1 for future exact matches
+                    self.l1_cache.put(items[position][2], result)
+
+                    results[position] = (result, "L2", similarity)
+                else:
+                    self.stats.l2_misses += 1
+
+        return results
+
     def put(
         self,
         file_path: str,
@@ -196,6 +243,30 @@ class TwoTierCache:
         if self.l2_cache and self.l2_cache.enabled:
             self.l2_cache.put(file_path, query, result)
 
+    def results(self) -> List[Any]:
+        """Distinct cached results across both levels."""
+        seen: Dict[int, Any] = {id(r): r for r in list(self.l1_cache.cache.values())}
+        if self.l2_cache and self.l2_cache.enabled:
+            for entry in list(self.l2_cache.entries):
+                seen.setdefault(id(entry.cached_result), entry.cached_result)
+        return list(seen.values())
+
+    def invalidate(self, predicate: Callable[[Any], bool]) -> Tuple[int, int]:
+        """
+        Evict results matching a predicate from both levels.
+
+        Args:
+            predicate: Called with each cached result; True evicts it
+
+        Returns:
+            (L1 entries removed, L2 entries removed)
+        """
+        l1_removed = self.l1_cache.remove_where(predicate)
+        l2_removed = 0
+        if self.l2_cache and self.l2_cache.enabled:
+            l2_removed = self.l2_cache.remove_where(predicate)
+        return l1_removed, l2_removed
+
     def clear(self) -> None:
         """Clear both cache levels."""
         self.l1_cache.clear()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the agent tooling (registry, discovery, orchestration, telemetry).
+
+Builds synthetic agent catalogs and times registry construction and the
+discovery paths against them so performance changes can be compared with
+real numbers.
+
+Usage:
+    python tools/benchmarks.py discovery --agents 100 1000 5000
+    python tools/benchmarks.py registry --agents 100 1000 5000
+    python tools/benchmarks.py search --agents 100 1000 5000
+    python tools/benchmarks.py telemetry --days 30 365
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agent_registry import AgentRegistry
+from intelligent_orchestrator import AgentDiscoveryEngine, AgentRecommendation, TierManager
+from telemetry import EventType, TelemetryCollector
+
+
+SYNTHETIC_TERMS = [
+    "api", "cache", "database", "deploy", "frontend", "backend", "security",
+    "testing", "performance", "pipeline", "mobile", "design", "review",
+    "documentation", "analytics", "infrastructure", "migration", "search",
+    "streaming", "monitoring", "accessibility", "compliance", "automation",
+]
+
+QUERIES = [
+    "optimize my React app",
+    "security audit for the authentication api",
+    "I need help writing documentation",
+    "deploy the data pipeline to kubernetes",
+    "brainstorming ideas for a new feature",
+    "debug a flaky test",
+    "seo performance",
+    "design experiments to validate hypotheses",
+]
+
+
+def build_agent_catalog(path: Path, n_agents: int, seed: int = 42) -> Dict[str, List[str]]:
+    """
+    Write ``n_agents`` synthetic agent definitions.
+
+    Each agent gets a description drawn from SYNTHETIC_TERMS plus agent-specific
+    terms, and a curated keyword list in the style of AGENT_KEYWORDS.
+
+    Args:
+        path: Directory to write agent markdown files to
+        n_agents: Number of agents
+        seed: Random seed for reproducible catalogs
+
+    Returns:
+        Keyword lists by agent name (to extend AGENT_KEYWORDS with)
+    """
+    rng = random.Random(seed)
+    path.mkdir(parents=True, exist_ok=True)
+    keywords = {}
+    for i in range(n_agents):
+        name = f"{rng.choice(SYNTHETIC_TERMS)}-specialist-{i}"
+        terms = rng.sample(SYNTHETIC_TERMS, 6) + [f"term{rng.randrange(n_agents)}" for _ in range(4)]
+        description = f"Use this agent to {' '.join(terms)} for production systems"
+        (path / f"{name}.md").write_text(
+            f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n"
+        )
+        keywords[name] = rng.sample(SYNTHETIC_TERMS, 4) + [f"term{i}"]
+    return keywords
+
+
+def discover_exhaustive(engine: AgentDiscoveryEngine, query: str,
+                        max_results: int = 5) -> List[AgentRecommendation]:
+    """Score every agent for the query (discovery before the inverted index)."""
+    query_lower = query.lower()
+    scored_agents = []
+    for agent_name in engine.registry.list_all_agents():
+        score, breakdown = engine._calculate_relevance(agent_name, query_lower)
+        if score > 0.1:
+            scored_agents.append(AgentRecommendation(
+                agent_name=agent_name,
+                relevance_score=score,
+                tier=TierManager.get_tier(agent_name),
+                explanation=engine._generate_explanation(agent_name, query, breakdown),
+                match_breakdown=breakdown
+            ))
+    scored_agents.sort(key=lambda x: x.relevance_score, reverse=True)
+    return scored_agents[:max_results]
+
+
+def _time_queries(fn, queries: List[str], rounds: int) -> float:
+    """Mean seconds per query over ``rounds`` passes."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            fn(query)
+    return (time.perf_counter() - start) / (rounds * len(queries))
+
+
+def benchmark_discovery(catalog_sizes: List[int], rounds: int = 3) -> Dict[int, Dict[str, float]]:
+    """
+    Time AgentDiscoveryEngine.discover as the agent catalog grows.
+
+    Args:
+        catalog_sizes: Numbers of synthetic agents to benchmark
+        rounds: Passes over QUERIES per measurement
+
+    Returns:
+        Per catalog size: index build time, seconds per query for the
+        indexed and exhaustive paths, and whether their results agree
+    """
+    results = {}
+    for n_agents in catalog_sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            keywords = build_agent_catalog(Path(tmpdir), n_agents)
+            with contextlib.redirect_stdout(io.StringIO()):
+                registry = AgentRegistry(Path(tmpdir))
+
+        engine = AgentDiscoveryEngine(registry)
+        engine.AGENT_KEYWORDS = {**AgentDiscoveryEngine.AGENT_KEYWORDS, **keywords}
+
+        start = time.perf_counter()
+        engine.rebuild_index()
+        build_seconds = time.perf_counter() - start
+
+        indexed = _time_queries(engine.discover, QUERIES, rounds)
+        exhaustive = _time_queries(lambda q: discover_exhaustive(engine, q), QUERIES, 1)
+        agree = all(
+            [r.agent_name for r in engine.discover(q)] ==
+            [r.agent_name for r in discover_exhaustive(engine, q)]
+            for q in QUERIES
+        )
+        results[n_agents] = {
+            'build_seconds': build_seconds,
+            'indexed_seconds': indexed,
+            'exhaustive_seconds': exhaustive,
+            'speedup': exhaustive / max(indexed, 1e-9),
+            'agree': agree,
+        }
+    return results
+
+
+def _print_discovery(results: Dict[int, Dict[str, float]]) -> None:
+    print("\n=== Agent Discovery Benchmark (ms per query) ===")
+    print(f"{'Agents':>8} {'Index build':>12} {'Indexed':>10} {'Exhaustive':>11} {'Speedup':>8}  Same results")
+    for n_agents, result in results.items():
+        print(f"{n_agents:>8} {result['build_seconds'] * 1000:>10.1f}ms "
+              f"{result['indexed_seconds'] * 1000:>8.2f}ms {result['exhaustive_seconds'] * 1000:>9.2f}ms "
+              f"{result['speedup']:>7.1f}x  {'yes' if result['agree'] else 'NO'}")
+
+
+def benchmark_registry(catalog_sizes: List[int]) -> Dict[int, Dict[str, float]]:
+    """
+    Time AgentRegistry construction with and without the parsed index cache.
+
+    Args:
+        catalog_sizes: Numbers of synthetic agents to benchmark
+
+    Returns:
+        Per catalog size: seconds to construct without a cache, from an empty
+        cache (parse and write), from a warm cache, and from a warm cache
+        after one agent file changed
+    """
+    results = {}
+    for n_agents in catalog_sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            agents_dir = Path(tmpdir) / 'agents'
+            cache_dir = Path(tmpdir) / 'cache'
+            build_agent_catalog(agents_dir, n_agents)
+
+            def construct(**kwargs) -> float:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    AgentRegistry(agents_dir, cache_dir=cache_dir, **kwargs)
+                return time.perf_counter() - start
+
+            uncached = construct(use_cache=False)
+            cold = construct()
+            warm = construct()
+            changed = next(agents_dir.glob('*.md'))
+            changed.write_text(changed.read_text() + "\nUpdated guidance.\n")
+            one_changed = construct()
+
+        results[n_agents] = {
+            'uncached_seconds': uncached,
+            'cold_seconds': cold,
+            'warm_seconds': warm,
+            'one_changed_seconds': one_changed,
+            'speedup': uncached / max(warm, 1e-9),
+        }
+    return results
+
+
+def _print_registry(results: Dict[int, Dict[str, float]]) -> None:
+    print("\n=== Agent Registry Construction Benchmark (ms) ===")
+    print(f"{'Agents':>8} {'No cache':>10} {'Cold':>10} {'Warm':>10} {'1 changed':>10} {'Speedup':>8}")
+    for n_agents, result in results.items():
+        print(f"{n_agents:>8} {result['uncached_seconds'] * 1000:>8.1f}ms "
+              f"{result['cold_seconds'] * 1000:>8.1f}ms {result['warm_seconds'] * 1000:>8.1f}ms "
+              f"{result['one_changed_seconds'] * 1000:>8.1f}ms {result['speedup']:>7.1f}x")
+
+
+def search_exhaustive(registry: AgentRegistry, query: str,
+                      max_results: int = 10) -> List[Tuple[str, float]]:
+    """Search by scanning every agent (AgentRegistry.search before its indices)."""
+    query_lower = query.lower()
+    query_words = set(re.findall(r'\b[a-z0-9][a-z0-9-]*\b', query_lower))
+    scores: Dict[str, float] = defaultdict(float)
+    if query_lower in registry.name_index:
+        scores[query_lower] += 10.0
+    for agent_name in registry.name_index:
+        if query_lower in agent_name.lower():
+            scores[agent_name] += 8.0
+    for capability in registry.capability_index:
+        if capability in query_lower or query_lower in capability:
+            for agent_name in registry.capability_index[capability]:
+                scores[agent_name] += 5.0
+    for domain in registry.domain_index:
+        if domain in query_lower or query_lower in domain:
+            for agent_name in registry.domain_index[domain]:
+                scores[agent_name] += 4.0
+    for word in query_words:
+        for agent_name in registry.keyword_index.get(word, []):
+            scores[agent_name] += 2.0
+    for agent_name, agent in registry.name_index.items():
+        if query_lower in agent.description.lower():
+            scores[agent_name] += 3.0
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:max_results]
+
+
+# Selective queries match a handful of agents; broad ones match a fixed
+# fraction of the catalog, so their cost is bound by the result set
+SEARCH_QUERIES = {
+    'selective': ["specialist-42", "term305", "kubernetes", "cache-specialist-99", "term12345"],
+    'broad': ["streaming", "production systems", "migration", "api"],
+}
+
+
+def benchmark_search(catalog_sizes: List[int], rounds: int = 3) -> Dict[int, Dict[str, float]]:
+    """
+    Time AgentRegistry.search as the agent catalog grows.
+
+    Args:
+        catalog_sizes: Numbers of synthetic agents to benchmark
+        rounds: Passes over SEARCH_QUERIES per measurement
+
+    Returns:
+        Per catalog size: index build time, and per SEARCH_QUERIES group the
+        seconds per query for indexed search (LRU cleared), LRU hits and the
+        full scan
+    """
+    results = {}
+    for n_agents in catalog_sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_agent_catalog(Path(tmpdir), n_agents)
+            with contextlib.redirect_stdout(io.StringIO()):
+                registry = AgentRegistry(Path(tmpdir))
+
+        start = time.perf_counter()
+        registry._build_search_index()
+        build_seconds = time.perf_counter() - start
+
+        def search_uncached(query: str):
+            registry._search_cache.clear()
+            return registry.search(query)
+
+        results[n_agents] = {'build_seconds': build_seconds}
+        for group, queries in SEARCH_QUERIES.items():
+            indexed = _time_queries(search_uncached, queries, rounds)
+            for query in queries:
+                registry.search(query)
+            results[n_agents][group] = {
+                'indexed_seconds': indexed,
+                'lru_seconds': _time_queries(registry.search, queries, rounds),
+                'scan_seconds': _time_queries(lambda q: search_exhaustive(registry, q),
+                                              queries, rounds),
+            }
+    return results
+
+
+def _print_search(results: Dict[int, Dict[str, float]]) -> None:
+    print("\n=== Agent Registry Search Benchmark (ms per query) ===")
+    print(f"{'Agents':>8} {'Index build':>12} {'Queries':>10} {'Indexed':>10} {'LRU hit':>10} {'Full scan':>10}")
+    for n_agents, result in results.items():
+        for group in SEARCH_QUERIES:
+            timings = result[group]
+            build = f"{result['build_seconds'] * 1000:>10.1f}ms" if group == 'selective' else ' ' * 12
+            print(f"{n_agents:>8} {build} {group:>10} {timings['indexed_seconds'] * 1000:>8.2f}ms "
+                  f"{timings['lru_seconds'] * 1000:>8.3f}ms {timings['scan_seconds'] * 1000:>8.2f}ms")
+
+
+def write_telemetry_events(collector: TelemetryCollector, n_days: int, events_per_day: int,
+                           seed: int = 42) -> None:
+    """
+    Write ``n_days`` daily event files of synthetic agent and command events.
+
+    Args:
+        collector: Collector whose events directory receives the files
+        n_days: Number of consecutive days, ending today
+        events_per_day: Events per daily file
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    agents = [f"agent-{i}" for i in range(150)]
+    commands = [f"/command-{i}" for i in range(20)]
+    start = time.time() - n_days * 86400
+    for day in range(n_days):
+        day_start = start + day * 86400
+        lines = []
+        for i in range(events_per_day):
+            event = {"timestamp": day_start + i * 86400 / events_per_day}
+            roll = rng.random()
+            if roll < 0.1:
+                event.update(event_type=EventType.COMMAND_INVOKED.value, command_name=rng.choice(commands))
+            elif roll < 0.15:
+                event.update(event_type=EventType.USER_FEEDBACK.value, user_satisfied=rng.random() < 0.8)
+            elif roll < 0.55:
+                event.update(event_type=EventType.AGENT_INVOKED.value, agent_name=rng.choice(agents))
+            else:
+                event.update(event_type=rng.choice([EventType.AGENT_COMPLETED.value] * 9
+                                                   + [EventType.AGENT_FAILED.value]),
+                             agent_name=rng.choice(agents),
+                             duration_seconds=rng.lognormvariate(2.0, 1.0))
+            lines.append(json.dumps(event))
+        day_name = time.strftime("%Y-%m-%d", time.localtime(day_start))
+        with open(collector.events_dir / f"{day_name}.jsonl", 'a') as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def benchmark_telemetry(day_counts: List[int], events_per_day: int = 200) -> Dict[int, Dict[str, float]]:
+    """
+    Time TelemetryCollector.generate_summary over growing event histories.
+
+    Args:
+        day_counts: Numbers of daily event files to benchmark
+        events_per_day: Events per daily file
+
+    Returns:
+        Per day count: seconds for a scan of every event, a cold summary
+        (parse all, compact closed days), a rebuild from segments, a warm
+        summary, a summary after events were appended to today's file, and
+        one agent's percentiles over the last 30 days (merged day sketches)
+    """
+    results = {}
+    for n_days in day_counts:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            collector = TelemetryCollector(Path(tmpdir))
+            write_telemetry_events(collector, n_days, events_per_day)
+
+            def timed(fn) -> float:
+                start = time.perf_counter()
+                fn()
+                return time.perf_counter() - start
+
+            scan = timed(lambda: collector._summary_from_events(collector.load_events()))
+            cold = timed(collector.generate_summary)
+            collector.store.path.unlink()
+            from_segments = timed(collector.generate_summary)
+            warm = timed(collector.generate_summary)
+            write_telemetry_events(collector, 1, 20, seed=7)
+            appended = timed(collector.generate_summary)
+            window_start = time.strftime("%Y-%m-%d", time.localtime(time.time() - 30 * 86400))
+            window = timed(lambda: collector.duration_percentiles(agent_name="agent-0",
+                                                                  start=window_start))
+
+        results[n_days] = {
+            'events': n_days * events_per_day,
+            'scan_seconds': scan,
+            'cold_seconds': cold,
+            'segments_seconds': from_segments,
+            'warm_seconds': warm,
+            'appended_seconds': appended,
+            'window_seconds': window,
+            'speedup': scan / max(warm, 1e-9),
+        }
+    return results
+
+
+def _print_telemetry(results: Dict[int, Dict[str, float]]) -> None:
+    print("\n=== Telemetry Summary Benchmark (ms) ===")
+    print(f"{'Days':>6} {'Events':>9} {'Full scan':>10} {'Cold':>10} {'Segments':>10} "
+          f"{'Warm':>10} {'Appended':>10} {'Window':>10} {'Speedup':>8}")
+    for n_days, result in results.items():
+        print(f"{n_days:>6} {result['events']:>9} {result['scan_seconds'] * 1000:>8.1f}ms "
+              f"{result['cold_seconds'] * 1000:>8.1f}ms {result['segments_seconds'] * 1000:>8.1f}ms "
+              f"{result['warm_seconds'] * 1000:>8.2f}ms {result['appended_seconds'] * 1000:>8.2f}ms "
+              f"{result['window_seconds'] * 1000:>8.2f}ms {result['speedup']:>7.1f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Agent tooling benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    discovery = subparsers.add_parser('discovery', help='Agent discovery latency by catalog size')
+    discovery.add_argument('--agents', type=int, nargs='+', default=[100, 1000, 5000],
+                           help='Synthetic catalog sizes (default: 100 1000 5000)')
+    discovery.add_argument('--rounds', type=int, default=3,
+                           help='Passes over the query set per measurement (default: 3)')
+
+    registry = subparsers.add_parser('registry', help='Agent registry construction time')
+    registry.add_argument('--agents', type=int, nargs='+', default=[100, 1000, 5000],
+                          help='Synthetic catalog sizes (default: 100 1000 5000)')
+
+    search = subparsers.add_parser('search', help='Agent registry search latency by catalog size')
+    search.add_argument('--agents', type=int, nargs='+', default=[100, 1000, 5000],
+                        help='Synthetic catalog sizes (default: 100 1000 5000)')
+    search.add_argument('--rounds', type=int, default=3,
+                        help='Passes over the query set per measurement (default: 3)')
+
+    telemetry = subparsers.add_parser('telemetry', help='Telemetry summary time by history length')
+    telemetry.add_argument('--days', type=int, nargs='+', default=[30, 365],
+                           help='Days of event files (default: 30 365)')
+    telemetry.add_argument('--events-per-day', type=int, default=200,
+                           help='Events per daily file (default: 200)')
+
+    args = parser.parse_args(argv)
+
+    if args.benchmark == 'discovery':
+        _print_discovery(benchmark_discovery(args.agents, args.rounds))
+
+    if args.benchmark == 'registry':
+        _print_registry(benchmark_registry(args.agents))
+
+    if args.benchmark == 'search':
+        _print_search(benchmark_search(args.agents, args.rounds))
+
+    if args.benchmark == 'telemetry':
+        _print_telemetry(benchmark_telemetry(args.days, args.events_per_day))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,9 @@ The goal is to answer "why" questions about code decisions using natural languag
 __version__ = "1.0.0"
 
 from .git_analyzer import GitArchaeologist, Commit, ArchCommit, RepositoryHistory
+from .history_store import HistoryStore, StoredHistory
+from .file_index import FileCommitIndex
+from .blame_index import BlameIndex
 from .github_integrator import (
     GitHubArchaeologist,
     EnrichedCommit,
@@ -20,13 +23,18 @@ from .github_integrator import (
     PullRequest,
     Issue,
 )
+from .github_cache import GitHubResponseCache
+from .commit_pr_map import CommitPullRequestMap
 from .context_synthesizer import (
     ContextSynthesizer,
     SearchableIndex,
     Answer,
     Citation,
     SimpleEmbeddingProvider,
+    HashingEmbeddingProvider,
+    ExactVectorIndex,
 )
+from .lexical_index import BM25Index, reciprocal_rank_fusion
 from .query_cli import ArchaeologyCLI
 
 __all__ = [
@@ -35,18 +43,28 @@ __all__ = [
     "Commit",
     "ArchCommit",
     "RepositoryHistory",
+    "HistoryStore",
+    "StoredHistory",
+    "FileCommitIndex",
+    "BlameIndex",
     # GitHub Integration
     "GitHubArchaeologist",
     "EnrichedCommit",
     "EnrichedHistory",
     "PullRequest",
     "Issue",
+    "GitHubResponseCache",
+    "CommitPullRequestMap",
     # Context Synthesis
     "ContextSynthesizer",
     "SearchableIndex",
     "Answer",
     "Citation",
     "SimpleEmbeddingProvider",
+    "HashingEmbeddingProvider",
+    "ExactVectorIndex",
+    "BM25Index",
+    "reciprocal_rank_fusion",
     # Query CLI
     "ArchaeologyCLI",
 ]
@@ -0,0 +1,861 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for Cognitive Code Archaeology.
+
+This module builds synthetic repositories and times the archaeology pipeline
+against them so performance changes can be compared with real numbers.
+
+Usage:
+    python tools/code_archaeology/benchmarks.py extraction --commits 10000
+    python tools/code_archaeology/benchmarks.py history --commits 10000
+    python tools/code_archaeology/benchmarks.py blame --commits 10000 --workers 4
+    python tools/code_archaeology/benchmarks.py embedding --documents 100000
+    python tools/code_archaeology/benchmarks.py search --documents 10000 100000 1000000
+    python tools/code_archaeology/benchmarks.py fallback --documents 100000
+    python tools/code_archaeology/benchmarks.py github --commits 200 --latency 0.05
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import io
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from code_archaeology.blame_index import BlameIndex
+from code_archaeology.context_synthesizer import (
+    ContextSynthesizer,
+    ExactVectorIndex,
+    HAS_FAISS,
+    SimpleEmbeddingProvider,
+)
+from code_archaeology.fake_github import FakeGitHubServer
+from code_archaeology.git_analyzer import Commit, GitArchaeologist, RepositoryHistory
+from code_archaeology.github_integrator import GitHubArchaeologist
+from code_archaeology.history_store import HistoryStore
+from code_archaeology.lexical_index import BM25Index, reciprocal_rank_fusion
+
+
+SYNTHETIC_WORDS = [
+    "refactor", "cache", "parser", "index", "auth", "session", "query",
+    "migration", "schema", "config", "logging", "retry", "timeout", "api",
+    "client", "server", "worker", "queue", "metrics", "tests", "docs",
+]
+
+
+def build_synthetic_repo(path: Path, n_commits: int, n_files: int = 500,
+                         files_per_commit: int = 3, seed: int = 42) -> Path:
+    """
+    Create a git repository with ``n_commits`` synthetic commits.
+
+    Commits are streamed through ``git fast-import`` so even 50k-commit repos
+    build in seconds. Each commit rewrites a few files drawn from a fixed pool.
+
+    Args:
+        path: Directory to create the repository in
+        n_commits: Number of commits to generate
+        n_files: Size of the file pool
+        files_per_commit: Files modified per commit
+        seed: Random seed for reproducible repositories
+
+    Returns:
+        Path to the repository
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(['git', 'init', '-q', str(path)], check=True)
+
+    files = [
+        f"src/{rng.choice(SYNTHETIC_WORDS)}/module_{i}.py" for i in range(n_files)
+    ]
+    authors = [f"Dev {i}" for i in range(20)]
+    timestamp = 1_600_000_000
+
+    process = subprocess.Popen(
+        ['git', '-C', str(path), 'fast-import', '--quiet'],
+        stdin=subprocess.PIPE,
+    )
+
+    def write(data: str) -> None:
+        process.stdin.write(data.encode('utf-8'))
+
+    for i in range(n_commits):
+        author = authors[i % len(authors)]
+        timestamp += rng.randint(60, 7200)
+        words = rng.sample(SYNTHETIC_WORDS, 4)
+        message = f"{words[0]} {words[1]} in {words[2]}\n\nUpdate {words[3]} handling (#{i % 997 + 1}).\n"
+        encoded = message.encode('utf-8')
+
+        write("commit refs/heads/main\n")
+        write(f"mark :{i + 1}\n")
+        write(f"committer {author} <dev{i % 20}@example.com> {timestamp} +0000\n")
+        write(f"data {len(encoded)}\n")
+        process.stdin.write(encoded)
+        write("\n")
+        if i > 0:
+            write(f"from :{i}\n")
+
+        for file_path in rng.sample(files, files_per_commit):
+            lines = "\n".join(
+                f"# {rng.choice(SYNTHETIC_WORDS)} {i}" for _ in range(rng.randint(1, 20))
+            ) + "\n"
+            content = lines.encode('utf-8')
+            write(f"M 100644 inline {file_path}\n")
+            write(f"data {len(content)}\n")
+            process.stdin.write(content)
+            write("\n")
+        write("\n")
+
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+
+    subprocess.run(['git', '-C', str(path), 'symbolic-ref', 'HEAD', 'refs/heads/main'],
+                   check=True)
+    return path
+
+
+def _time_call(fn: Callable[[], object]) -> Dict[str, float]:
+    """Time a single call and return elapsed seconds plus result size."""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'count': len(result) if hasattr(result, '__len__') else 0}
+
+
+def benchmark_extraction(repo_path: Path, legacy_limit: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Compare streaming and per-commit commit extraction.
+
+    Args:
+        repo_path: Repository to extract history from
+        legacy_limit: Cap on commits for the legacy path (None for all).
+            The legacy rate is extrapolated to the full history when capped.
+
+    Returns:
+        Dictionary with timings for each extraction path
+    """
+    archaeologist = GitArchaeologist(str(repo_path))
+
+    streaming = _time_call(lambda: archaeologist.extract_commit_history(streaming=True))
+    legacy = _time_call(
+        lambda: archaeologist.extract_commit_history(limit=legacy_limit, streaming=False)
+    )
+
+    streaming['commits_per_s'] = streaming['count'] / max(streaming['seconds'], 1e-9)
+    legacy['commits_per_s'] = legacy['count'] / max(legacy['seconds'], 1e-9)
+    legacy['projected_full_seconds'] = streaming['count'] / max(legacy['commits_per_s'], 1e-9)
+
+    return {
+        'streaming': streaming,
+        'legacy': legacy,
+        'speedup': legacy['projected_full_seconds'] / max(streaming['seconds'], 1e-9),
+    }
+
+
+def _print_extraction(results: Dict[str, Dict[str, float]]) -> None:
+    streaming = results['streaming']
+    legacy = results['legacy']
+    print("\n=== Commit Extraction Benchmark ===")
+    print(f"Streaming (git log -z --numstat): {streaming['count']} commits "
+          f"in {streaming['seconds']:.2f}s ({streaming['commits_per_s']:.0f} commits/s)")
+    print(f"Legacy (git show per commit):     {legacy['count']} commits "
+          f"in {legacy['seconds']:.2f}s ({legacy['commits_per_s']:.0f} commits/s)")
+    if legacy['count'] != streaming['count']:
+        print(f"  Projected legacy time for {streaming['count']} commits: "
+              f"{legacy['projected_full_seconds']:.1f}s")
+    print(f"Speedup: {results['speedup']:.1f}x")
+
+
+def _append_commits(repo_path: Path, count: int) -> None:
+    """Add ``count`` small commits on top of the current HEAD."""
+    for i in range(count):
+        target = Path(repo_path) / 'src' / f'delta_{i}.py'
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(f"value = {i}\n")
+        subprocess.run(['git', '-C', str(repo_path), 'add', '-A'], check=True)
+        subprocess.run(
+            ['git', '-C', str(repo_path), '-c', 'user.name=Bench', '-c', 'user.email=bench@example.com',
+             'commit', '-q', '-m', f'Delta commit {i}'],
+            check=True,
+        )
+
+
+def benchmark_history_store(repo_path: Path, store_dir: Path,
+                            delta_commits: int = 10) -> Dict[str, Dict[str, float]]:
+    """
+    Time cold, warm and HEAD-delta startup through the persisted history store.
+
+    Args:
+        repo_path: Repository to analyze (gets ``delta_commits`` new commits)
+        store_dir: Directory for the history store
+        delta_commits: Commits to add before the delta refresh
+
+    Returns:
+        Dictionary with timings for each startup mode
+    """
+    archaeologist = GitArchaeologist(str(repo_path))
+    store = HistoryStore(str(repo_path), store_dir=store_dir)
+    store.clear()
+
+    def run() -> object:
+        history, new_commits = archaeologist.analyze_repo_incremental(store)
+        return new_commits
+
+    cold = _time_call(run)
+    warm = _time_call(run)
+    _append_commits(repo_path, delta_commits)
+    delta = _time_call(run)
+
+    return {'cold': cold, 'warm': warm, 'delta': delta}
+
+
+def _print_history_store(results: Dict[str, Dict[str, float]]) -> None:
+    print("\n=== History Store Startup Benchmark ===")
+    print(f"Cold (full analysis + save):   {results['cold']['seconds'] * 1000:.0f}ms "
+          f"({results['cold']['count']} commits read)")
+    print(f"Warm (no new commits):         {results['warm']['seconds'] * 1000:.0f}ms "
+          f"({results['warm']['count']} commits read)")
+    print(f"Delta (new commits on HEAD):   {results['delta']['seconds'] * 1000:.0f}ms "
+          f"({results['delta']['count']} commits read)")
+
+
+def benchmark_blame_index(repo_path: Path, store_dir: Path, workers: int,
+                           delta_commits: int = 10,
+                           n_queries: int = 1000) -> Dict[str, Dict[str, float]]:
+    """
+    Time cold builds (one and ``workers`` processes), warm and delta refreshes
+    of the blame index, and line-range lookups.
+
+    Args:
+        repo_path: Repository to blame (gets ``delta_commits`` new commits)
+        store_dir: Directory for the blame index
+        workers: Worker processes for the parallel cold build
+        delta_commits: Commits to add before the delta refresh
+        n_queries: Line-range lookups to time
+
+    Returns:
+        Dictionary with timings for each stage
+    """
+    def build(max_workers: int) -> BlameIndex:
+        index = BlameIndex(str(repo_path), store_dir=store_dir, max_workers=max_workers)
+        index.clear()
+        return index
+
+    serial = build(1)
+    serial_cold = _time_call(lambda: [None] * serial.refresh())
+    index = build(workers)
+    cold = _time_call(lambda: [None] * index.refresh())
+    index.save()
+
+    def reload_and_refresh() -> object:
+        reloaded = BlameIndex(str(repo_path), store_dir=store_dir, max_workers=workers)
+        reloaded.load()
+        return [None] * reloaded.refresh()
+
+    warm = _time_call(reload_and_refresh)
+    # fast-import leaves no work tree; check it out so new commits only add files
+    subprocess.run(['git', '-C', str(repo_path), 'reset', '-q', '--hard'], check=True)
+    _append_commits(repo_path, delta_commits)
+    delta = _time_call(lambda: [None] * index.refresh())
+
+    rng = random.Random(7)
+    paths = sorted(index.files)
+    ranges = []
+    for _ in range(n_queries):
+        path = rng.choice(paths)
+        n_lines = index.files[path][0][-1] - 1
+        start = rng.randint(1, max(n_lines, 1))
+        ranges.append((path, start, start + rng.randint(0, 20)))
+    start_time = time.perf_counter()
+    for path, first, last in ranges:
+        index.commits_for_lines(path, first, last)
+    lookup_ms = (time.perf_counter() - start_time) * 1000 / max(n_queries, 1)
+
+    return {
+        'serial_cold': serial_cold,
+        'cold': cold,
+        'warm': warm,
+        'delta': delta,
+        'lookup': {'ms': lookup_ms, 'count': n_queries},
+        'workers': {'count': workers},
+    }
+
+
+def _print_blame_index(results: Dict[str, Dict[str, float]]) -> None:
+    workers = results['workers']['count']
+    print("\n=== Blame Index Benchmark ===")
+    print(f"Cold (1 process):              {results['serial_cold']['seconds'] * 1000:.0f}ms "
+          f"({results['serial_cold']['count']} files blamed)")
+    label = f"Cold ({workers} processes):"
+    print(f"{label:<31}{results['cold']['seconds'] * 1000:.0f}ms "
+          f"({results['cold']['count']} files blamed)")
+    print(f"Warm (load, HEAD unchanged):   {results['warm']['seconds'] * 1000:.0f}ms "
+          f"({results['warm']['count']} files blamed)")
+    print(f"Delta (new commits on HEAD):   {results['delta']['seconds'] * 1000:.0f}ms "
+          f"({results['delta']['count']} files blamed)")
+    print(f"Line-range lookup:             {results['lookup']['ms'] * 1000:.1f}us")
+
+
+def generate_commit_documents(n_documents: int, seed: int = 42) -> List[str]:
+    """
+    Generate commit-style documents like those ContextSynthesizer indexes.
+
+    Args:
+        n_documents: Number of documents
+        seed: Random seed for reproducible corpora
+
+    Returns:
+        List of document texts
+    """
+    rng = random.Random(seed)
+    identifiers = [f"{rng.choice(SYNTHETIC_WORDS)}_{i}" for i in range(5000)]
+    documents = []
+    for i in range(n_documents):
+        words = rng.sample(SYNTHETIC_WORDS, 4) + rng.sample(identifiers, 6)
+        documents.append(
+            f"{words[0]} {words[1]} in {words[2]}\n\nUpdate {words[3]} handling for "
+            f"{' '.join(words[4:])} (#{i % 997 + 1}).\n\n"
+            f"Author: Dev {i % 20}\nDate: 2024-01-{i % 28 + 1:02d} 12:00:00"
+        )
+    return documents
+
+
+def legacy_simple_embed(texts: List[str], max_features: int = 512) -> object:
+    """Reference copy of the per-document SimpleEmbeddingProvider loop it replaced."""
+    from collections import Counter
+    import numpy as np
+
+    counter = Counter()
+    for text in texts:
+        counter.update(re.findall(r'\w+', text.lower()))
+    vocabulary = {token: i for i, (token, _) in enumerate(counter.most_common(max_features))}
+
+    embeddings = []
+    for text in texts:
+        vec = np.zeros(len(vocabulary), dtype=np.float32)
+        for token in re.findall(r'\w+', text.lower()):
+            if token in vocabulary:
+                vec[vocabulary[token]] += 1.0
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec = vec / norm
+        embeddings.append(vec)
+    return np.array(embeddings)
+
+
+def benchmark_embedding(n_documents: int, legacy_limit: Optional[int] = None,
+                        max_features: int = 512) -> Dict[str, Dict[str, float]]:
+    """
+    Compare vectorized and per-document TF-IDF embedding throughput.
+
+    Args:
+        n_documents: Corpus size
+        legacy_limit: Cap on documents for the legacy path (None for all)
+        max_features: Vocabulary size
+
+    Returns:
+        Dictionary with timings for fitting, query embedding and the legacy path
+    """
+    documents = generate_commit_documents(n_documents)
+    queries = documents[:1000]
+
+    provider = SimpleEmbeddingProvider(max_features=max_features)
+    fit = _time_call(lambda: provider.embed(documents))
+    query = _time_call(lambda: provider.embed(queries))
+    legacy_docs = documents[:legacy_limit] if legacy_limit else documents
+    legacy = _time_call(lambda: legacy_simple_embed(legacy_docs, max_features))
+
+    for result in (fit, query, legacy):
+        result['docs_per_s'] = result['count'] / max(result['seconds'], 1e-9)
+
+    return {
+        'vectorized': fit,
+        'query': query,
+        'legacy': legacy,
+        'speedup': fit['docs_per_s'] / max(legacy['docs_per_s'], 1e-9),
+    }
+
+
+def _print_embedding(results: Dict[str, Dict[str, float]]) -> None:
+    print("\n=== SimpleEmbeddingProvider Benchmark ===")
+    print(f"Vectorized fit + embed:        {results['vectorized']['count']} docs "
+          f"in {results['vectorized']['seconds']:.2f}s "
+          f"({results['vectorized']['docs_per_s']:.0f} docs/s)")
+    print(f"Vectorized embed (fitted):     {results['query']['count']} docs "
+          f"in {results['query']['seconds'] * 1000:.0f}ms "
+          f"({results['query']['docs_per_s']:.0f} docs/s)")
+    print(f"Legacy per-document loop:      {results['legacy']['count']} docs "
+          f"in {results['legacy']['seconds']:.2f}s "
+          f"({results['legacy']['docs_per_s']:.0f} docs/s)")
+    print(f"Speedup: {results['speedup']:.1f}x")
+
+
+def build_github_fixture(server: FakeGitHubServer, n_commits: int, commits_per_pr: int = 3,
+                         seed: int = 42) -> RepositoryHistory:
+    """
+    Populate a fake GitHub server and return a matching commit history.
+
+    Commits are grouped into PRs of ``commits_per_pr`` and reference their
+    PR (``#<n>``); a third also reference an issue and a tenth carry no
+    reference, so enrichment falls back to the commit search endpoint.
+
+    Args:
+        server: FakeGitHubServer to populate
+        n_commits: Number of commits
+        commits_per_pr: Commits in each pull request
+        seed: Random seed for reproducible fixtures
+
+    Returns:
+        RepositoryHistory with the commits, newest first
+    """
+    rng = random.Random(seed)
+    date = datetime(2024, 1, 1)
+    shas = [f"{rng.getrandbits(160):040x}" for _ in range(n_commits)]
+    commits = []
+    for i, sha in enumerate(shas):
+        group = i // commits_per_pr
+        pr_number = 2 * group + 1
+        issue_number = 2 * group + 2
+        if i % commits_per_pr == 0:
+            server.add_pull_request(pr_number, commits=shas[i:i + commits_per_pr],
+                                    comments=rng.randint(0, 4), review_comments=rng.randint(0, 4))
+        words = rng.sample(SYNTHETIC_WORDS, 3)
+        message = f"{words[0]} {words[1]} in {words[2]}"
+        if i % 10 != 0:
+            message += f" (#{pr_number})"
+        if group % 3 == 0:
+            if issue_number not in server.issues:
+                server.add_issue(issue_number, comments=rng.randint(0, 3))
+            message += f"\n\nFixes #{issue_number}"
+        commits.append(Commit(
+            sha=sha, message=message, author=f"Dev {i % 20}", email="dev@example.com",
+            date=date + timedelta(hours=i), parents=[],
+        ))
+    commits.reverse()
+
+    return RepositoryHistory(
+        repo_path=Path('.'), commits=commits, arch_commits=[], temporal_index={},
+        file_history={}, author_stats={}, branch_commits={},
+    )
+
+
+def benchmark_github(n_commits: int, latency: float = 0.05, concurrency: int = 16,
+                     commits_per_pr: int = 3) -> Dict[str, Dict[str, float]]:
+    """
+    Time GitHub enrichment against a local fake GitHub.
+
+    Runs sequential enrichment without caches (the original behaviour),
+    concurrent enrichment from a cold response cache, a second concurrent
+    run from the warm cache in a fresh process-like archaeologist, a
+    concurrent run resolving commits through the commit -> PR map (built
+    within the timed run), and GraphQL bulk enrichment.
+
+    Args:
+        n_commits: Commits to enrich
+        latency: Simulated round-trip time per request in seconds
+        concurrency: Requests in flight for the concurrent runs
+        commits_per_pr: Commits in each pull request
+
+    Returns:
+        Dictionary with timings, request counts and quota used per run
+    """
+    results = {}
+    with FakeGitHubServer(latency=latency) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        history = build_github_fixture(server, n_commits, commits_per_pr)
+        runs = (('sequential', 1, None), ('concurrent', concurrency, cache_dir),
+                ('warm', concurrency, cache_dir), ('mapped', concurrency, None),
+                ('bulk', 1, None))
+
+        for name, workers, run_cache_dir in runs:
+            archaeologist = GitHubArchaeologist('owner', 'repo', token='bench',
+                                                base_url=server.url, cache_dir=run_cache_dir)
+            if name == 'sequential':
+                # Sequential baseline fetches every PR reference, as before memoization
+                archaeologist._pull_requests = _NoMemo()
+                archaeologist._issues = _NoMemo()
+            server.request_count = 0
+            server.max_in_flight = 0
+            quota_before = server.rate_limit_remaining
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = _time_call(
+                    lambda: archaeologist.enrich_history(
+                        history, concurrency=workers, bulk=name == 'bulk',
+                        commit_map=name == 'mapped').enriched_commits
+                )
+            result['requests'] = server.request_count
+            result['quota'] = quota_before - server.rate_limit_remaining
+            result['max_in_flight'] = server.max_in_flight
+            results[name] = result
+
+    results['speedup'] = results['sequential']['seconds'] / max(results['concurrent']['seconds'], 1e-9)
+    return results
+
+
+class _NoMemo(dict):
+    """Memo that never retains entries (reproduces the unmemoized fetch pattern)."""
+
+    def __setitem__(self, key, value) -> None:
+        pass
+
+
+def _print_github(results: Dict[str, Dict[str, float]], latency: float) -> None:
+    print(f"\n=== GitHub Enrichment Benchmark ({latency * 1000:.0f}ms per request) ===")
+    labels = {
+        'sequential': 'Sequential, no memo/cache:',
+        'concurrent': 'Concurrent, cold cache:',
+        'warm': 'Concurrent, warm cache:',
+        'mapped': 'Concurrent, commit -> PR map:',
+        'bulk': 'GraphQL bulk:',
+    }
+    for name, label in labels.items():
+        result = results[name]
+        print(f"{label:<31}{result['count']} commits in {result['seconds']:.2f}s "
+              f"({result['requests']} requests, {result['quota']} quota, "
+              f"max {result['max_in_flight']} in flight)")
+    print(f"Speedup (cold): {results['speedup']:.1f}x")
+
+
+def generate_search_queries(documents: List[str], shas: List[str], n_queries: int,
+                            seed: int = 7) -> List[Dict[str, object]]:
+    """
+    Generate questions that each target one synthetic commit document.
+
+    Three kinds, in equal numbers: an abbreviated SHA, three of the
+    document's identifiers, and its title words plus one identifier.
+
+    Args:
+        documents: Documents from generate_commit_documents
+        shas: Full SHA of each document
+        n_queries: Number of queries
+        seed: Random seed
+
+    Returns:
+        List of {'kind', 'text', 'target'} dictionaries
+    """
+    rng = random.Random(seed)
+    identifier = re.compile(r'\b[a-z]+_\d+\b')
+    queries = []
+    for i in range(n_queries):
+        target = rng.randrange(len(documents))
+        title = documents[target].split('\n', 1)[0]
+        identifiers = identifier.findall(documents[target])
+        kind = ('sha', 'identifiers', 'topic')[i % 3]
+        if kind == 'sha':
+            text = f"Why was {shas[target][:8]} needed?"
+        elif kind == 'identifiers':
+            text = f"Where did {' and '.join(rng.sample(identifiers, 3))} change?"
+        else:
+            text = f"Why {title} for {rng.choice(identifiers)}?"
+        queries.append({'kind': kind, 'text': text, 'target': target})
+    return queries
+
+
+def benchmark_search(n_documents: int, n_queries: int = 300,
+                     max_features: int = 256) -> Dict[str, Dict[str, float]]:
+    """
+    Compare vector, BM25 and fused hybrid retrieval on synthetic commits.
+
+    Mirrors ContextSynthesizer.search: TF-IDF vectors in a flat L2 index,
+    BM25 over each document plus its SHA, and reciprocal rank fusion of the
+    top FUSION_DEPTH of each. Recall@10 is the share of queries whose target
+    document is in the top 10.
+
+    Args:
+        n_documents: Corpus size
+        n_queries: Queries to run
+        max_features: TF-IDF vocabulary size
+
+    Returns:
+        Dictionary with build timings and per-mode latency and recall
+    """
+    import numpy as np
+
+    documents = generate_commit_documents(n_documents)
+    shas = [hashlib.sha1(str(i).encode()).hexdigest() for i in range(n_documents)]
+    queries = generate_search_queries(documents, shas, n_queries)
+
+    # Fit on a sample, then embed in chunks so the corpus is never tokenized at once
+    start = time.perf_counter()
+    provider = SimpleEmbeddingProvider(max_features=max_features).fit(documents[:50_000])
+    if HAS_FAISS:
+        import faiss
+        vectors = faiss.IndexFlatL2(provider.dimension)
+        for chunk in range(0, n_documents, 50_000):
+            vectors.add(provider.embed(documents[chunk:chunk + 50_000]))
+    else:
+        vectors = np.vstack([provider.embed(documents[chunk:chunk + 50_000])
+                             for chunk in range(0, n_documents, 50_000)])
+    vector_build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lexical = BM25Index([f"{document}\n{sha}" for document, sha in zip(documents, shas)])
+    lexical_build_s = time.perf_counter() - start
+    del documents
+
+    depth = ContextSynthesizer.FUSION_DEPTH
+
+    def vector_ranking(text: str, k: int) -> List[int]:
+        query = provider.embed([text])
+        if HAS_FAISS:
+            return [int(i) for i in vectors.search(query, k)[1][0] if i >= 0]
+        distances = ((vectors - query) ** 2).sum(axis=1)
+        return np.argsort(distances, kind='stable')[:k].tolist()
+
+    def lexical_ranking(text: str, k: int) -> List[int]:
+        return [doc for doc, _ in lexical.search(text, k)]
+
+    def hybrid_ranking(text: str, k: int) -> List[int]:
+        rankings = [vector_ranking(text, depth), lexical_ranking(text, depth)]
+        fused = reciprocal_rank_fusion(rankings, k, ContextSynthesizer.RRF_CONSTANT)
+        return [doc for doc, _ in fused]
+
+    results: Dict[str, Dict[str, float]] = {
+        'build': {
+            'vector_s': vector_build_s,
+            'bm25_s': lexical_build_s,
+            'bm25_mb': lexical.nbytes / 2 ** 20,
+        },
+    }
+    for mode, ranking in (('vector', vector_ranking), ('bm25', lexical_ranking),
+                          ('hybrid', hybrid_ranking)):
+        latencies = []
+        hits: Dict[str, List[bool]] = {}
+        for query in queries:
+            start = time.perf_counter()
+            top = ranking(query['text'], 10)
+            latencies.append(time.perf_counter() - start)
+            hits.setdefault(query['kind'], []).append(query['target'] in top)
+
+        results[mode] = {
+            'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+            'p95_ms': float(np.percentile(latencies, 95)) * 1000,
+            'recall_at_10': float(np.mean([hit for kind in hits.values() for hit in kind])),
+            **{f"recall_{kind}": float(np.mean(kind_hits)) for kind, kind_hits in hits.items()},
+        }
+    return results
+
+
+def _print_search(results: Dict[str, Dict[str, float]], n_documents: int) -> None:
+    build = results['build']
+    print(f"\n=== Hybrid Search Benchmark ({n_documents} documents) ===")
+    print(f"Build: vectors {build['vector_s']:.1f}s, BM25 {build['bm25_s']:.1f}s "
+          f"({build['bm25_mb']:.0f} MB postings)")
+    print(f"{'Mode':<8}{'p50':>10}{'p95':>10}{'recall@10':>11}"
+          f"{'sha':>7}{'idents':>8}{'topic':>7}")
+    for mode in ('vector', 'bm25', 'hybrid'):
+        r = results[mode]
+        print(f"{mode:<8}{r['p50_ms']:>8.2f}ms{r['p95_ms']:>8.2f}ms{r['recall_at_10']:>11.2f}"
+              f"{r['recall_sha']:>7.2f}{r['recall_identifiers']:>8.2f}{r['recall_topic']:>7.2f}")
+
+
+def legacy_cosine_search(embeddings: object, query: object, k: int) -> List[int]:
+    """Reference copy of the per-document cosine loop ExactVectorIndex replaced."""
+    import numpy as np
+
+    similarities = []
+    for doc_emb in embeddings:
+        sim = np.dot(query, doc_emb) / (
+            np.linalg.norm(query) * np.linalg.norm(doc_emb) + 1e-10
+        )
+        similarities.append(sim)
+    return np.argsort(similarities)[::-1][:k].tolist()
+
+
+def benchmark_fallback_search(n_documents: int, n_queries: int = 50,
+                              legacy_limit: Optional[int] = 10000,
+                              chunk_rows: int = 16384) -> Dict[str, Dict[str, float]]:
+    """
+    Time vector search without FAISS: the old loop against ExactVectorIndex.
+
+    Uses 512-feature TF-IDF embeddings as ContextSynthesizer does by default,
+    plus dense 384-dimension vectors (sentence-embedding shaped) as the case
+    where queries have no zero dimensions to skip.
+
+    Args:
+        n_documents: Corpus size
+        n_queries: Queries to time
+        legacy_limit: Cap on documents for the legacy loop (time is scaled up)
+        chunk_rows: Block size for the memory-mapped run
+
+    Returns:
+        Dictionary of per-query latencies for each mode
+    """
+    import numpy as np
+
+    documents = generate_commit_documents(n_documents)
+    provider = SimpleEmbeddingProvider(max_features=512)
+    tfidf = provider.embed(documents)
+    tfidf_queries = provider.embed([
+        f"Why was the {word} logic changed?" for word in
+        (SYNTHETIC_WORDS * (n_queries // len(SYNTHETIC_WORDS) + 1))[:n_queries]
+    ])
+    rng = np.random.default_rng(0)
+    dense = rng.standard_normal((n_documents, 384)).astype(np.float32)
+    dense_queries = rng.standard_normal((n_queries, 384)).astype(np.float32)
+
+    def per_query_ms(search: Callable[[object], object], queries: object) -> Dict[str, float]:
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            search(query)
+            latencies.append(time.perf_counter() - start)
+        return {'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+                'p95_ms': float(np.percentile(latencies, 95)) * 1000}
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, embeddings, queries in (('tfidf', tfidf, tfidf_queries),
+                                          ('dense', dense, dense_queries)):
+            legacy_rows = embeddings[:legacy_limit] if legacy_limit else embeddings
+            legacy = per_query_ms(lambda q: legacy_cosine_search(legacy_rows, q, 10), queries[:3])
+            scale = len(embeddings) / len(legacy_rows)
+            results[f'{name}_legacy'] = {key: value * scale for key, value in legacy.items()}
+
+            start = time.perf_counter()
+            index = ExactVectorIndex(embeddings)
+            build_ms = (time.perf_counter() - start) * 1000
+            results[f'{name}_numpy'] = {**per_query_ms(functools.partial(index.search, k=10), queries),
+                                        'build_ms': build_ms}
+            del index
+
+            path = Path(tmpdir) / f'{name}.npy'
+            np.save(path, embeddings)
+            chunked = ExactVectorIndex(np.load(path, mmap_mode='r'), chunk_rows=chunk_rows)
+            results[f'{name}_chunked'] = per_query_ms(functools.partial(chunked.search, k=10), queries)
+            del chunked
+
+    return results
+
+
+def _print_fallback_search(results: Dict[str, Dict[str, float]], n_documents: int) -> None:
+    print(f"\n=== No-FAISS Vector Search Benchmark ({n_documents} documents) ===")
+    print(f"{'Mode':<16}{'p50':>11}{'p95':>11}")
+    for name in ('tfidf', 'dense'):
+        for mode in ('legacy', 'numpy', 'chunked'):
+            r = results[f'{name}_{mode}']
+            print(f"{name + ' ' + mode:<16}{r['p50_ms']:>9.2f}ms{r['p95_ms']:>9.2f}ms")
+    print(f"(legacy loop timed on a capped corpus and scaled; index build: "
+          f"tfidf {results['tfidf_numpy']['build_ms']:.0f}ms, "
+          f"dense {results['dense_numpy']['build_ms']:.0f}ms)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Cognitive Code Archaeology benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    extraction = subparsers.add_parser('extraction', help='Commit extraction throughput')
+    extraction.add_argument('--commits', type=int, default=10000,
+                            help='Synthetic commits to generate (default: 10000)')
+    extraction.add_argument('--repo', type=Path, default=None,
+                            help='Benchmark an existing repository instead')
+    extraction.add_argument('--legacy-limit', type=int, default=None,
+                            help='Cap commits on the legacy path and extrapolate')
+
+    history = subparsers.add_parser('history', help='Persisted history startup time')
+    history.add_argument('--commits', type=int, default=10000,
+                         help='Synthetic commits to generate (default: 10000)')
+    history.add_argument('--delta', type=int, default=10,
+                         help='Commits to add before the delta refresh (default: 10)')
+
+    blame = subparsers.add_parser('blame', help='Line blame index build and refresh time')
+    blame.add_argument('--commits', type=int, default=10000,
+                       help='Synthetic commits to generate (default: 10000)')
+    blame.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='Worker processes for the parallel build (default: CPU count)')
+    blame.add_argument('--delta', type=int, default=10,
+                       help='Commits to add before the delta refresh (default: 10)')
+
+    embedding = subparsers.add_parser('embedding', help='TF-IDF embedding throughput')
+    embedding.add_argument('--documents', type=int, default=100000,
+                           help='Synthetic commit documents to embed (default: 100000)')
+    embedding.add_argument('--legacy-limit', type=int, default=None,
+                           help='Cap documents on the legacy path')
+
+    search = subparsers.add_parser('search', help='Vector, BM25 and hybrid search latency and recall')
+    search.add_argument('--documents', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='Corpus sizes to benchmark (default: 10000 100000 1000000)')
+    search.add_argument('--queries', type=int, default=300,
+                        help='Queries per corpus size (default: 300)')
+
+    fallback = subparsers.add_parser('fallback', help='Vector search latency without FAISS')
+    fallback.add_argument('--documents', type=int, default=100000,
+                          help='Synthetic commit documents (default: 100000)')
+    fallback.add_argument('--legacy-limit', type=int, default=10000,
+                          help='Cap documents on the legacy loop and scale its time')
+
+    github = subparsers.add_parser('github', help='GitHub enrichment wall-clock time')
+    github.add_argument('--commits', type=int, default=200,
+                        help='Commits to enrich (default: 200)')
+    github.add_argument('--latency', type=float, default=0.05,
+                        help='Simulated seconds per API request (default: 0.05)')
+    github.add_argument('--concurrency', type=int, default=16,
+                        help='Requests in flight for the concurrent path (default: 16)')
+    github.add_argument('--commits-per-pr', type=int, default=3,
+                        help='Commits in each pull request (default: 3)')
+
+    args = parser.parse_args(argv)
+
+    if args.benchmark == 'github':
+        _print_github(benchmark_github(args.commits, args.latency, args.concurrency,
+                                       args.commits_per_pr), args.latency)
+
+    if args.benchmark == 'search':
+        for n_documents in args.documents:
+            _print_search(benchmark_search(n_documents, args.queries), n_documents)
+
+    if args.benchmark == 'fallback':
+        _print_fallback_search(
+            benchmark_fallback_search(args.documents, legacy_limit=args.legacy_limit),
+            args.documents,
+        )
+
+    if args.benchmark == 'embedding':
+        _print_embedding(benchmark_embedding(args.documents, args.legacy_limit))
+
+    if args.benchmark == 'history':
+        with tempfile.TemporaryDirectory() as tmpdir:
+            print(f"Building synthetic repository with {args.commits} commits...")
+            repo_path = build_synthetic_repo(Path(tmpdir) / 'repo', args.commits)
+            # Silence per-stage progress output from full analyses
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = benchmark_history_store(repo_path, Path(tmpdir) / 'history', args.delta)
+            _print_history_store(results)
+
+    if args.benchmark == 'blame':
+        with tempfile.TemporaryDirectory() as tmpdir:
+            print(f"Building synthetic repository with {args.commits} commits...")
+            repo_path = build_synthetic_repo(Path(tmpdir) / 'repo', args.commits)
+            _print_blame_index(benchmark_blame_index(
+                repo_path, Path(tmpdir) / 'blame', args.workers, args.delta
+            ))
+
+    if args.benchmark == 'extraction':
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_path = args.repo
+            if repo_path is None:
+                print(f"Building synthetic repository with {args.commits} commits...")
+                start = time.perf_counter()
+                repo_path = build_synthetic_repo(Path(tmpdir) / 'repo', args.commits)
+                print(f"  Built in {time.perf_counter() - start:.1f}s")
+            _print_extraction(benchmark_extraction(repo_path, args.legacy_limit))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
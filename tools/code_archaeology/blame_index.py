@@ -0,0 +1,280 @@
+"""
+Blame Index - Map lines of files at HEAD to the commits that last changed them.
+
+This module provides tools to:
+- Run ``git blame --porcelain`` over every file at HEAD in a process pool
+- Store each file's blame as runs of consecutive lines owned by one commit
+- Refresh only the files changed since the HEAD the index was built at
+- Rank the commits owning a line range, for "why is this line here" questions
+- Persist the index between runs under ``.ail/blame/``
+"""
+
+import bisect
+import os
+import pickle
+import posixpath
+import re
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# One run per group of consecutive lines from the same commit: the header
+# "<sha> <source line> <result line> <lines in group>" (the count is given
+# only on a group's first line)
+PORCELAIN_GROUP = re.compile(r'([0-9a-f]{40}) \d+ (\d+) (\d+)$')
+
+# (start lines, SHAs): run i covers lines starts[i] .. starts[i + 1] - 1 and
+# the last start is one past the file's last line
+FileBlame = Tuple[List[int], List[str]]
+
+
+def parse_porcelain(output: str) -> FileBlame:
+    """
+    Parse ``git blame --porcelain`` output into runs.
+
+    Adjacent groups from the same commit are merged into one run.
+
+    Args:
+        output: Porcelain blame output for one file
+
+    Returns:
+        (starts, shas) as described by ``FileBlame``
+    """
+    starts: List[int] = []
+    shas: List[str] = []
+    end = 1
+    for line in output.splitlines():
+        if not line or line[0] == '\t':
+            continue
+        match = PORCELAIN_GROUP.match(line)
+        if match is None:
+            continue
+        sha, start, count = match.group(1), int(match.group(2)), int(match.group(3))
+        if not shas or shas[-1] != sha or start != end:
+            starts.append(start)
+            shas.append(sha)
+        end = start + count
+    starts.append(end)
+    return starts, shas
+
+
+def _blame_file(task: Tuple[str, str, str]) -> Tuple[str, Optional[FileBlame]]:
+    """
+    Blame one file at a revision (process pool worker).
+
+    Args:
+        task: (repository path, revision, repository-relative file path)
+
+    Returns:
+        (file path, runs), with None if the file cannot be blamed at the
+        revision (e.g. it was deleted)
+    """
+    repo_path, revision, path = task
+    result = subprocess.run(
+        ['git', '-C', repo_path, 'blame', '--porcelain', revision, '--', path],
+        capture_output=True, text=True, errors='replace', check=False,
+    )
+    if result.returncode != 0:
+        return path, None
+    return path, parse_porcelain(result.stdout)
+
+
+class BlameIndex:
+    """
+    (file, line range) → owning commit SHAs, from ``git blame`` at one HEAD.
+
+    Each file is stored as a sorted list of run start lines and the SHA of
+    each run, so a line range is located by binary search. SHA strings are
+    shared between files, keeping the pickle close to one copy per commit.
+    Kept in memory; load()/save() persist it as a versioned pickle keyed by
+    repository, replaced atomically.
+    """
+
+    VERSION = 1
+    FILENAME = "blame.pkl"
+    MIN_PARALLEL_FILES = 8  # Fewer changed files are blamed in-process
+    CHUNK_SIZE = 16  # Files handed to a worker at a time
+
+    def __init__(self, repo_path: str, store_dir: Optional[Path] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            repo_path: Path to the git repository
+            store_dir: Directory for the index file (default: <repo>/.ail/blame)
+            max_workers: Blame worker processes (default: CPU count)
+        """
+        self.repo_path = Path(repo_path).resolve()
+        self.store_dir = Path(store_dir) if store_dir else self.repo_path / '.ail' / 'blame'
+        self.max_workers = max_workers
+        self.head_sha: Optional[str] = None  # HEAD the blame was computed at
+        self.files: Dict[str, FileBlame] = {}
+
+    @property
+    def path(self) -> Path:
+        """Path of the index file."""
+        return self.store_dir / self.FILENAME
+
+    @property
+    def size(self) -> int:
+        """Number of indexed files."""
+        return len(self.files)
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """Normalize a path to the index's repository-relative form."""
+        path = posixpath.normpath(path.replace('\\', '/'))
+        return '' if path == '.' else path.lstrip('/')
+
+    def exists(self) -> bool:
+        """Check if a stored index is available."""
+        return self.path.exists()
+
+    def commits_for_lines(self, path: str, start_line: int,
+                          end_line: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Get the commits that last changed a range of lines.
+
+        Args:
+            path: Repository-relative file path
+            start_line: First line of the range (1-based)
+            end_line: Last line of the range, inclusive (default: start_line)
+
+        Returns:
+            List of (SHA, lines owned in the range), most lines first; ties
+            keep the order of first appearance in the range. Empty if the
+            file is not indexed or the range lies outside it.
+        """
+        blame = self.files.get(self.normalize(path))
+        if blame is None:
+            return []
+        starts, shas = blame
+        end_line = start_line if end_line is None else end_line
+        start_line = max(start_line, 1)
+        end_line = min(end_line, starts[-1] - 1)
+        if start_line > end_line:
+            return []
+
+        owned: Dict[str, int] = {}
+        run = bisect.bisect_right(starts, start_line) - 1
+        while run < len(shas) and starts[run] <= end_line:
+            lines = min(starts[run + 1] - 1, end_line) - max(starts[run], start_line) + 1
+            owned[shas[run]] = owned.get(shas[run], 0) + lines
+            run += 1
+        return sorted(owned.items(), key=lambda entry: -entry[1])
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to the repository HEAD.
+
+        Only files that differ between the indexed HEAD and the current one
+        are blamed again; the whole tree is blamed when nothing is indexed
+        or the indexed HEAD is no longer in the repository.
+
+        Returns:
+            Number of files blamed
+        """
+        head_sha = (self._git('rev-parse', '--verify', '-q', 'HEAD') or '').strip()
+        if not head_sha or head_sha == self.head_sha:
+            return 0
+
+        paths = self._changed_paths(self.head_sha, head_sha) if self.head_sha else None
+        if paths is None:
+            self.files = {}
+            paths = self._split(self._git('ls-tree', '-r', '-z', '--name-only', head_sha) or '')
+
+        self._update(head_sha, paths)
+        self.head_sha = head_sha
+        return len(paths)
+
+    def _changed_paths(self, old_sha: str, new_sha: str) -> Optional[List[str]]:
+        """Paths that differ between two commits, or None if ``old_sha`` is unknown."""
+        output = self._git('diff', '--name-only', '-z', '--no-renames', old_sha, new_sha)
+        return None if output is None else self._split(output)
+
+    def _update(self, head_sha: str, paths: List[str]) -> None:
+        """Blame ``paths`` at ``head_sha``, dropping files that no longer exist."""
+        tasks = [(str(self.repo_path), head_sha, path) for path in paths]
+        if len(tasks) < self.MIN_PARALLEL_FILES or self.max_workers == 1:
+            results: Iterable[Tuple[str, Optional[FileBlame]]] = map(_blame_file, tasks)
+            self._store(results)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                self._store(executor.map(_blame_file, tasks, chunksize=self.CHUNK_SIZE))
+
+    def _store(self, results: Iterable[Tuple[str, Optional[FileBlame]]]) -> None:
+        """Record blame results; files blamed together share SHA strings."""
+        shared: Dict[str, str] = {}
+        for path, blame in results:
+            if blame is None:
+                self.files.pop(path, None)
+                continue
+            starts, shas = blame
+            self.files[path] = (starts, [shared.setdefault(sha, sha) for sha in shas])
+
+    def _git(self, *args: str) -> Optional[str]:
+        """Run a git command in the repository; None if it fails."""
+        try:
+            result = subprocess.run(
+                ['git', '-C', str(self.repo_path), *args],
+                capture_output=True, text=True, check=False,
+            )
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout
+
+    @staticmethod
+    def _split(output: str) -> List[str]:
+        """Split NUL-terminated git output into paths."""
+        return [path for path in output.split('\0') if path]
+
+    def load(self) -> bool:
+        """
+        Load the stored index, replacing the in-memory one.
+
+        Returns:
+            True if a compatible index was loaded
+        """
+        if not self.path.exists():
+            return False
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Failed to load blame index {self.path}: {e}")
+            return False
+
+        if (not isinstance(data, dict) or data.get('version') != self.VERSION
+                or data.get('repo_path') != str(self.repo_path)):
+            return False
+
+        self.head_sha = data['head_sha']
+        self.files = dict(data['files'])
+        return True
+
+    def save(self) -> None:
+        """Persist the index atomically (write to a temp file, then rename)."""
+        data = {
+            'version': self.VERSION,
+            'repo_path': str(self.repo_path),
+            'head_sha': self.head_sha,
+            'files': self.files,
+        }
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Forget the index, in memory and on disk."""
+        self.head_sha = None
+        self.files = {}
+        if self.path.exists():
+            self.path.unlink()
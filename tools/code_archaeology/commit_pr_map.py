@@ -0,0 +1,170 @@
+"""
+Commit → PR Map - Resolve commits to pull requests without an API call each.
+
+This module provides tools to:
+- Map every commit of every closed pull request (and its merge/squash
+  commit) to the PR number
+- Record how far the closed-PR list has been read, so later refreshes only
+  read PRs updated since
+- Persist the map between runs under ``.ail/github/``
+"""
+
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+class CommitPullRequestMap:
+    """
+    Commit SHA → PR number, built from the closed PR list.
+
+    A commit that appears in several PRs maps to the lowest PR number (the
+    one that introduced it). Kept in memory; load()/save() persist it as a
+    versioned pickle keyed by repository, replaced atomically.
+    """
+
+    VERSION = 1
+    FILENAME = "commit_prs.pkl"
+
+    def __init__(self, owner: str, repo: str, store_dir: Optional[Path] = None):
+        """
+        Initialize an empty map.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            store_dir: Directory for the map file (None keeps it in memory only)
+        """
+        self.owner = owner
+        self.repo = repo
+        self.store_dir = Path(store_dir) if store_dir else None
+        self.commit_to_pr: Dict[str, int] = {}
+        self.pr_heads: Dict[int, str] = {}          # PR -> head SHA when its commits were read
+        self.updated_through: Optional[str] = None  # Newest PR updated_at read (ISO 8601)
+        self.built_at: Optional[float] = None       # When the map was last built or refreshed
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Path of the map file, if persisted."""
+        return self.store_dir / self.FILENAME if self.store_dir else None
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the map has been built (lookups may replace API calls)."""
+        return self.built_at is not None
+
+    @property
+    def size(self) -> int:
+        """Number of mapped commits."""
+        return len(self.commit_to_pr)
+
+    def get(self, sha: str) -> Optional[int]:
+        """
+        Look up the PR that introduced a commit.
+
+        Args:
+            sha: Full commit SHA
+
+        Returns:
+            PR number, or None if the commit is in no closed PR
+        """
+        return self.commit_to_pr.get(sha)
+
+    def add_pull_request(self, number: int, commit_shas: Iterable[str],
+                         head_sha: Optional[str] = None,
+                         merge_commit_sha: Optional[str] = None) -> None:
+        """
+        Map a PR's commits (and merge or squash commit) to it.
+
+        Args:
+            number: PR number
+            commit_shas: SHAs from the PR's commit list
+            head_sha: PR head SHA the commit list was read at
+            merge_commit_sha: Commit the PR was merged (or squashed) as
+        """
+        shas = list(commit_shas)
+        if merge_commit_sha:
+            shas.append(merge_commit_sha)
+        for sha in shas:
+            current = self.commit_to_pr.get(sha)
+            if current is None or number < current:
+                self.commit_to_pr[sha] = number
+        if head_sha:
+            self.pr_heads[number] = head_sha
+
+    def mark_built(self, updated_through: Optional[str]) -> None:
+        """
+        Record a completed build or refresh.
+
+        Args:
+            updated_through: updated_at of the newest PR read (None if no
+                PR was read, keeping the previous mark)
+        """
+        if updated_through and (self.updated_through is None
+                                or updated_through > self.updated_through):
+            self.updated_through = updated_through
+        self.built_at = time.time()
+
+    def load(self) -> bool:
+        """
+        Load the stored map, replacing the in-memory one.
+
+        Returns:
+            True if a compatible map was loaded
+        """
+        if self.path is None or not self.path.exists():
+            return False
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Failed to load commit→PR map {self.path}: {e}")
+            return False
+
+        if (not isinstance(data, dict) or data.get('version') != self.VERSION
+                or data.get('repository') != f"{self.owner}/{self.repo}"):
+            return False
+
+        self.commit_to_pr = dict(data['commit_to_pr'])
+        self.pr_heads = dict(data['pr_heads'])
+        self.updated_through = data['updated_through']
+        self.built_at = data['built_at']
+        return True
+
+    def save(self) -> bool:
+        """
+        Persist the map atomically (write to a temp file, then rename).
+
+        Returns:
+            True if written, False if the map is in memory only
+        """
+        if self.path is None:
+            return False
+
+        data = {
+            'version': self.VERSION,
+            'repository': f"{self.owner}/{self.repo}",
+            'commit_to_pr': self.commit_to_pr,
+            'pr_heads': self.pr_heads,
+            'updated_through': self.updated_through,
+            'built_at': self.built_at,
+        }
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        return True
+
+    def clear(self) -> None:
+        """Forget all mappings, in memory and on disk."""
+        self.commit_to_pr = {}
+        self.pr_heads = {}
+        self.updated_through = None
+        self.built_at = None
+        if self.path is not None and self.path.exists():
+            self.path.unlink()
@@ -13,8 +13,10 @@ from __future__ import annotations
 
 import os
 import json
+import re
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import chain, repeat
 from typing import List, Dict, Optional, Tuple, Set, TYPE_CHECKING
 from pathlib import Path
 import hashlib
@@ -37,6 +39,7 @@ except ImportError:
 
 from .git_analyzer import Commit, RepositoryHistory
 from .github_integrator import EnrichedHistory, EnrichedCommit
+from .lexical_index import BM25Index, HAS_NUMPY, reciprocal_rank_fusion
 
 
 @dataclass
@@ -117,6 +120,8 @@ class SearchableIndex:
     document_metadata: List[Dict] = field(default_factory=list)
     faiss_index: Optional[object] = None  # FAISS index
     embedding_provider: Optional[EmbeddingProvider] = None  # Store the provider
+    lexical_index: Optional[BM25Index] = None  # BM25 over documents + SHAs
+    vector_index: Optional[ExactVectorIndex] = None  # Vector search when FAISS is missing
 
     @property
     def size(self) -> int:
@@ -189,62 +194,170 @@ class ClaudeEmbeddingProvider(EmbeddingProvider):
 
 
 class SimpleEmbeddingProvider(EmbeddingProvider):
-    """Simple TF-IDF based embeddings (no external dependencies)."""
+    """
+    TF-IDF embeddings over a fitted vocabulary (no external dependencies).
+
+    The first ``embed`` call fits the vocabulary (the ``max_features`` most
+    frequent tokens) and IDF weights; later calls, including query-time
+    embedding, reuse them. Documents are tokenized in one pass with a
+    precompiled pattern, counted into a CSR matrix built from token-id arrays
+    and weighted and normalized with whole-matrix NumPy operations.
+    """
+
+    TOKEN_PATTERN = re.compile(r'\w+')
 
     def __init__(self, max_features: int = 512):
         """Initialize simple embedding provider."""
         self.max_features = max_features
         self._vocabulary: Optional[Dict[str, int]] = None
+        self._idf: Optional[np.ndarray] = None  # type: ignore
+
+    def _tokenize(self, texts: List[str]) -> Tuple[List[str], np.ndarray]:  # type: ignore
+        """
+        Tokenize texts in one pass.
+
+        Returns:
+            (flat token list, CSR row pointer of length len(texts) + 1)
+        """
+        findall = self.TOKEN_PATTERN.findall
+        per_text = [findall(text.lower()) for text in texts]
+        indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(tokens) for tokens in per_text], out=indptr[1:])
+        return list(chain.from_iterable(per_text)), indptr
+
+    def _token_ids(self, tokens: List[str]) -> np.ndarray:  # type: ignore
+        """Vocabulary id of each token, -1 for out-of-vocabulary tokens."""
+        return np.fromiter(map(self._vocabulary.get, tokens, repeat(-1, len(tokens))),
+                           dtype=np.int64, count=len(tokens))
+
+    @staticmethod
+    def _count_matrix(token_ids: np.ndarray, indptr: np.ndarray,  # type: ignore
+                      n_columns: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:  # type: ignore
+        """
+        Build a CSR term-count matrix from per-token ids.
+
+        Args:
+            token_ids: Column id per token (-1 tokens are dropped)
+            indptr: Row pointer into ``token_ids``
+            n_columns: Number of columns
+
+        Returns:
+            (indptr, indices, data) of the CSR matrix, column ids sorted per row
+        """
+        n_rows = len(indptr) - 1
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(indptr))
+        keep = token_ids >= 0
+        cells, counts = np.unique(rows[keep] * n_columns + token_ids[keep], return_counts=True)
+
+        row_of_cell = cells // n_columns
+        csr_indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_of_cell, minlength=n_rows), out=csr_indptr[1:])
+        return csr_indptr, cells % n_columns, counts.astype(np.float32)
 
     def _build_vocabulary(self, texts: List[str]) -> Dict[str, int]:
-        """Build vocabulary from texts."""
-        from collections import Counter
-        import re
+        """Build vocabulary from texts (also fits IDF weights)."""
+        self.fit(texts)
+        return self._vocabulary
 
-        # Tokenize all texts
-        all_tokens = []
-        for text in texts:
-            tokens = re.findall(r'\w+', text.lower())
-            all_tokens.extend(tokens)
+    def fit(self, texts: List[str]) -> SimpleEmbeddingProvider:
+        """
+        Fit the vocabulary and IDF weights on a corpus.
 
-        # Get top N most common tokens
-        counter = Counter(all_tokens)
-        top_tokens = [token for token, _ in counter.most_common(self.max_features)]
+        Args:
+            texts: Corpus to fit on
 
-        # Create vocabulary mapping
-        vocab = {token: i for i, token in enumerate(top_tokens)}
-        return vocab
+        Returns:
+            self
+        """
+        self._fit_transform(texts)
+        return self
+
+    def _fit_transform(self, texts: List[str]) -> np.ndarray:  # type: ignore
+        """Fit on ``texts`` and embed them, tokenizing only once."""
+        tokens, indptr = self._tokenize(texts)
+
+        # Corpus-wide ids for every distinct token, in first-seen order
+        terms = list(dict.fromkeys(tokens))
+        corpus_ids = dict(zip(terms, range(len(terms))))
+        token_ids = np.fromiter(map(corpus_ids.__getitem__, tokens),
+                                dtype=np.int64, count=len(tokens))
+        n_terms = len(terms)
+
+        # Top max_features by frequency; stable sort keeps first-seen order on ties
+        frequency = np.bincount(token_ids, minlength=n_terms)
+        top = np.argsort(-frequency, kind='stable')[:self.max_features]
+        self._vocabulary = {terms[i]: rank for rank, i in enumerate(top.tolist())}
+
+        remap = np.full(n_terms, -1, dtype=np.int64)
+        remap[top] = np.arange(len(top), dtype=np.int64)
+        counts = self._count_matrix(remap[token_ids], indptr, len(top))
+
+        # Smoothed IDF: log((1 + n) / (1 + df)) + 1
+        document_frequency = np.bincount(counts[1], minlength=len(top))
+        self._idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        return self._weight(counts, len(texts))
+
+    def _weight(self, counts: Tuple[np.ndarray, np.ndarray, np.ndarray],  # type: ignore
+                n_rows: int) -> np.ndarray:  # type: ignore
+        """Dense L2-normalized TF-IDF rows from a CSR count matrix."""
+        indptr, indices, data = counts
+        embeddings = np.zeros((n_rows, len(self._vocabulary)), dtype=np.float32)
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(indptr))
+        embeddings[rows, indices] = data * self._idf[indices]
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+        return embeddings
 
     def embed(self, texts: List[str]) -> np.ndarray:  # type: ignore
-        """Generate simple TF-IDF embeddings."""
-        import re
-
-        # Build vocabulary if needed
+        """Generate TF-IDF embeddings (fits the vocabulary on first use)."""
         if self._vocabulary is None:
-            self._vocabulary = self._build_vocabulary(texts)
+            return self._fit_transform(texts)
 
-        # Determine dimension (use vocabulary size or max_features)
-        dimension = len(self._vocabulary)
+        tokens, indptr = self._tokenize(texts)
+        counts = self._count_matrix(self._token_ids(tokens), indptr, len(self._vocabulary))
+        return self._weight(counts, len(texts))
 
-        embeddings = []
-        for text in texts:
-            # Tokenize
-            tokens = re.findall(r'\w+', text.lower())
+    def save(self, path: str) -> None:
+        """
+        Persist the fitted vocabulary and IDF weights as JSON.
 
-            # Create vector
-            vec = np.zeros(dimension, dtype=np.float32)
-            for token in tokens:
-                if token in self._vocabulary:
-                    vec[self._vocabulary[token]] += 1.0
+        Args:
+            path: File to write
+        """
+        if self._vocabulary is None:
+            raise ValueError("SimpleEmbeddingProvider is not fitted")
 
-            # Simple normalization
-            norm = np.linalg.norm(vec)
-            if norm > 0:
-                vec = vec / norm
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'max_features': self.max_features,
+                'vocabulary': sorted(self._vocabulary, key=self._vocabulary.get),
+                'idf': self._idf.tolist(),
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> SimpleEmbeddingProvider:
+        """
+        Load a provider saved with ``save``.
 
-            embeddings.append(vec)
+        Args:
+            path: File written by ``save``
 
-        return np.array(embeddings)
+        Returns:
+            Fitted SimpleEmbeddingProvider
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        provider = cls(max_features=data['max_features'])
+        provider._vocabulary = {token: i for i, token in enumerate(data['vocabulary'])}
+        provider._idf = np.asarray(data['idf'], dtype=np.float32)
+        return provider
 
     @property
     def dimension(self) -> int:
@@ -254,17 +367,210 @@ class SimpleEmbeddingProvider(EmbeddingProvider):
         return self.max_features
 
 
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Stateless hashing-trick embeddings (no fitting, no external dependencies).
+
+    Word unigrams, word bigrams and character n-grams are hashed into a fixed
+    number of signed buckets, so the dimension never depends on the texts seen
+    first and two processes always embed the same text identically. Character
+    n-grams let morphological variants ("auth", "authentication") overlap.
+    """
+
+    STOPWORDS = frozenset({
+        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'did', 'do', 'does',
+        'for', 'from', 'has', 'have', 'in', 'is', 'it', 'of', 'on', 'or',
+        'the', 'this', 'that', 'to', 'was', 'were', 'we', 'with',
+    })
+
+    def __init__(self, n_features: int = 512, char_ngrams: Tuple[int, int] = (3, 5),
+                 char_weight: float = 0.5, bigram_weight: float = 0.5):
+        """
+        Initialize hashing embedding provider.
+
+        Args:
+            n_features: Number of hash buckets (embedding dimension)
+            char_ngrams: Inclusive (min, max) character n-gram lengths
+            char_weight: Total weight of a word's character n-grams
+            bigram_weight: Weight of each word bigram
+        """
+        self.n_features = n_features
+        self.char_ngrams = char_ngrams
+        self.char_weight = char_weight
+        self.bigram_weight = bigram_weight
+
+    def _features(self, text: str) -> Dict[str, float]:
+        """Extract weighted features from a text."""
+        words = [w for w in re.findall(r'\w+', text.lower()) if w not in self.STOPWORDS]
+        features: Dict[str, float] = {}
+
+        def add(feature: str, weight: float) -> None:
+            features[feature] = features.get(feature, 0.0) + weight
+
+        low, high = self.char_ngrams
+        for word in words:
+            add(f"w:{word}", 1.0)
+            padded = f"<{word}>"
+            grams = [
+                padded[i:i + n]
+                for n in range(low, high + 1)
+                for i in range(len(padded) - n + 1)
+            ]
+            for gram in grams:
+                add(f"c:{gram}", self.char_weight / len(grams))
+
+        for first, second in zip(words, words[1:]):
+            add(f"b:{first} {second}", self.bigram_weight)
+
+        return features
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        """Map a feature to a stable (bucket, sign) pair."""
+        digest = int.from_bytes(
+            hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little'
+        )
+        return digest % self.n_features, (1.0 if digest >> 63 else -1.0)
+
+    def embed(self, texts: List[str]) -> np.ndarray:  # type: ignore
+        """Generate L2-normalized hashed feature vectors."""
+        embeddings = np.zeros((len(texts), self.n_features), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text).items():
+                bucket, sign = self._bucket(feature)
+                # Sublinear term frequency damps repeated words
+                embeddings[row, bucket] += sign * (1.0 + np.log(weight) if weight > 1.0 else weight)
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+        return embeddings
+
+    @property
+    def dimension(self) -> int:
+        """Embedding dimension (fixed number of hash buckets)."""
+        return self.n_features
+
+
+class ExactVectorIndex:
+    """
+    Exact cosine search with NumPy, used when FAISS is not installed.
+
+    Rows are normalized once and stored transposed (dimension-major), so a
+    query multiplies only the rows of its non-zero dimensions; TF-IDF and
+    hashed queries use a handful of them. The top k come from argpartition
+    rather than a full sort.
+
+    With ``chunk_rows`` the matrix (e.g. a memory-mapped ``.npy``) is left
+    where it is and scored one block of rows at a time against precomputed
+    inverse row norms, so it never has to fit in RAM.
+    """
+
+    SPARSE_QUERY_FRACTION = 0.5  # Use the column subset below this density
+
+    def __init__(self, embeddings: np.ndarray, chunk_rows: Optional[int] = None):  # type: ignore
+        """
+        Build the index.
+
+        Args:
+            embeddings: Document embeddings (n_docs, dimension)
+            chunk_rows: Score this many rows at a time instead of copying
+                the matrix (None normalizes an in-memory copy)
+        """
+        self.n_documents, self.dimension = embeddings.shape
+        self.chunk_rows = chunk_rows
+
+        if chunk_rows:
+            self._embeddings = embeddings
+            norms = np.concatenate([
+                np.linalg.norm(np.asarray(embeddings[start:start + chunk_rows], dtype=np.float32), axis=1)
+                for start in range(0, self.n_documents, chunk_rows)
+            ] or [np.empty(0, dtype=np.float32)])
+            self._inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+            self._columns = None
+        else:
+            normalized = np.asarray(embeddings, dtype=np.float32)
+            norms = np.linalg.norm(normalized, axis=1, keepdims=True)
+            normalized = np.divide(normalized, norms, out=np.zeros_like(normalized), where=norms > 0)
+            self._columns = np.ascontiguousarray(normalized.T)
+
+    def scores(self, query_embedding: np.ndarray) -> np.ndarray:  # type: ignore
+        """
+        Cosine similarity of the query with every document.
+
+        Args:
+            query_embedding: Query vector
+
+        Returns:
+            float32 array of length n_documents (0 for zero vectors)
+        """
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        nonzero = np.flatnonzero(query)
+        sparse = len(nonzero) < self.SPARSE_QUERY_FRACTION * self.dimension
+
+        if self._columns is not None:
+            if sparse:
+                return query[nonzero] @ self._columns[nonzero]
+            return query @ self._columns
+
+        scores = np.empty(self.n_documents, dtype=np.float32)
+        for start in range(0, self.n_documents, self.chunk_rows):
+            block = np.asarray(self._embeddings[start:start + self.chunk_rows], dtype=np.float32)
+            if sparse:
+                block_scores = block[:, nonzero] @ query[nonzero]
+            else:
+                block_scores = block @ query
+            scores[start:start + len(block)] = block_scores * self._inverse_norms[start:start + len(block)]
+        return scores
+
+    def search(self, query_embedding: np.ndarray, k: int = 10) -> List[Tuple[int, float]]:  # type: ignore
+        """
+        Find the most similar documents.
+
+        Args:
+            query_embedding: Query vector
+            k: Number of results
+
+        Returns:
+            List of (document position, cosine similarity) tuples, best
+            first; ties keep document order
+        """
+        k = min(k, self.n_documents)
+        if k <= 0:
+            return []
+
+        scores = self.scores(query_embedding)
+        top = np.argpartition(-scores, k - 1)[:k] if k < self.n_documents else np.arange(k)
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(int(idx), float(scores[idx])) for idx in top]
+
+
 class ContextSynthesizer:
-    """Main context synthesis engine."""
+    """
+    Main context synthesis engine.
+
+    Search is hybrid by default: the vector ranking and a BM25 ranking of the
+    same documents are fused with reciprocal rank fusion, so exact
+    identifiers that embeddings blur (function names, ticket numbers, SHAs)
+    still surface their documents.
+    """
 
-    def __init__(self, embedding_provider: Optional[EmbeddingProvider] = None):
+    FUSION_DEPTH = 50  # Candidates taken from each ranking before fusion
+    RRF_CONSTANT = 60
+
+    def __init__(self, embedding_provider: Optional[EmbeddingProvider] = None,
+                 lexical: bool = True):
         """
         Initialize context synthesizer.
 
         Args:
             embedding_provider: Provider for text embeddings (default: SimpleEmbeddingProvider)
+            lexical: Build a BM25 index and fuse it with vector search
         """
         self.embedding_provider = embedding_provider or SimpleEmbeddingProvider()
+        self.lexical = lexical and HAS_NUMPY
 
     def _extract_documents(self, enriched_history: EnrichedHistory) -> Tuple[List[str], List[Dict]]:
         """
@@ -334,10 +640,12 @@ class ContextSynthesizer:
 
         # Generate embeddings
         print(f"  Generating embeddings...")
+        vector_index = None
         if not HAS_FAISS:
-            print("  Warning: FAISS not available, using simple search")
+            print("  Warning: FAISS not available, using NumPy search")
             embeddings = self.embedding_provider.embed(documents)
             faiss_index = None
+            vector_index = ExactVectorIndex(embeddings)
         else:
             embeddings = self.embedding_provider.embed(documents)
 
@@ -347,6 +655,14 @@ class ContextSynthesizer:
             faiss_index = faiss.IndexFlatL2(dimension)
             faiss_index.add(embeddings)
 
+        lexical_index = None
+        if self.lexical:
+            # SHAs are indexed too so abbreviated SHAs in questions match
+            print("  Building BM25 index...")
+            lexical_index = BM25Index([
+                f"{document}\n{meta['sha']}" for document, meta in zip(documents, metadata)
+            ])
+
         print(f"✓ Index built: {len(documents)} documents, {embeddings.shape[1]} dimensions")
 
         return SearchableIndex(
@@ -356,12 +672,18 @@ class ContextSynthesizer:
             document_metadata=metadata,
             faiss_index=faiss_index,
             embedding_provider=self.embedding_provider,  # Store provider for queries
+            lexical_index=lexical_index,
+            vector_index=vector_index,
         )
 
     def search(self, index: SearchableIndex, query: str, k: int = 10) -> List[SearchResult]:
         """
         Search the index with a natural language query.
 
+        With a lexical index, the top FUSION_DEPTH documents of the vector
+        and BM25 rankings are fused; relevance is the fused score scaled so
+        a document ranked first by both rankings scores 1.0.
+
         Args:
             index: SearchableIndex to search
             query: Natural language query
@@ -374,50 +696,54 @@ class ContextSynthesizer:
         provider = index.embedding_provider or self.embedding_provider
         query_embedding = provider.embed([query])[0]
 
+        if index.lexical_index is None:
+            ranked = self._vector_search(index, query_embedding, k)
+        else:
+            depth = max(k, self.FUSION_DEPTH)
+            rankings = [
+                [idx for idx, _ in self._vector_search(index, query_embedding, depth)],
+                [idx for idx, _ in index.lexical_index.search(query, depth)],
+            ]
+            scale = (self.RRF_CONSTANT + 1) / len(rankings)
+            ranked = [
+                (idx, score * scale)
+                for idx, score in reciprocal_rank_fusion(rankings, k, self.RRF_CONSTANT)
+            ]
+
+        return [
+            SearchResult(
+                commit=index.document_metadata[idx]['enriched_commit'],
+                relevance_score=score,
+                matched_content=index.documents[idx][:500],
+            )
+            for idx, score in ranked
+        ]
+
+    def _vector_search(self, index: SearchableIndex, query_embedding: np.ndarray,  # type: ignore
+                       k: int) -> List[Tuple[int, float]]:
+        """
+        Rank documents by embedding similarity.
+
+        Returns:
+            List of (document position, similarity) tuples, best first
+        """
         if index.faiss_index is not None:
             # Use FAISS for fast search
             distances, indices = index.faiss_index.search(
-                query_embedding.reshape(1, -1), k
+                query_embedding.reshape(1, -1), min(k, index.size)
             )
 
-            results = []
-            for i, (dist, idx) in enumerate(zip(distances[0], indices[0])):
-                meta = index.document_metadata[idx]
-                enriched_commit = meta['enriched_commit']
-
-                # Convert distance to similarity score (0-1)
-                similarity = 1.0 / (1.0 + dist)
-
-                results.append(SearchResult(
-                    commit=enriched_commit,
-                    relevance_score=similarity,
-                    matched_content=index.documents[idx][:500],
-                ))
-        else:
-            # Simple cosine similarity search
-            similarities = []
-            for doc_emb in index.embeddings:
-                # Cosine similarity
-                sim = np.dot(query_embedding, doc_emb) / (
-                    np.linalg.norm(query_embedding) * np.linalg.norm(doc_emb) + 1e-10
-                )
-                similarities.append(sim)
-
-            # Get top k
-            top_indices = np.argsort(similarities)[::-1][:k]
-
-            results = []
-            for idx in top_indices:
-                meta = index.document_metadata[idx]
-                enriched_commit = meta['enriched_commit']
-
-                results.append(SearchResult(
-                    commit=enriched_commit,
-                    relevance_score=float(similarities[idx]),
-                    matched_content=index.documents[idx][:500],
-                ))
-
-        return results
+            # Convert distance to similarity score (0-1)
+            return [
+                (int(idx), float(1.0 / (1.0 + dist)))
+                for dist, idx in zip(distances[0], indices[0])
+                if idx >= 0
+            ]
+
+        if index.vector_index is None:
+            # Indexes assembled without build_searchable_index get one on first use
+            index.vector_index = ExactVectorIndex(index.embeddings)
+        return index.vector_index.search(query_embedding, k)
 
     def synthesize_answer(self, index: SearchableIndex, question: str,
                           max_results: int = 10) -> Answer:
@@ -0,0 +1,551 @@
+"""
+Local fake of the GitHub REST API for tests and benchmarks.
+
+Serves the endpoints GitHubArchaeologist uses from in-memory pull requests
+and issues, with configurable per-request latency and rate-limit headers, so
+enrichment can be exercised and timed without network access or a token.
+Responses carry ETag / Last-Modified validators; conditional requests that
+match get a 304 which, as on GitHub, does not count against the rate limit.
+List endpoints paginate with per_page/page and Link headers, and POST
+/graphql answers the bulk queries GraphQLBulkFetcher sends (aliased
+issueOrPullRequest / object / node selections, paged connections) without
+implementing general GraphQL.
+
+Usage:
+    with FakeGitHubServer(latency=0.05) as server:
+        server.add_pull_request(12, commits=['abc123'], comments=2)
+        archaeologist = GitHubArchaeologist('owner', 'repo', base_url=server.url)
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+class FakeGitHubServer:
+    """In-memory GitHub REST API served over HTTP on localhost."""
+
+    CREATED_AT = "2024-01-15T10:00:00Z"
+    MERGED_AT = "2024-01-16T10:00:00Z"
+
+    DEFAULT_PER_PAGE = 30   # GitHub's REST default
+    MAX_PER_PAGE = 100
+
+    def __init__(self, latency: float = 0.0, rate_limit: int = 5000,
+                 rate_limit_window: float = 3600.0, graphql_page_size: int = 100):
+        """
+        Initialize fake server (call start() or use as a context manager).
+
+        Args:
+            latency: Seconds each response is delayed, to emulate network round trips
+            rate_limit: Requests allowed per window
+            rate_limit_window: Seconds until the rate limit resets
+            graphql_page_size: Cap on GraphQL connection pages (lower it to
+                exercise pagination with small fixtures)
+        """
+        self.latency = latency
+        self.graphql_page_size = graphql_page_size
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.rate_limit_remaining = rate_limit
+        self.rate_limit_reset = time.time() + rate_limit_window
+
+        self.pulls: Dict[int, Dict[str, Any]] = {}
+        self.issues: Dict[int, Dict[str, Any]] = {}
+        self.commit_pulls: Dict[str, List[int]] = {}
+
+        self.last_modified = formatdate(usegmt=True)  # Bumped whenever data changes
+        self._updates = 0
+
+        self.request_count = 0
+        self.not_modified_count = 0     # Requests answered with 304
+        self.requests: List[str] = []   # Request paths, in arrival order
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # Data ---------------------------------------------------------------
+
+    def add_pull_request(self, number: int, commits: Iterable[str] = (),
+                         comments: int = 0, review_comments: int = 0,
+                         title: Optional[str] = None, merged: bool = True,
+                         author: str = "dev",
+                         closes: Iterable[int] = (),
+                         merge_commit: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Add a pull request.
+
+        Args:
+            number: PR number
+            commits: SHAs of the commits in the PR (also linked for commit search)
+            comments: Number of general comments to generate
+            review_comments: Number of review comments to generate
+            title: PR title (default: "PR #<number>")
+            merged: Whether the PR is merged (otherwise open)
+            author: Login of the PR author
+            closes: Issue numbers the PR closes (GraphQL closingIssuesReferences)
+            merge_commit: SHA the PR was merged or squashed as (merge_commit_sha)
+
+        Returns:
+            The stored PR record
+        """
+        commits = list(commits)
+        self._updates += 1
+        pr = {
+            'number': number,
+            'title': title or f"PR #{number}",
+            'body': f"Description of PR #{number}",
+            'user': {'login': author},
+            'state': 'closed' if merged else 'open',
+            'created_at': self.CREATED_AT,
+            'merged_at': self.MERGED_AT if merged else None,
+            'closed_at': self.MERGED_AT if merged else None,
+            # Later additions count as more recently updated
+            'updated_at': self._timestamp(self._updates),
+            'head': {'sha': commits[-1] if commits else None},
+            'merge_commit_sha': merge_commit,
+            'labels': [{'name': 'enhancement'}],
+            'html_url': f"https://github.com/owner/repo/pull/{number}",
+            'commits': commits,
+            'closes': list(closes),
+            'comments': [self._comment(number, i) for i in range(comments)],
+            'review_comments': [
+                dict(self._comment(number, i, prefix="Review"),
+                     path=f"src/file_{i}.py", line=i + 1)
+                for i in range(review_comments)
+            ],
+        }
+        self.pulls[number] = pr
+        for sha in commits:
+            self.commit_pulls.setdefault(sha, []).append(number)
+        self.touch()
+        return pr
+
+    def add_issue(self, number: int, comments: int = 0, title: Optional[str] = None,
+                  author: str = "reporter") -> Dict[str, Any]:
+        """
+        Add an issue.
+
+        Args:
+            number: Issue number
+            comments: Number of comments to generate
+            title: Issue title (default: "Issue #<number>")
+            author: Login of the issue author
+
+        Returns:
+            The stored issue record
+        """
+        issue = {
+            'number': number,
+            'title': title or f"Issue #{number}",
+            'body': f"Description of issue #{number}",
+            'user': {'login': author},
+            'state': 'closed',
+            'created_at': self.CREATED_AT,
+            'closed_at': self.MERGED_AT,
+            'labels': [{'name': 'bug'}],
+            'html_url': f"https://github.com/owner/repo/issues/{number}",
+            'comments': [self._comment(number, i) for i in range(comments)],
+        }
+        self.issues[number] = issue
+        self.touch()
+        return issue
+
+    def touch(self) -> None:
+        """Advance Last-Modified after editing records in place."""
+        self.last_modified = formatdate(time.time() + 1, usegmt=True)
+
+    @staticmethod
+    def _timestamp(minutes: int) -> str:
+        return (datetime(2024, 2, 1) + timedelta(minutes=minutes)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def update_pull_request(self, number: int, **fields: Any) -> None:
+        """
+        Edit a pull request and mark it as the most recently updated.
+
+        Args:
+            number: PR number
+            **fields: Record fields to replace (e.g. ``commits=[...]``)
+        """
+        pr = self.pulls[number]
+        for sha in fields.get('commits', []):
+            if number not in self.commit_pulls.setdefault(sha, []):
+                self.commit_pulls[sha].append(number)
+        pr.update(fields)
+        if 'commits' in fields:
+            pr['head'] = {'sha': fields['commits'][-1] if fields['commits'] else None}
+        self._updates += 1
+        pr['updated_at'] = self._timestamp(self._updates)
+        self.touch()
+
+    @staticmethod
+    def _comment(number: int, i: int, prefix: str = "Comment") -> Dict[str, Any]:
+        return {
+            'user': {'login': f"reviewer{i % 3}"},
+            'body': f"{prefix} {i} on #{number}",
+            'created_at': FakeGitHubServer.CREATED_AT,
+        }
+
+    # Routing ------------------------------------------------------------
+
+    ROUTES = [
+        (re.compile(r'^/repos/[^/]+/[^/]+/pulls$'), '_pull_list'),
+        (re.compile(r'^/repos/[^/]+/[^/]+/pulls/(\d+)$'), '_pull'),
+        (re.compile(r'^/repos/[^/]+/[^/]+/pulls/(\d+)/commits$'), '_pull_commits'),
+        (re.compile(r'^/repos/[^/]+/[^/]+/pulls/(\d+)/comments$'), '_pull_review_comments'),
+        (re.compile(r'^/repos/[^/]+/[^/]+/issues/(\d+)$'), '_issue'),
+        (re.compile(r'^/repos/[^/]+/[^/]+/issues/(\d+)/comments$'), '_issue_comments'),
+        (re.compile(r'^/repos/[^/]+/[^/]+/commits/([0-9a-fA-F]+)/pulls$'), '_commit_pulls'),
+    ]
+
+    def route(self, path: str, query: Optional[Dict[str, List[str]]] = None) -> Tuple[int, Any]:
+        """
+        Resolve a request path to (status, JSON body).
+
+        Args:
+            path: Request path without the query string
+            query: Parsed query string (used by the PR list)
+
+        Returns:
+            HTTP status and response body
+        """
+        for pattern, handler in self.ROUTES:
+            match = pattern.match(path)
+            if match:
+                if handler == '_pull_list':
+                    return self._pull_list(query or {})
+                return getattr(self, handler)(match.group(1))
+        return 404, {'message': 'Not Found'}
+
+    PR_PRIVATE = ('commits', 'closes', 'comments', 'review_comments')
+
+    @staticmethod
+    def _public(record: Dict[str, Any], *private: str) -> Dict[str, Any]:
+        return {key: value for key, value in record.items() if key not in private}
+
+    def _pull_list(self, query: Dict[str, List[str]]) -> Tuple[int, Any]:
+        state = query.get('state', ['open'])[0]
+        pulls = [pr for pr in self.pulls.values() if state == 'all' or pr['state'] == state]
+        key = 'updated_at' if query.get('sort', ['created'])[0] == 'updated' else 'number'
+        descending = query.get('direction', ['desc'])[0] == 'desc'
+        pulls.sort(key=lambda pr: pr[key], reverse=descending)
+        return 200, [self._public(pr, *self.PR_PRIVATE) for pr in pulls]
+
+    def _pull(self, number: str) -> Tuple[int, Any]:
+        pr = self.pulls.get(int(number))
+        if pr is None:
+            return 404, {'message': 'Not Found'}
+        return 200, self._public(pr, *self.PR_PRIVATE)
+
+    def _pull_commits(self, number: str) -> Tuple[int, Any]:
+        pr = self.pulls.get(int(number))
+        if pr is None:
+            return 404, {'message': 'Not Found'}
+        return 200, [{'sha': sha} for sha in pr['commits']]
+
+    def _pull_review_comments(self, number: str) -> Tuple[int, Any]:
+        pr = self.pulls.get(int(number))
+        if pr is None:
+            return 404, {'message': 'Not Found'}
+        return 200, pr['review_comments']
+
+    def _issue(self, number: str) -> Tuple[int, Any]:
+        number = int(number)
+        if number in self.pulls:
+            # GitHub serves PRs from the issues API too, marked with 'pull_request'
+            pr = self._public(self.pulls[number], *self.PR_PRIVATE)
+            pr['pull_request'] = {'url': pr['html_url']}
+            return 200, pr
+        issue = self.issues.get(number)
+        if issue is None:
+            return 404, {'message': 'Not Found'}
+        return 200, self._public(issue, 'comments')
+
+    def _issue_comments(self, number: str) -> Tuple[int, Any]:
+        record = self.pulls.get(int(number)) or self.issues.get(int(number))
+        if record is None:
+            return 404, {'message': 'Not Found'}
+        return 200, record['comments']
+
+    def _commit_pulls(self, sha: str) -> Tuple[int, Any]:
+        return 200, [
+            self._public(self.pulls[number], *self.PR_PRIVATE)
+            for number in self.commit_pulls.get(sha, [])
+        ]
+
+    def _paginate(self, path: str, query: Dict[str, List[str]],
+                  items: List[Any]) -> Tuple[List[Any], Optional[str]]:
+        """One page of a list response and its Link header."""
+        per_page = min(int(query.get('per_page', [self.DEFAULT_PER_PAGE])[0]), self.MAX_PER_PAGE)
+        page = max(int(query.get('page', ['1'])[0]), 1)
+        start = (page - 1) * per_page
+        link = None
+        if start + per_page < len(items):
+            last = (len(items) + per_page - 1) // per_page
+            params = {key: values[0] for key, values in query.items() if key != 'page'}
+            params['per_page'] = per_page
+            base = f"{self.url}{path}?{urlencode(params)}"
+            link = f'<{base}&page={page + 1}>; rel="next", <{base}&page={last}>; rel="last"'
+        return items[start:start + per_page], link
+
+    # GraphQL ------------------------------------------------------------
+
+    GRAPHQL_SELECTIONS = [
+        (re.compile(r'(\w+): issueOrPullRequest\(number: (\d+)\)'), '_gql_issue_or_pull'),
+        (re.compile(r'(\w+): object\(oid: "([0-9a-fA-F]+)"\)'), '_gql_commit'),
+        (re.compile(r'(\w+): node\(id: "([^"]+)"\) \{ \.\.\. on \w+ \{ '
+                    r'(\w+)\(first: \d+, after: "([^"]*)"\)'), '_gql_connection_page'),
+    ]
+
+    def graphql(self, query: str) -> Dict[str, Any]:
+        """
+        Answer a bulk query.
+
+        Args:
+            query: GraphQL document as sent by GraphQLBulkFetcher
+
+        Returns:
+            Response payload with ``data`` (and NOT_FOUND ``errors``)
+        """
+        data: Dict[str, Any] = {}
+        errors = []
+        for pattern, handler in self.GRAPHQL_SELECTIONS:
+            for match in pattern.finditer(query):
+                alias, args = match.group(1), match.groups()[1:]
+                data[alias] = getattr(self, handler)(*args)
+                if data[alias] is None:
+                    errors.append({'type': 'NOT_FOUND', 'path': [alias],
+                                   'message': f"Could not resolve {alias}"})
+        if not data:
+            return {'data': None, 'errors': [{'message': 'Unsupported query for the stub'}]}
+
+        if re.search(r'^query \{ repository\(', query):
+            data = {'repository': data}
+        payload: Dict[str, Any] = {'data': data}
+        if errors:
+            payload['errors'] = errors
+        return payload
+
+    def _gql_page(self, items: List[Any], after: str = "") -> Dict[str, Any]:
+        start = int(after) if after else 0
+        end = start + self.graphql_page_size
+        return {
+            'nodes': items[start:end],
+            'pageInfo': {'hasNextPage': end < len(items), 'endCursor': str(min(end, len(items)))},
+        }
+
+    @staticmethod
+    def _gql_comment(comment: Dict[str, Any]) -> Dict[str, Any]:
+        node = {'author': comment['user'], 'body': comment['body'],
+                'createdAt': comment['created_at']}
+        if 'path' in comment:
+            node.update(path=comment['path'], line=comment['line'], originalLine=comment['line'])
+        return node
+
+    def _gql_connection(self, node_id: str, name: str) -> Optional[List[Any]]:
+        """All nodes of a connection, by owner node id."""
+        kind, _, rest = node_id.partition('_')
+        if kind == 'PR':
+            pr = self.pulls.get(int(rest))
+            if pr is None:
+                return None
+            if name == 'commits':
+                return [{'commit': {'oid': sha}} for sha in pr['commits']]
+            if name == 'comments':
+                return [self._gql_comment(c) for c in pr['comments']]
+            if name == 'reviews':
+                return [self._gql_review(pr, author) for author in self._reviewers(pr)]
+            if name == 'closingIssuesReferences':
+                return [self._gql_issue(self.issues[n]) for n in pr['closes'] if n in self.issues]
+        elif kind == 'I':
+            issue = self.issues.get(int(rest))
+            if issue is not None and name == 'comments':
+                return [self._gql_comment(c) for c in issue['comments']]
+        elif kind == 'PRR':
+            number, _, author = rest.partition('_')
+            pr = self.pulls.get(int(number))
+            if pr is not None and name == 'comments':
+                return [self._gql_comment(c) for c in pr['review_comments']
+                        if c['user']['login'] == author]
+        return None
+
+    @staticmethod
+    def _reviewers(pr: Dict[str, Any]) -> List[str]:
+        # One review per review-comment author
+        return list(dict.fromkeys(c['user']['login'] for c in pr['review_comments']))
+
+    def _gql_review(self, pr: Dict[str, Any], author: str) -> Dict[str, Any]:
+        node_id = f"PRR_{pr['number']}_{author}"
+        return {'id': node_id, 'comments': self._gql_page(self._gql_connection(node_id, 'comments'))}
+
+    def _gql_issue(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+        node_id = f"I_{issue['number']}"
+        return {
+            '__typename': 'Issue', 'id': node_id, 'number': issue['number'],
+            'title': issue['title'], 'body': issue['body'], 'url': issue['html_url'],
+            'state': issue['state'].upper(), 'createdAt': issue['created_at'],
+            'closedAt': issue['closed_at'], 'author': issue['user'],
+            'labels': {'nodes': issue['labels']},
+            'comments': self._gql_page(self._gql_connection(node_id, 'comments')),
+        }
+
+    def _gql_pull(self, pr: Dict[str, Any]) -> Dict[str, Any]:
+        node_id = f"PR_{pr['number']}"
+        node = {
+            '__typename': 'PullRequest', 'id': node_id, 'number': pr['number'],
+            'title': pr['title'], 'body': pr['body'], 'url': pr['html_url'],
+            'state': 'MERGED' if pr['merged_at'] else pr['state'].upper(),
+            'createdAt': pr['created_at'], 'mergedAt': pr['merged_at'],
+            'closedAt': pr['closed_at'], 'author': pr['user'],
+            'labels': {'nodes': pr['labels']},
+        }
+        for name in ('commits', 'comments', 'reviews', 'closingIssuesReferences'):
+            node[name] = self._gql_page(self._gql_connection(node_id, name))
+        return node
+
+    def _gql_issue_or_pull(self, number: str) -> Optional[Dict[str, Any]]:
+        number = int(number)
+        if number in self.pulls:
+            return self._gql_pull(self.pulls[number])
+        if number in self.issues:
+            return self._gql_issue(self.issues[number])
+        return None
+
+    def _gql_commit(self, sha: str) -> Dict[str, Any]:
+        numbers = self.commit_pulls.get(sha, [])[:1]
+        return {'associatedPullRequests': {'nodes': [{'number': n} for n in numbers]}}
+
+    def _gql_connection_page(self, node_id: str, name: str, after: str) -> Optional[Dict[str, Any]]:
+        items = self._gql_connection(node_id, name)
+        if items is None:
+            return None
+        return {name: self._gql_page(items, after)}
+
+    # Rate limiting ------------------------------------------------------
+
+    def _consume_rate_limit(self, consume: bool = True) -> Tuple[bool, int, int]:
+        """Count a request against the rate limit; returns (allowed, remaining, reset)."""
+        with self._lock:
+            if time.time() >= self.rate_limit_reset:
+                self.rate_limit_remaining = self.rate_limit
+                self.rate_limit_reset = time.time() + self.rate_limit_window
+            allowed = self.rate_limit_remaining > 0
+            if allowed and consume:
+                self.rate_limit_remaining -= 1
+            return allowed, self.rate_limit_remaining, int(self.rate_limit_reset)
+
+    # Server lifecycle ---------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeGitHubServer':
+        """Start serving on a free localhost port in a background thread."""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, so client pooling is exercised
+            disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+            def do_GET(self):
+                fake._handle(self)
+
+            def do_POST(self):
+                fake._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeGitHubServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _handle(self, request: BaseHTTPRequestHandler) -> None:
+        url = urlsplit(request.path)
+        path = url.path
+        with self._lock:
+            self.request_count += 1
+            self.requests.append(path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+
+            link = None
+            if request.command == 'POST':
+                length = int(request.headers.get('Content-Length', 0))
+                document = json.loads(request.rfile.read(length) or b'{}')
+                if path == '/graphql':
+                    status, body = 200, self.graphql(document.get('query', ''))
+                else:
+                    status, body = 404, {'message': 'Not Found'}
+            else:
+                query = parse_qs(url.query)
+                status, body = self.route(path, query)
+                if status == 200 and isinstance(body, list):
+                    body, link = self._paginate(path, query, body)
+            payload = json.dumps(body).encode('utf-8')
+            etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+            last_modified = self.last_modified
+
+            if_none_match = request.headers.get('If-None-Match')
+            if if_none_match is not None:
+                not_modified = if_none_match == etag
+            else:
+                not_modified = request.headers.get('If-Modified-Since') == last_modified
+            not_modified = not_modified and status == 200 and request.command == 'GET'
+
+            allowed, remaining, reset = self._consume_rate_limit(consume=not not_modified)
+            if not_modified:
+                status, payload = 304, b''
+                with self._lock:
+                    self.not_modified_count += 1
+            elif not allowed:
+                status = 403
+                payload = json.dumps({'message': 'API rate limit exceeded'}).encode('utf-8')
+
+            request.send_response(status)
+            request.send_header('Content-Type', 'application/json')
+            request.send_header('Content-Length', str(len(payload)))
+            if status in (200, 304) and request.command == 'GET':
+                request.send_header('ETag', etag)
+                request.send_header('Last-Modified', last_modified)
+            if link and status == 200:
+                request.send_header('Link', link)
+            request.send_header('X-RateLimit-Limit', str(self.rate_limit))
+            request.send_header('X-RateLimit-Remaining', str(remaining))
+            request.send_header('X-RateLimit-Reset', str(reset))
+            request.end_headers()
+            request.wfile.write(payload)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
@@ -0,0 +1,130 @@
+"""
+File Commit Index - Posting lists from files and directories to commits.
+
+This module provides tools to:
+- Map every file path to the SHAs of the commits that touched it
+- Follow renames so a file's postings include commits made under old paths
+- Map directories to the commits that touched anything below them
+- Pick a candidate set of commits for a question about one file
+"""
+
+import posixpath
+from typing import Dict, List, Set
+
+from .git_analyzer import RepositoryHistory
+
+
+class FileCommitIndex:
+    """
+    File → commit SHA postings built from ``RepositoryHistory.file_history``.
+
+    Paths are repository-relative with ``/`` separators, as git reports them.
+    Renames recorded on commits (new path → old path) link a path to its
+    previous names, so lookups return the file's whole history. Directory
+    postings cover every ancestor directory of a changed file except the
+    repository root.
+    """
+
+    def __init__(self, history: RepositoryHistory):
+        """
+        Build the index.
+
+        Args:
+            history: Analyzed repository history
+        """
+        self.file_commits: Dict[str, List[str]] = {
+            path: [c.sha for c in commits] for path, commits in history.file_history.items()
+        }
+        self.previous_paths: Dict[str, Set[str]] = {}  # path -> paths it was renamed from
+        for commit in history.commits:
+            for new_path, old_path in commit.renames.items():
+                self.previous_paths.setdefault(new_path, set()).add(old_path)
+
+        self.directory_commits: Dict[str, Set[str]] = {}
+        for path, shas in self.file_commits.items():
+            directory = posixpath.dirname(path)
+            while directory:
+                self.directory_commits.setdefault(directory, set()).update(shas)
+                directory = posixpath.dirname(directory)
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """Normalize a path to the index's repository-relative form."""
+        path = posixpath.normpath(path.replace('\\', '/'))
+        return '' if path == '.' else path.lstrip('/')
+
+    def paths_for(self, path: str) -> List[str]:
+        """
+        Get a path and every path it was renamed from, newest first.
+
+        Args:
+            path: Repository-relative file path
+
+        Returns:
+            The normalized path followed by its earlier names
+        """
+        path = self.normalize(path)
+        paths = [path]
+        seen = {path}
+        for current in paths:
+            for previous in sorted(self.previous_paths.get(current, ())):
+                if previous not in seen:
+                    seen.add(previous)
+                    paths.append(previous)
+        return paths
+
+    def commits_for_file(self, path: str, follow_renames: bool = True) -> List[str]:
+        """
+        Get the SHAs of commits that touched a file.
+
+        Args:
+            path: Repository-relative file path
+            follow_renames: Include commits made under the file's earlier names
+
+        Returns:
+            Commit SHAs without duplicates, current path's commits first
+        """
+        paths = self.paths_for(path) if follow_renames else [self.normalize(path)]
+        shas: Dict[str, None] = {}
+        for name in paths:
+            shas.update(dict.fromkeys(self.file_commits.get(name, ())))
+        return list(shas)
+
+    def commits_for_directory(self, directory: str) -> Set[str]:
+        """
+        Get the SHAs of commits that touched any file below a directory.
+
+        Args:
+            directory: Repository-relative directory path
+
+        Returns:
+            Set of commit SHAs (empty for unknown directories and the root)
+        """
+        return self.directory_commits.get(self.normalize(directory), set())
+
+    def candidate_shas(self, path: str, min_count: int = 0) -> List[str]:
+        """
+        Get the commits to consider for a question about a file.
+
+        The file's own commits (following renames) come first. While there
+        are fewer than ``min_count`` of them, commits touching the file's
+        directory, then its parent directories, are added; the repository
+        root is never used, so the result may stay below ``min_count``.
+
+        Args:
+            path: Repository-relative file path
+            min_count: Widen to enclosing directories below this many candidates
+
+        Returns:
+            Commit SHAs without duplicates
+        """
+        paths = self.paths_for(path)
+        candidates = dict.fromkeys(self.commits_for_file(path))
+
+        directories = {posixpath.dirname(name) for name in paths}
+        while len(candidates) < min_count and any(directories):
+            for directory in sorted(directories):
+                candidates.update(dict.fromkeys(sorted(self.commits_for_directory(directory))))
+            directories = {posixpath.dirname(d) for d in directories if d}
+
+        return list(candidates)
@@ -13,9 +13,12 @@ import re
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple, Iterator, TYPE_CHECKING
 import json
 
+if TYPE_CHECKING:
+    from .history_store import HistoryStore
+
 
 @dataclass
 class Commit:
@@ -33,6 +36,7 @@ class Commit:
     deletions: int = 0
     diff: str = ""
     tags: Set[str] = field(default_factory=set)
+    renames: Dict[str, str] = field(default_factory=dict)  # new path -> old path
 
     def __hash__(self):
         return hash(self.sha)
@@ -91,6 +95,29 @@ class RepositoryHistory:
         """Get top 10 contributors by commit count."""
         return sorted(self.author_stats.items(), key=lambda x: x[1], reverse=True)[:10]
 
+    def add_commits(self, commits: List[Commit], arch_commits: List[ArchCommit]) -> None:
+        """
+        Merge newly discovered commits into the history and its indexes.
+
+        Only the entries touched by the new commits are updated; existing
+        index lists are extended in place rather than rebuilt.
+
+        Args:
+            commits: New commits, ordered from newest to oldest
+            arch_commits: Architecturally significant subset of ``commits``
+        """
+        if not commits:
+            return
+
+        self.commits[:0] = commits
+
+        self.arch_commits.extend(arch_commits)
+        self.arch_commits.sort(key=lambda ac: ac.impact_score, reverse=True)
+
+        TemporalCorrelator.update_temporal_index(self.temporal_index, commits)
+        TemporalCorrelator.update_file_history(self.file_history, commits)
+        TemporalCorrelator.update_author_stats(self.author_stats, commits)
+
 
 class CommitAnalyzer:
     """Analyzes commits to identify architectural significance."""
@@ -220,17 +247,28 @@ class TemporalCorrelator:
         Format: YYYY-MM-DD -> [commits on that date]
         """
         index = {}
+        TemporalCorrelator.update_temporal_index(index, commits)
+        return index
+
+    @staticmethod
+    def update_temporal_index(index: Dict[str, List[Commit]], commits: List[Commit]) -> None:
+        """
+        Add commits to an existing temporal index in place.
+
+        Only the days that receive new commits are re-sorted.
+        """
+        additions = {}
         for commit in commits:
             date_key = commit.date.strftime('%Y-%m-%d')
-            if date_key not in index:
-                index[date_key] = []
-            index[date_key].append(commit)
-
-        # Sort commits within each day by timestamp
-        for date_key in index:
-            index[date_key].sort(key=lambda c: c.date)
+            if date_key not in additions:
+                additions[date_key] = []
+            additions[date_key].append(commit)
 
-        return index
+        # New commits go first so same-timestamp ties order as in a full build
+        for date_key, new_commits in additions.items():
+            merged = new_commits + index.get(date_key, [])
+            merged.sort(key=lambda c: c.date)
+            index[date_key] = merged
 
     @staticmethod
     def build_file_history(commits: List[Commit]) -> Dict[str, List[Commit]]:
@@ -240,17 +278,29 @@ class TemporalCorrelator:
         Format: filename -> [commits that modified this file]
         """
         index = {}
+        TemporalCorrelator.update_file_history(index, commits)
+        return index
+
+    @staticmethod
+    def update_file_history(index: Dict[str, List[Commit]], commits: List[Commit]) -> None:
+        """
+        Add commits to an existing file history index in place.
+
+        Only the files touched by the new commits are re-sorted.
+        """
+        additions = {}
         for commit in commits:
             for file_path in commit.files_changed:
-                if file_path not in index:
-                    index[file_path] = []
-                index[file_path].append(commit)
+                if file_path not in additions:
+                    additions[file_path] = []
+                additions[file_path].append(commit)
 
-        # Sort commits for each file chronologically
-        for file_path in index:
-            index[file_path].sort(key=lambda c: c.date)
-
-        return index
+        # Sort commits for each file chronologically; new commits go first so
+        # same-timestamp ties order as in a full build
+        for file_path, new_commits in additions.items():
+            merged = new_commits + index.get(file_path, [])
+            merged.sort(key=lambda c: c.date)
+            index[file_path] = merged
 
     @staticmethod
     def build_author_stats(commits: List[Commit]) -> Dict[str, int]:
@@ -260,12 +310,16 @@ class TemporalCorrelator:
         Format: author -> commit count
         """
         stats = {}
+        TemporalCorrelator.update_author_stats(stats, commits)
+        return stats
+
+    @staticmethod
+    def update_author_stats(stats: Dict[str, int], commits: List[Commit]) -> None:
+        """Add commit counts for new commits to existing author statistics."""
         for commit in commits:
             author = commit.author
             stats[author] = stats.get(author, 0) + 1
 
-        return stats
-
 
 class GitArchaeologist:
     """Main class for analyzing git repository history."""
@@ -294,16 +348,160 @@ class GitArchaeologist:
         )
         return result.stdout.strip()
 
-    def extract_commit_history(self, limit: Optional[int] = None) -> List[Commit]:
+    # Field and record separators for the streaming log format. ASCII
+    # RS/US never appear in author names and are vanishingly rare in messages.
+    _RECORD_SEP = '\x1e'
+    _FIELD_SEP = '\x1f'
+    _STREAM_FORMAT = '%x1e%H%x1f%an%x1f%ae%x1f%at%x1f%P%x1f%s%n%b%x1f'
+    _STREAM_CHUNK_SIZE = 64 * 1024
+
+    def extract_commit_history(self, limit: Optional[int] = None,
+                               streaming: bool = True) -> List[Commit]:
         """
         Extract complete commit history from the repository.
 
         Args:
             limit: Maximum number of commits to extract (None for all)
+            streaming: Use the single-pass ``git log --numstat -z`` extractor
+                (default). ``False`` selects the legacy path that runs
+                ``git show --stat`` once per commit.
 
         Returns:
             List of Commit objects, ordered from newest to oldest
         """
+        if streaming:
+            return list(self.iter_commits(limit=limit))
+
+        return self._extract_commit_history_per_commit(limit=limit)
+
+    def iter_commits(self, limit: Optional[int] = None,
+                     revisions: Optional[List[str]] = None) -> Iterator[Commit]:
+        """
+        Stream commits from a single ``git log --numstat -z`` invocation.
+
+        Messages, parents and per-file line counts all come from one git
+        process. Output is parsed incrementally, so the full log is never
+        held in memory and callers may stop iterating early.
+
+        Args:
+            limit: Maximum number of commits to yield (None for all)
+            revisions: Revision arguments passed to git log (default: ``--all``)
+
+        Yields:
+            Commit objects, ordered from newest to oldest
+        """
+        # First-parent stats for merges match what `git show --stat` reports
+        cmd = ['git', '-C', str(self.repo_path), 'log', '-z', '--numstat',
+               '--diff-merges=first-parent', f'--format={self._STREAM_FORMAT}']
+        if limit:
+            cmd.append(f'-n{limit}')
+        cmd.extend(revisions if revisions is not None else ['--all'])
+        cmd.append('--')
+
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+        completed = False
+        try:
+            yield from self._parse_numstat_stream(self._iter_nul_tokens(process.stdout))
+            completed = True
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+
+        if completed and process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
+
+    def _iter_nul_tokens(self, stream) -> Iterator[str]:
+        """Split a binary stream on NUL bytes, decoding each token lazily."""
+        pending = b''
+        while True:
+            chunk = stream.read(self._STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            pending += chunk
+            tokens = pending.split(b'\0')
+            pending = tokens.pop()
+            for token in tokens:
+                yield token.decode('utf-8', errors='replace')
+
+        if pending:
+            yield pending.decode('utf-8', errors='replace')
+
+    def _parse_numstat_stream(self, tokens: Iterator[str]) -> Iterator[Commit]:
+        """
+        Parse NUL-separated ``git log -z --numstat`` tokens into commits.
+
+        Token shapes:
+            header:  "\x1e<sha>\x1f<author>\x1f...\x1f<message>\x1f"
+            numstat: "<added>\t<deleted>\t<path>"
+            rename:  "<added>\t<deleted>\t" followed by <old> and <new> tokens
+        """
+        commit: Optional[Commit] = None
+        tokens = iter(tokens)
+
+        for token in tokens:
+            token = token.lstrip('\n')
+            if not token:
+                continue
+
+            if token.startswith(self._RECORD_SEP):
+                if commit is not None:
+                    yield commit
+                commit = self._parse_stream_header(token[1:])
+                continue
+
+            if commit is None:
+                continue
+
+            parts = token.split('\t', 2)
+            if len(parts) != 3:
+                continue
+
+            added, deleted, path = parts
+            if not path:
+                # Rename or copy: old and new paths follow as separate tokens
+                old_path = next(tokens, '')
+                path = next(tokens, '')
+                if old_path and old_path != path:
+                    commit.renames[path] = old_path
+
+            commit.files_changed.append(path)
+            # Binary files report "-" for both counts
+            if added.isdigit():
+                commit.additions += int(added)
+            if deleted.isdigit():
+                commit.deletions += int(deleted)
+
+        if commit is not None:
+            yield commit
+
+    def _parse_stream_header(self, header: str) -> Commit:
+        """Build a Commit (without file stats) from a streaming log header."""
+        sha, author, email, timestamp, parents, message = header.split(self._FIELD_SEP, 5)
+        if message.endswith(self._FIELD_SEP):
+            message = message[:-1]
+
+        return Commit(
+            sha=sha,
+            message=message.strip(),
+            author=author,
+            email=email,
+            date=datetime.fromtimestamp(int(timestamp)),
+            parents=parents.split() if parents else [],
+        )
+
+    def _extract_commit_history_per_commit(self, limit: Optional[int] = None) -> List[Commit]:
+        """
+        Legacy extraction: one ``git log`` plus one ``git show --stat`` per commit.
+
+        Kept for comparison benchmarks; prefer ``iter_commits``.
+        """
         # Get commit log with custom format
         format_str = '%H%n%an%n%ae%n%at%n%P%n%s%n%b%n---COMMIT-END---'
 
@@ -460,13 +658,105 @@ class GitArchaeologist:
             branch_commits=branch_commits,
         )
 
-    def _analyze_branches(self, commits: List[Commit]) -> Dict[str, List[Commit]]:
-        """Analyze branches and map commits to branches."""
-        # Get all branches
-        branches_output = self._run_git_command(['branch', '-a'])
-        branches = [b.strip().lstrip('* ') for b in branches_output.split('\n')]
+    def analyze_repo_incremental(self, store: 'HistoryStore') -> Tuple[RepositoryHistory, List[Commit]]:
+        """
+        Load persisted history and extend it with commits added since the last run.
+
+        Only commits reachable from the current refs but not from the stored
+        refs are read from git, and only the index entries they touch are
+        updated. Falls back to a full analysis when nothing is stored or the
+        stored refs no longer resolve (e.g. after history was rewritten).
+
+        Args:
+            store: HistoryStore holding the persisted history
+
+        Returns:
+            Tuple of (RepositoryHistory, new commits since the stored state)
+        """
+        tips = self.list_ref_tips()
+        branch_tips = self.list_branch_tips()
+
+        snapshot = store.load()
+        if snapshot is None:
+            history = self.analyze_repo()
+            store.save(history, tips, branch_tips)
+            return history, list(history.commits)
+
+        history = snapshot.history
+        if set(tips) == set(snapshot.tips) and branch_tips == snapshot.branch_tips:
+            return history, []
+
+        new_tips = [t for t in tips if t not in set(snapshot.tips)]
+        known = {c.sha for c in history.commits}
+        try:
+            new_commits = [
+                c for c in self.iter_commits(revisions=new_tips + ['--not'] + snapshot.tips)
+                if c.sha not in known
+            ] if new_tips else []
+        except subprocess.CalledProcessError:
+            print("Stored history no longer matches repository refs, rebuilding...")
+            history = self.analyze_repo()
+            store.save(history, tips, branch_tips)
+            return history, list(history.commits)
+
+        history.add_commits(new_commits, self.identify_architectural_commits(new_commits))
+
+        changed = [b for b, sha in branch_tips.items() if snapshot.branch_tips.get(b) != sha]
+        for branch in list(history.branch_commits):
+            if branch not in branch_tips:
+                del history.branch_commits[branch]
+        history.branch_commits.update(self._analyze_branches(history.commits, branches=changed))
+
+        store.save(history, tips, branch_tips)
+        return history, new_commits
+
+    def list_ref_tips(self) -> List[str]:
+        """List the commit SHAs of HEAD and every ref (the roots of ``git log --all``)."""
+        output = self._run_git_command(['rev-parse', 'HEAD', '--all'], check=False)
+        tips = []
+        for line in output.split('\n'):
+            line = line.strip()
+            if len(line) == 40 and line not in tips:
+                tips.append(line)
+        return tips
+
+    def list_branch_tips(self) -> Dict[str, str]:
+        """Map branch names (as shown by ``git branch -a``) to their tip SHAs."""
+        output = self._run_git_command(
+            ['branch', '-a', '--format=%(refname) %(objectname)'], check=False
+        )
+        tips = {}
+        for line in output.split('\n'):
+            if not line.strip():
+                continue
+            refname, _, sha = line.rpartition(' ')
+            if refname.startswith('refs/heads/'):
+                name = refname[len('refs/heads/'):]
+            elif refname.startswith('refs/'):
+                name = refname[len('refs/'):]
+            else:
+                name = refname
+            if 'HEAD' in name:
+                continue
+            tips[name] = sha
+        return tips
+
+    def _analyze_branches(self, commits: List[Commit],
+                          branches: Optional[List[str]] = None) -> Dict[str, List[Commit]]:
+        """
+        Analyze branches and map commits to branches.
+
+        Args:
+            commits: Commits to assign to branches
+            branches: Branch names to analyze (default: all branches)
+        """
+        if branches is None:
+            # Get all branches
+            branches_output = self._run_git_command(['branch', '-a'])
+            branches = [b.strip().lstrip('* ') for b in branches_output.split('\n')]
 
         branch_commits = {}
+        commits_by_sha = {c.sha: c for c in commits}
 
         # For each branch, get its commits
         for branch in branches:
@@ -475,10 +765,11 @@ class GitArchaeologist:
 
             try:
                 branch_log = self._run_git_command(['log', '--format=%H', branch], check=False)
-                branch_shas = set(branch_log.split('\n'))
 
-                # Find commits in this branch
-                branch_commits[branch] = [c for c in commits if c.sha in branch_shas]
+                # Resolve branch commits by SHA lookup
+                branch_commits[branch] = [
+                    commits_by_sha[sha] for sha in branch_log.split('\n') if sha in commits_by_sha
+                ]
             except:
                 continue
 
@@ -0,0 +1,231 @@
+"""
+GitHub Response Cache - Persist GitHub API responses between runs.
+
+This module provides tools to:
+- Store response bodies with their ETag / Last-Modified validators
+- Revalidate them with conditional requests (304 Not Modified responses
+  do not count against the GitHub rate limit)
+- Reload the cache quickly so warm enrichment runs reuse earlier downloads
+"""
+
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class CachedResponse:
+    """A cached GitHub API response and its validators."""
+
+    body: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    next_url: Optional[str] = None  # Link rel="next" of a paginated list
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that revalidate this response."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+@dataclass
+class ResponseCacheStats:
+    """Statistics for the GitHub response cache."""
+
+    revalidated: int = 0  # 304 Not Modified: cached body reused
+    stored: int = 0       # 200 with validators: body (re)stored
+    uncached: int = 0     # Responses without validators or not found
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of cacheable requests answered by a 304."""
+        total = self.revalidated + self.stored
+        if total == 0:
+            return 0.0
+        return self.revalidated / total
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        return {
+            'revalidated': self.revalidated,
+            'stored': self.stored,
+            'uncached': self.uncached,
+            'hit_rate': f"{self.hit_rate:.1%}",
+        }
+
+
+class GitHubResponseCache:
+    """
+    On-disk cache of GitHub API responses under ``.ail/github/``.
+
+    Entries are keyed by request URL (including query parameters) and kept in
+    memory; save() writes them as one versioned pickle, replaced atomically.
+    Safe to share between the threads of concurrent enrichment.
+    """
+
+    VERSION = 2
+    FILENAME = "responses.pkl"
+
+    def __init__(self, store_dir: Path):
+        """
+        Initialize the response cache and load any stored entries.
+
+        Args:
+            store_dir: Directory for the cache file
+        """
+        self.store_dir = Path(store_dir)
+        self.stats = ResponseCacheStats()
+        self._entries: Dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    @property
+    def path(self) -> Path:
+        """Path of the cache file."""
+        return self.store_dir / self.FILENAME
+
+    @property
+    def size(self) -> int:
+        """Number of cached responses."""
+        return len(self._entries)
+
+    def exists(self) -> bool:
+        """Check if a stored cache is available."""
+        return self.path.exists()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Request URL including query string
+
+        Returns:
+            CachedResponse or None if the request was never cached
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, body: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, next_url: Optional[str] = None) -> None:
+        """
+        Store a response if it carries a validator.
+
+        Args:
+            key: Request URL including query string
+            body: Decoded JSON body
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            next_url: URL of the next page, for paginated lists
+        """
+        with self._lock:
+            if not etag and not last_modified:
+                self.stats.uncached += 1
+                return
+            self._entries[key] = CachedResponse(
+                body=body, etag=etag, last_modified=last_modified, fetched_at=time.time(),
+                next_url=next_url,
+            )
+            self.stats.stored += 1
+            self._dirty = True
+
+    def revalidated(self, key: str) -> Optional[CachedResponse]:
+        """
+        Record a 304 for ``key`` and return the cached response.
+
+        Args:
+            key: Request URL including query string
+
+        Returns:
+            CachedResponse, or None if the entry has been evicted meanwhile
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.stats.revalidated += 1
+            return entry
+
+    def discard(self, key: str) -> None:
+        """Drop a cached response (e.g. the resource is gone)."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def load(self) -> int:
+        """
+        Load stored entries, replacing the in-memory ones.
+
+        Returns:
+            Number of entries loaded (0 if nothing is stored or the file is
+            unreadable or from an incompatible version)
+        """
+        if not self.path.exists():
+            return 0
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Failed to load GitHub response cache {self.path}: {e}")
+            return 0
+
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            return 0
+
+        entries = {
+            key: CachedResponse(body=body, etag=etag, last_modified=last_modified,
+                                fetched_at=fetched_at, next_url=next_url)
+            for key, (body, etag, last_modified, fetched_at, next_url) in data['entries'].items()
+        }
+        with self._lock:
+            self._entries = entries
+            self._dirty = False
+        return len(entries)
+
+    def save(self) -> bool:
+        """
+        Persist entries atomically (write to a temp file, then rename).
+
+        Returns:
+            True if the cache was written, False if nothing changed
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            data = {
+                'version': self.VERSION,
+                'entries': {
+                    key: (entry.body, entry.etag, entry.last_modified, entry.fetched_at,
+                          entry.next_url)
+                    for key, entry in self._entries.items()
+                },
+            }
+            self._dirty = False
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        # Unique temp name so concurrent writers never interleave in one file
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        return True
+
+    def clear(self) -> None:
+        """Delete all cached responses, in memory and on disk."""
+        with self._lock:
+            self._entries = {}
+            self._dirty = False
+        if self.path.exists():
+            self.path.unlink()
@@ -9,16 +9,24 @@ This module provides tools to:
 - Enrich commit metadata with GitHub data
 """
 
+import asyncio
 import os
 import re
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional, Set, Tuple
+from typing import Any, Awaitable, Callable, List, Dict, Optional, Set, Tuple
 from pathlib import Path
 import json
 import time
 
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlencode
+
+from .commit_pr_map import CommitPullRequestMap
+from .github_cache import GitHubResponseCache
 from .git_analyzer import Commit, ArchCommit, RepositoryHistory
 
 
@@ -126,6 +134,22 @@ class EnrichedHistory:
     issues: Dict[int, Issue]  # Issue number -> Issue
     commit_to_pr: Dict[str, int]  # Commit SHA -> PR number
 
+    # Lookup tables, built once here and kept in sync by add_enriched_commits
+    commits_by_sha: Dict[str, EnrichedCommit] = field(default_factory=dict, repr=False)
+    commits_by_faiss_id: Dict[int, EnrichedCommit] = field(default_factory=dict, repr=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+    # FAISS id -> document id, as linked (by reference, so later additions resolve)
+    _faiss_doc_ids: Dict[int, str] = field(default_factory=dict, init=False, repr=False,
+                                           compare=False)
+
+    def __post_init__(self):
+        """Build the SHA lookup table."""
+        self._rebuild_sha_index()
+
+    def _rebuild_sha_index(self) -> None:
+        self.commits_by_sha = {ec.commit.sha: ec for ec in self.enriched_commits}
+        self._indexed_count = len(self.enriched_commits)
+
     @property
     def enrichment_rate(self) -> float:
         """Percentage of commits with GitHub context."""
@@ -134,21 +158,104 @@ class EnrichedHistory:
         enriched_count = sum(1 for ec in self.enriched_commits if ec.has_context)
         return enriched_count / len(self.enriched_commits)
 
+    def get_commit(self, sha: str) -> Optional[EnrichedCommit]:
+        """
+        Look up an enriched commit by SHA in constant time.
+
+        Args:
+            sha: Full commit SHA
+
+        Returns:
+            EnrichedCommit or None if the commit is not in this history
+        """
+        if self._indexed_count != len(self.enriched_commits):
+            # enriched_commits was modified directly; resync the table
+            self._rebuild_sha_index()
+        return self.commits_by_sha.get(sha)
+
+    def get_commit_by_faiss_id(self, faiss_id: int) -> Optional[EnrichedCommit]:
+        """
+        Look up an enriched commit by its integer id in the FAISS index.
+
+        Requires link_faiss_ids() to have been called with the index metadata.
+        Ids added to that metadata, and commits added to this history, after
+        linking are resolved on first lookup.
+        """
+        faiss_id = int(faiss_id)
+        enriched = self.commits_by_faiss_id.get(faiss_id)
+        if enriched is None:
+            doc_id = self._faiss_doc_ids.get(faiss_id, "")
+            if doc_id.startswith("commit_"):
+                enriched = self.get_commit(doc_id[len("commit_"):])
+                if enriched is not None:
+                    self.commits_by_faiss_id[faiss_id] = enriched
+        return enriched
+
+    def link_faiss_ids(self, id_to_doc: Dict[int, str]) -> int:
+        """
+        Map FAISS integer ids to commits.
+
+        Args:
+            id_to_doc: FAISS id -> document id (``"commit_<sha>"``), as kept in
+                ``FAISSIndex.metadata``; kept by reference, so ids the index
+                gains later still resolve
+
+        Returns:
+            Number of ids resolved to commits in this history
+        """
+        self._faiss_doc_ids = id_to_doc
+        self.commits_by_faiss_id = {}
+        for faiss_id, doc_id in id_to_doc.items():
+            if not doc_id.startswith("commit_"):
+                continue
+            enriched = self.get_commit(doc_id[len("commit_"):])
+            if enriched is not None:
+                self.commits_by_faiss_id[int(faiss_id)] = enriched
+        return len(self.commits_by_faiss_id)
+
+    def add_enriched_commits(self, enriched_commits: List[EnrichedCommit]) -> None:
+        """
+        Add newly enriched commits (newest first) and update lookup tables.
+
+        Args:
+            enriched_commits: Commits to add, ordered from newest to oldest
+        """
+        self.enriched_commits[:0] = enriched_commits
+        for enriched in enriched_commits:
+            self.commits_by_sha[enriched.commit.sha] = enriched
+            if enriched.pull_request:
+                self.pull_requests[enriched.pull_request.number] = enriched.pull_request
+                self.commit_to_pr[enriched.commit.sha] = enriched.pull_request.number
+            for issue in enriched.related_issues:
+                self.issues[issue.number] = issue
+        self._indexed_count = len(self.enriched_commits)
+
 
 class GitHubAPIClient:
     """GitHub API client with rate limiting and error handling."""
 
     BASE_URL = "https://api.github.com"
+    RATE_LIMIT_RESERVE = 10  # Pause when fewer requests than this remain
+    PER_PAGE = 100  # Maximum page size of list endpoints
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, base_url: Optional[str] = None,
+                 pool_size: int = 10, response_cache: Optional[GitHubResponseCache] = None):
         """
         Initialize GitHub API client.
 
         Args:
             token: GitHub personal access token (or use GITHUB_TOKEN env var)
+            base_url: API root (default: https://api.github.com)
+            pool_size: Keep-alive connections kept per host (default: 10)
+            response_cache: Cache of responses revalidated with conditional
+                requests (optional)
         """
         self.token = token or os.environ.get('GITHUB_TOKEN')
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        self.response_cache = response_cache
         self.session = requests.Session()
+        self.pool_size = 0
+        self.set_pool_size(pool_size)
 
         if self.token:
             self.session.headers.update({
@@ -162,15 +269,45 @@ class GitHubAPIClient:
 
         self.rate_limit_remaining = None
         self.rate_limit_reset = None
+        self._rate_limit_lock = threading.Lock()
+
+    def set_pool_size(self, pool_size: int) -> None:
+        """
+        Size the connection pool for concurrent requests.
+
+        Args:
+            pool_size: Keep-alive connections kept per host
+        """
+        if pool_size <= self.pool_size:
+            return
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.pool_size = pool_size
+
+    def rate_limit_delay(self, reserve: int = RATE_LIMIT_RESERVE) -> float:
+        """
+        Seconds to wait before the next request to stay within the rate limit.
+
+        Args:
+            reserve: Pause when fewer than this many requests remain
+
+        Returns:
+            0.0 if requests may proceed now
+        """
+        with self._rate_limit_lock:
+            remaining, reset = self.rate_limit_remaining, self.rate_limit_reset
+        if remaining is None or remaining >= reserve or not reset:
+            return 0.0
+        wait_time = reset - time.time()
+        return wait_time + 1 if wait_time > 0 else 0.0
 
     def _check_rate_limit(self):
         """Check and handle rate limiting."""
-        if self.rate_limit_remaining is not None and self.rate_limit_remaining < 10:
-            if self.rate_limit_reset:
-                wait_time = max(0, self.rate_limit_reset - time.time())
-                if wait_time > 0:
-                    print(f"Rate limit low ({self.rate_limit_remaining}), waiting {wait_time:.0f}s...")
-                    time.sleep(wait_time + 1)
+        wait_time = self.rate_limit_delay()
+        if wait_time > 0:
+            print(f"Rate limit low ({self.rate_limit_remaining}), waiting {wait_time:.0f}s...")
+            time.sleep(wait_time)
 
     def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
         """
@@ -183,51 +320,171 @@ class GitHubAPIClient:
         Returns:
             JSON response as dictionary
         """
+        data, _ = self._get(f"{self.base_url}{endpoint}", params or {})
+        return data
+
+    def _get_all_pages(self, endpoint: str, params: Dict = None) -> List[Dict]:
+        """
+        Fetch every page of a list endpoint, following Link rel="next".
+
+        Args:
+            endpoint: API endpoint returning a JSON list
+            params: Query parameters (per_page defaults to the maximum, 100)
+
+        Returns:
+            Items from all pages ([] if not found)
+        """
+        return list(self.iter_pages(endpoint, params))
+
+    def iter_pages(self, endpoint: str, params: Dict = None):
+        """
+        Iterate over the items of a list endpoint, fetching pages on demand.
+
+        Stop iterating to skip the remaining pages.
+
+        Args:
+            endpoint: API endpoint returning a JSON list
+            params: Query parameters (per_page defaults to the maximum, 100)
+
+        Yields:
+            Items in the order the API returns them
+        """
+        params = dict(params or {})
+        params.setdefault('per_page', self.PER_PAGE)
+        url = f"{self.base_url}{endpoint}"
+
+        while url:
+            data, url = self._get(url, params)
+            if not data:
+                return
+            yield from data
+            params = {}  # The next link carries the query string
+
+    def _get(self, url: str, params: Dict) -> Tuple[Any, Optional[str]]:
+        """
+        GET one page, revalidating a cached copy if there is one.
+
+        Returns:
+            (JSON body or None if not found, URL of the next page or None)
+        """
         self._check_rate_limit()
 
-        url = f"{self.BASE_URL}{endpoint}"
-        response = self.session.get(url, params=params or {})
+        # Revalidate a cached response instead of downloading it again
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        cached = self.response_cache.get(cache_key) if self.response_cache else None
+        headers = cached.validators if cached else None
+
+        response = self.session.get(url, params=params, headers=headers)
+        self._update_rate_limit(response)
 
-        # Update rate limit info
-        self.rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-        self.rate_limit_reset = int(response.headers.get('X-RateLimit-Reset', 0))
+        if response.status_code == 304 and cached:
+            entry = self.response_cache.revalidated(cache_key)
+            if entry is not None:
+                return entry.body, entry.next_url
+            # Evicted meanwhile; fetch unconditionally
+            response = self.session.get(url, params=params)
+            self._update_rate_limit(response)
 
         if response.status_code == 404:
-            return None
+            if self.response_cache:
+                self.response_cache.discard(cache_key)
+            return None, None
         elif response.status_code == 403:
             raise Exception(f"GitHub API rate limit exceeded or forbidden: {response.text}")
         elif response.status_code != 200:
             raise Exception(f"GitHub API error {response.status_code}: {response.text}")
 
-        return response.json()
+        data = response.json()
+        next_url = response.links.get('next', {}).get('url')
+        if self.response_cache:
+            self.response_cache.put(
+                cache_key, data,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                next_url=next_url,
+            )
+        return data, next_url
+
+    def _update_rate_limit(self, response: requests.Response) -> None:
+        """Record the rate limit state reported by a response."""
+        with self._rate_limit_lock:
+            self.rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
+            self.rate_limit_reset = int(response.headers.get('X-RateLimit-Reset', 0))
+
+    def graphql(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """
+        Run a GraphQL query (requires a token on github.com).
+
+        Args:
+            query: GraphQL query document
+            variables: Query variables
+
+        Returns:
+            The ``data`` member of the response. Aliases that were not found
+            (NOT_FOUND errors) are returned as None instead of raising.
+        """
+        self._check_rate_limit()
+
+        response = self.session.post(
+            f"{self.base_url}/graphql",
+            json={'query': query, 'variables': variables or {}},
+        )
+        self._update_rate_limit(response)
+
+        if response.status_code == 403:
+            raise Exception(f"GitHub API rate limit exceeded or forbidden: {response.text}")
+        elif response.status_code != 200:
+            raise Exception(f"GitHub GraphQL error {response.status_code}: {response.text}")
+
+        payload = response.json()
+        errors = [e for e in payload.get('errors', []) if e.get('type') != 'NOT_FOUND']
+        if errors or payload.get('data') is None:
+            raise Exception(f"GitHub GraphQL error: {errors or payload.get('errors')}")
+        return payload['data']
+
+    def save_response_cache(self) -> bool:
+        """
+        Persist the response cache if it changed.
+
+        Returns:
+            True if the cache was written
+        """
+        if self.response_cache is None:
+            return False
+        try:
+            return self.response_cache.save()
+        except OSError as e:
+            print(f"Warning: Failed to save GitHub response cache: {e}")
+            return False
 
     def get_pull_request(self, owner: str, repo: str, pr_number: int) -> Optional[Dict]:
         """Get pull request data."""
         return self._make_request(f"/repos/{owner}/{repo}/pulls/{pr_number}")
 
     def get_pull_request_commits(self, owner: str, repo: str, pr_number: int) -> List[Dict]:
-        """Get commits in a pull request."""
-        data = self._make_request(f"/repos/{owner}/{repo}/pulls/{pr_number}/commits")
-        return data if data else []
+        """Get commits in a pull request (all pages)."""
+        return self._get_all_pages(f"/repos/{owner}/{repo}/pulls/{pr_number}/commits")
 
     def get_pull_request_comments(self, owner: str, repo: str, pr_number: int) -> List[Dict]:
-        """Get general comments on a pull request."""
-        data = self._make_request(f"/repos/{owner}/{repo}/issues/{pr_number}/comments")
-        return data if data else []
+        """Get general comments on a pull request (all pages)."""
+        return self._get_all_pages(f"/repos/{owner}/{repo}/issues/{pr_number}/comments")
 
     def get_pull_request_review_comments(self, owner: str, repo: str, pr_number: int) -> List[Dict]:
-        """Get code review comments on a pull request."""
-        data = self._make_request(f"/repos/{owner}/{repo}/pulls/{pr_number}/comments")
-        return data if data else []
+        """Get code review comments on a pull request (all pages)."""
+        return self._get_all_pages(f"/repos/{owner}/{repo}/pulls/{pr_number}/comments")
 
     def get_issue(self, owner: str, repo: str, issue_number: int) -> Optional[Dict]:
         """Get issue data."""
         return self._make_request(f"/repos/{owner}/{repo}/issues/{issue_number}")
 
     def get_issue_comments(self, owner: str, repo: str, issue_number: int) -> List[Dict]:
-        """Get comments on an issue."""
-        data = self._make_request(f"/repos/{owner}/{repo}/issues/{issue_number}/comments")
-        return data if data else []
+        """Get comments on an issue (all pages)."""
+        return self._get_all_pages(f"/repos/{owner}/{repo}/issues/{issue_number}/comments")
+
+    def iter_closed_pull_requests(self, owner: str, repo: str):
+        """Closed (including merged) pull requests, most recently updated first."""
+        return self.iter_pages(f"/repos/{owner}/{repo}/pulls",
+                               params={'state': 'closed', 'sort': 'updated', 'direction': 'desc'})
 
     def search_pulls_by_commit(self, owner: str, repo: str, commit_sha: str) -> List[Dict]:
         """Search for pull requests containing a specific commit."""
@@ -240,7 +497,8 @@ class GitHubAPIClient:
 class GitHubArchaeologist:
     """Enriches repository history with GitHub context."""
 
-    def __init__(self, owner: str, repo: str, token: Optional[str] = None):
+    def __init__(self, owner: str, repo: str, token: Optional[str] = None,
+                 base_url: Optional[str] = None, cache_dir: Optional[str] = None):
         """
         Initialize GitHub archaeologist.
 
@@ -248,10 +506,30 @@ class GitHubArchaeologist:
             owner: Repository owner (username or organization)
             repo: Repository name
             token: GitHub personal access token
+            base_url: API root (default: https://api.github.com)
+            cache_dir: Directory for the persistent response cache
+                (e.g. <repo>/.ail/github; None disables it)
         """
         self.owner = owner
         self.repo = repo
-        self.client = GitHubAPIClient(token)
+        response_cache = GitHubResponseCache(Path(cache_dir)) if cache_dir else None
+        self.client = GitHubAPIClient(token, base_url=base_url, response_cache=response_cache)
+
+        # In-process memo: a PR is fetched once however many commits reference it.
+        # None records a number that is not a PR (or not an issue).
+        self._pull_requests: Dict[int, Optional[PullRequest]] = {}
+        self._issues: Dict[int, Optional[Issue]] = {}
+        self._linked_issues: Dict[int, List[int]] = {}  # PR -> issues it closes (bulk mode)
+        self.memo_hits = 0
+
+        # Commit -> PR links from closed PRs, loaded from a previous run. A
+        # map loaded but not refreshed misses PRs merged since, so misses
+        # still fall back to the API until build_commit_pr_map() completes.
+        self.commit_pr_map = CommitPullRequestMap(
+            owner, repo, store_dir=Path(cache_dir) if cache_dir else None,
+        )
+        self.commit_pr_map.load()
+        self.commit_map_complete = False
 
     @staticmethod
     def parse_repo_url(repo_url: str) -> Tuple[str, str]:
@@ -304,16 +582,31 @@ class GitHubArchaeologist:
         Returns:
             PullRequest object or None if not found
         """
+        if pr_number in self._pull_requests:
+            self.memo_hits += 1
+            return self._pull_requests[pr_number]
+
         pr_data = self.client.get_pull_request(self.owner, self.repo, pr_number)
         if not pr_data:
+            self._pull_requests[pr_number] = None
             return None
 
-        # Get commits in this PR
-        pr_commits_data = self.client.get_pull_request_commits(self.owner, self.repo, pr_number)
+        pr = self._build_pull_request(
+            pr_number,
+            pr_data,
+            self.client.get_pull_request_commits(self.owner, self.repo, pr_number),
+            self.client.get_pull_request_comments(self.owner, self.repo, pr_number),
+            self.client.get_pull_request_review_comments(self.owner, self.repo, pr_number),
+        )
+        self._pull_requests[pr_number] = pr
+        return pr
+
+    def _build_pull_request(self, pr_number: int, pr_data: Dict, pr_commits_data: List[Dict],
+                            comments_data: List[Dict],
+                            review_comments_data: List[Dict]) -> PullRequest:
+        """Build a PullRequest from the PR, commits, comments and review comments responses."""
         commit_shas = [c['sha'] for c in pr_commits_data]
 
-        # Get general comments
-        comments_data = self.client.get_pull_request_comments(self.owner, self.repo, pr_number)
         comments = [
             PRComment(
                 author=c['user']['login'],
@@ -323,8 +616,6 @@ class GitHubArchaeologist:
             for c in comments_data
         ]
 
-        # Get review comments
-        review_comments_data = self.client.get_pull_request_review_comments(self.owner, self.repo, pr_number)
         review_comments = [
             ReviewComment(
                 author=c['user']['login'],
@@ -366,13 +657,33 @@ class GitHubArchaeologist:
         Returns:
             Issue object or None if not found
         """
+        if issue_number in self._issues:
+            self.memo_hits += 1
+            return self._issues[issue_number]
+
         issue_data = self.client.get_issue(self.owner, self.repo, issue_number)
         if not issue_data or 'pull_request' in issue_data:
             # This is a PR, not an issue
+            self._issues[issue_number] = None
             return None
 
-        # Get comments
-        comments_data = self.client.get_issue_comments(self.owner, self.repo, issue_number)
+        issue = self._build_issue(
+            issue_number,
+            issue_data,
+            self.client.get_issue_comments(self.owner, self.repo, issue_number),
+        )
+        self._issues[issue_number] = issue
+        return issue
+
+    def clear_memo(self) -> None:
+        """Forget memoized PRs and issues (the response cache still revalidates)."""
+        self._pull_requests.clear()
+        self._issues.clear()
+        self._linked_issues.clear()
+
+    def _build_issue(self, issue_number: int, issue_data: Dict,
+                     comments_data: List[Dict]) -> Issue:
+        """Build an Issue from the issue and comments responses."""
         comments = [
             IssueComment(
                 author=c['user']['login'],
@@ -395,6 +706,11 @@ class GitHubArchaeologist:
             url=issue_data['html_url'],
         )
 
+    def _pr_number_from_message(self, commit: Commit) -> Optional[int]:
+        """First PR reference (#123) in the commit message, if any."""
+        pr_numbers = self._extract_issue_numbers(commit.message)
+        return min(pr_numbers) if pr_numbers else None
+
     def link_commit_to_pr(self, commit: Commit) -> Optional[int]:
         """
         Find PR number associated with a commit.
@@ -405,12 +721,14 @@ class GitHubArchaeologist:
         Returns:
             PR number if found, None otherwise
         """
-        # First, check commit message for PR references (#123)
-        pr_numbers = self._extract_issue_numbers(commit.message)
+        pr_number = self._pr_number_from_message(commit)
+        if pr_number is not None:
+            return pr_number
 
-        if pr_numbers:
-            # Return first PR number found
-            return min(pr_numbers)
+        # Dict lookup in the commit -> PR map; a miss is final once it is complete
+        pr_number = self.commit_pr_map.get(commit.sha)
+        if pr_number is not None or self.commit_map_complete:
+            return pr_number
 
         # Fall back to GitHub API search
         try:
@@ -422,6 +740,83 @@ class GitHubArchaeologist:
 
         return None
 
+    def build_commit_pr_map(self, concurrency: int = 8) -> int:
+        """
+        Build or extend the commit -> PR map from closed pull requests.
+
+        The stored map (if any) is loaded first; then the closed PR list is
+        read newest-updated first down to the PRs already covered, and the
+        commit lists of new or changed PRs are fetched. Afterwards
+        link_commit_to_pr() resolves commits without a #reference with a
+        dict lookup instead of a /commits/{sha}/pulls call.
+
+        A PR whose commit list cannot be fetched is left unrecorded and the
+        covered range stops before it, so the next refresh reads it again;
+        until then misses still fall back to the API. If the PR list itself
+        cannot be read the map is left as it was.
+
+        Args:
+            concurrency: Commit lists fetched in parallel
+
+        Returns:
+            Number of PRs whose commits were (re)read
+        """
+        commit_map = self.commit_pr_map
+        if not commit_map.is_built:
+            commit_map.load()
+
+        high_water = commit_map.updated_through
+        updated = []
+        try:
+            for pr in self.client.iter_closed_pull_requests(self.owner, self.repo):
+                if high_water and pr['updated_at'] < high_water:
+                    break
+                updated.append(pr)
+        except Exception as e:
+            print(f"Warning: Failed to list closed pull requests: {e}")
+            return 0
+
+        def fetch_commits(pr: Dict) -> Optional[List[Dict]]:
+            try:
+                return self.client.get_pull_request_commits(self.owner, self.repo, pr['number'])
+            except Exception as e:
+                print(f"Warning: Failed to fetch commits of PR #{pr['number']}: {e}")
+                return None
+
+        # Commit lists only change while a PR is open; skip PRs read at the same head
+        to_read = [pr for pr in updated
+                   if commit_map.pr_heads.get(pr['number']) != (pr.get('head') or {}).get('sha')]
+        self.client.set_pool_size(concurrency)
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            commit_lists = list(executor.map(fetch_commits, to_read))
+
+        failed = []
+        for pr, commits in zip(to_read, commit_lists):
+            if commits is None:
+                failed.append(pr)
+                continue
+            commit_map.add_pull_request(
+                pr['number'],
+                [c['sha'] for c in commits],
+                head_sha=(pr.get('head') or {}).get('sha'),
+                merge_commit_sha=pr.get('merge_commit_sha') if pr.get('merged_at') else None,
+            )
+
+        # Listing stops below the mark, so keep it at the oldest failed PR
+        if failed:
+            commit_map.mark_built(min(pr['updated_at'] for pr in failed))
+        else:
+            commit_map.mark_built(updated[0]['updated_at'] if updated else None)
+        self.commit_map_complete = not failed
+        try:
+            commit_map.save()
+        except OSError as e:
+            print(f"Warning: Failed to save commit→PR map: {e}")
+
+        print(f"  Commit→PR map: {commit_map.size} commits, "
+              f"{len(to_read) - len(failed)} PRs read, {len(failed)} failed")
+        return len(to_read) - len(failed)
+
     def enrich_commit(self, commit: Commit) -> EnrichedCommit:
         """
         Enrich a single commit with GitHub context.
@@ -461,13 +856,21 @@ class GitHubArchaeologist:
         return enriched
 
     def enrich_history(self, history: RepositoryHistory,
-                       limit: Optional[int] = None) -> EnrichedHistory:
+                       limit: Optional[int] = None,
+                       concurrency: int = 8,
+                       bulk: bool = False,
+                       commit_map: bool = False) -> EnrichedHistory:
         """
         Enrich repository history with GitHub data.
 
         Args:
             history: RepositoryHistory from git analyzer
             limit: Maximum number of commits to enrich (None for all)
+            concurrency: Maximum API requests in flight (1 for sequential)
+            bulk: Fetch PRs, discussions and linked issues in batched
+                GraphQL queries (requires a token; REST is used without one)
+            commit_map: Build or refresh the commit -> PR map first and link
+                commits without a #reference through it (see build_commit_pr_map)
 
         Returns:
             EnrichedHistory with GitHub context
@@ -475,23 +878,38 @@ class GitHubArchaeologist:
         print(f"Enriching {len(history.commits)} commits with GitHub data...")
 
         commits_to_process = history.commits[:limit] if limit else history.commits
-        enriched_commits = []
+
+        if bulk and not self.client.token:
+            print("Warning: GraphQL bulk mode requires a GitHub token, using REST")
+            bulk = False
+
+        if commit_map:
+            self.build_commit_pr_map(concurrency=concurrency)
+
+        if bulk:
+            fetcher = GraphQLBulkFetcher(self)
+            enriched_commits = fetcher.enrich_commits(commits_to_process)
+            print(f"  GraphQL queries: {fetcher.queries}")
+        elif concurrency > 1:
+            enricher = AsyncGitHubEnricher(self, concurrency=concurrency)
+            enriched_commits = _run_coroutine(enricher.enrich_commits(commits_to_process))
+        else:
+            enriched_commits = []
+            for i, commit in enumerate(commits_to_process, 1):
+                if i % 10 == 0:
+                    print(f"  Processed {i}/{len(commits_to_process)} commits...")
+                enriched_commits.append(self.enrich_commit(commit))
+
         pull_requests = {}
         issues = {}
         commit_to_pr = {}
 
-        for i, commit in enumerate(commits_to_process, 1):
-            if i % 10 == 0:
-                print(f"  Processed {i}/{len(commits_to_process)} commits...")
-
-            enriched = self.enrich_commit(commit)
-            enriched_commits.append(enriched)
-
+        for enriched in enriched_commits:
             # Track PRs and issues
             if enriched.pull_request:
                 pr_num = enriched.pull_request.number
                 pull_requests[pr_num] = enriched.pull_request
-                commit_to_pr[commit.sha] = pr_num
+                commit_to_pr[enriched.commit.sha] = pr_num
 
             for issue in enriched.related_issues:
                 issues[issue.number] = issue
@@ -503,12 +921,16 @@ class GitHubArchaeologist:
             issues=issues,
             commit_to_pr=commit_to_pr,
         )
+        self.client.save_response_cache()
 
         print(f"✓ Enrichment complete:")
         print(f"  Commits enriched: {len(enriched_commits)}")
         print(f"  Pull requests: {len(pull_requests)}")
         print(f"  Issues: {len(issues)}")
         print(f"  Enrichment rate: {enriched_history.enrichment_rate:.1%}")
+        if self.client.response_cache is not None:
+            stats = self.client.response_cache.stats
+            print(f"  Responses revalidated (304): {stats.revalidated}, downloaded: {stats.stored}")
 
         return enriched_history
 
@@ -572,6 +994,513 @@ class GitHubArchaeologist:
         print(f"Exported to: {output_path}")
 
 
+class AsyncGitHubEnricher:
+    """
+    Concurrent commit enrichment on asyncio.
+
+    Requests run on a bounded thread pool over the archaeologist's pooled
+    ``requests.Session`` (keep-alive connections are reused across calls), so
+    no async HTTP library is required. The four requests behind a pull request
+    and the PR/issue lookups of a commit are issued together; a semaphore caps
+    the number in flight. When the rate limit tracked by ``GitHubAPIClient``
+    runs low, new requests wait for the reset instead of failing. PRs and
+    issues go through the archaeologist's memo, and commits referencing the
+    same one while it is being fetched wait for that fetch.
+    """
+
+    def __init__(self, archaeologist: GitHubArchaeologist, concurrency: int = 8):
+        """
+        Initialize concurrent enricher.
+
+        Args:
+            archaeologist: GitHubArchaeologist providing the client and parsing
+            concurrency: Maximum API requests in flight
+        """
+        self.archaeologist = archaeologist
+        self.client = archaeologist.client
+        self.concurrency = max(1, concurrency)
+        self.client.set_pool_size(self.concurrency)
+        # Keep enough requests in reserve for the ones already in flight
+        self.rate_limit_reserve = max(GitHubAPIClient.RATE_LIMIT_RESERVE, self.concurrency)
+        self._pending: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    async def _call(self, semaphore: asyncio.Semaphore, rate_limit_lock: asyncio.Lock,
+                    executor: ThreadPoolExecutor, func: Callable, *args) -> Any:
+        """Run one blocking client call once a request slot and rate limit allow."""
+        async with semaphore:
+            async with rate_limit_lock:
+                wait_time = self.client.rate_limit_delay(self.rate_limit_reserve)
+                if wait_time > 0:
+                    print(f"Rate limit low ({self.client.rate_limit_remaining}), "
+                          f"waiting {wait_time:.0f}s...")
+                    await asyncio.sleep(wait_time)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, func, *args)
+
+    async def enrich_commits(self, commits: List[Commit]) -> List[EnrichedCommit]:
+        """
+        Enrich commits concurrently.
+
+        Args:
+            commits: Commits to enrich
+
+        Returns:
+            EnrichedCommits in the same order as ``commits``
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        rate_limit_lock = asyncio.Lock()
+        # Fetches in flight, so commits referencing the same PR/issue share one
+        self._pending: Dict[Tuple[str, int], asyncio.Future] = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency,
+                                thread_name_prefix='github-enrich') as executor:
+            def call(func: Callable, *args) -> Awaitable:
+                return self._call(semaphore, rate_limit_lock, executor, func, *args)
+
+            return list(await asyncio.gather(
+                *(self._enrich_commit(call, commit) for commit in commits)
+            ))
+
+    async def _enrich_commit(self, call: Callable[..., Awaitable],
+                             commit: Commit) -> EnrichedCommit:
+        """Enrich a single commit; mirrors GitHubArchaeologist.enrich_commit."""
+        archaeologist = self.archaeologist
+        enriched = EnrichedCommit(commit=commit)
+
+        pr_number = archaeologist._pr_number_from_message(commit)
+        if pr_number is None:
+            pr_number = archaeologist.commit_pr_map.get(commit.sha)
+        if pr_number is None and not archaeologist.commit_map_complete:
+            # Fall back to GitHub API search
+            try:
+                pulls_data = await call(self.client.search_pulls_by_commit,
+                                        archaeologist.owner, archaeologist.repo, commit.sha)
+                if pulls_data:
+                    pr_number = pulls_data[0]['number']
+            except Exception:
+                pass
+
+        issue_numbers = sorted(archaeologist._extract_issue_numbers(commit.message) - {pr_number})
+        results = await asyncio.gather(
+            self._memoized('pull', archaeologist._pull_requests, pr_number,
+                           lambda: self._fetch_pull_request(call, pr_number))
+            if pr_number else _none(),
+            *(self._memoized('issue', archaeologist._issues, issue_num,
+                             lambda issue_num=issue_num: self._fetch_issue(call, issue_num))
+              for issue_num in issue_numbers),
+            return_exceptions=True,
+        )
+
+        pr = results[0]
+        if isinstance(pr, Exception):
+            print(f"Warning: Failed to fetch PR #{pr_number}: {pr}")
+        elif pr:
+            enriched.pull_request = pr
+            enriched.discussion_context = pr.discussion_summary
+
+        for issue_num, issue in zip(issue_numbers, results[1:]):
+            if isinstance(issue, Exception):
+                print(f"Warning: Failed to fetch issue #{issue_num}: {issue}")
+            elif issue:
+                enriched.related_issues.append(issue)
+
+        return enriched
+
+    async def _memoized(self, kind: str, memo: Dict[int, Any], number: int,
+                        fetch: Callable[[], Awaitable]) -> Any:
+        """Return a memoized PR/issue, joining a fetch already in flight."""
+        if number in memo:
+            self.archaeologist.memo_hits += 1
+            return memo[number]
+
+        key = (kind, number)
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.archaeologist.memo_hits += 1
+            return await asyncio.shield(pending)
+
+        pending = asyncio.ensure_future(fetch())
+        self._pending[key] = pending
+        try:
+            result = await pending
+        finally:
+            del self._pending[key]
+        memo[number] = result  # Errors propagate and are not memoized
+        return result
+
+    async def _fetch_pull_request(self, call: Callable[..., Awaitable],
+                                  pr_number: int) -> Optional[PullRequest]:
+        """Fetch a pull request with its four requests issued together."""
+        owner, repo = self.archaeologist.owner, self.archaeologist.repo
+        pr_data, commits_data, comments_data, review_comments_data = await asyncio.gather(
+            call(self.client.get_pull_request, owner, repo, pr_number),
+            call(self.client.get_pull_request_commits, owner, repo, pr_number),
+            call(self.client.get_pull_request_comments, owner, repo, pr_number),
+            call(self.client.get_pull_request_review_comments, owner, repo, pr_number),
+        )
+        if not pr_data:
+            return None
+        return self.archaeologist._build_pull_request(
+            pr_number, pr_data, commits_data, comments_data, review_comments_data,
+        )
+
+    async def _fetch_issue(self, call: Callable[..., Awaitable],
+                           issue_number: int) -> Optional[Issue]:
+        """Fetch an issue, then its comments (skipped for PRs and missing issues)."""
+        owner, repo = self.archaeologist.owner, self.archaeologist.repo
+        issue_data = await call(self.client.get_issue, owner, repo, issue_number)
+        if not issue_data or 'pull_request' in issue_data:
+            # This is a PR, not an issue
+            return None
+        comments_data = await call(self.client.get_issue_comments, owner, repo, issue_number)
+        return self.archaeologist._build_issue(issue_number, issue_data, comments_data)
+
+
+# GraphQL selections for bulk mode. Page sizes keep a 50-PR query well under
+# GitHub's 500,000-node limit; longer connections are paged afterwards.
+GRAPHQL_BATCH_SIZE = 50
+_PAGE_INFO = "pageInfo { hasNextPage endCursor }"
+_COMMENT_NODES = "nodes { author { login } body createdAt }"
+_REVIEW_COMMENT_NODES = "nodes { author { login } body path line originalLine createdAt }"
+
+# (type, connection) -> (page size, node selection, type of the nodes if they
+# have connections of their own)
+_GRAPHQL_CONNECTIONS = {
+    ('PullRequest', 'commits'): (100, "nodes { commit { oid } }", None),
+    ('PullRequest', 'comments'): (100, _COMMENT_NODES, None),
+    ('PullRequest', 'reviews'): (
+        50, f"nodes {{ id comments(first: 50) {{ {_REVIEW_COMMENT_NODES} {_PAGE_INFO} }} }}",
+        'PullRequestReview',
+    ),
+    ('PullRequest', 'closingIssuesReferences'): (10, "nodes { ...IssueFields }", 'Issue'),
+    ('Issue', 'comments'): (100, _COMMENT_NODES, None),
+    ('PullRequestReview', 'comments'): (50, _REVIEW_COMMENT_NODES, None),
+}
+
+
+def _graphql_connection(type_name: str, name: str, after: Optional[str] = None) -> str:
+    """Selection for one page of a connection."""
+    first, nodes, _ = _GRAPHQL_CONNECTIONS[(type_name, name)]
+    args = f"first: {first}" + (f", after: {json.dumps(after)}" if after else "")
+    return f"{name}({args}) {{ {nodes} {_PAGE_INFO} }}"
+
+
+_ISSUE_FRAGMENT = (
+    "fragment IssueFields on Issue { id number title body url state createdAt closedAt "
+    "author { login } labels(first: 100) { nodes { name } } "
+    f"{_graphql_connection('Issue', 'comments')} }}"
+)
+_PULL_REQUEST_FRAGMENT = (
+    "fragment PullRequestFields on PullRequest { id number title body url state createdAt "
+    "mergedAt closedAt author { login } labels(first: 100) { nodes { name } } "
+    + " ".join(_graphql_connection('PullRequest', name)
+               for name in ('commits', 'comments', 'reviews', 'closingIssuesReferences'))
+    + " }"
+)
+
+
+def _batches(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class GraphQLBulkFetcher:
+    """
+    Bulk enrichment through the GitHub GraphQL API.
+
+    PRs and issues are requested by number, up to 50 per query, together
+    with their commits, comments, review comments and the issues a PR
+    closes. Connections longer than one page are then followed, batched
+    across objects, until every page is read. Commits without a #reference
+    are resolved to their PR in batched queries as well.
+    """
+
+    COMMIT_BATCH_SIZE = 100
+
+    def __init__(self, archaeologist: GitHubArchaeologist,
+                 batch_size: int = GRAPHQL_BATCH_SIZE):
+        """
+        Initialize bulk fetcher.
+
+        Args:
+            archaeologist: GitHubArchaeologist providing the client and memo
+            batch_size: PRs/issues per query (at most 50)
+        """
+        self.archaeologist = archaeologist
+        self.client = archaeologist.client
+        self.batch_size = max(1, min(batch_size, GRAPHQL_BATCH_SIZE))
+        self.queries = 0
+
+    def _query(self, selections: List[str], repository: bool = True) -> Dict:
+        """Run one query of aliased selections, with the fragments it uses."""
+        body = " ".join(selections)
+        if repository:
+            owner = json.dumps(self.archaeologist.owner)
+            repo = json.dumps(self.archaeologist.repo)
+            body = f"repository(owner: {owner}, name: {repo}) {{ {body} }}"
+
+        query = f"query {{ {body} }}"
+        if "...PullRequestFields" in query:
+            query += " " + _PULL_REQUEST_FRAGMENT
+        if "...IssueFields" in query or "...PullRequestFields" in query:
+            query += " " + _ISSUE_FRAGMENT
+
+        self.queries += 1
+        data = self.client.graphql(query)
+        return (data.get('repository') or {}) if repository else data
+
+    def find_pull_requests(self, shas: List[str]) -> Dict[str, int]:
+        """
+        Resolve commits to the PR that introduced them.
+
+        Args:
+            shas: Commit SHAs
+
+        Returns:
+            SHA -> PR number for commits associated with a PR
+        """
+        result = {}
+        for batch in _batches(list(shas), self.COMMIT_BATCH_SIZE):
+            data = self._query([
+                f"c{i}: object(oid: {json.dumps(sha)}) {{ ... on Commit {{ "
+                f"associatedPullRequests(first: 1) {{ nodes {{ number }} }} }} }}"
+                for i, sha in enumerate(batch)
+            ])
+            for i, sha in enumerate(batch):
+                pulls = (data.get(f"c{i}") or {}).get('associatedPullRequests') or {}
+                nodes = pulls.get('nodes') or []
+                if nodes:
+                    result[sha] = nodes[0]['number']
+        return result
+
+    def fetch(self, numbers: List[int]) -> Dict[int, Any]:
+        """
+        Fetch PRs and issues by number, following all pages.
+
+        Args:
+            numbers: PR or issue numbers
+
+        Returns:
+            Number -> PullRequest, Issue, or None if neither exists. Issues
+            closed by a fetched PR are included; the PR's closing issue numbers
+            are recorded in the archaeologist's ``_linked_issues``.
+        """
+        nodes: Dict[int, Optional[Dict]] = {}
+        for batch in _batches(sorted(set(numbers)), self.batch_size):
+            data = self._query([
+                f"n{number}: issueOrPullRequest(number: {number}) {{ __typename "
+                f"... on PullRequest {{ ...PullRequestFields }} ... on Issue {{ ...IssueFields }} }}"
+                for number in batch
+            ])
+            for number in batch:
+                nodes[number] = data.get(f"n{number}")
+
+        self._fetch_remaining_pages([
+            (node, node['__typename']) for node in nodes.values() if node
+        ])
+
+        results: Dict[int, Any] = {}
+        for number, node in nodes.items():
+            if node is None:
+                results[number] = None
+            elif node['__typename'] == 'PullRequest':
+                results[number] = self._build_pull_request(node)
+                closing = node['closingIssuesReferences']['nodes']
+                self.archaeologist._linked_issues[number] = [issue['number'] for issue in closing]
+                for issue in closing:
+                    results.setdefault(issue['number'], self._build_issue(issue))
+            else:
+                results[number] = self._build_issue(node)
+        return results
+
+    def _fetch_remaining_pages(self, roots: List[Tuple[Dict, str]]) -> None:
+        """Append every further page of every truncated connection in place."""
+        pending: List[Tuple[Dict, str, str]] = []
+
+        def scan(node: Dict, type_name: str) -> None:
+            for (owner_type, name), (_, _, child_type) in _GRAPHQL_CONNECTIONS.items():
+                if owner_type != type_name or name not in node:
+                    continue
+                if child_type:
+                    for child in node[name]['nodes']:
+                        scan(child, child_type)
+                if node[name]['pageInfo']['hasNextPage']:
+                    pending.append((node, type_name, name))
+
+        for node, type_name in roots:
+            scan(node, type_name)
+
+        while pending:
+            batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+            data = self._query([
+                f"p{i}: node(id: {json.dumps(node['id'])}) {{ ... on {type_name} {{ "
+                f"{_graphql_connection(type_name, name, node[name]['pageInfo']['endCursor'])} }} }}"
+                for i, (node, type_name, name) in enumerate(batch)
+            ], repository=False)
+
+            for i, (node, type_name, name) in enumerate(batch):
+                page = (data.get(f"p{i}") or {}).get(name)
+                if not page:
+                    node[name]['pageInfo']['hasNextPage'] = False
+                    continue
+                node[name]['nodes'].extend(page['nodes'])
+                node[name]['pageInfo'] = page['pageInfo']
+                child_type = _GRAPHQL_CONNECTIONS[(type_name, name)][2]
+                if child_type:
+                    for child in page['nodes']:
+                        scan(child, child_type)
+                if page['pageInfo']['hasNextPage']:
+                    pending.append((node, type_name, name))
+
+    @staticmethod
+    def _login(actor: Optional[Dict]) -> str:
+        # Deleted accounts come back as a null author
+        return (actor or {}).get('login') or 'ghost'
+
+    def _build_pull_request(self, node: Dict) -> PullRequest:
+        """Build a PullRequest from a GraphQL PullRequestFields node."""
+        parse = self.archaeologist._parse_datetime
+        comments = [
+            PRComment(author=self._login(c['author']), body=c['body'],
+                      created_at=parse(c['createdAt']))
+            for c in node['comments']['nodes']
+        ]
+        review_comments = [
+            ReviewComment(
+                author=self._login(c['author']),
+                body=c['body'],
+                path=c['path'],
+                line=c.get('line') or c.get('originalLine') or 0,
+                created_at=parse(c['createdAt']),
+            )
+            for review in node['reviews']['nodes']
+            for c in review['comments']['nodes']
+        ]
+
+        return PullRequest(
+            number=node['number'],
+            title=node['title'],
+            body=node.get('body') or '',
+            author=self._login(node['author']),
+            state="merged" if node.get('mergedAt') else node['state'].lower(),
+            created_at=parse(node['createdAt']),
+            merged_at=parse(node.get('mergedAt')),
+            closed_at=parse(node.get('closedAt')),
+            commits=[c['commit']['oid'] for c in node['commits']['nodes']],
+            labels=[label['name'] for label in node['labels']['nodes']],
+            # Same definition as the REST path: authors of review comments
+            reviewers=list(set(rc.author for rc in review_comments)),
+            comments=comments,
+            review_comments=review_comments,
+            url=node['url'],
+        )
+
+    def _build_issue(self, node: Dict) -> Issue:
+        """Build an Issue from a GraphQL IssueFields node."""
+        parse = self.archaeologist._parse_datetime
+        return Issue(
+            number=node['number'],
+            title=node['title'],
+            body=node.get('body') or '',
+            author=self._login(node['author']),
+            state=node['state'].lower(),
+            created_at=parse(node['createdAt']),
+            closed_at=parse(node.get('closedAt')),
+            labels=[label['name'] for label in node['labels']['nodes']],
+            comments=[
+                IssueComment(author=self._login(c['author']), body=c['body'],
+                             created_at=parse(c['createdAt']))
+                for c in node['comments']['nodes']
+            ],
+            url=node['url'],
+        )
+
+    def _is_known(self, number: int) -> bool:
+        """Whether the memo already says what ``number`` is."""
+        pulls, issues = self.archaeologist._pull_requests, self.archaeologist._issues
+        return (pulls.get(number) is not None or issues.get(number) is not None
+                or (number in pulls and number in issues))
+
+    def enrich_commits(self, commits: List[Commit]) -> List[EnrichedCommit]:
+        """
+        Enrich commits with bulk-fetched PRs and issues.
+
+        A commit's PR is the lowest #reference that is a PR (or, without
+        references, the PR GitHub associates with the commit). Its related
+        issues are the referenced issues plus the issues its PR closes.
+
+        Args:
+            commits: Commits to enrich
+
+        Returns:
+            EnrichedCommits in the same order as ``commits``
+        """
+        archaeologist = self.archaeologist
+        refs = {c.sha: sorted(archaeologist._extract_issue_numbers(c.message)) for c in commits}
+        unreferenced = [c.sha for c in commits if not refs[c.sha]]
+        commit_map = archaeologist.commit_pr_map
+        associated = {sha: commit_map.get(sha) for sha in unreferenced if commit_map.get(sha)}
+        if not archaeologist.commit_map_complete:
+            associated.update(self.find_pull_requests(
+                [sha for sha in unreferenced if sha not in associated]
+            ))
+
+        wanted = set(associated.values()).union(*refs.values())
+        unknown = [number for number in wanted if not self._is_known(number)]
+        for number, item in self.fetch(unknown).items():
+            if isinstance(item, PullRequest):
+                archaeologist._pull_requests[number] = item
+                archaeologist._issues[number] = None
+            elif isinstance(item, Issue):
+                archaeologist._issues[number] = item
+                archaeologist._pull_requests.setdefault(number, None)
+            else:
+                archaeologist._pull_requests[number] = None
+                archaeologist._issues[number] = None
+
+        enriched_commits = []
+        for commit in commits:
+            enriched = EnrichedCommit(commit=commit)
+            numbers = refs[commit.sha] or ([associated[commit.sha]] if commit.sha in associated else [])
+
+            pr = next((archaeologist._pull_requests[n] for n in numbers
+                       if archaeologist._pull_requests.get(n)), None)
+            if pr:
+                enriched.pull_request = pr
+                enriched.discussion_context = pr.discussion_summary
+
+            issue_numbers = [n for n in refs[commit.sha] if archaeologist._issues.get(n)]
+            if pr:
+                issue_numbers += archaeologist._linked_issues.get(pr.number, [])
+            for number in dict.fromkeys(issue_numbers):
+                issue = archaeologist._issues.get(number)
+                if issue:
+                    enriched.related_issues.append(issue)
+
+            enriched_commits.append(enriched)
+        return enriched_commits
+
+
+async def _none() -> None:
+    return None
+
+
+def _run_coroutine(coroutine: Awaitable) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses a worker thread when called from inside a running event loop (e.g.
+    from an async context provider), where asyncio.run() is not allowed.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
 def main():
     """CLI entry point for testing."""
     import sys
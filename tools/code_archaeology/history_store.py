@@ -0,0 +1,181 @@
+"""
+History Store - Persist analyzed repository history between runs.
+
+This module provides tools to:
+- Save a RepositoryHistory to disk keyed by commit SHA
+- Record the ref tips the history was computed against
+- Reload history quickly so only new commits need to be read from git
+"""
+
+import os
+import pickle
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .git_analyzer import Commit, ArchCommit, RepositoryHistory
+
+
+@dataclass
+class StoredHistory:
+    """History loaded from a HistoryStore with the refs it was built from."""
+
+    history: RepositoryHistory
+    tips: List[str]  # SHAs of HEAD and all refs at save time
+    branch_tips: Dict[str, str]  # branch -> tip SHA at save time
+
+    @property
+    def head_sha(self) -> Optional[str]:
+        """SHA the history was last refreshed against (first tip)."""
+        return self.tips[0] if self.tips else None
+
+
+class HistoryStore:
+    """
+    On-disk store for repository history under ``.ail/history/``.
+
+    Commits are stored once, keyed by SHA, as plain tuples; indexes are stored
+    as SHA lists that reference them. Plain data keeps the file independent of
+    how the ``code_archaeology`` package was imported and loads with the C
+    unpickler in milliseconds.
+    """
+
+    VERSION = 2
+    FILENAME = "history.pkl"
+
+    def __init__(self, repo_path: str, store_dir: Optional[Path] = None):
+        """
+        Initialize the history store.
+
+        Args:
+            repo_path: Path to the git repository
+            store_dir: Directory for the store (default: <repo>/.ail/history)
+        """
+        self.repo_path = Path(repo_path).resolve()
+        self.store_dir = Path(store_dir) if store_dir else self.repo_path / '.ail' / 'history'
+
+    @property
+    def path(self) -> Path:
+        """Path of the store file."""
+        return self.store_dir / self.FILENAME
+
+    def exists(self) -> bool:
+        """Check if a stored history is available."""
+        return self.path.exists()
+
+    def load(self) -> Optional[StoredHistory]:
+        """
+        Load the stored history.
+
+        Returns:
+            StoredHistory, or None if nothing is stored or the file is
+            unreadable or from an incompatible version
+        """
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Failed to load history store {self.path}: {e}")
+            return None
+
+        if data.get('version') != self.VERSION or data.get('repo_path') != str(self.repo_path):
+            return None
+
+        commits_by_sha = {
+            sha: Commit(
+                sha=sha,
+                message=message,
+                author=author,
+                email=email,
+                date=datetime.fromtimestamp(timestamp),
+                parents=list(parents),
+                files_changed=list(files),
+                additions=additions,
+                deletions=deletions,
+                renames=dict(renames),
+            )
+            for sha, (message, author, email, timestamp, parents, files, additions, deletions, renames)
+            in data['commits'].items()
+        }
+
+        def resolve(shas: List[str]) -> List[Commit]:
+            return [commits_by_sha[sha] for sha in shas if sha in commits_by_sha]
+
+        arch_commits = [
+            ArchCommit(
+                commit=commits_by_sha[sha],
+                significance=significance,
+                impact_score=impact_score,
+                patterns=list(patterns),
+                related_files=list(related_files),
+            )
+            for sha, significance, impact_score, patterns, related_files in data['arch_commits']
+            if sha in commits_by_sha
+        ]
+
+        history = RepositoryHistory(
+            repo_path=self.repo_path,
+            commits=list(commits_by_sha.values()),
+            arch_commits=arch_commits,
+            temporal_index={day: resolve(shas) for day, shas in data['temporal_index'].items()},
+            file_history={path: resolve(shas) for path, shas in data['file_history'].items()},
+            author_stats=dict(data['author_stats']),
+            branch_commits={name: resolve(shas) for name, shas in data['branch_commits'].items()},
+        )
+
+        return StoredHistory(
+            history=history,
+            tips=list(data['tips']),
+            branch_tips=dict(data['branch_tips']),
+        )
+
+    def save(self, history: RepositoryHistory, tips: List[str],
+             branch_tips: Dict[str, str]) -> None:
+        """
+        Persist history atomically (write to a temp file, then rename).
+
+        Args:
+            history: RepositoryHistory to store
+            tips: SHAs of HEAD and all refs the history covers
+            branch_tips: Branch name -> tip SHA
+        """
+        def shas(commits: List[Commit]) -> List[str]:
+            return [c.sha for c in commits]
+
+        data = {
+            'version': self.VERSION,
+            'repo_path': str(self.repo_path),
+            'tips': list(tips),
+            'branch_tips': dict(branch_tips),
+            # Dict preserves newest-to-oldest commit order
+            'commits': {
+                c.sha: (
+                    c.message, c.author, c.email, c.date.timestamp(),
+                    c.parents, c.files_changed, c.additions, c.deletions, c.renames,
+                )
+                for c in history.commits
+            },
+            'arch_commits': [
+                (ac.commit.sha, ac.significance, ac.impact_score, ac.patterns, ac.related_files)
+                for ac in history.arch_commits
+            ],
+            'temporal_index': {day: shas(cs) for day, cs in history.temporal_index.items()},
+            'file_history': {path: shas(cs) for path, cs in history.file_history.items()},
+            'author_stats': dict(history.author_stats),
+            'branch_commits': {name: shas(cs) for name, cs in history.branch_commits.items()},
+        }
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Delete the stored history."""
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,191 @@
+"""
+Lexical Index - BM25 keyword search and rank fusion for history documents.
+
+This module provides tools to:
+- Build an inverted index over document texts as compact NumPy postings
+- Score queries with Okapi BM25, so exact identifiers (function names,
+  ticket numbers, SHAs) rank documents that contain them first
+- Match abbreviated commit SHAs against the full SHAs in the index
+- Fuse several rankings with reciprocal rank fusion
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed document list.
+
+    Postings are stored term-major in three arrays: ``_offsets`` (postings
+    of term t are ``_offsets[t]:_offsets[t + 1]``), ``_doc_ids`` (int32) and
+    ``_weights`` (float32). Each weight is the term-frequency part of BM25,
+    already normalized by document length, so a query only multiplies by
+    IDF and adds. Tokens are lowercased ``\\w+`` runs, as in
+    SimpleEmbeddingProvider.
+    """
+
+    TOKEN_PATTERN = re.compile(r'\w+')
+    SHA_PREFIX = re.compile(r'[0-9a-f]{7,40}')
+    K1 = 1.2
+    B = 0.75
+    CHUNK_SIZE = 50_000  # Documents tokenized at a time (bounds peak memory)
+    MAX_PREFIX_MATCHES = 32
+
+    def __init__(self, texts: Sequence[str]):
+        """
+        Build the index.
+
+        Args:
+            texts: Document texts; results refer to documents by position
+        """
+        self.n_documents = len(texts)
+        self.vocabulary: Dict[str, int] = {}
+
+        findall = self.TOKEN_PATTERN.findall
+        lengths = np.zeros(self.n_documents, dtype=np.int64)
+        id_chunks = []
+        for start in range(0, self.n_documents, self.CHUNK_SIZE):
+            per_text = [findall(text.lower()) for text in texts[start:start + self.CHUNK_SIZE]]
+            lengths[start:start + len(per_text)] = [len(tokens) for tokens in per_text]
+            tokens = list(chain.from_iterable(per_text))
+            for term in dict.fromkeys(tokens):
+                if term not in self.vocabulary:
+                    self.vocabulary[term] = len(self.vocabulary)
+            id_chunks.append(np.fromiter(map(self.vocabulary.__getitem__, tokens),
+                                         dtype=np.int64, count=len(tokens)))
+
+        n_terms = len(self.vocabulary)
+        n_rows = max(self.n_documents, 1)
+        token_ids = np.concatenate(id_chunks) if id_chunks else np.empty(0, dtype=np.int64)
+        rows = np.repeat(np.arange(self.n_documents, dtype=np.int64), lengths)
+
+        # Sorting (term, document) keys yields term-major postings directly
+        keys, counts = np.unique(token_ids * n_rows + rows, return_counts=True)
+        del token_ids, rows
+        terms = keys // n_rows
+        self._doc_ids = (keys % n_rows).astype(np.int32)
+        self._offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=n_terms), out=self._offsets[1:])
+
+        document_frequency = np.diff(self._offsets)
+        self._idf = np.log(
+            1 + (self.n_documents - document_frequency + 0.5) / (document_frequency + 0.5)
+        ).astype(np.float32)
+
+        average_length = lengths.mean() if self.n_documents and lengths.any() else 1.0
+        norm = self.K1 * (1 - self.B + self.B * lengths[self._doc_ids] / average_length)
+        self._weights = (counts * (self.K1 + 1) / (counts + norm)).astype(np.float32)
+
+        # Sorted SHA-like terms for abbreviated-SHA lookups
+        self._sha_terms = sorted(t for t in self.vocabulary if self.SHA_PREFIX.fullmatch(t))
+
+    @property
+    def size(self) -> int:
+        """Number of indexed documents."""
+        return self.n_documents
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the posting arrays."""
+        return self._offsets.nbytes + self._doc_ids.nbytes + self._weights.nbytes + self._idf.nbytes
+
+    def query_terms(self, query: str) -> List[int]:
+        """
+        Map a query to the ids of the indexed terms it matches.
+
+        Hex tokens of 7+ characters also match every indexed SHA-like term
+        they prefix, so ``abc1234`` finds the commit ``abc1234f...``.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Distinct term ids in query order
+        """
+        term_ids: Dict[int, None] = {}
+        for token in dict.fromkeys(self.TOKEN_PATTERN.findall(query.lower())):
+            if token in self.vocabulary:
+                term_ids[self.vocabulary[token]] = None
+            if self.SHA_PREFIX.fullmatch(token):
+                position = bisect.bisect_left(self._sha_terms, token)
+                for term in self._sha_terms[position:position + self.MAX_PREFIX_MATCHES]:
+                    if not term.startswith(token):
+                        break
+                    term_ids[self.vocabulary[term]] = None
+        return list(term_ids)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Rank documents for a query.
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            List of (document position, BM25 score) tuples, best first; only
+            documents containing at least one query term
+        """
+        term_ids = self.query_terms(query)
+        if not term_ids or k <= 0:
+            return []
+
+        slices = [(self._offsets[t], self._offsets[t + 1], self._idf[t]) for t in term_ids]
+        n_postings = sum(end - start for start, end, _ in slices)
+
+        if n_postings * 8 < self.n_documents:
+            # Few postings: aggregate them without touching every document
+            docs = np.concatenate([self._doc_ids[s:e] for s, e, _ in slices])
+            contributions = np.concatenate([idf * self._weights[s:e] for s, e, idf in slices])
+            docs, inverse = np.unique(docs, return_inverse=True)
+            scores = np.bincount(inverse, weights=contributions)
+        else:
+            dense = np.zeros(self.n_documents, dtype=np.float64)
+            for start, end, idf in slices:
+                dense[self._doc_ids[start:end]] += idf * self._weights[start:end]
+            docs = np.flatnonzero(dense)
+            scores = dense[docs]
+
+        if len(docs) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+            docs, scores = docs[keep], scores[keep]
+
+        # Best score first; ties keep document order
+        order = np.lexsort((docs, -scores))
+        return [(int(docs[i]), float(scores[i])) for i in order]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 10,
+                           constant: int = 60) -> List[Tuple[int, float]]:
+    """
+    Fuse rankings with reciprocal rank fusion.
+
+    Each item scores the sum of ``1 / (constant + rank)`` over the rankings
+    that contain it (rank starts at 1), so items ranked well by several
+    rankings rise and no ranking's raw score scale matters.
+
+    Args:
+        rankings: Ranked item lists, best first
+        k: Number of fused results
+        constant: Damping constant (60 in the original formulation)
+
+    Returns:
+        List of (item, fused score) tuples, best first; ties keep the order
+        in which items first appear across the rankings
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (constant + rank)
+    return sorted(fused.items(), key=lambda entry: -entry[1])[:k]
@@ -115,7 +115,8 @@ class ArchaeologyCLI:
                     task2 = progress.add_task("Enriching with GitHub data...", total=None)
                     try:
                         owner, repo = self.github_repo.split('/')
-                        gh_arch = GitHubArchaeologist(owner, repo)
+                        gh_arch = GitHubArchaeologist(
+                            owner, repo, cache_dir=str(self.repo_path / '.ail' / 'github'))
                         enriched = gh_arch.enrich_history(history)
                         progress.update(task2, completed=True)
                         self._print(f"  ✓ Enrichment rate: {enriched.enrichment_rate:.1%}", style="green")
@@ -170,7 +171,8 @@ class ArchaeologyCLI:
                 print("Enriching with GitHub data...")
                 try:
                     owner, repo = self.github_repo.split('/')
-                    gh_arch = GitHubArchaeologist(owner, repo)
+                    gh_arch = GitHubArchaeologist(
+                        owner, repo, cache_dir=str(self.repo_path / '.ail' / 'github'))
                     enriched = gh_arch.enrich_history(history)
                     print(f"  ✓ Enrichment rate: {enriched.enrichment_rate:.1%}")
                 except Exception as e:
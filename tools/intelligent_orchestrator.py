@@ -13,9 +13,13 @@ Design Goals:
 - Progressive: Start rule-based, add ML later (optional)
 """
 
+import copy
+import itertools
+import os
 import re
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Set
+from typing import List, Dict, FrozenSet, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
 from agent_registry import AgentRegistry, AgentMetadata
@@ -191,8 +195,27 @@ class OrchestratedWorkflow:
     success_criteria: List[str] = field(default_factory=list)
 
 
+@dataclass
+class ProjectScan:
+    """File and directory facts gathered by one walk of the project tree"""
+    file_names: Set[str] = field(default_factory=set)
+    dir_names: Set[str] = field(default_factory=set)
+    dir_paths: Set[str] = field(default_factory=set)  # Relative POSIX paths
+    extension_counts: Dict[str, int] = field(default_factory=dict)
+    content_matches: Set[str] = field(default_factory=set)  # "file:content" patterns found
+    mtimes: Dict[str, int] = field(default_factory=dict)  # Walked dirs and read manifests
+
+
 class ProjectAnalyzer:
-    """Analyzes project structure to build context"""
+    """
+    Analyzes project structure to build context.
+
+    The project is walked once per analysis with os.scandir, skipping
+    IGNORE_DIRS; every pattern is then answered from that scan. The result
+    is cached, keyed by the mtimes of the walked directories and of the
+    manifests read for content patterns, so repeated analyses of an
+    unchanged tree only stat those paths.
+    """
 
     # File extension to language mapping
     LANGUAGE_MAP = {
@@ -241,96 +264,216 @@ class ProjectAnalyzer:
         "rest": ["routes.py", "api/", "controllers/"],
     }
 
+    # Directories never descended into (dependencies, VCS data, build output)
+    IGNORE_DIRS = {".git", "node_modules", "venv", ".venv", "__pycache__",
+                   ".pytest_cache", "dist", "build"}
+
+    # Manifests larger than this are not read for content patterns
+    MAX_MANIFEST_BYTES = 1024 * 1024
+
     def __init__(self, project_dir: Optional[Path] = None):
         """Initialize project analyzer"""
         if project_dir is None:
             project_dir = Path.cwd()
         self.project_dir = Path(project_dir)
 
+        # Content patterns grouped by file pattern: {"package.json": {"react", ...}}
+        self._content_patterns: Dict[str, Set[str]] = {}
+        for patterns in (*self.FRAMEWORK_PATTERNS.values(), *self.TECH_PATTERNS.values()):
+            for pattern in patterns:
+                if ":" in pattern:
+                    filename, content_pattern = pattern.split(":", 1)
+                    self._content_patterns.setdefault(filename, set()).add(content_pattern)
+
+        self._cached: Optional[Tuple[Dict[str, int], ProjectContext]] = None
+
     def analyze(self) -> ProjectContext:
-        """Analyze project and return context"""
+        """
+        Analyze project and return context.
+
+        Returns the cached context while no walked directory or read
+        manifest has changed (files added, removed or renamed change their
+        directory's mtime).
+        """
+        if self._cached is not None and self._is_unchanged(self._cached[0]):
+            return copy.deepcopy(self._cached[1])
+
+        scan = self._scan()
         context = ProjectContext()
 
         # Detect languages
-        context.languages = self._detect_languages()
+        context.languages = self._detect_languages(scan)
 
         # Detect frameworks
-        context.frameworks = self._detect_frameworks()
+        context.frameworks = self._detect_frameworks(scan)
 
         # Detect technologies
-        context.technologies = self._detect_technologies()
+        context.technologies = self._detect_technologies(scan)
 
         # Classify project type
         context.project_type = self._classify_project_type(
-            context.languages, context.frameworks
+            context.languages, context.frameworks, scan
         )
 
         # Check for common artifacts
-        context.has_tests = self._has_tests()
+        context.has_tests = self._has_tests(scan)
         context.has_ci_cd = self._has_ci_cd()
-        context.has_docs = self._has_docs()
+        context.has_docs = self._has_docs(scan)
 
         # Count files
-        context.file_count = self._count_code_files()
+        context.file_count = self._count_code_files(scan)
 
         # Estimate complexity
         context.complexity = self._estimate_complexity(context.file_count)
 
-        return context
+        self._cached = (scan.mtimes, context)
+        return copy.deepcopy(context)
+
+    def clear_cache(self):
+        """Forget the cached context so the next analysis walks the tree"""
+        self._cached = None
+
+    def _is_unchanged(self, mtimes: Dict[str, int]) -> bool:
+        """Check that every path the cached context was built from is unmodified"""
+        for path, mtime in mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _scan(self) -> ProjectScan:
+        """Walk the project once, collecting names, extensions and manifest matches"""
+        scan = ProjectScan()
+        pending = {filename: set(needles) for filename, needles in self._content_patterns.items()}
+        stack = [(str(self.project_dir), "")]
+
+        while stack:
+            path, rel_path = stack.pop()
+            try:
+                scan.mtimes[path] = os.stat(path).st_mtime_ns
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
 
-    def _detect_languages(self) -> Set[str]:
+            for entry in entries:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                if is_dir:
+                    if name not in self.IGNORE_DIRS:
+                        child = f"{rel_path}/{name}" if rel_path else name
+                        scan.dir_names.add(name)
+                        scan.dir_paths.add(child)
+                        stack.append((entry.path, child))
+                    continue
+
+                scan.file_names.add(name)
+                ext = os.path.splitext(name)[1]
+                if ext:
+                    scan.extension_counts[ext] = scan.extension_counts.get(ext, 0) + 1
+                if pending:
+                    self._match_contents(entry, pending, scan)
+
+        return scan
+
+    def _match_contents(self, entry: os.DirEntry, pending: Dict[str, Set[str]],
+                        scan: ProjectScan):
+        """Read a manifest at most once and record the content patterns it contains"""
+        text = None
+        for filename, needles in list(pending.items()):
+            if not fnmatchcase(entry.name, filename):
+                continue
+            if text is None:
+                text = self._read_manifest(entry, scan)
+                if text is None:
+                    return
+            for needle in [n for n in needles if n in text]:
+                needles.discard(needle)
+                scan.content_matches.add(f"{filename}:{needle}")
+            if not needles:
+                # Every pattern for this file name is already found
+                del pending[filename]
+
+    def _read_manifest(self, entry: os.DirEntry, scan: ProjectScan) -> Optional[str]:
+        """Read a small manifest, recording its mtime for cache validation"""
+        try:
+            stat = entry.stat()
+            scan.mtimes[entry.path] = stat.st_mtime_ns
+            if stat.st_size > self.MAX_MANIFEST_BYTES:
+                return None
+            with open(entry.path, 'r', errors='replace') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _detect_languages(self, scan: ProjectScan) -> Set[str]:
         """Detect programming languages in project"""
-        languages = set()
-
-        for ext, lang in self.LANGUAGE_MAP.items():
-            if list(self.project_dir.rglob(f"*{ext}")):
-                languages.add(lang)
+        return {lang for ext, lang in self.LANGUAGE_MAP.items()
+                if ext in scan.extension_counts}
 
-        return languages
-
-    def _detect_frameworks(self) -> Set[str]:
+    def _detect_frameworks(self, scan: ProjectScan) -> Set[str]:
         """Detect frameworks in use"""
         frameworks = set()
 
         for framework, patterns in self.FRAMEWORK_PATTERNS.items():
-            if self._check_patterns(patterns):
+            if self._check_patterns(patterns, scan):
                 frameworks.add(framework)
 
         return frameworks
 
-    def _detect_technologies(self) -> Set[str]:
+    def _detect_technologies(self, scan: ProjectScan) -> Set[str]:
         """Detect technologies in use"""
         technologies = set()
 
         for tech, patterns in self.TECH_PATTERNS.items():
-            if self._check_patterns(patterns):
+            if self._check_patterns(patterns, scan):
                 technologies.add(tech)
 
         return technologies
 
-    def _check_patterns(self, patterns: List[str]) -> bool:
+    def _check_patterns(self, patterns: List[str], scan: ProjectScan) -> bool:
         """Check if any pattern matches in project"""
-        for pattern in patterns:
-            if ":" in pattern:
-                # File content pattern (e.g., "package.json:react")
-                filename, content_pattern = pattern.split(":", 1)
-                files = list(self.project_dir.rglob(filename))
-                for file in files:
-                    try:
-                        with open(file, 'r') as f:
-                            if content_pattern in f.read():
-                                return True
-                    except:
-                        pass
-            else:
-                # File existence pattern
-                if list(self.project_dir.rglob(pattern)):
-                    return True
-
-        return False
+        return any(self._matches(pattern, scan) for pattern in patterns)
+
+    def _matches(self, pattern: str, scan: ProjectScan) -> bool:
+        """Match a pattern against the scan as Path.rglob would against the tree"""
+        if ":" in pattern:
+            # File content pattern (e.g., "package.json:react")
+            return pattern in scan.content_matches
+
+        if pattern.endswith("/"):
+            # Directory pattern (e.g., "tests/")
+            return pattern.rstrip("/") in scan.dir_names
+
+        if "/" in pattern:
+            # Nested path (e.g., "config/routes.rb")
+            parent, name = pattern.rsplit("/", 1)
+            return any(
+                (rel_path == parent or rel_path.endswith("/" + parent))
+                and (self.project_dir / rel_path / name).exists()
+                for rel_path in scan.dir_paths
+            )
+
+        if not any(char in pattern for char in "*?["):
+            return pattern in scan.file_names or pattern in scan.dir_names
+
+        suffix = pattern[1:]
+        if pattern.startswith("*.") and suffix.count(".") == 1 and \
+                not any(char in suffix for char in "*?["):
+            # Plain extension (e.g., "*.tf")
+            return suffix in scan.extension_counts
+
+        return any(fnmatchcase(name, pattern) for name in scan.file_names) or \
+            any(fnmatchcase(name, pattern) for name in scan.dir_names)
 
     def _classify_project_type(
-        self, languages: Set[str], frameworks: Set[str]
+        self, languages: Set[str], frameworks: Set[str], scan: ProjectScan
     ) -> str:
         """Classify project type based on languages and frameworks"""
         # Web frameworks
@@ -345,7 +488,7 @@ class ProjectAnalyzer:
 
         # Data/ML indicators
         if "sql" in languages or any(fw in frameworks for fw in ["django", "flask", "fastapi"]):
-            if list(self.project_dir.rglob("*.ipynb")):
+            if self._matches("*.ipynb", scan):
                 return "ml"
             return "data"
 
@@ -357,11 +500,11 @@ class ProjectAnalyzer:
 
         return "general"
 
-    def _has_tests(self) -> bool:
+    def _has_tests(self, scan: ProjectScan) -> bool:
         """Check if project has tests"""
         test_patterns = ["test_*.py", "*_test.py", "*.test.js", "*.spec.ts",
                         "tests/", "__tests__/", "spec/"]
-        return any(list(self.project_dir.rglob(p)) for p in test_patterns)
+        return any(self._matches(p, scan) for p in test_patterns)
 
     def _has_ci_cd(self) -> bool:
         """Check if project has CI/CD setup"""
@@ -369,24 +512,14 @@ class ProjectAnalyzer:
                    "Jenkinsfile", ".circleci/"]
         return any((self.project_dir / f).exists() for f in ci_files)
 
-    def _has_docs(self) -> bool:
+    def _has_docs(self, scan: ProjectScan) -> bool:
         """Check if project has documentation"""
         doc_patterns = ["docs/", "README.md", "*.md"]
-        return any(list(self.project_dir.rglob(p)) for p in doc_patterns)
+        return any(self._matches(p, scan) for p in doc_patterns)
 
-    def _count_code_files(self) -> int:
-        """Count code files (excluding node_modules, etc.)"""
-        exclude_dirs = {".git", "node_modules", "venv", "__pycache__",
-                       ".pytest_cache", "dist", "build"}
-
-        count = 0
-        for ext in self.LANGUAGE_MAP:
-            for file in self.project_dir.rglob(f"*{ext}"):
-                # Skip if in excluded directory
-                if not any(excluded in file.parts for excluded in exclude_dirs):
-                    count += 1
-
-        return count
+    def _count_code_files(self, scan: ProjectScan) -> int:
+        """Count code files (IGNORE_DIRS are pruned by the scan)"""
+        return sum(scan.extension_counts.get(ext, 0) for ext in self.LANGUAGE_MAP)
 
     def _estimate_complexity(self, file_count: int) -> str:
         """Estimate project complexity based on file count"""
@@ -483,6 +616,98 @@ class AgentRecommendation:
     match_breakdown: Dict[str, float] = field(default_factory=dict)
 
 
+class DiscoveryIndex:
+    """
+    Inverted index over agent keywords and descriptions for AgentDiscoveryEngine.
+
+    Everything about an agent that does not depend on the query is computed
+    once: keyword postings, the DOMAIN_INTENTS its description aligns with,
+    its tier, and a trigram index over description words. Scoring a query
+    then touches only the agents sharing keywords or words with it; the rest
+    score the same as every other agent in their (tier, intents) group.
+    """
+
+    def __init__(
+        self,
+        registry: AgentRegistry,
+        agent_keywords: Dict[str, List[str]],
+        domain_intents: Dict[str, List[str]],
+    ):
+        """Compile the index from the registry's current agents"""
+        self.agents = registry.list_all_agents()
+        self.position = {name: i for i, name in enumerate(self.agents)}
+        self.tiers = {name: TierManager.get_tier(name) for name in self.agents}
+
+        # Direct name queries ("the-critic" or "the critic")
+        self.names: Dict[str, Set[str]] = {}
+        for name in self.agents:
+            self.names.setdefault(name, set()).add(name)
+            self.names.setdefault(name.replace("-", " "), set()).add(name)
+
+        # Keyword -> [(agent, occurrences)], and keyword list length per agent
+        self.keyword_postings: Dict[str, List[Tuple[str, int]]] = {}
+        self.keyword_counts: Dict[str, int] = {}
+        for name in self.agents:
+            keywords = agent_keywords.get(name)
+            if not keywords:
+                continue
+            self.keyword_counts[name] = len(keywords)
+            for keyword in set(keywords):
+                self.keyword_postings.setdefault(keyword, []).append(
+                    (name, keywords.count(keyword))
+                )
+        self.max_keyword_length = max(map(len, self.keyword_postings), default=0)
+
+        # Description words -> agents, and trigram -> description words
+        self.word_agents: Dict[str, Set[str]] = {}
+        self.word_trigrams: Dict[str, Set[str]] = {}
+        self.agent_intents: Dict[str, FrozenSet[str]] = {}
+        self.groups: Dict[Tuple[AgentTier, FrozenSet[str]], List[str]] = {}
+        for name in self.agents:
+            agent_meta = registry.get_agent(name)
+            if not agent_meta:
+                continue
+            description = agent_meta.description.lower()
+            for word in description.split():
+                self.word_agents.setdefault(word, set()).add(name)
+            intents = frozenset(
+                intent for intent, keywords in domain_intents.items()
+                if any(kw in description for kw in keywords)
+            )
+            self.agent_intents[name] = intents
+            self.groups.setdefault((self.tiers[name], intents), []).append(name)
+
+        for word in self.word_agents:
+            for i in range(len(word) - 2):
+                self.word_trigrams.setdefault(word[i:i + 3], set()).add(word)
+
+    def matching_keywords(self, query: str) -> Set[str]:
+        """Keywords that occur in the query as substrings"""
+        matches = set()
+        for start in range(len(query)):
+            for end in range(start + 1, min(len(query), start + self.max_keyword_length) + 1):
+                if query[start:end] in self.keyword_postings:
+                    matches.add(query[start:end])
+        return matches
+
+    def agents_with_description_text(self, text: str) -> Set[str]:
+        """Agents whose description contains text (at least 3 characters, no spaces)"""
+        candidates = None
+        for i in range(len(text) - 2):
+            words = self.word_trigrams.get(text[i:i + 3])
+            if not words:
+                return set()
+            candidates = set(words) if candidates is None else candidates & words
+            if not candidates:
+                return set()
+
+        agents = set()
+        for word in candidates or ():
+            if text in word:
+                agents |= self.word_agents[word]
+        return agents
+
+
 class AgentDiscoveryEngine:
     """
     Solves the 78-agent navigation problem with intelligent search.
@@ -498,6 +723,10 @@ class AgentDiscoveryEngine:
     - Intent alignment: 30%
     - Context fit: 20%
     - Tier priority: 10%
+
+    Scores come from a DiscoveryIndex compiled on first use, so a query only
+    scores the agents that share keywords or description words with it.
+    Call rebuild_index() after the registry changes.
     """
 
     # Domain intent keywords
@@ -544,9 +773,33 @@ class AgentDiscoveryEngine:
         "database-administrator": ["database", "dba", "tuning", "backup", "oltp", "admin"],
     }
 
+    # Tier priority scores (Core > Extended > Experimental)
+    TIER_SCORES = {
+        AgentTier.CORE: 1.0,
+        AgentTier.EXTENDED: 0.7,
+        AgentTier.EXPERIMENTAL: 0.4,
+        AgentTier.UNKNOWN: 0.0,
+    }
+
+    # Query words ignored by the context fit score
+    CONTEXT_STOP_WORDS = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+                          "of", "with", "my", "i", "need", "want", "help"}
+
     def __init__(self, registry: AgentRegistry):
         """Initialize discovery engine"""
         self.registry = registry
+        self._index: Optional[DiscoveryIndex] = None
+
+    @property
+    def index(self) -> DiscoveryIndex:
+        """Inverted index over the registry (compiled on first use)"""
+        if self._index is None:
+            self.rebuild_index()
+        return self._index
+
+    def rebuild_index(self):
+        """Recompile the discovery index from the registry"""
+        self._index = DiscoveryIndex(self.registry, self.AGENT_KEYWORDS, self.DOMAIN_INTENTS)
 
     def discover(
         self,
@@ -566,33 +819,101 @@ class AgentDiscoveryEngine:
             List of agent recommendations sorted by relevance
         """
         query_lower = query.lower()
+        index = self.index
+        query_words = set(query_lower.split())
+        context_words = [w for w in query_lower.split()
+                         if w not in self.CONTEXT_STOP_WORDS and len(w) > 2]
+        detected_intents = frozenset(
+            intent for intent, keywords in self.DOMAIN_INTENTS.items()
+            if any(kw in query_lower for kw in keywords)
+        )
 
-        # Score all agents
-        scored_agents = []
-        for agent_name in self.registry.list_all_agents():
-            # Apply tier filter if specified
-            if tier_filter and TierManager.get_tier(agent_name) != tier_filter:
+        # Keyword matches: exact matches are worth double
+        keyword_totals: Dict[str, int] = {}
+        for keyword in index.matching_keywords(query_lower):
+            weight = 2 if keyword == query_lower or keyword in query_words else 1
+            for agent_name, occurrences in index.keyword_postings[keyword]:
+                keyword_totals[agent_name] = keyword_totals.get(agent_name, 0) + weight * occurrences
+
+        # Description matches, counted per query word
+        context_matches: Dict[str, int] = {}
+        for word in context_words:
+            for agent_name in index.agents_with_description_text(word):
+                context_matches[agent_name] = context_matches.get(agent_name, 0) + 1
+
+        name_matches = index.names.get(query_lower, set())
+        touched = set(keyword_totals) | set(context_matches) | name_matches
+
+        # Intent alignment depends only on the agent's intents: score each set once
+        intent_scores: Dict[FrozenSet[str], float] = {}
+
+        def relevance(agent_name: str, keyword_score: float, context_score: float) -> float:
+            intents = index.agent_intents.get(agent_name)
+            if intents not in intent_scores:
+                intent_scores[intents] = self._intent_score(intents, detected_intents)
+            # Same terms and order as _calculate_relevance
+            return (keyword_score * 0.4 + intent_scores[intents] * 0.3 + context_score * 0.2
+                    + self.TIER_SCORES[index.tiers[agent_name]] * 0.1)
+
+        # Score the agents sharing tokens with the query
+        candidates = []
+        for agent_name in touched:
+            if tier_filter and index.tiers[agent_name] != tier_filter:
                 continue
-
-            score, breakdown = self._calculate_relevance(agent_name, query_lower)
-
-            if score > 0.1:  # Minimum threshold
-                agent_meta = self.registry.get_agent(agent_name)
-                explanation = self._generate_explanation(agent_name, query, breakdown)
-
-                recommendation = AgentRecommendation(
-                    agent_name=agent_name,
-                    relevance_score=score,
-                    tier=TierManager.get_tier(agent_name),
-                    explanation=explanation,
-                    match_breakdown=breakdown
-                )
-                scored_agents.append(recommendation)
-
-        # Sort by relevance score (descending)
-        scored_agents.sort(key=lambda x: x.relevance_score, reverse=True)
-
-        return scored_agents[:max_results]
+            if agent_name in name_matches:
+                keyword_score = 1.0  # Perfect match
+            elif agent_name in keyword_totals:
+                keyword_score = min(keyword_totals[agent_name] / index.keyword_counts[agent_name], 1.0)
+            else:
+                keyword_score = 0.0
+            context_score = min(context_matches.get(agent_name, 0) / len(context_words), 1.0) \
+                if context_words else 0.0
+            candidates.append((relevance(agent_name, keyword_score, context_score),
+                               agent_name, keyword_score, context_score))
+
+        # Every other agent scores as its (tier, intents) group does; within a
+        # group registry order decides, so only the first max_results can rank
+        for (tier, intents), members in index.groups.items():
+            if tier_filter and tier != tier_filter:
+                continue
+            score = relevance(members[0], 0.0, 0.0)
+            if score <= 0.1:
+                continue
+            untouched = (name for name in members if name not in touched)
+            for agent_name in itertools.islice(untouched, max_results):
+                candidates.append((score, agent_name, 0.0, 0.0))
+
+        # Sort by relevance score (descending), ties in registry order
+        candidates = [c for c in candidates if c[0] > 0.1]  # Minimum threshold
+        candidates.sort(key=lambda c: (-c[0], index.position[c[1]]))
+
+        recommendations = []
+        for score, agent_name, keyword_score, context_score in candidates[:max_results]:
+            breakdown = {
+                'keyword': keyword_score * 0.4,
+                'intent': intent_scores[index.agent_intents.get(agent_name)] * 0.3,
+                'context': context_score * 0.2,
+                'tier': self.TIER_SCORES[index.tiers[agent_name]] * 0.1,
+            }
+            recommendations.append(AgentRecommendation(
+                agent_name=agent_name,
+                relevance_score=score,
+                tier=index.tiers[agent_name],
+                explanation=self._generate_explanation(agent_name, query, breakdown),
+                match_breakdown=breakdown
+            ))
+
+        return recommendations
+
+    @staticmethod
+    def _intent_score(agent_intents: Optional[FrozenSet[str]],
+                      detected_intents: FrozenSet[str]) -> float:
+        """Intent alignment from an agent's precomputed intents (None: not in registry)"""
+        if agent_intents is None:
+            return 0.0
+        if not detected_intents:
+            return 0.5  # Neutral if no intent detected
+        return min(len(agent_intents & detected_intents) / len(detected_intents), 1.0)
 
     def _calculate_relevance(self, agent_name: str, query: str) -> Tuple[float, Dict[str, float]]:
         """
@@ -680,8 +1001,7 @@ class AgentDiscoveryEngine:
         description = agent_meta.description.lower()
 
         # Split query into words, filter common words
-        stop_words = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "my", "i", "need", "want", "help"}
-        query_words = [w for w in query.split() if w not in stop_words and len(w) > 2]
+        query_words = [w for w in query.split() if w not in self.CONTEXT_STOP_WORDS and len(w) > 2]
 
         if not query_words:
             return 0.0
@@ -693,13 +1013,7 @@ class AgentDiscoveryEngine:
 
     def _tier_priority_score(self, agent_name: str) -> float:
         """Score based on agent tier (Core > Extended > Experimental)"""
-        tier = TierManager.get_tier(agent_name)
-        return {
-            AgentTier.CORE: 1.0,
-            AgentTier.EXTENDED: 0.7,
-            AgentTier.EXPERIMENTAL: 0.4,
-            AgentTier.UNKNOWN: 0.0,
-        }[tier]
+        return self.TIER_SCORES[TierManager.get_tier(agent_name)]
 
     def _generate_explanation(
         self, agent_name: str, query: str, breakdown: Dict[str, float]
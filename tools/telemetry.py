@@ -11,16 +11,28 @@ Design Principles:
 - Transparent: Clear documentation of what's collected
 - Local-first: Data stored locally in .claude-telemetry/
 - Simple: Plain JSON files, no databases required
+
+Summaries are served from a running-aggregate checkpoint plus per-day columnar
+segments (NumPy), so only events newer than the checkpoint are parsed.
 """
 
 import json
+import math
+import os
+import pickle
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 class EventType(Enum):
     """Types of telemetry events we track"""
@@ -58,6 +70,612 @@ class TelemetryEvent:
         return {k: v for k, v in asdict(self).items() if v is not None}
 
 
+# Event type codes used in columnar segments (-1 for unknown types)
+EVENT_CODES = {event_type.value: code for code, event_type in enumerate(EventType)}
+
+
+class DurationSketch:
+    """
+    Mergeable streaming quantile sketch of durations (DDSketch).
+
+    Positive values are counted in logarithmic buckets, so every quantile is
+    within RELATIVE_ACCURACY of an exact value of the data, and memory stays
+    bounded by MAX_BUCKETS however many values are added. Zero (and negative)
+    durations are counted separately. Sketches of disjoint data merge by
+    adding bucket counts.
+    """
+
+    RELATIVE_ACCURACY = 0.01
+    GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    LOG_GAMMA = math.log(GAMMA)
+    MAX_BUCKETS = 2048
+
+    def __init__(self):
+        """Initialize an empty sketch"""
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values):
+        """Add an array of durations"""
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        keys, counts = np.unique(np.ceil(np.log(positive) / self.LOG_GAMMA).astype(np.int64),
+                                 return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self._collapse()
+
+    def merge(self, other: "DurationSketch"):
+        """Add the values counted by another sketch"""
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self._collapse()
+
+    def _collapse(self):
+        """Fold the lowest buckets together once there are too many"""
+        if len(self.buckets) <= self.MAX_BUCKETS:
+            return
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.MAX_BUCKETS
+        floor = keys[excess]
+        self.buckets[floor] += sum(self.buckets.pop(key) for key in keys[:excess])
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q (0-1); 0.0 for an empty sketch"""
+        if not self.count:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2 * self.GAMMA ** key / (self.GAMMA + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_state(self) -> Tuple:
+        """Plain data for persistence"""
+        return (self.count, self.zero_count, self.min, self.max, dict(self.buckets))
+
+    @classmethod
+    def from_state(cls, state: Tuple) -> "DurationSketch":
+        """Rebuild a sketch from to_state() data"""
+        sketch = cls()
+        sketch.count, sketch.zero_count, sketch.min, sketch.max, sketch.buckets = state
+        sketch.buckets = dict(sketch.buckets)
+        return sketch
+
+    GROUPS = ("all", "agents", "commands")
+
+    @classmethod
+    def pack(cls, sketches: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Pack a day's sketches ({"all": sketch, "agents": {...}, "commands": {...}})
+        into a few flat arrays, which persist and load far faster than one
+        object per sketch. Unpack only what a query needs.
+        """
+        groups, names, flat = [], [], []
+        for code, group in enumerate(cls.GROUPS):
+            by_name = {"": sketches[group]} if group == "all" else sketches[group]
+            for name, sketch in by_name.items():
+                groups.append(code)
+                names.append(name)
+                flat.append(sketch)
+
+        bucket_items = [sorted(sketch.buckets.items()) for sketch in flat]
+        return {
+            "groups": np.array(groups, dtype=np.int8),
+            "names": names,
+            "counts": np.array([(sketch.count, sketch.zero_count) for sketch in flat],
+                               dtype=np.int64).reshape(-1, 2),
+            "bounds": np.array([(sketch.min, sketch.max) for sketch in flat],
+                               dtype=np.float64).reshape(-1, 2),
+            "offsets": np.cumsum([0] + [len(items) for items in bucket_items]),
+            "buckets": np.array([item for items in bucket_items for item in items],
+                                dtype=np.int64).reshape(-1, 2),
+        }
+
+    @classmethod
+    def unpack_one(cls, packed: Dict[str, Any], group: str,
+                   name: str = "") -> Optional["DurationSketch"]:
+        """Unpack one sketch of a pack() result, or None if it has none by that name"""
+        code = cls.GROUPS.index(group)
+        for i, (sketch_group, sketch_name) in enumerate(zip(packed["groups"].tolist(), packed["names"])):
+            if sketch_group == code and sketch_name == name:
+                return cls._unpack_at(packed, i)
+        return None
+
+    @classmethod
+    def unpack(cls, packed: Dict[str, Any]) -> Dict[str, Any]:
+        """Unpack all sketches of a pack() result"""
+        sketches = {"all": cls(), "agents": {}, "commands": {}}
+        for i, (code, name) in enumerate(zip(packed["groups"].tolist(), packed["names"])):
+            if code == 0:
+                sketches["all"] = cls._unpack_at(packed, i)
+            else:
+                sketches[cls.GROUPS[code]][name] = cls._unpack_at(packed, i)
+        return sketches
+
+    @classmethod
+    def _unpack_at(cls, packed: Dict[str, Any], i: int) -> "DurationSketch":
+        sketch = cls()
+        sketch.count, sketch.zero_count = packed["counts"][i].tolist()
+        sketch.min, sketch.max = packed["bounds"][i].tolist()
+        start, end = packed["offsets"][i], packed["offsets"][i + 1]
+        sketch.buckets = dict(packed["buckets"][start:end].tolist())
+        return sketch
+
+
+@dataclass
+class EventColumns:
+    """Telemetry events as parallel NumPy arrays"""
+    timestamp: Any                  # float64
+    event_code: Any                 # int8, index into EventType (-1 if unknown)
+    agent: Any                      # int32, index into agent_names (-1 if none)
+    command: Any                    # int32, index into command_names (-1 if none)
+    duration: Any                   # float64, NaN if none
+    satisfied: Any                  # bool
+    agent_names: List[str]
+    command_names: List[str]
+
+    @classmethod
+    def from_events(cls, events: List[Dict]) -> "EventColumns":
+        """Convert event dictionaries to columns"""
+        agent_ids: Dict[str, int] = {}
+        command_ids: Dict[str, int] = {}
+        agents, commands, durations = [], [], []
+        for event in events:
+            agent_name = event.get("agent_name")
+            agents.append(agent_ids.setdefault(agent_name, len(agent_ids)) if agent_name else -1)
+            command_name = event.get("command_name")
+            commands.append(command_ids.setdefault(command_name, len(command_ids)) if command_name else -1)
+            duration = event.get("duration_seconds")
+            durations.append(np.nan if duration is None else duration)
+
+        return cls(
+            timestamp=np.array([e["timestamp"] for e in events], dtype=np.float64),
+            event_code=np.array([EVENT_CODES.get(e["event_type"], -1) for e in events], dtype=np.int8),
+            agent=np.array(agents, dtype=np.int32),
+            command=np.array(commands, dtype=np.int32),
+            duration=np.array(durations, dtype=np.float64),
+            satisfied=np.array([bool(e.get("user_satisfied")) for e in events], dtype=bool),
+            agent_names=list(agent_ids),
+            command_names=list(command_ids),
+        )
+
+    def duration_sketches(self) -> Dict[str, Any]:
+        """
+        Sketches of the batch's durations: overall, per agent and per command,
+        in DurationSketch.pack() form. Built for all sketches at once.
+        """
+        has_duration = ~np.isnan(self.duration)
+        durations = self.duration[has_duration]
+        agents, commands = self.agent[has_duration], self.command[has_duration]
+        n_agents = len(self.agent_names)
+
+        # Sketch 0 is overall, then one per agent id, then one per command id
+        has_agent, has_command = agents >= 0, commands >= 0
+        sketch_ids = np.concatenate([
+            np.zeros(len(durations), dtype=np.int64),
+            1 + agents[has_agent].astype(np.int64),
+            1 + n_agents + commands[has_command].astype(np.int64),
+        ])
+        values = np.concatenate([durations, durations[has_agent], durations[has_command]])
+        n_sketches = 1 + n_agents + len(self.command_names)
+
+        counts = np.bincount(sketch_ids, minlength=n_sketches)
+        zero_counts = np.bincount(sketch_ids[values <= 0], minlength=n_sketches)
+        mins, maxs = np.full(n_sketches, math.inf), np.full(n_sketches, -math.inf)
+        np.minimum.at(mins, sketch_ids, values)
+        np.maximum.at(maxs, sketch_ids, values)
+
+        positive = values > 0
+        keys = np.ceil(np.log(values[positive]) / DurationSketch.LOG_GAMMA).astype(np.int64)
+        pairs, bucket_counts = np.unique((sketch_ids[positive] << 32) + (keys + (1 << 31)),
+                                         return_counts=True)
+        pair_sketches = pairs >> 32
+        offsets = np.searchsorted(pair_sketches, np.arange(n_sketches + 1))
+
+        kept = counts > 0
+        kept[0] = True
+        kept_ids = np.flatnonzero(kept)
+        groups = np.zeros(n_sketches, dtype=np.int8)
+        groups[1:1 + n_agents] = 1
+        groups[1 + n_agents:] = 2
+        names = [""] + self.agent_names + self.command_names
+        bucket_slices = [np.arange(offsets[i], offsets[i + 1]) for i in kept_ids]
+        bucket_index = np.concatenate(bucket_slices) if bucket_slices else np.empty(0, np.int64)
+
+        packed = {
+            "groups": groups[kept],
+            "names": [names[i] for i in kept_ids.tolist()],
+            "counts": np.stack([counts[kept], zero_counts[kept]], axis=1).astype(np.int64),
+            "bounds": np.stack([mins[kept], maxs[kept]], axis=1),
+            "offsets": np.cumsum([0] + [len(index) for index in bucket_slices]),
+            "buckets": np.stack([(pairs[bucket_index] & 0xFFFFFFFF) - (1 << 31),
+                                 bucket_counts[bucket_index]], axis=1).astype(np.int64),
+        }
+        if np.diff(packed["offsets"]).max() > DurationSketch.MAX_BUCKETS:
+            sketches = DurationSketch.unpack(packed)
+            for sketch in [sketches["all"], *sketches["agents"].values(), *sketches["commands"].values()]:
+                sketch._collapse()
+            packed = DurationSketch.pack(sketches)
+        return packed
+
+    @classmethod
+    def concatenate(cls, parts: List["EventColumns"]) -> "EventColumns":
+        """Join batches in order, merging their name tables"""
+        agent_ids: Dict[str, int] = {}
+        command_ids: Dict[str, int] = {}
+
+        def remap(ids, names: List[str], table: Dict[str, int]):
+            mapping = np.array([table.setdefault(name, len(table)) for name in names] + [-1],
+                               dtype=np.int32)
+            return mapping[ids]  # -1 indexes the trailing -1
+
+        agents = [remap(part.agent, part.agent_names, agent_ids) for part in parts]
+        commands = [remap(part.command, part.command_names, command_ids) for part in parts]
+        return cls(
+            timestamp=np.concatenate([part.timestamp for part in parts] or [np.empty(0)]),
+            event_code=np.concatenate([part.event_code for part in parts] or [np.empty(0, np.int8)]),
+            agent=np.concatenate(agents or [np.empty(0, np.int32)]),
+            command=np.concatenate(commands or [np.empty(0, np.int32)]),
+            duration=np.concatenate([part.duration for part in parts] or [np.empty(0)]),
+            satisfied=np.concatenate([part.satisfied for part in parts] or [np.empty(0, bool)]),
+            agent_names=list(agent_ids),
+            command_names=list(command_ids),
+        )
+
+
+@dataclass
+class TelemetryCheckpoint:
+    """
+    Running aggregates over a prefix of the event files.
+
+    ``files`` records, in file order, how many bytes of each daily file have
+    been folded in (and the file's mtime then). Counters are accumulated in
+    event order, so they equal a single pass over all events. Durations are
+    kept as DurationSketches: overall, and per day for the whole day, each
+    agent and each command, so any window of days can be merged.
+    """
+    files: List[Tuple[str, int, int]] = field(default_factory=list)
+    total_events: int = 0
+    first_timestamp: Optional[float] = None
+    last_timestamp: Optional[float] = None
+    # agent -> [invocations, completions, failures, total_duration]
+    agents: Dict[str, List] = field(default_factory=dict)
+    commands: Dict[str, int] = field(default_factory=dict)
+    total_feedback: int = 0
+    satisfied_count: int = 0
+    duration_sum: float = 0.0
+    duration_sketch: Optional[DurationSketch] = None
+    # day -> DurationSketch.pack() of its overall, per agent and per command sketches
+    day_sketches: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.duration_sketch is None:
+            self.duration_sketch = DurationSketch()
+
+    def add(self, columns: EventColumns):
+        """Fold a batch of events (in file order) into the aggregates"""
+        if not len(columns.timestamp):
+            return
+
+        self.total_events += len(columns.timestamp)
+        first, last = float(columns.timestamp.min()), float(columns.timestamp.max())
+        self.first_timestamp = first if self.first_timestamp is None else min(self.first_timestamp, first)
+        self.last_timestamp = last if self.last_timestamp is None else max(self.last_timestamp, last)
+
+        code = columns.event_code
+        has_agent = columns.agent >= 0
+        n_agents = len(columns.agent_names)
+        if n_agents:
+            # Register agents in order of first appearance, as a scan would
+            ids, first_index = np.unique(columns.agent[has_agent], return_index=True)
+            for agent_id in ids[np.argsort(first_index)]:
+                self.agents.setdefault(columns.agent_names[agent_id], [0, 0, 0, 0.0])
+
+            counts = [
+                np.bincount(columns.agent[has_agent & (code == EVENT_CODES[event_type.value])],
+                            minlength=n_agents)
+                for event_type in (EventType.AGENT_INVOKED, EventType.AGENT_COMPLETED,
+                                   EventType.AGENT_FAILED)
+            ]
+            # Durations of completions, added one by one onto the running totals
+            timed = (has_agent & (code == EVENT_CODES[EventType.AGENT_COMPLETED.value])
+                     & ~np.isnan(columns.duration) & (columns.duration != 0))
+            totals = np.array([self.agents[name][3] for name in columns.agent_names])
+            np.add.at(totals, columns.agent[timed], columns.duration[timed])
+
+            for agent_id, name in enumerate(columns.agent_names):
+                stats = self.agents[name]
+                stats[0] += int(counts[0][agent_id])
+                stats[1] += int(counts[1][agent_id])
+                stats[2] += int(counts[2][agent_id])
+                stats[3] = float(totals[agent_id])
+
+        if columns.command_names:
+            counts = np.bincount(columns.command[columns.command >= 0],
+                                 minlength=len(columns.command_names))
+            for command_id, name in enumerate(columns.command_names):
+                self.commands[name] = self.commands.get(name, 0) + int(counts[command_id])
+
+        feedback = code == EVENT_CODES[EventType.USER_FEEDBACK.value]
+        self.total_feedback += int(feedback.sum())
+        self.satisfied_count += int((feedback & columns.satisfied).sum())
+
+        durations = columns.duration[~np.isnan(columns.duration)]
+        if len(durations):
+            self.duration_sum = float(np.cumsum(np.concatenate(([self.duration_sum], durations)))[-1])
+
+    def add_sketches(self, day: str, packed: Dict[str, Any]):
+        """Merge a day's packed duration sketches (from EventColumns.duration_sketches)"""
+        day_sketch = DurationSketch.unpack_one(packed, "all")
+        if day_sketch is None or not day_sketch.count:
+            return
+
+        self.duration_sketch.merge(day_sketch)
+        if day in self.day_sketches:
+            sketches = DurationSketch.unpack(self.day_sketches[day])
+            added = DurationSketch.unpack(packed)
+            sketches["all"].merge(added["all"])
+            for group in ("agents", "commands"):
+                for name, sketch in added[group].items():
+                    sketches[group].setdefault(name, DurationSketch()).merge(sketch)
+            packed = DurationSketch.pack(sketches)
+        self.day_sketches[day] = packed
+
+    def window_sketch(self, agent_name: Optional[str] = None, command_name: Optional[str] = None,
+                      start: Optional[str] = None, end: Optional[str] = None) -> DurationSketch:
+        """
+        Merge the day sketches of a window.
+
+        Args:
+            agent_name: Only durations of this agent
+            command_name: Only durations of this command
+            start: First day (YYYY-MM-DD), inclusive
+            end: Last day (YYYY-MM-DD), inclusive
+        """
+        if agent_name:
+            group, name = "agents", agent_name
+        elif command_name:
+            group, name = "commands", command_name
+        else:
+            group, name = "all", ""
+
+        sketch = DurationSketch()
+        for day, packed in self.day_sketches.items():
+            if (start and day < start) or (end and day > end):
+                continue
+            part = DurationSketch.unpack_one(packed, group, name)
+            if part is not None:
+                sketch.merge(part)
+        return sketch
+
+
+class TelemetryStore:
+    """
+    Columnar store for telemetry summaries under ``<telemetry>/columnar/``.
+
+    The daily ``.jsonl`` files stay the source of truth. Closed days (every
+    file but the newest) are compacted into NumPy segments, and a checkpoint
+    of running aggregates and duration sketches records how far each file
+    has been read, so a summary only parses events appended since. Checkpoint and segments are
+    rebuilt when files are rewritten, truncated or inserted before the newest.
+    """
+
+    VERSION = 2
+    FILENAME = "checkpoint.pkl"
+    SEGMENTS = "segments"
+
+    def __init__(self, events_dir: Path, store_dir: Path):
+        """Initialize store for an events directory"""
+        self.events_dir = Path(events_dir)
+        self.store_dir = Path(store_dir)
+        self.segments_dir = self.store_dir / self.SEGMENTS
+
+    @property
+    def path(self) -> Path:
+        """Path of the checkpoint file"""
+        return self.store_dir / self.FILENAME
+
+    def exists(self) -> bool:
+        """Check if a checkpoint is available"""
+        return self.path.exists()
+
+    def load(self) -> Optional[TelemetryCheckpoint]:
+        """Load the checkpoint, or None if missing, unreadable or outdated"""
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load telemetry checkpoint {self.path}: {e}")
+            return None
+
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            return None
+        state = data['checkpoint']
+        state['duration_sketch'] = DurationSketch.from_state(state['duration_sketch'])
+        return TelemetryCheckpoint(**state)
+
+    def save(self, checkpoint: TelemetryCheckpoint):
+        """Persist the checkpoint atomically (write to a temp file, then rename)"""
+        state = dict(vars(checkpoint))
+        state['duration_sketch'] = checkpoint.duration_sketch.to_state()
+        data = {'version': self.VERSION, 'checkpoint': state}
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write telemetry checkpoint {self.path}: {e}")
+
+    def clear(self):
+        """Delete the checkpoint and all segments"""
+        if self.path.exists():
+            self.path.unlink()
+        if self.segments_dir.exists():
+            for segment in self.segments_dir.glob("*.pkl"):
+                segment.unlink()
+
+    def load_segment(self, event_file: Path,
+                     stat: os.stat_result) -> Optional[Tuple[EventColumns, Dict[str, Any]]]:
+        """
+        Load the segment of a daily file if it was compacted from its current
+        contents; returns its columns and packed duration sketches.
+        """
+        segment = self.segments_dir / f"{event_file.stem}.pkl"
+        if not segment.exists():
+            return None
+
+        try:
+            with open(segment, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load telemetry segment {segment}: {e}")
+            return None
+
+        if (not isinstance(data, dict) or data.get('version') != self.VERSION
+                or data.get('source') != (stat.st_size, stat.st_mtime_ns)):
+            return None
+        return EventColumns(**data['columns']), data['sketches']
+
+    def save_segment(self, event_file: Path, stat: os.stat_result, columns: EventColumns,
+                     sketches: Dict[str, Any]):
+        """Compact a daily file's columns and duration sketches into its segment"""
+        segment = self.segments_dir / f"{event_file.stem}.pkl"
+        data = {
+            'version': self.VERSION,
+            'source': (stat.st_size, stat.st_mtime_ns),
+            'columns': vars(columns),
+            'sketches': sketches,
+        }
+        try:
+            self.segments_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = segment.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, segment)
+        except OSError as e:
+            print(f"Warning: Could not write telemetry segment {segment}: {e}")
+
+    def refresh(self) -> TelemetryCheckpoint:
+        """Bring the checkpoint up to date with the event files and return it"""
+        event_files = sorted(self.events_dir.glob("*.jsonl"))
+        stats = {event_file.name: event_file.stat() for event_file in event_files}
+
+        checkpoint = self.load()
+        if checkpoint is None or not self._extends(checkpoint, event_files, stats):
+            checkpoint = self._rebuild(event_files, stats)
+            self.save(checkpoint)
+        elif self._append(checkpoint, event_files, stats):
+            self.save(checkpoint)
+        return checkpoint
+
+    def _extends(self, checkpoint: TelemetryCheckpoint, event_files: List[Path],
+                 stats: Dict[str, os.stat_result]) -> bool:
+        """Check that the files only grew at the end since the checkpoint"""
+        names = [event_file.name for event_file in event_files]
+        if [name for name, _, _ in checkpoint.files] != names[:len(checkpoint.files)]:
+            return False
+
+        last = len(checkpoint.files) - 1
+        for i, (name, offset, mtime_ns) in enumerate(checkpoint.files):
+            stat = stats[name]
+            grew = stat.st_size > offset
+            if stat.st_size < offset or (grew and i < last):
+                return False
+            if not grew and stat.st_mtime_ns != mtime_ns:
+                return False
+        return True
+
+    def _append(self, checkpoint: TelemetryCheckpoint, event_files: List[Path],
+                stats: Dict[str, os.stat_result]) -> bool:
+        """Fold events appended since the checkpoint; True if any were read"""
+        changed = False
+        for i, event_file in enumerate(event_files):
+            offset = checkpoint.files[i][1] if i < len(checkpoint.files) else 0
+            stat = stats[event_file.name]
+            if i < len(checkpoint.files) and stat.st_size == offset:
+                continue
+
+            columns, consumed = self._read_events(event_file, offset)
+            checkpoint.add(columns)
+            checkpoint.add_sketches(event_file.stem, columns.duration_sketches())
+            entry = (event_file.name, offset + consumed, stat.st_mtime_ns)
+            if i < len(checkpoint.files):
+                checkpoint.files[i] = entry
+            else:
+                checkpoint.files.append(entry)
+            changed = True
+        return changed
+
+    def _rebuild(self, event_files: List[Path],
+                 stats: Dict[str, os.stat_result]) -> TelemetryCheckpoint:
+        """Aggregate all files from segments where current, compacting closed days"""
+        checkpoint = TelemetryCheckpoint()
+        parts = []
+        for i, event_file in enumerate(event_files):
+            stat = stats[event_file.name]
+            segment = self.load_segment(event_file, stat)
+            if segment is not None:
+                columns, sketches = segment
+                consumed = stat.st_size
+            else:
+                columns, consumed = self._read_events(event_file, 0)
+                sketches = columns.duration_sketches()
+                if i < len(event_files) - 1 and consumed == stat.st_size:
+                    self.save_segment(event_file, stat, columns, sketches)
+            parts.append(columns)
+            checkpoint.add_sketches(event_file.stem, sketches)
+            checkpoint.files.append((event_file.name, consumed, stat.st_mtime_ns))
+        checkpoint.add(EventColumns.concatenate(parts))
+
+        # Drop segments of deleted files
+        if self.segments_dir.exists():
+            days = {event_file.stem for event_file in event_files}
+            for segment in self.segments_dir.glob("*.pkl"):
+                if segment.stem not in days:
+                    segment.unlink()
+        return checkpoint
+
+    @staticmethod
+    def _read_events(event_file: Path, offset: int) -> Tuple[EventColumns, int]:
+        """Parse complete lines from offset on; returns columns and bytes consumed"""
+        with open(event_file, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+
+        # A line still being written is left for the next refresh
+        consumed = data.rfind(b'\n') + 1
+        events = [json.loads(line) for line in data[:consumed].splitlines() if line.strip()]
+        return EventColumns.from_events(events), consumed
+
+
 class TelemetryCollector:
     """
     Collects and persists telemetry events.
@@ -67,6 +685,9 @@ class TelemetryCollector:
       ├── events/
       │   ├── 2025-10-07.jsonl  # Daily event logs
       │   └── 2025-10-08.jsonl
+      ├── columnar/              # Derived, rebuilt from events/ when stale
+      │   ├── checkpoint.pkl     # Running aggregates and read offsets
+      │   └── segments/          # Compacted closed days, one per file
       ├── config.json            # User preferences
       └── summary.json           # Aggregated metrics
     """
@@ -81,6 +702,9 @@ class TelemetryCollector:
         self.events_dir = self.base_dir / "events"
         self.config_file = self.base_dir / "config.json"
         self.summary_file = self.base_dir / "summary.json"
+        self.store = (
+            TelemetryStore(self.events_dir, self.base_dir / "columnar") if HAS_NUMPY else None
+        )
 
         self._ensure_directories()
         self._load_config()
@@ -264,26 +888,17 @@ class TelemetryCollector:
 
         return events
 
-    def _calculate_performance_metrics(self, summary: Dict, events: List[Dict]):
+    def _calculate_performance_metrics(self, summary: Dict, n: int, duration_sum: float,
+                                       percentile: Callable[[int], float]):
         """Calculate detailed performance metrics including percentiles"""
-        # Collect all durations
-        durations = [
-            e["duration_seconds"] for e in events
-            if e.get("duration_seconds") is not None
-        ]
-
-        if not durations:
+        if not n:
             return
 
-        # Sort for percentile calculation
-        sorted_durations = sorted(durations)
-        n = len(sorted_durations)
-
         # Calculate percentiles
-        summary["performance"]["avg_duration"] = sum(durations) / n
-        summary["performance"]["median_duration"] = self._percentile(sorted_durations, 50)
-        summary["performance"]["p95_duration"] = self._percentile(sorted_durations, 95)
-        summary["performance"]["p99_duration"] = self._percentile(sorted_durations, 99)
+        summary["performance"]["avg_duration"] = duration_sum / n
+        summary["performance"]["median_duration"] = float(percentile(50))
+        summary["performance"]["p95_duration"] = float(percentile(95))
+        summary["performance"]["p99_duration"] = float(percentile(99))
 
         # Find fastest and slowest agents (by average duration)
         agent_durations = {
@@ -306,7 +921,7 @@ class TelemetryCollector:
 
     def _percentile(self, sorted_values: List[float], percentile: int) -> float:
         """Calculate percentile from sorted values"""
-        if not sorted_values:
+        if len(sorted_values) == 0:
             return 0.0
 
         k = (len(sorted_values) - 1) * (percentile / 100)
@@ -320,11 +935,75 @@ class TelemetryCollector:
             return sorted_values[f] * (c - k) + sorted_values[c] * (k - f)
 
     def generate_summary(self) -> Dict:
-        """Generate summary statistics from all events"""
-        events = self.load_events()
+        """
+        Generate summary statistics from all events.
+
+        Served from the columnar store's checkpoint, so only events appended
+        since the previous summary are parsed, and percentiles come from a
+        duration sketch (within DurationSketch.RELATIVE_ACCURACY). Without
+        NumPy every event is loaded and percentiles are exact.
+        """
+        if self.store is not None:
+            summary = self._summary_from_checkpoint(self.store.refresh())
+        else:
+            summary = self._summary_from_events(self.load_events())
+
+        if summary["total_events"]:
+            # Save summary
+            with open(self.summary_file, 'w') as f:
+                json.dump(summary, f, indent=2)
 
-        summary = {
-            "total_events": len(events),
+        return summary
+
+    def duration_percentiles(
+        self,
+        percentiles: Tuple[int, ...] = (50, 95, 99),
+        agent_name: Optional[str] = None,
+        command_name: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> Dict[int, float]:
+        """
+        Duration percentiles over a window of days.
+
+        Merges the per-day sketches of the window, so the cost depends on the
+        number of days, not events. Without NumPy the window's events are
+        loaded and sorted.
+
+        Args:
+            percentiles: Percentiles to compute (0-100)
+            agent_name: Only durations of this agent
+            command_name: Only durations of this command
+            start: First day (YYYY-MM-DD), inclusive
+            end: Last day (YYYY-MM-DD), inclusive
+
+        Returns:
+            Value per percentile (0.0 when the window has no durations)
+        """
+        if self.store is not None:
+            sketch = self.store.refresh().window_sketch(agent_name, command_name, start, end)
+            return {p: sketch.quantile(p / 100) for p in percentiles}
+
+        durations = []
+        for event_file in sorted(self.events_dir.glob("*.jsonl")):
+            day = event_file.stem
+            if (start and day < start) or (end and day > end):
+                continue
+            for event in self.load_events(day):
+                if event.get("duration_seconds") is None:
+                    continue
+                if agent_name and event.get("agent_name") != agent_name:
+                    continue
+                if command_name and event.get("command_name") != command_name:
+                    continue
+                durations.append(event["duration_seconds"])
+        durations.sort()
+        return {p: float(self._percentile(durations, p)) for p in percentiles}
+
+    def _empty_summary(self) -> Dict:
+        """Summary structure with no events"""
+        return {
+            "total_events": 0,
             "agents": {},
             "commands": {},
             "satisfaction": {
@@ -346,6 +1025,39 @@ class TelemetryCollector:
             }
         }
 
+    def _summary_from_checkpoint(self, checkpoint: TelemetryCheckpoint) -> Dict:
+        """Build the summary from the store's running aggregates"""
+        summary = self._empty_summary()
+        summary["total_events"] = checkpoint.total_events
+        if not checkpoint.total_events:
+            return summary
+
+        summary["period"]["first_event"] = datetime.fromtimestamp(checkpoint.first_timestamp).isoformat()
+        summary["period"]["last_event"] = datetime.fromtimestamp(checkpoint.last_timestamp).isoformat()
+
+        for agent_name, (invocations, completions, failures, total_duration) in checkpoint.agents.items():
+            summary["agents"][agent_name] = {
+                "invocations": invocations,
+                "completions": completions,
+                "failures": failures,
+                "total_duration": total_duration,
+                "avg_duration": 0.0
+            }
+        for command_name, invocations in checkpoint.commands.items():
+            summary["commands"][command_name] = {"invocations": invocations}
+        summary["satisfaction"]["total_feedback"] = checkpoint.total_feedback
+        summary["satisfaction"]["satisfied_count"] = checkpoint.satisfied_count
+
+        self._calculate_rates(summary)
+        sketch = checkpoint.duration_sketch
+        self._calculate_performance_metrics(summary, sketch.count, checkpoint.duration_sum,
+                                            lambda p: sketch.quantile(p / 100))
+        return summary
+
+    def _summary_from_events(self, events: List[Dict]) -> Dict:
+        """Build the summary by scanning every event"""
+        summary = self._empty_summary()
+        summary["total_events"] = len(events)
         if not events:
             return summary
 
@@ -392,7 +1104,20 @@ class TelemetryCollector:
                 if event.get("user_satisfied"):
                     summary["satisfaction"]["satisfied_count"] += 1
 
-        # Calculate averages
+        self._calculate_rates(summary)
+
+        # Calculate performance metrics
+        durations = [
+            e["duration_seconds"] for e in events
+            if e.get("duration_seconds") is not None
+        ]
+        sorted_durations = sorted(durations)
+        self._calculate_performance_metrics(summary, len(durations), sum(durations),
+                                            lambda p: self._percentile(sorted_durations, p))
+        return summary
+
+    def _calculate_rates(self, summary: Dict):
+        """Calculate agent average durations and the satisfaction rate"""
         for agent_stats in summary["agents"].values():
             if agent_stats["completions"] > 0:
                 agent_stats["avg_duration"] = (
@@ -405,15 +1130,6 @@ class TelemetryCollector:
                 summary["satisfaction"]["total_feedback"]
             )
 
-        # Calculate performance metrics
-        self._calculate_performance_metrics(summary, events)
-
-        # Save summary
-        with open(self.summary_file, 'w') as f:
-            json.dump(summary, f, indent=2)
-
-        return summary
-
     def print_summary(self):
         """Print formatted summary to console"""
         summary = self.generate_summary()